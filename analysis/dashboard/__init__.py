@@ -4,18 +4,32 @@ from .loaders import (
     EVSnapshot,
     SlippageSnapshot,
     TurnoverSnapshot,
+    list_state_files,
     load_ev_history,
+    load_ev_snapshot,
     load_execution_slippage,
     load_state_slippage,
+    load_state_slippage_snapshot,
     load_turnover_metrics,
+    load_turnover_snapshot,
+    parse_run_timestamp,
+    read_run_index,
+    run_daily_path,
 )
 
 __all__ = [
     "EVSnapshot",
     "SlippageSnapshot",
     "TurnoverSnapshot",
+    "list_state_files",
     "load_ev_history",
+    "load_ev_snapshot",
     "load_execution_slippage",
     "load_state_slippage",
+    "load_state_slippage_snapshot",
     "load_turnover_metrics",
+    "load_turnover_snapshot",
+    "parse_run_timestamp",
+    "read_run_index",
+    "run_daily_path",
 ]
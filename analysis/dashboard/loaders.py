@@ -11,6 +11,8 @@ from pathlib import Path
 from statistics import NormalDist
 from typing import Dict, List, Mapping, Optional, Tuple
 
+from core.state_snapshots import list_snapshots, load_snapshot, snapshot_stem
+
 
 @dataclass
 class EVSnapshot:
@@ -88,7 +90,7 @@ class TurnoverSnapshot:
 
 
 def _parse_state_timestamp(path: Path) -> datetime:
-    stem = path.stem
+    stem = snapshot_stem(path)
     tokens = [token for token in stem.split("_") if token.isdigit()]
     if len(tokens) >= 2 and len(tokens[0]) == 8:
         ts_raw = f"{tokens[0]}{tokens[1][:6]}"
@@ -122,75 +124,82 @@ def _normal_approx_lcb(alpha: float, beta: float, confidence: float) -> float:
     return max(0.0, min(1.0, lcb))
 
 
-def _list_state_files(archive_dir: Path) -> List[Path]:
+def list_state_files(archive_dir: Path) -> List[Path]:
+    """State exports under ``archive_dir`` ordered by the timestamp in their name.
+
+    Includes delta-encoded snapshots (``*.delta.gz``, see ``core.state_snapshots``).
+    """
+
     if not archive_dir.exists():
         raise FileNotFoundError(f"EV archive directory not found: {archive_dir}")
-    files = sorted(archive_dir.glob("*.json"), key=_parse_state_timestamp)
+    files = sorted(list_snapshots(archive_dir), key=_parse_state_timestamp)
     if not files:
         raise ValueError(f"No EV state exports discovered under {archive_dir}")
     return files
 
 
+def load_ev_snapshot(path: Path, *, cache: Optional[Dict[str, Dict[str, object]]] = None) -> EVSnapshot:
+    payload = load_snapshot(path, cache)
+    timestamp = _parse_state_timestamp(path)
+    ev_global = payload.get("ev_global", {})
+    alpha = float(ev_global.get("alpha", 0.0))
+    beta = float(ev_global.get("beta", 0.0))
+    decay = float(ev_global.get("decay", 0.0)) if "decay" in ev_global else 0.0
+    confidence = float(ev_global.get("conf", 0.95))
+    total = alpha + beta
+    win_mean = alpha / total if total > 0 else None
+    win_lcb = _normal_approx_lcb(alpha, beta, confidence) if total > 0 else None
+    return EVSnapshot(
+        timestamp=timestamp,
+        alpha=alpha,
+        beta=beta,
+        decay=decay,
+        confidence=confidence,
+        win_rate_mean=win_mean,
+        win_rate_lcb=win_lcb,
+    )
+
+
 def load_ev_history(archive_dir: Path, *, limit: Optional[int] = None) -> List[EVSnapshot]:
-    files = _list_state_files(archive_dir)
-    snapshots: List[EVSnapshot] = []
+    files = list_state_files(archive_dir)
     selected = files if limit is None else files[-limit:]
-    for path in selected:
-        payload = _read_json(path)
-        timestamp = _parse_state_timestamp(path)
-        ev_global = payload.get("ev_global", {})
-        alpha = float(ev_global.get("alpha", 0.0))
-        beta = float(ev_global.get("beta", 0.0))
-        decay = float(ev_global.get("decay", 0.0)) if "decay" in ev_global else 0.0
-        confidence = float(ev_global.get("conf", 0.95))
-        total = alpha + beta
-        win_mean = alpha / total if total > 0 else None
-        win_lcb = _normal_approx_lcb(alpha, beta, confidence) if total > 0 else None
-        snapshots.append(
-            EVSnapshot(
-                timestamp=timestamp,
-                alpha=alpha,
-                beta=beta,
-                decay=decay,
-                confidence=confidence,
-                win_rate_mean=win_mean,
-                win_rate_lcb=win_lcb,
-            )
-        )
-    return snapshots
+    cache: Dict[str, Dict[str, object]] = {}
+    return [load_ev_snapshot(path, cache=cache) for path in selected]
+
+
+def load_state_slippage_snapshot(
+    path: Path, *, cache: Optional[Dict[str, Dict[str, object]]] = None
+) -> SlippageSnapshot:
+    payload = load_snapshot(path, cache)
+    timestamp = _parse_state_timestamp(path)
+    slip = payload.get("slip") or {}
+    coeffs_raw = slip.get("a") or {}
+    coefficients: Dict[str, float] = {}
+    for band, value in coeffs_raw.items():
+        try:
+            coefficients[str(band)] = float(value)
+        except (TypeError, ValueError):
+            continue
+    curve = slip.get("curve") if isinstance(slip.get("curve"), Mapping) else None
+    ewma_alpha = slip.get("ewma_alpha")
+    try:
+        ewma_alpha_value = float(ewma_alpha) if ewma_alpha is not None else None
+    except (TypeError, ValueError):
+        ewma_alpha_value = None
+    return SlippageSnapshot(
+        timestamp=timestamp,
+        coefficients=coefficients,
+        ewma_alpha=ewma_alpha_value,
+        curve=curve if curve is not None else None,
+        source="state_archive",
+    )
 
 
 def load_state_slippage(archive_dir: Path, *, limit: Optional[int] = None) -> List[SlippageSnapshot]:
-    files = _list_state_files(archive_dir)
-    snapshots: List[SlippageSnapshot] = []
+    files = list_state_files(archive_dir)
     selected = files if limit is None else files[-limit:]
-    for path in selected:
-        payload = _read_json(path)
-        timestamp = _parse_state_timestamp(path)
-        slip = payload.get("slip") or {}
-        coeffs_raw = slip.get("a") or {}
-        coefficients: Dict[str, float] = {}
-        for band, value in coeffs_raw.items():
-            try:
-                coefficients[str(band)] = float(value)
-            except (TypeError, ValueError):
-                continue
-        curve = slip.get("curve") if isinstance(slip.get("curve"), Mapping) else None
-        ewma_alpha = slip.get("ewma_alpha")
-        try:
-            ewma_alpha_value = float(ewma_alpha) if ewma_alpha is not None else None
-        except (TypeError, ValueError):
-            ewma_alpha_value = None
-        snapshots.append(
-            SlippageSnapshot(
-                timestamp=timestamp,
-                coefficients=coefficients,
-                ewma_alpha=ewma_alpha_value,
-                curve=curve if curve is not None else None,
-                source="state_archive",
-            )
-        )
-    return snapshots
+    cache: Dict[str, Dict[str, object]] = {}
+    return [load_state_slippage_snapshot(path, cache=cache) for path in selected]
 
 
 def load_execution_slippage(telemetry_path: Path) -> List[SlippageSnapshot]:
@@ -251,67 +260,101 @@ def _load_daily_csv(path: Path) -> Tuple[int, int, Optional[str], Optional[str]]
     return total_fills, max(total_days, 0), active_days, first_date, last_date
 
 
+def read_run_index(runs_root: Path) -> Tuple[Path, List[Dict[str, str]]]:
+    """Return ``runs_root/index.csv`` and its rows."""
+
+    index_path = runs_root / "index.csv"
+    if not index_path.exists():
+        raise FileNotFoundError(f"Run index not found: {index_path}")
+    with index_path.open("r", encoding="utf-8") as handle:
+        return index_path, list(csv.DictReader(handle))
+
+
+def run_daily_path(
+    row: Mapping[str, Optional[str]], runs_root: Path, *, daily_dir_name: str = "daily.csv"
+) -> Optional[Path]:
+    """Daily summary path for an index row, or ``None`` when the row names no run."""
+
+    run_id = row.get("run_id") or row.get("run_dir")
+    if not run_id:
+        return None
+    run_dir = row.get("run_dir") or f"runs/{run_id}"
+    run_path = Path(run_dir)
+    if not run_path.is_absolute():
+        parts = run_path.parts
+        if parts and parts[0] == runs_root.name:
+            run_path = runs_root.joinpath(*parts[1:])
+        else:
+            run_path = runs_root / run_path
+    return run_path / daily_dir_name
+
+
+def parse_run_timestamp(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.strptime(value or "", "%Y%m%d_%H%M%S").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def load_turnover_snapshot(
+    row: Mapping[str, Optional[str]],
+    runs_root: Path,
+    *,
+    index_path: Path,
+    daily_dir_name: str = "daily.csv",
+) -> Optional[TurnoverSnapshot]:
+    """Turnover for one index row; rows without a timestamp use the index mtime."""
+
+    daily_path = run_daily_path(row, runs_root, daily_dir_name=daily_dir_name)
+    if daily_path is None:
+        return None
+    run_id = row.get("run_id") or row.get("run_dir")
+    try:
+        total_fills, total_days, active_days, start_date, end_date = _load_daily_csv(daily_path)
+    except FileNotFoundError:
+        total_fills = 0
+        total_days = 0
+        active_days = 0
+        start_date = None
+        end_date = None
+    trades = _to_int(row.get("trades"))
+    wins = _to_int(row.get("wins"))
+    win_rate = _to_float(row.get("win_rate"))
+    timestamp = parse_run_timestamp(row.get("timestamp"))
+    if timestamp is None:
+        timestamp = datetime.fromtimestamp(index_path.stat().st_mtime, tz=timezone.utc)
+    avg_trades_per_day = (
+        total_fills / total_days if total_days > 0 else None
+    )
+    avg_trades_active_day = (
+        total_fills / active_days if active_days > 0 else None
+    )
+    return TurnoverSnapshot(
+        run_id=str(run_id),
+        timestamp=timestamp,
+        trades=trades if trades is not None else total_fills,
+        wins=wins,
+        win_rate=win_rate,
+        avg_trades_per_day=avg_trades_per_day,
+        avg_trades_active_day=avg_trades_active_day,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+
 def load_turnover_metrics(
     runs_root: Path,
     *,
     limit: Optional[int] = None,
     daily_dir_name: str = "daily.csv",
 ) -> List[TurnoverSnapshot]:
-    index_path = runs_root / "index.csv"
-    if not index_path.exists():
-        raise FileNotFoundError(f"Run index not found: {index_path}")
-    snapshots: List[TurnoverSnapshot] = []
-    with index_path.open("r", encoding="utf-8") as handle:
-        reader = list(csv.DictReader(handle))
+    index_path, reader = read_run_index(runs_root)
     rows = reader if limit is None else reader[-limit:]
+    snapshots: List[TurnoverSnapshot] = []
     for row in rows:
-        run_id = row.get("run_id") or row.get("run_dir")
-        if not run_id:
-            continue
-        run_dir = row.get("run_dir") or f"runs/{run_id}"
-        run_path = Path(run_dir)
-        if not run_path.is_absolute():
-            parts = run_path.parts
-            if parts and parts[0] == runs_root.name:
-                run_path = runs_root.joinpath(*parts[1:])
-            else:
-                run_path = runs_root / run_path
-        daily_path = run_path / daily_dir_name
-        try:
-            total_fills, total_days, active_days, start_date, end_date = _load_daily_csv(daily_path)
-        except FileNotFoundError:
-            total_fills = 0
-            total_days = 0
-            active_days = 0
-            start_date = None
-            end_date = None
-        trades = _to_int(row.get("trades"))
-        wins = _to_int(row.get("wins"))
-        win_rate = _to_float(row.get("win_rate"))
-        timestamp_str = row.get("timestamp") or ""
-        try:
-            timestamp = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S").replace(tzinfo=timezone.utc)
-        except ValueError:
-            timestamp = datetime.fromtimestamp(index_path.stat().st_mtime, tz=timezone.utc)
-        avg_trades_per_day = (
-            total_fills / total_days if total_days > 0 else None
-        )
-        avg_trades_active_day = (
-            total_fills / active_days if active_days > 0 else None
-        )
-        snapshots.append(
-            TurnoverSnapshot(
-                run_id=str(run_id),
-                timestamp=timestamp,
-                trades=trades if trades is not None else total_fills,
-                wins=wins,
-                win_rate=win_rate,
-                avg_trades_per_day=avg_trades_per_day,
-                avg_trades_active_day=avg_trades_active_day,
-                start_date=start_date,
-                end_date=end_date,
-            )
-        )
+        snapshot = load_turnover_snapshot(row, runs_root, index_path=index_path, daily_dir_name=daily_dir_name)
+        if snapshot is not None:
+            snapshots.append(snapshot)
     return snapshots
 
 
@@ -4,11 +4,19 @@ This module follows the Phase 3 observability automation design by emitting
 individual dashboard datasets, maintaining a manifest with monotonically
 increasing sequence numbers, updating a heartbeat file, and persisting
 export history with retention controls.
+
+Exports are incremental: ``<output-dir>/export_state.json`` keeps, per
+dataset, a fingerprint of its sources (state file names/mtimes/sizes, run
+index rows plus their ``daily.csv`` stats, latency rollup rows) and the
+serialised row produced for each source item. A dataset whose fingerprint is
+unchanged is not rebuilt at all; otherwise only items without a remembered
+row are loaded. ``--full-refresh`` ignores the saved state.
 """
 
 from __future__ import annotations
 
 import argparse
+import csv
 import fcntl
 import hashlib
 import json
@@ -21,7 +29,7 @@ import tempfile
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Sequence, Tuple
 
 if __package__ in (None, ""):
     # Allow running as a script without package context
@@ -31,15 +39,16 @@ from analysis.dashboard import (  # noqa: E402  (import after sys.path mutation)
     EVSnapshot,
     SlippageSnapshot,
     TurnoverSnapshot,
-    load_ev_history,
+    list_state_files,
+    load_ev_snapshot,
     load_execution_slippage,
-    load_state_slippage,
-    load_turnover_metrics,
-)
-from analysis.weekly_payload import (  # noqa: E402
-    LatencyRollupEntry,
-    load_latency_rollups,
+    load_state_slippage_snapshot,
+    load_turnover_snapshot,
+    parse_run_timestamp,
+    read_run_index,
+    run_daily_path,
 )
+from analysis.weekly_payload import LatencyRollupEntry  # noqa: E402
 from scripts._automation_context import build_automation_context  # noqa: E402
 from scripts._automation_logging import (  # noqa: E402
     AutomationLogError,
@@ -57,6 +66,10 @@ DEFAULT_ARCHIVE_MANIFEST = Path("ops/dashboard_export_archive_manifest.jsonl")
 DEFAULT_MANIFEST = DEFAULT_OUTPUT_DIR / "manifest.json"
 DEFAULT_LATENCY_ROLLUP = Path("ops/signal_latency_rollup.csv")
 DEFAULT_RETENTION_DAYS = 56
+EXPORT_STATE_FILENAME = "export_state.json"
+EXPORT_STATE_VERSION = 1
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
 
 @dataclass
@@ -69,6 +82,69 @@ class DatasetResult:
     checksum_sha256: str
     path: Path
     sources: Mapping[str, str]
+    reused: bool = False
+
+
+class ExportState:
+    """Per-dataset source fingerprints and remembered rows from earlier exports."""
+
+    def __init__(self, path: Path, *, enabled: bool = True) -> None:
+        self.path = path
+        self.enabled = enabled
+        self.datasets: Dict[str, Dict[str, Any]] = {}
+        if not enabled or not path.exists():
+            return
+        try:
+            loaded = _read_json(path)
+        except (OSError, ValueError):
+            return
+        if isinstance(loaded, Mapping) and loaded.get("version") == EXPORT_STATE_VERSION:
+            datasets = loaded.get("datasets")
+            if isinstance(datasets, Mapping):
+                self.datasets = {str(k): dict(v) for k, v in datasets.items() if isinstance(v, Mapping)}
+
+    def items(self, name: str) -> Dict[str, Any]:
+        """Rows remembered for ``name`` keyed by source item (empty when disabled)."""
+
+        if not self.enabled:
+            return {}
+        items = self.datasets.get(name, {}).get("items")
+        return dict(items) if isinstance(items, Mapping) else {}
+
+    def reuse(self, name: str, fingerprint: str, target: Path) -> Optional[DatasetResult]:
+        """Previous result for ``name`` when its sources and artefact are unchanged."""
+
+        entry = self.datasets.get(name)
+        if not self.enabled or not entry or entry.get("fingerprint") != fingerprint:
+            return None
+        if entry.get("output") != _stat_key(target):
+            return None
+        try:
+            payload = _read_json(target)
+        except (OSError, ValueError):
+            return None
+        return DatasetResult(
+            name=name,
+            payload=payload,
+            row_count=int(entry.get("row_count", 0)),
+            checksum_sha256=str(entry.get("checksum_sha256", "")),
+            path=target,
+            sources=dict(payload.get("sources") or {}),
+            reused=True,
+        )
+
+    def record(self, result: DatasetResult, fingerprint: str, items: Mapping[str, Any]) -> None:
+        self.datasets[result.name] = {
+            "fingerprint": fingerprint,
+            "output": _stat_key(result.path),
+            "row_count": result.row_count,
+            "checksum_sha256": result.checksum_sha256,
+            "items": dict(items),
+        }
+
+    def save(self, *, indent: Optional[int]) -> None:
+        payload = {"version": EXPORT_STATE_VERSION, "datasets": self.datasets}
+        _write_json_atomic(self.path, payload, indent=indent)
 
 
 @dataclass
@@ -87,6 +163,7 @@ class ExportContext:
     heartbeat_file: Path
     history_dir: Path
     archive_manifest: Path
+    state: Optional[ExportState] = None
 
 
 @dataclass
@@ -199,11 +276,65 @@ def _update_heartbeat_safe(
     return None
 
 
+def _reuse_dataset(ctx: ExportContext, name: str, fingerprint: str) -> Optional[DatasetResult]:
+    if ctx.state is None:
+        return None
+    return ctx.state.reuse(name, fingerprint, ctx.output_dir / f"{name}.json")
+
+
+def _remembered_items(ctx: ExportContext, name: str) -> Dict[str, Any]:
+    return ctx.state.items(name) if ctx.state is not None else {}
+
+
+def _remember_dataset(
+    ctx: ExportContext, result: DatasetResult, fingerprint: str, items: Mapping[str, Any]
+) -> DatasetResult:
+    if ctx.state is not None:
+        ctx.state.record(result, fingerprint, items)
+    return result
+
+
+def _state_file_keys(files: Sequence[Path]) -> List[str]:
+    return [f"{path.name}:{_stat_key(path)}" for path in files]
+
+
+def _state_file_rows(
+    ctx: ExportContext,
+    name: str,
+    files: Sequence[Path],
+    keys: Sequence[str],
+    serialise: Callable[[Path], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Serialised row per state file, loading only files not remembered from the last export."""
+
+    remembered = _remembered_items(ctx, name)
+    items: Dict[str, Any] = {}
+    for path, key in zip(files, keys):
+        if key not in items:
+            items[key] = remembered[key] if key in remembered else serialise(path)
+    return items
+
+
 def build_ev_history_dataset(ctx: ExportContext) -> DatasetResult:
-    history = load_ev_history(ctx.archive_dir, limit=ctx.args.ev_limit)
-    rows = [_serialise_ev_snapshot(snapshot) for snapshot in history]
-    latest = rows[-1] if rows else None
+    files = list_state_files(ctx.archive_dir)
+    selected = files if ctx.args.ev_limit is None else files[-ctx.args.ev_limit :]
     sources = {"archive_dir": str(ctx.archive_dir)}
+    keys = _state_file_keys(selected)
+    fingerprint = _hash_sources(
+        {
+            "sources": sources,
+            "items": keys,
+            "scope": [ctx.args.strategy, ctx.args.symbol, ctx.args.mode],
+        }
+    )
+    reused = _reuse_dataset(ctx, "ev_history", fingerprint)
+    if reused is not None:
+        return reused
+    items = _state_file_rows(
+        ctx, "ev_history", selected, keys, lambda path: _serialise_ev_snapshot(load_ev_snapshot(path))
+    )
+    rows = [items[key] for key in keys]
+    latest = rows[-1] if rows else None
     payload: Dict[str, Any] = {
         "dataset": "ev_history",
         "generated_at": _isoformat(ctx.generated_at),
@@ -216,44 +347,101 @@ def build_ev_history_dataset(ctx: ExportContext) -> DatasetResult:
     }
     if latest:
         payload["latest"] = latest
-    return _finalise_dataset_result(
+    result = _finalise_dataset_result(
         ctx,
         name="ev_history",
         payload=payload,
         row_count=len(rows),
         sources=sources,
     )
+    return _remember_dataset(ctx, result, fingerprint, items)
 
 
 def build_slippage_dataset(ctx: ExportContext) -> DatasetResult:
-    state_snapshots = load_state_slippage(ctx.archive_dir, limit=ctx.args.slip_limit)
-    execution_snapshots: List[SlippageSnapshot] = []
+    files = list_state_files(ctx.archive_dir)
+    selected = files if ctx.args.slip_limit is None else files[-ctx.args.slip_limit :]
     sources: Dict[str, str] = {"archive_dir": str(ctx.archive_dir)}
-    if ctx.telemetry_path is not None and ctx.telemetry_path.exists():
-        execution_snapshots = load_execution_slippage(ctx.telemetry_path)
-        sources["portfolio_telemetry"] = str(ctx.telemetry_path)
+    telemetry_path = ctx.telemetry_path
+    if telemetry_path is not None and telemetry_path.exists():
+        sources["portfolio_telemetry"] = str(telemetry_path)
+    else:
+        telemetry_path = None
+    keys = _state_file_keys(selected)
+    fingerprint = _hash_sources(
+        {
+            "sources": sources,
+            "items": keys,
+            "telemetry": _stat_key(telemetry_path) if telemetry_path is not None else None,
+        }
+    )
+    reused = _reuse_dataset(ctx, "slippage", fingerprint)
+    if reused is not None:
+        return reused
+    items = _state_file_rows(
+        ctx,
+        "slippage",
+        selected,
+        keys,
+        lambda path: _serialise_slippage_snapshot(load_state_slippage_snapshot(path)),
+    )
+    execution_snapshots: List[SlippageSnapshot] = []
+    if telemetry_path is not None:
+        execution_snapshots = load_execution_slippage(telemetry_path)
     payload = {
         "dataset": "slippage",
         "generated_at": _isoformat(ctx.generated_at),
         "job_id": ctx.job_id,
-        "state": [_serialise_slippage_snapshot(item) for item in state_snapshots],
+        "state": [items[key] for key in keys],
         "execution": [_serialise_slippage_snapshot(item) for item in execution_snapshots],
         "sources": sources,
     }
     row_count = len(payload["state"]) + len(payload["execution"])
-    return _finalise_dataset_result(
+    result = _finalise_dataset_result(
         ctx,
         name="slippage",
         payload=payload,
         row_count=row_count,
         sources=sources,
     )
+    return _remember_dataset(ctx, result, fingerprint, items)
 
 
 def build_turnover_dataset(ctx: ExportContext) -> DatasetResult:
-    turnover = load_turnover_metrics(ctx.runs_root, limit=ctx.args.turnover_limit)
-    rows = [_serialise_turnover_snapshot(item) for item in turnover]
+    index_path, index_rows = read_run_index(ctx.runs_root)
+    limit = ctx.args.turnover_limit
+    selected = index_rows if limit is None else index_rows[-limit:]
+    index_mtime = _stat_key(index_path)
+    keys: List[str] = []
+    for row in selected:
+        daily_path = run_daily_path(row, ctx.runs_root)
+        # Rows without a parsable timestamp are stamped with the index mtime.
+        stamp = index_mtime if parse_run_timestamp(row.get("timestamp")) is None else None
+        keys.append(
+            _hash_sources(
+                {
+                    "row": row,
+                    "daily": _stat_key(daily_path) if daily_path is not None else None,
+                    "index": stamp,
+                }
+            )
+        )
     sources = {"runs_root": str(ctx.runs_root)}
+    fingerprint = _hash_sources({"sources": sources, "items": keys})
+    reused = _reuse_dataset(ctx, "turnover", fingerprint)
+    if reused is not None:
+        return reused
+    remembered = _remembered_items(ctx, "turnover")
+    items: Dict[str, Any] = {}
+    rows: List[Dict[str, Any]] = []
+    for key, row in zip(keys, selected):
+        if key not in items:
+            if key in remembered:
+                items[key] = remembered[key]
+            else:
+                snapshot = load_turnover_snapshot(row, ctx.runs_root, index_path=index_path)
+                items[key] = _serialise_turnover_snapshot(snapshot) if snapshot is not None else None
+        if items[key] is not None:
+            rows.append(items[key])
     payload = {
         "dataset": "turnover",
         "generated_at": _isoformat(ctx.generated_at),
@@ -261,23 +449,55 @@ def build_turnover_dataset(ctx: ExportContext) -> DatasetResult:
         "rows": rows,
         "sources": sources,
     }
-    return _finalise_dataset_result(
+    result = _finalise_dataset_result(
         ctx,
         name="turnover",
         payload=payload,
         row_count=len(rows),
         sources=sources,
     )
+    return _remember_dataset(ctx, result, fingerprint, items)
 
 
 def build_latency_dataset(ctx: ExportContext) -> DatasetResult:
     if not ctx.latency_path.exists():
         raise FileNotFoundError(f"Latency rollup file not found: {ctx.latency_path}")
-    entries = load_latency_rollups(ctx.latency_path)
-    if ctx.args.latency_limit is not None and ctx.args.latency_limit >= 0:
-        entries = entries[-ctx.args.latency_limit :]
-    rows = [_serialise_latency_entry(item) for item in entries]
     sources = {"latency_rollup": str(ctx.latency_path)}
+    limit = ctx.args.latency_limit
+    fingerprint = _hash_sources(
+        {"sources": sources, "limit": limit, "rollup": _stat_key(ctx.latency_path)}
+    )
+    reused = _reuse_dataset(ctx, "latency", fingerprint)
+    if reused is not None:
+        return reused
+    # The rollup is rewritten in place (merge + retention), so rows are matched
+    # by content: each item is ``{"order": window_start_us, "row": ...}``.
+    remembered = _remembered_items(ctx, "latency")
+    items: Dict[str, Any] = {}
+    ordered: List[Tuple[int, str]] = []
+    with ctx.latency_path.open(newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, [])
+        for raw in reader:
+            if not raw:
+                continue
+            key = hashlib.sha256("\x1f".join(raw).encode("utf-8")).hexdigest()
+            if key not in items:
+                if key in remembered:
+                    items[key] = remembered[key]
+                else:
+                    entry = LatencyRollupEntry.from_row(dict(zip(header, raw)))
+                    items[key] = (
+                        {"order": _epoch_us(entry.window_start), "row": _serialise_latency_entry(entry)}
+                        if entry is not None
+                        else {"order": None}
+                    )
+            if items[key]["order"] is not None:
+                ordered.append((items[key]["order"], key))
+    ordered.sort(key=lambda item: item[0])
+    if limit is not None and limit >= 0:
+        ordered = ordered[-limit:]
+    rows = [items[key]["row"] for _, key in ordered]
     payload = {
         "dataset": "latency",
         "generated_at": _isoformat(ctx.generated_at),
@@ -285,13 +505,14 @@ def build_latency_dataset(ctx: ExportContext) -> DatasetResult:
         "rows": rows,
         "sources": sources,
     }
-    return _finalise_dataset_result(
+    result = _finalise_dataset_result(
         ctx,
         name="latency",
         payload=payload,
         row_count=len(rows),
         sources=sources,
     )
+    return _remember_dataset(ctx, result, fingerprint, items)
 
 
 DATASET_BUILDERS = {
@@ -359,6 +580,15 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         help="Optional path to write summary metadata about the export run.",
     )
     parser.add_argument("--indent", type=int, default=2, help="Indent level for JSON outputs.")
+    parser.add_argument(
+        "--export-state",
+        help=f"Incremental export state file (default: <output-dir>/{EXPORT_STATE_FILENAME}).",
+    )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Rebuild every dataset from its sources, ignoring the saved export state.",
+    )
     return parser.parse_args(argv)
 
 
@@ -384,6 +614,14 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
 
     status = "ok" if not errors else "error"
     artefacts: List[str] = [str(result.path) for result in dataset_results]
+    unchanged = [result.name for result in dataset_results if result.reused]
+
+    if export_ctx.state is not None and len(unchanged) < len(dataset_results):
+        try:
+            export_ctx.state.save(indent=args.indent)
+        except OSError as exc:
+            status = "error"
+            _record_error(errors, "export_state", exc)
     manifest_entry: Optional[Dict[str, Any]] = None
 
     if dataset_results:
@@ -436,6 +674,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         "job_id": ctx.job_id,
         "generated_at": _isoformat(generated_at),
         "datasets": dataset_status,
+        "unchanged_datasets": unchanged,
         "artefacts": artefacts,
         "sequence": manifest_entry.get("sequence") if manifest_entry else None,
         "errors": errors,
@@ -474,6 +713,7 @@ def _build_export_context(args: argparse.Namespace, job_id: str, generated_at: d
     heartbeat_file = Path(args.heartbeat_file).resolve()
     history_dir = Path(args.history_dir).resolve()
     archive_manifest = Path(args.archive_manifest).resolve()
+    state_path = Path(args.export_state).resolve() if args.export_state else output_dir / EXPORT_STATE_FILENAME
     return ExportContext(
         args=args,
         job_id=job_id,
@@ -487,6 +727,7 @@ def _build_export_context(args: argparse.Namespace, job_id: str, generated_at: d
         heartbeat_file=heartbeat_file,
         history_dir=history_dir,
         archive_manifest=archive_manifest,
+        state=ExportState(state_path, enabled=not args.full_refresh),
     )
 
 
@@ -712,11 +953,25 @@ def _run_upload_command(command: str) -> Dict[str, Any]:
     }
 
 
-def _hash_sources(sources: Mapping[str, str]) -> str:
+def _hash_sources(sources: Mapping[str, Any]) -> str:
     canonical = json.dumps(dict(sorted(sources.items())), separators=(",", ":"))
     return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
 
 
+def _stat_key(path: Path) -> Optional[List[int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _epoch_us(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
 def _read_json(path: Path) -> Any:
     if not path.exists():
         raise FileNotFoundError(str(path))
@@ -1,24 +1,85 @@
-"""Portfolio monitoring utilities for router-driven multi-strategy runs."""
+"""Portfolio monitoring utilities for router-driven multi-strategy runs.
+
+When numpy is installed, equity curves are held as ``EquityArrays`` (int64
+epoch microseconds plus float64 values). Curves are aligned on the union
+timeline with a forward fill through ``searchsorted``, so aggregation,
+drawdowns and per-category contributions are array operations rather than
+per-point Python loops. Without numpy the point-by-point loops below produce
+the same summary. Parsed metrics files are cached by path, mtime and size, so repeated
+summaries over the same snapshot only re-read files that changed.
+"""
 
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
-from datetime import datetime, timezone
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
+try:  # optional: vectorised aggregation when available
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    np = None  # type: ignore[assignment]
+
 from configs.strategies.loader import StrategyManifest, load_manifest
 from core.router_pipeline import PortfolioTelemetry, build_portfolio_state
 from router.router_v1 import PortfolioState
 
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+@dataclass(frozen=True)
+class EquityArrays:
+    """Equity curve as sorted int64 epoch microseconds and float64 values."""
+
+    ts_us: np.ndarray
+    values: np.ndarray
+    labels: np.ndarray
+
+    @classmethod
+    def from_points(cls, points: Sequence[Tuple[datetime, str, float]]) -> "EquityArrays":
+        ts_us = np.fromiter(
+            ((dt - _EPOCH) // _ONE_MICROSECOND for dt, _, _ in points), dtype=np.int64, count=len(points)
+        )
+        values = np.fromiter((value for _, _, value in points), dtype=np.float64, count=len(points))
+        labels = np.empty(len(points), dtype=object)
+        labels[:] = [label for _, label, _ in points]
+        if ts_us.size > 1 and np.any(np.diff(ts_us) < 0):
+            order = np.argsort(ts_us, kind="stable")
+            ts_us, values, labels = ts_us[order], values[order], labels[order]
+        for array in (ts_us, values, labels):
+            array.setflags(write=False)
+        return cls(ts_us=ts_us, values=values, labels=labels)
+
+    def __len__(self) -> int:
+        return int(self.ts_us.size)
+
+    def to_points(self) -> List[Tuple[datetime, str, float]]:
+        return [
+            (_datetime_from_us(ts), str(label), float(value))
+            for ts, label, value in zip(self.ts_us.tolist(), self.labels, self.values.tolist())
+        ]
+
+
+def _datetime_from_us(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(value))
+
+
 @dataclass
 class StrategySeries:
     """Container for a strategy equity curve."""
 
     manifest: StrategyManifest
     equity_curve: List[Tuple[datetime, str, float]]
+    arrays: Optional[EquityArrays] = field(default=None, repr=False, compare=False)
+
+    def as_arrays(self) -> EquityArrays:
+        if self.arrays is None:
+            self.arrays = EquityArrays.from_points(self.equity_curve)
+        return self.arrays
 
 
 def _parse_timestamp(value: str) -> datetime:
@@ -73,11 +134,42 @@ def _normalise_equity_curve(raw: Sequence[Any]) -> List[Tuple[datetime, str, flo
     return normalised
 
 
-def _load_strategy_series(path: Path) -> Tuple[StrategyManifest, List[Tuple[datetime, str, float]]]:
-    with path.open("r", encoding="utf-8") as handle:
+# resolved metrics path -> ((mtime_ns, size), manifest_path, manifest_id, curve, arrays)
+_SERIES_CACHE: Dict[
+    str, Tuple[Tuple[int, int], Any, Any, List[Tuple[datetime, str, float]], Optional[EquityArrays]]
+] = {}
+
+
+def _parse_metrics_file(
+    path: Path,
+) -> Tuple[Any, Any, List[Tuple[datetime, str, float]], Optional[EquityArrays]]:
+    resolved = path.resolve()
+    stat = resolved.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _SERIES_CACHE.get(str(resolved))
+    if cached is not None and cached[0] == stamp:
+        return cached[1:]
+    with resolved.open("r", encoding="utf-8") as handle:
         payload = json.load(handle)
-    manifest_path_value = payload.get("manifest_path")
-    manifest_id = payload.get("manifest_id")
+    curve_raw = payload.get("equity_curve")
+    if not isinstance(curve_raw, Sequence) or not curve_raw:
+        raise ValueError(f"metrics file {path} missing equity_curve entries")
+    curve = _normalise_equity_curve(curve_raw)
+    arrays = EquityArrays.from_points(curve) if np is not None else None
+    entry = (payload.get("manifest_path"), payload.get("manifest_id"), curve, arrays)
+    _SERIES_CACHE[str(resolved)] = (stamp, *entry)
+    return entry
+
+
+def _load_strategy_series(path: Path) -> Tuple[StrategyManifest, List[Tuple[datetime, str, float]]]:
+    manifest, curve, _ = _load_strategy_arrays(path)
+    return manifest, curve
+
+
+def _load_strategy_arrays(
+    path: Path,
+) -> Tuple[StrategyManifest, List[Tuple[datetime, str, float]], Optional[EquityArrays]]:
+    manifest_path_value, manifest_id, curve, arrays = _parse_metrics_file(path)
     if not manifest_path_value:
         raise ValueError(f"metrics file {path} missing manifest_path")
     manifest_path = Path(manifest_path_value)
@@ -88,13 +180,96 @@ def _load_strategy_series(path: Path) -> Tuple[StrategyManifest, List[Tuple[date
         raise ValueError(
             f"Manifest id mismatch for {path}: metrics={manifest_id} manifest={manifest.id}"
         )
-    curve = payload.get("equity_curve")
-    if not isinstance(curve, Sequence) or not curve:
-        raise ValueError(f"metrics file {path} missing equity_curve entries")
-    return manifest, _normalise_equity_curve(curve)
+    return manifest, list(curve), arrays
+
+
+def _align_series(series: Sequence[EquityArrays]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Forward-fill every curve onto the shared timeline.
+
+    The timeline is the union of all timestamps from the latest curve start
+    onwards, so every curve has a value at each point. Returns
+    ``(timeline_us, labels, filled)`` where ``filled`` has one row per curve.
+    """
+
+    series = [item for item in series if len(item)]
+    if not series:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, np.empty(0, dtype=object), np.empty((0, 0), dtype=np.float64)
+    start = max(int(item.ts_us[0]) for item in series)
+    timeline = np.unique(np.concatenate([item.ts_us[item.ts_us >= start] for item in series]))
+    labels = np.empty(timeline.size, dtype=object)
+    labelled = np.zeros(timeline.size, dtype=bool)
+    filled = np.empty((len(series), timeline.size), dtype=np.float64)
+    for row, item in enumerate(series):
+        positions = np.searchsorted(item.ts_us, timeline, side="right") - 1
+        filled[row] = item.values[positions]
+        first = np.searchsorted(item.ts_us, timeline, side="left")
+        hit = ~labelled & (first < len(item))
+        hit[hit] = item.ts_us[first[hit]] == timeline[hit]
+        labels[hit] = item.labels[first[hit]]
+        labelled |= hit
+    return timeline, labels, filled
+
+
+def _sum_rows(filled: np.ndarray) -> np.ndarray:
+    # Accumulate row by row so totals match a left-to-right Python sum.
+    total = np.zeros(filled.shape[1], dtype=np.float64)
+    for row in filled:
+        total += row
+    return total
 
 
 def _aggregate_equity_curves(curves: Mapping[str, List[Tuple[datetime, str, float]]]) -> List[Tuple[datetime, str, float]]:
+    if np is None:
+        return _aggregate_equity_curves_loop(curves)
+    timeline, labels, filled = _align_series([EquityArrays.from_points(series) for series in curves.values()])
+    total = _sum_rows(filled)
+    return [
+        (_datetime_from_us(ts), str(label), value)
+        for ts, label, value in zip(timeline.tolist(), labels, total.tolist())
+    ]
+
+
+def _drawdown_arrays(ts_us: np.ndarray, labels: np.ndarray, values: np.ndarray) -> Dict[str, Any]:
+    """Vectorised ``_max_drawdown``: running peak via ``np.maximum.accumulate``.
+
+    Ties resolve as in the point-by-point loop: the reported peak is the last
+    occurrence of the highest equity and the trough the first maximal
+    drawdown; stretches with a non-positive peak are ignored.
+    """
+
+    count = int(values.size)
+    if count == 0:
+        return {"max_drawdown_pct": 0.0}
+    peaks = np.maximum.accumulate(values)
+    drawdowns = np.zeros(count, dtype=np.float64)
+    np.divide(peaks - values, peaks, out=drawdowns, where=peaks > 0)
+    trough = int(np.argmax(drawdowns))
+    max_dd = float(drawdowns[trough])
+    if not max_dd > 0:
+        trough, max_dd = 0, 0.0
+    peak = count - 1 - int(np.argmax(values[::-1] >= peaks[-1]))
+    return {
+        "max_drawdown_pct": max_dd * 100.0,
+        "peak_ts": str(labels[peak]),
+        "peak_dt": _datetime_from_us(int(ts_us[peak])).isoformat(),
+        "peak_equity": float(values[peak]),
+        "trough_ts": str(labels[trough]),
+        "trough_dt": _datetime_from_us(int(ts_us[trough])).isoformat(),
+        "trough_equity": float(values[trough]),
+    }
+
+
+def _max_drawdown(points: Sequence[Tuple[datetime, str, float]]) -> Dict[str, Any]:
+    if np is None:
+        return _max_drawdown_loop(points)
+    arrays = EquityArrays.from_points(points)
+    return _drawdown_arrays(arrays.ts_us, arrays.labels, arrays.values)
+
+
+def _aggregate_equity_curves_loop(
+    curves: Mapping[str, List[Tuple[datetime, str, float]]]
+) -> List[Tuple[datetime, str, float]]:
     if not curves:
         return []
     start_dt = max(series[0][0] for series in curves.values() if series)
@@ -131,7 +306,7 @@ def _aggregate_equity_curves(curves: Mapping[str, List[Tuple[datetime, str, floa
     return aggregated
 
 
-def _max_drawdown(points: Sequence[Tuple[datetime, str, float]]) -> Dict[str, Any]:
+def _max_drawdown_loop(points: Sequence[Tuple[datetime, str, float]]) -> Dict[str, Any]:
     if not points:
         return {"max_drawdown_pct": 0.0}
     peak_value = points[0][2]
@@ -165,6 +340,75 @@ def _max_drawdown(points: Sequence[Tuple[datetime, str, float]]) -> Dict[str, An
     }
 
 
+def _category_contributions_loop(
+    categories: Sequence[str],
+    curves: Sequence[List[Tuple[datetime, str, float]]],
+    aggregate_curve: Sequence[Tuple[datetime, str, float]],
+) -> List[Dict[str, Any]]:
+    """Loop counterpart of ``_category_contributions`` on the aggregate timeline."""
+
+    if not aggregate_curve:
+        return []
+    aggregate_pnl = aggregate_curve[-1][2] - aggregate_curve[0][2]
+    contributions: List[Dict[str, Any]] = []
+    for category in sorted(set(categories)):
+        members = [curve for key, curve in zip(categories, curves) if key == category]
+        totals = [0.0] * len(aggregate_curve)
+        for curve in members:
+            idx = 0
+            value = curve[0][2]
+            for position, (dt, _, _) in enumerate(aggregate_curve):
+                while idx < len(curve) and curve[idx][0] <= dt:
+                    value = curve[idx][2]
+                    idx += 1
+                totals[position] += value
+        points = [(dt, label, total) for (dt, label, _), total in zip(aggregate_curve, totals)]
+        pnl = totals[-1] - totals[0]
+        contributions.append(
+            {
+                "category": category,
+                "strategies": len(members),
+                "start_equity": totals[0],
+                "end_equity": totals[-1],
+                "pnl": pnl,
+                "contribution_pct": pnl / aggregate_pnl * 100.0 if aggregate_pnl else None,
+                "max_drawdown_pct": _max_drawdown_loop(points)["max_drawdown_pct"],
+            }
+        )
+    return contributions
+
+
+def _category_contributions(
+    categories: Sequence[str],
+    timeline: np.ndarray,
+    labels: np.ndarray,
+    filled: np.ndarray,
+    aggregate_values: np.ndarray,
+) -> List[Dict[str, Any]]:
+    """Per-category equity change over the aligned window and its share of the total."""
+
+    if not timeline.size:
+        return []
+    keys = np.asarray(categories, dtype=object)
+    aggregate_pnl = float(aggregate_values[-1] - aggregate_values[0])
+    contributions: List[Dict[str, Any]] = []
+    for category in sorted(set(categories)):
+        values = _sum_rows(filled[keys == category])
+        pnl = float(values[-1] - values[0])
+        contributions.append(
+            {
+                "category": category,
+                "strategies": int(np.count_nonzero(keys == category)),
+                "start_equity": float(values[0]),
+                "end_equity": float(values[-1]),
+                "pnl": pnl,
+                "contribution_pct": pnl / aggregate_pnl * 100.0 if aggregate_pnl else None,
+                "max_drawdown_pct": _drawdown_arrays(timeline, labels, values)["max_drawdown_pct"],
+            }
+        )
+    return contributions
+
+
 def _serialise_category_summary(portfolio: PortfolioState) -> List[Dict[str, Any]]:
     def _optional_float(value: Any) -> Optional[float]:
         try:
@@ -290,13 +534,32 @@ def load_portfolio_snapshot(base_dir: Path) -> Tuple[List[StrategySeries], Portf
         raise FileNotFoundError(f"metrics directory not found at {metrics_dir}")
     series: List[StrategySeries] = []
     for path in sorted(metrics_dir.glob("*.json")):
-        manifest, curve = _load_strategy_series(path)
-        series.append(StrategySeries(manifest=manifest, equity_curve=curve))
+        manifest, curve, arrays = _load_strategy_arrays(path)
+        series.append(StrategySeries(manifest=manifest, equity_curve=curve, arrays=arrays))
     if not series:
         raise ValueError(f"No metrics files discovered under {metrics_dir}")
     return series, telemetry
 
 
+def _summarise_arrays(
+    strategies: Sequence[StrategySeries],
+    series_map: Mapping[str, StrategySeries],
+    categories: Sequence[str],
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any], List[Dict[str, Any]], List[Tuple[str, float]]]:
+    timeline, labels, filled = _align_series([item.as_arrays() for item in series_map.values()])
+    aggregate_values = _sum_rows(filled)
+
+    per_strategy_drawdowns: Dict[str, Dict[str, Any]] = {}
+    for item in strategies:
+        arrays = item.as_arrays()
+        per_strategy_drawdowns[item.manifest.id] = _drawdown_arrays(arrays.ts_us, arrays.labels, arrays.values)
+
+    aggregate_drawdown = _drawdown_arrays(timeline, labels, aggregate_values)
+    contributions = _category_contributions(categories, timeline, labels, filled, aggregate_values)
+    aggregate_points = [(str(label), value) for label, value in zip(labels, aggregate_values.tolist())]
+    return per_strategy_drawdowns, aggregate_drawdown, contributions, aggregate_points
+
+
 def build_portfolio_summary(
     base_dir: Path,
     *,
@@ -306,14 +569,27 @@ def build_portfolio_summary(
     manifests = [item.manifest for item in strategies]
     portfolio = build_portfolio_state(manifests, telemetry=telemetry)
 
-    series_map = {item.manifest.id: item.equity_curve for item in strategies}
-    aggregate_curve = _aggregate_equity_curves(series_map)
-
-    per_strategy_drawdowns: Dict[str, Dict[str, Any]] = {}
-    for item in strategies:
-        per_strategy_drawdowns[item.manifest.id] = _max_drawdown(item.equity_curve)
-
-    aggregate_drawdown = _max_drawdown(aggregate_curve)
+    series_map = {item.manifest.id: item for item in strategies}
+    categories = [item.manifest.category for item in series_map.values()]
+    if np is None:
+        aggregate_curve = _aggregate_equity_curves_loop(
+            {key: item.equity_curve for key, item in series_map.items()}
+        )
+        per_strategy_drawdowns = {
+            item.manifest.id: _max_drawdown_loop(item.equity_curve) for item in strategies
+        }
+        aggregate_drawdown = _max_drawdown_loop(aggregate_curve)
+        contributions = _category_contributions_loop(
+            categories, [item.equity_curve for item in series_map.values()], aggregate_curve
+        )
+        aggregate_points = [(label, value) for _, label, value in aggregate_curve]
+    else:
+        (
+            per_strategy_drawdowns,
+            aggregate_drawdown,
+            contributions,
+            aggregate_points,
+        ) = _summarise_arrays(strategies, series_map, categories)
 
     if generated_at is None:
         generated_at = datetime.now(timezone.utc)
@@ -349,13 +625,13 @@ def build_portfolio_summary(
             "aggregate": aggregate_drawdown,
             "per_strategy": per_strategy_drawdowns,
         },
-        "aggregate_equity_curve": [
-            {"ts": label, "equity": value} for _, label, value in aggregate_curve
-        ],
+        "category_contributions": contributions,
+        "aggregate_equity_curve": [{"ts": label, "equity": value} for label, value in aggregate_points],
     }
 
 
 __all__ = [
+    "EquityArrays",
     "StrategySeries",
     "load_portfolio_snapshot",
     "build_portfolio_summary",
@@ -2,6 +2,10 @@ from __future__ import annotations
 
 """Loader + schema helpers for strategy manifests (configs/strategies/*.yaml)."""
 
+import os
+import pickle
+import sys
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
@@ -12,11 +16,18 @@ __all__ = [
     "CATEGORY_CHOICES",
     "StrategyManifest",
     "load_manifest",
+    "load_manifest_cached",
     "load_manifests",
 ]
 
 CATEGORY_CHOICES = {"scalping", "day", "swing"}
 
+# Bump when StrategyManifest (or anything it nests) changes shape.
+MANIFEST_CACHE_VERSION = 1
+# Files modified this recently are not cached: their mtime may not change on
+# the next edit if it lands within the filesystem timestamp granularity.
+_MANIFEST_CACHE_RACY_SECONDS = 2.0
+
 
 @dataclass
 class InstrumentSpec:
@@ -293,8 +304,7 @@ class StrategyManifest:
 
 
 def _read_yaml(path: Path) -> Dict[str, Any]:
-    with path.open(encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    data = yaml.load_file(path) or {}
     if not isinstance(data, dict):
         raise ValueError(f"manifest must be a mapping: {path}")
     return data
@@ -355,6 +365,50 @@ def load_manifest(path: str | Path) -> StrategyManifest:
     return manifest
 
 
+def _manifest_cache_path(path: Path) -> Path:
+    tag = sys.implementation.cache_tag or "py"
+    return path.parent / "__pycache__" / f"{path.name}.{tag}.manifest.pickle"
+
+
+def load_manifest_cached(path: str | Path) -> StrategyManifest:
+    """``load_manifest`` backed by a pickled copy of the parsed manifest.
+
+    The pickle lives in the manifest directory's ``__pycache__`` (next to
+    compiled bytecode) and is keyed by the YAML's mtime and size, so editing
+    the manifest invalidates it. Any cache I/O problem falls back to parsing.
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return load_manifest(path)
+    key = (MANIFEST_CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+    cache_path = _manifest_cache_path(path)
+    try:
+        with cache_path.open("rb") as handle:
+            cached_key, cached = pickle.load(handle)
+        if cached_key == key and isinstance(cached, StrategyManifest):
+            return cached
+    except Exception:
+        pass
+
+    manifest = load_manifest(path)
+    if time.time() - stat.st_mtime < _MANIFEST_CACHE_RACY_SECONDS:
+        return manifest
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        with tmp_path.open("wb") as handle:
+            pickle.dump((key, manifest), handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+    return manifest
+
+
 def load_manifests(directory: str | Path) -> Dict[str, StrategyManifest]:
     """Load all manifests under the given directory (recursively)."""
     directory = Path(directory)
@@ -0,0 +1,347 @@
+"""Versioned per-bar indicator cache shared by ingestion and backtests.
+
+A cache file holds the ``INDICATOR_COLUMNS`` that ``FeaturePipeline`` computes
+for every bar of one bar stream, keyed by ``(symbol, tf, or_n, version)``::
+
+    <root>/<SYMBOL>/<tf>/or<or_n>_<version>.zip
+
+Each file is a plain zip (stdlib only, no numpy) holding ``meta.json``, the
+bar timestamps in ``ts.txt`` and one little-endian float64 array per column
+(``<column>.f64``), including the source bar's ``PRICE_COLUMNS``
+(``bar_o.f64`` ...).
+
+``version`` hashes ``FEATURE_SET_VERSION`` together with the source of the
+feature modules, so editing any indicator (or the pipeline that sequences
+them) silently invalidates older files; saving a table removes the stale
+versions for the same key.
+
+Rows are only valid for the stream they were computed from, starting at its
+first bar (the rolling windows depend on everything before a bar). A bar
+matches a row only when both its timestamp and its OHLC equal the stored
+ones, so a different data file with the same timestamps is not replayed.
+Two producers keep the contract:
+
+* ``FeatureReplay`` – attached to ``FeaturePipeline`` by ``BacktestRunner``
+  (``RunnerConfig.feature_cache_dir``): replays rows while the run's bars
+  match the table from row 0, records computed rows past its end, and stops
+  using the cache at the first mismatch.
+* ``extend_feature_table`` – used by ``scripts/pull_prices.py`` to append
+  rows for freshly validated bars, re-running the same pipeline code.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import sys
+import zipfile
+from array import array
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from core.runner_features import (
+    INDICATOR_COLUMNS,
+    FeaturePipeline,
+    parse_session_timestamp,
+    session_for_timestamp,
+)
+
+# Bump when the meaning of a column changes without a code change in the
+# hashed modules (e.g. a different bar normalisation upstream).
+FEATURE_SET_VERSION = 2
+# Source bar prices stored next to the indicators to validate replays.
+PRICE_COLUMNS = ("o", "h", "l", "c")
+_HASHED_MODULES = ("core/feature_store.py", "core/runner_features.py")
+_ROOT = Path(__file__).resolve().parents[1]
+
+
+@lru_cache(maxsize=1)
+def feature_code_version() -> str:
+    digest = hashlib.sha256(f"feature-set:{FEATURE_SET_VERSION}".encode())
+    for relative in _HASHED_MODULES:
+        digest.update(relative.encode())
+        digest.update((_ROOT / relative).read_bytes())
+    return digest.hexdigest()[:12]
+
+
+@dataclass(frozen=True)
+class FeatureCacheKey:
+    symbol: str
+    tf: str
+    or_n: int
+    version: str = field(default_factory=feature_code_version)
+
+    def path(self, root: Path) -> Path:
+        return Path(root) / self.symbol.upper() / self.tf / f"or{int(self.or_n)}_{self.version}.zip"
+
+
+def _pack_floats(values: Sequence[float]) -> bytes:
+    packed = array("d", values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_floats(data: bytes) -> List[float]:
+    packed = array("d")
+    packed.frombytes(data)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tolist()
+
+
+def _bar_prices(bar: Optional[Mapping[str, Any]]) -> List[float]:
+    prices: List[float] = []
+    for name in PRICE_COLUMNS:
+        value = bar.get(name) if bar is not None else None
+        try:
+            prices.append(math.nan if value is None else float(value))
+        except (TypeError, ValueError):
+            prices.append(math.nan)
+    return prices
+
+
+@dataclass
+class FeatureTable:
+    ts: List[str] = field(default_factory=list)
+    columns: Dict[str, List[float]] = field(
+        default_factory=lambda: {name: [] for name in INDICATOR_COLUMNS}
+    )
+    prices: Dict[str, List[float]] = field(
+        default_factory=lambda: {name: [] for name in PRICE_COLUMNS}
+    )
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def row(self, index: int) -> Dict[str, Any]:
+        return {name: self.columns[name][index] for name in INDICATOR_COLUMNS}
+
+    def matches(self, index: int, ts: Any, bar: Optional[Mapping[str, Any]]) -> bool:
+        """Whether row ``index`` was computed from this exact bar (NaN never matches)."""
+
+        if self.ts[index] != ts:
+            return False
+        return all(
+            self.prices[name][index] == price for name, price in zip(PRICE_COLUMNS, _bar_prices(bar))
+        )
+
+    def append(self, ts: str, values: Mapping[str, Any], bar: Optional[Mapping[str, Any]] = None) -> None:
+        self.ts.append(ts)
+        for name in INDICATOR_COLUMNS:
+            value = values.get(name)
+            self.columns[name].append(math.nan if value is None else float(value))
+        for name, price in zip(PRICE_COLUMNS, _bar_prices(bar)):
+            self.prices[name].append(price)
+
+
+class FeatureCache:
+    """Load/save ``FeatureTable`` files under ``root``."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def load(self, key: FeatureCacheKey) -> Optional[FeatureTable]:
+        path = key.path(self.root)
+        if not path.exists():
+            return None
+        try:
+            with zipfile.ZipFile(path) as archive:
+                meta = json.loads(archive.read("meta.json"))
+                if meta.get("version") != key.version:
+                    return None
+                text = archive.read("ts.txt").decode("utf-8")
+                table = FeatureTable(ts=text.split("\n") if text else [])
+                table.columns = {name: _unpack_floats(archive.read(f"{name}.f64")) for name in INDICATOR_COLUMNS}
+                table.prices = {name: _unpack_floats(archive.read(f"bar_{name}.f64")) for name in PRICE_COLUMNS}
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+        arrays = [*table.columns.values(), *table.prices.values()]
+        if any(len(values) != len(table.ts) for values in arrays):
+            return None
+        return table
+
+    def save(self, key: FeatureCacheKey, table: FeatureTable) -> Path:
+        path = key.path(self.root)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("meta.json", json.dumps({"version": key.version, "rows": len(table)}))
+            archive.writestr("ts.txt", "\n".join(table.ts))
+            for name in INDICATOR_COLUMNS:
+                archive.writestr(f"{name}.f64", _pack_floats(table.columns[name]))
+            for name in PRICE_COLUMNS:
+                archive.writestr(f"bar_{name}.f64", _pack_floats(table.prices[name]))
+        tmp.replace(path)
+        # Stale versions, including tables from the earlier .npz layout.
+        for stale in path.parent.glob(f"or{int(key.or_n)}_*"):
+            if stale != path and stale.suffix in (".zip", ".npz"):
+                stale.unlink(missing_ok=True)
+        return path
+
+
+class FeatureReplay:
+    """Serve and extend one cached table while a run follows its bar stream."""
+
+    def __init__(self, cache: FeatureCache, key: FeatureCacheKey, table: Optional[FeatureTable]) -> None:
+        self.cache = cache
+        self.key = key
+        self.table = table if table is not None else FeatureTable()
+        self.cursor = 0
+        self.aligned = True
+        self.hits = 0
+        self.recorded = 0
+        self._saved_rows = len(self.table)
+
+    def lookup(self, ts: Any, bar: Optional[Mapping[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        if not self.aligned or self.cursor >= len(self.table):
+            return None
+        if not self.table.matches(self.cursor, ts, bar):
+            self.aligned = False
+            return None
+        row = self.table.row(self.cursor)
+        self.cursor += 1
+        self.hits += 1
+        return row
+
+    def record(self, ts: Any, values: Mapping[str, Any], bar: Optional[Mapping[str, Any]] = None) -> None:
+        if not self.aligned or not isinstance(ts, str) or self.cursor != len(self.table):
+            self.aligned = False
+            return
+        self.table.append(ts, values, bar)
+        self.cursor += 1
+        self.recorded += 1
+
+    def flush(self, *, force: bool = False) -> Optional[Path]:
+        """Persist recorded rows; without ``force`` only once they double the file."""
+
+        pending = len(self.table) - self._saved_rows
+        if pending <= 0 or (not force and pending < max(self._saved_rows, 1)):
+            return None
+        path = self.cache.save(self.key, self.table)
+        self._saved_rows = len(self.table)
+        return path
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.key.path(self.cache.root)),
+            "version": self.key.version,
+            "hits": self.hits,
+            "recorded": self.recorded,
+            "aligned": self.aligned,
+        }
+
+
+def open_replay(root: Path, *, symbol: str, tf: str, or_n: int) -> FeatureReplay:
+    cache = FeatureCache(root)
+    key = FeatureCacheKey(symbol=str(symbol).upper(), tf=str(tf), or_n=int(or_n))
+    return FeatureReplay(cache, key, cache.load(key))
+
+
+class _TableBuilder:
+    """Run ``FeaturePipeline.compute_indicators`` exactly as ``BacktestRunner`` does."""
+
+    def __init__(self, or_n: int) -> None:
+        self.window: List[Dict[str, Any]] = []
+        self.session_bars: List[Dict[str, Any]] = []
+        self._last_session: Optional[str] = None
+        self._pipeline = FeaturePipeline(
+            rcfg=SimpleNamespace(or_n=or_n),
+            window=self.window,
+            session_bars=self.session_bars,
+            rv_hist=defaultdict(lambda: deque(maxlen=1)),
+            ctx_builder=None,
+        )
+
+    def push(self, bar: Mapping[str, Any]) -> Dict[str, Any]:
+        session = session_for_timestamp(parse_session_timestamp(bar["timestamp"]))
+        new_session = self._last_session is None or session != self._last_session
+        self._last_session = session
+        return self._pipeline.compute_indicators(bar, session=session, new_session=new_session)
+
+
+def _warm_start(bars: Sequence[Mapping[str, Any]], anchor: int, table: FeatureTable) -> Optional[int]:
+    """Index to replay from so the pipeline state after ``bars[anchor]`` is exact.
+
+    Exact when ``bars`` begins at the table's first bar, or when the replay
+    starts at a session boundary and still covers the full rolling window.
+    """
+
+    if anchor + 1 == len(table) and table.matches(0, bars[0]["timestamp"], bars[0]):
+        return 0
+    latest = anchor + 1 - FeaturePipeline.WINDOW_LIMIT
+    if latest < 1:
+        return None
+    sessions = [session_for_timestamp(parse_session_timestamp(bar["timestamp"])) for bar in bars[: latest + 1]]
+    for index in range(latest, 0, -1):
+        if sessions[index] != sessions[index - 1]:
+            return index
+    return None
+
+
+def extend_feature_table(
+    root: Path,
+    *,
+    symbol: str,
+    tf: str,
+    or_n: int,
+    bars: Sequence[Mapping[str, Any]],
+    load_all: Optional[Callable[[], Iterable[Mapping[str, Any]]]] = None,
+) -> Dict[str, Any]:
+    """Append rows for the new tail of ``bars`` to the cached table.
+
+    ``bars`` are ``{"timestamp", "o", "h", "l", "c"}`` mappings ending with the
+    freshly ingested bars and starting somewhere earlier in the stream. When
+    they cannot reproduce the pipeline state exactly (or do not overlap the
+    table), ``load_all`` supplies the whole stream and the table is rebuilt.
+    """
+
+    cache = FeatureCache(root)
+    key = FeatureCacheKey(symbol=str(symbol).upper(), tf=str(tf), or_n=int(or_n))
+    table = cache.load(key) or FeatureTable()
+    start: Optional[int] = None
+    anchor = -1
+    if len(table):
+        last_ts = table.ts[-1]
+        anchor = next((i for i in range(len(bars) - 1, -1, -1) if bars[i]["timestamp"] == last_ts), -1)
+        if anchor >= 0 and not table.matches(len(table) - 1, last_ts, bars[anchor]):
+            # Same timestamp, different prices: the table came from other data.
+            anchor = -1
+        if anchor >= 0:
+            start = _warm_start(bars, anchor, table)
+    elif bars and load_all is None:
+        start = 0
+
+    rebuilt = False
+    if start is None:
+        if load_all is None:
+            return {"path": None, "appended": 0, "rebuilt": False, "rows": len(table)}
+        bars = list(load_all())
+        table, start, anchor, rebuilt = FeatureTable(), 0, -1, True
+
+    builder = _TableBuilder(or_n)
+    appended = 0
+    for index in range(start, len(bars)):
+        values = builder.push(bars[index])
+        if index > anchor:
+            table.append(str(bars[index]["timestamp"]), values, bars[index])
+            appended += 1
+    path = cache.save(key, table) if appended or rebuilt else key.path(cache.root)
+    return {"path": str(path), "appended": appended, "rebuilt": rebuilt, "rows": len(table)}
+
+
+__all__ = [
+    "FEATURE_SET_VERSION",
+    "FeatureCache",
+    "FeatureCacheKey",
+    "FeatureReplay",
+    "FeatureTable",
+    "PRICE_COLUMNS",
+    "extend_feature_table",
+    "feature_code_version",
+    "open_replay",
+]
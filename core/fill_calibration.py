@@ -0,0 +1,586 @@
+"""Monte Carlo calibration of same-bar TP/SL resolution for Bridge fills.
+
+``BridgeFill.compute_same_bar_probability`` blends a distance prior with a
+drift heuristic. This module replaces that heuristic with a lookup table
+estimated from simulated intra-bar paths:
+
+1. ``CollisionSample`` captures every same-bar TP/SL collision observed while a
+   run is executing (see ``_BaseFill.collision_log``).
+2. ``simulate_collision_paths`` draws intra-bar price paths for all samples in
+   NumPy batches. Paths are pinned to the bar open/close and forced to touch
+   both the high and the low, so only OHLC information is required.
+3. ``calibrate_fill_table`` aggregates the simulated outcomes into a
+   ``FillCalibrationTable`` keyed by (range/ATR, distance-to-TP,
+   distance-to-SL) bins.
+
+The table is plain JSON and its lookup is pure Python arithmetic, so the
+runner only pays an O(1) bin computation per collision. NumPy is needed for
+calibration only.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+TABLE_VERSION = 1
+
+
+def _require_numpy():
+    try:
+        import numpy as np  # type: ignore
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError("numpy is required for fill model calibration") from exc
+    return np
+
+
+@dataclass(frozen=True)
+class CollisionSample:
+    """Inputs describing a single same-bar TP/SL collision."""
+
+    side: str
+    entry_px: float
+    tp_px: float
+    stop_px: float
+    o: float
+    h: float
+    l: float
+    c: float
+    atr: Optional[float] = None
+    require_entry_touch: bool = False
+
+    @classmethod
+    def from_bar(
+        cls,
+        *,
+        side: str,
+        entry_px: float,
+        tp_px: float,
+        stop_px: float,
+        bar: Mapping[str, Any],
+        atr: Optional[float] = None,
+        require_entry_touch: bool = False,
+    ) -> "CollisionSample":
+        entry = float(entry_px)
+        return cls(
+            side=str(side).upper(),
+            entry_px=entry,
+            tp_px=float(tp_px),
+            stop_px=float(stop_px),
+            o=float(bar.get("o", entry)),
+            h=float(bar.get("h", entry)),
+            l=float(bar.get("l", entry)),
+            c=float(bar.get("c", entry)),
+            atr=_finite_or_none(atr),
+            require_entry_touch=bool(require_entry_touch),
+        )
+
+    def range_px(self) -> float:
+        return max(self.h - self.l, 0.0)
+
+    def normalised(self) -> Tuple[float, float, float, float, float]:
+        """Return (open, close, entry, tp, stop) mapped onto the unit bar range.
+
+        The mapping is oriented so that the favourable direction is always
+        "up": for BUY trades ``0`` is the bar low, for SELL trades ``0`` is the
+        bar high.
+        """
+
+        rng = self.range_px()
+        if rng <= 0.0:
+            return 0.5, 0.5, 0.5, 0.5, 0.5
+        if self.side == "SELL":
+            return tuple(  # type: ignore[return-value]
+                (self.h - value) / rng
+                for value in (self.o, self.c, self.entry_px, self.tp_px, self.stop_px)
+            )
+        return tuple(  # type: ignore[return-value]
+            (value - self.l) / rng
+            for value in (self.o, self.c, self.entry_px, self.tp_px, self.stop_px)
+        )
+
+
+@dataclass(frozen=True)
+class FillCalibrationCell:
+    """Calibrated outcome statistics for one table bin."""
+
+    p_tp: float
+    exit_mean_r: float
+    exit_q10_r: float
+    exit_q50_r: float
+    exit_q90_r: float
+    trades: int
+
+    def exit_price(self, *, side: str, entry_px: float, range_px: float) -> float:
+        """Translate the mean exit offset (in bar ranges) back into a price."""
+
+        direction = 1.0 if str(side).upper() == "BUY" else -1.0
+        return float(entry_px) + direction * self.exit_mean_r * float(range_px)
+
+
+@dataclass(frozen=True)
+class CalibrationAxis:
+    """Uniform binning along a single normalised dimension."""
+
+    lower: float
+    upper: float
+    bins: int
+
+    def index(self, value: float) -> int:
+        if self.bins <= 1 or self.upper <= self.lower:
+            return 0
+        pos = (float(value) - self.lower) / (self.upper - self.lower)
+        idx = int(pos * self.bins)
+        if idx < 0:
+            return 0
+        if idx >= self.bins:
+            return self.bins - 1
+        return idx
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"lower": self.lower, "upper": self.upper, "bins": self.bins}
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any]) -> "CalibrationAxis":
+        return cls(
+            lower=float(payload["lower"]),
+            upper=float(payload["upper"]),
+            bins=max(1, int(payload["bins"])),
+        )
+
+
+DEFAULT_RANGE_ATR_AXIS = CalibrationAxis(0.0, 4.0, 8)
+DEFAULT_DISTANCE_AXIS = CalibrationAxis(0.0, 1.0, 10)
+
+
+@dataclass
+class FillCalibrationTable:
+    """Lookup table of simulated same-bar outcomes.
+
+    Cells are stored in two flat mappings: ``cells`` keyed by the full
+    (range/ATR, d_tp, d_sl) bin triple and ``pooled`` keyed by (d_tp, d_sl)
+    only. The pooled view is used when the caller cannot supply an ATR or
+    when the full cell has fewer than ``min_trades`` observations.
+    """
+
+    range_atr_axis: CalibrationAxis = DEFAULT_RANGE_ATR_AXIS
+    d_tp_axis: CalibrationAxis = DEFAULT_DISTANCE_AXIS
+    d_sl_axis: CalibrationAxis = DEFAULT_DISTANCE_AXIS
+    min_trades: int = 3
+    cells: Dict[Tuple[int, int, int], FillCalibrationCell] = field(default_factory=dict)
+    pooled: Dict[Tuple[int, int], FillCalibrationCell] = field(default_factory=dict)
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    # ----- Keys -------------------------------------------------------------------
+    @staticmethod
+    def features(
+        *,
+        entry_px: float,
+        tp_px: float,
+        stop_px: float,
+        high: float,
+        low: float,
+        atr: Optional[float],
+    ) -> Optional[Tuple[Optional[float], float, float]]:
+        rng = float(high) - float(low)
+        if not math.isfinite(rng) or rng <= 0.0:
+            return None
+        d_tp = abs(float(tp_px) - float(entry_px)) / rng
+        d_sl = abs(float(entry_px) - float(stop_px)) / rng
+        atr_value = _finite_or_none(atr)
+        range_atr = rng / atr_value if atr_value and atr_value > 0.0 else None
+        return range_atr, d_tp, d_sl
+
+    def key_for(
+        self, range_atr: Optional[float], d_tp: float, d_sl: float
+    ) -> Tuple[Optional[int], int, int]:
+        ra_idx = None if range_atr is None else self.range_atr_axis.index(range_atr)
+        return ra_idx, self.d_tp_axis.index(d_tp), self.d_sl_axis.index(d_sl)
+
+    # ----- Lookup -----------------------------------------------------------------
+    def lookup(
+        self, range_atr: Optional[float], d_tp: float, d_sl: float
+    ) -> Optional[FillCalibrationCell]:
+        ra_idx, tp_idx, sl_idx = self.key_for(range_atr, d_tp, d_sl)
+        if ra_idx is not None:
+            cell = self.cells.get((ra_idx, tp_idx, sl_idx))
+            if cell is not None and cell.trades >= self.min_trades:
+                return cell
+        cell = self.pooled.get((tp_idx, sl_idx))
+        if cell is not None and cell.trades >= self.min_trades:
+            return cell
+        return None
+
+    def lookup_collision(
+        self,
+        *,
+        entry_px: float,
+        tp_px: float,
+        stop_px: float,
+        bar: Mapping[str, Any],
+        atr: Optional[float] = None,
+    ) -> Optional[FillCalibrationCell]:
+        try:
+            high = float(bar["h"])
+            low = float(bar["l"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if atr is None:
+            atr = bar.get("atr")
+        feats = self.features(
+            entry_px=entry_px,
+            tp_px=tp_px,
+            stop_px=stop_px,
+            high=high,
+            low=low,
+            atr=atr,
+        )
+        if feats is None:
+            return None
+        return self.lookup(*feats)
+
+    # ----- Serialisation ----------------------------------------------------------
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "version": TABLE_VERSION,
+            "axes": {
+                "range_atr": self.range_atr_axis.as_dict(),
+                "d_tp": self.d_tp_axis.as_dict(),
+                "d_sl": self.d_sl_axis.as_dict(),
+            },
+            "min_trades": self.min_trades,
+            "cells": [
+                {"key": list(key), **_cell_to_dict(cell)}
+                for key, cell in sorted(self.cells.items())
+            ],
+            "pooled": [
+                {"key": list(key), **_cell_to_dict(cell)}
+                for key, cell in sorted(self.pooled.items())
+            ],
+            "meta": dict(self.meta),
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any]) -> "FillCalibrationTable":
+        version = int(payload.get("version", TABLE_VERSION))
+        if version != TABLE_VERSION:
+            raise ValueError(f"Unsupported fill calibration table version: {version}")
+        axes = payload.get("axes", {}) or {}
+        table = cls(
+            range_atr_axis=CalibrationAxis.from_dict(
+                axes.get("range_atr", DEFAULT_RANGE_ATR_AXIS.as_dict())
+            ),
+            d_tp_axis=CalibrationAxis.from_dict(
+                axes.get("d_tp", DEFAULT_DISTANCE_AXIS.as_dict())
+            ),
+            d_sl_axis=CalibrationAxis.from_dict(
+                axes.get("d_sl", DEFAULT_DISTANCE_AXIS.as_dict())
+            ),
+            min_trades=max(1, int(payload.get("min_trades", 3))),
+            meta=dict(payload.get("meta", {}) or {}),
+        )
+        for entry in payload.get("cells", []) or []:
+            key = tuple(int(v) for v in entry["key"])
+            if len(key) == 3:
+                table.cells[key] = _cell_from_dict(entry)  # type: ignore[index]
+        for entry in payload.get("pooled", []) or []:
+            key = tuple(int(v) for v in entry["key"])
+            if len(key) == 2:
+                table.pooled[key] = _cell_from_dict(entry)  # type: ignore[index]
+        return table
+
+    def save(self, path: Union[str, Path]) -> Path:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(json.dumps(self.as_dict(), ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        return target
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "FillCalibrationTable":
+        with Path(path).open("r", encoding="utf-8") as handle:
+            return cls.from_dict(json.load(handle))
+
+
+def _finite_or_none(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        numeric = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(numeric):
+        return None
+    return numeric
+
+
+def _cell_to_dict(cell: FillCalibrationCell) -> Dict[str, Any]:
+    return {
+        "p_tp": cell.p_tp,
+        "exit_mean_r": cell.exit_mean_r,
+        "exit_q10_r": cell.exit_q10_r,
+        "exit_q50_r": cell.exit_q50_r,
+        "exit_q90_r": cell.exit_q90_r,
+        "trades": cell.trades,
+    }
+
+
+def _cell_from_dict(payload: Mapping[str, Any]) -> FillCalibrationCell:
+    return FillCalibrationCell(
+        p_tp=float(payload["p_tp"]),
+        exit_mean_r=float(payload.get("exit_mean_r", 0.0)),
+        exit_q10_r=float(payload.get("exit_q10_r", 0.0)),
+        exit_q50_r=float(payload.get("exit_q50_r", 0.0)),
+        exit_q90_r=float(payload.get("exit_q90_r", 0.0)),
+        trades=int(payload.get("trades", 0)),
+    )
+
+
+# ----- Simulation ---------------------------------------------------------------
+@dataclass
+class PathSimulationResult:
+    """Per-sample outcomes returned by ``simulate_collision_paths``.
+
+    ``exit_r`` has shape ``(n_samples, n_paths)`` and stores the exit offset
+    from the entry price in units of the bar range (positive = favourable).
+    """
+
+    p_tp: Any
+    exit_r: Any
+
+
+def simulate_collision_paths(
+    samples: Sequence[CollisionSample],
+    *,
+    n_paths: int = 2000,
+    n_steps: int = 60,
+    noise_scale: float = 0.35,
+    seed: Optional[int] = 0,
+    max_batch_elements: int = 4_000_000,
+) -> PathSimulationResult:
+    """Simulate intra-bar paths for every collision sample in NumPy batches.
+
+    Each path is a piecewise Brownian bridge through four anchors: the open,
+    the first extreme, the second extreme and the close. The extreme order is
+    drawn with a probability inversely proportional to the total distance the
+    path would travel, and the extreme times follow a Dirichlet split weighted
+    by segment lengths. TP exits fill at the limit price while stop exits fill
+    at the first path point beyond the stop, which models gap-through slippage
+    on the discrete grid.
+    """
+
+    np = _require_numpy()
+    n_samples = len(samples)
+    n_paths = max(1, int(n_paths))
+    n_steps = max(4, int(n_steps))
+    if n_samples == 0:
+        return PathSimulationResult(
+            p_tp=np.zeros(0, dtype=float), exit_r=np.zeros((0, n_paths), dtype=float)
+        )
+
+    rng = np.random.default_rng(seed)
+    norm = np.asarray([sample.normalised() for sample in samples], dtype=float)
+    require_touch = np.asarray(
+        [sample.require_entry_touch for sample in samples], dtype=bool
+    )
+    per_sample = n_paths * (n_steps + 1)
+    batch = max(1, int(max_batch_elements) // per_sample)
+
+    p_tp = np.empty(n_samples, dtype=float)
+    exit_r = np.empty((n_samples, n_paths), dtype=float)
+    grid = np.arange(n_steps + 1, dtype=float)
+
+    for start in range(0, n_samples, batch):
+        stop = min(n_samples, start + batch)
+        chunk = norm[start:stop]
+        tp_first, exits = _simulate_chunk(
+            np,
+            rng,
+            chunk,
+            require_touch[start:stop],
+            n_paths=n_paths,
+            n_steps=n_steps,
+            grid=grid,
+            noise_scale=noise_scale,
+        )
+        p_tp[start:stop] = tp_first.mean(axis=1)
+        exit_r[start:stop] = exits
+    return PathSimulationResult(p_tp=p_tp, exit_r=exit_r)
+
+
+def _simulate_chunk(np, rng, chunk, require_touch, *, n_paths, n_steps, grid, noise_scale):
+    m = chunk.shape[0]
+    open_n = chunk[:, 0][:, None]
+    close_n = chunk[:, 1][:, None]
+    entry_n = chunk[:, 2][:, None]
+    tp_n = chunk[:, 3][:, None]
+    sl_n = chunk[:, 4][:, None]
+
+    # Extreme order: high-first paths travel o→1→0→c, low-first o→0→1→c.
+    travel_hf = (1.0 - open_n) + 1.0 + close_n
+    travel_lf = open_n + 1.0 + (1.0 - close_n)
+    p_high_first = travel_lf / np.maximum(travel_hf + travel_lf, 1e-12)
+    high_first = rng.random((m, n_paths)) < p_high_first
+    e1 = np.where(high_first, 1.0, 0.0)
+    e2 = 1.0 - e1
+
+    seg0 = np.abs(e1 - open_n)
+    seg2 = np.abs(close_n - e2)
+    shape = 1.0 + 4.0 * np.stack([seg0, np.ones_like(seg0), seg2], axis=-1)
+    weights = rng.gamma(shape)
+    weights /= weights.sum(axis=-1, keepdims=True)
+    k1 = np.clip(np.rint(weights[..., 0] * n_steps), 1, n_steps - 2)
+    k2 = np.clip(np.rint((weights[..., 0] + weights[..., 1]) * n_steps), k1 + 1, n_steps - 1)
+
+    k1 = k1[..., None]
+    k2 = k2[..., None]
+    o = np.broadcast_to(open_n, (m, n_paths))[..., None]
+    c = np.broadcast_to(close_n, (m, n_paths))[..., None]
+    e1 = e1[..., None]
+    e2 = e2[..., None]
+    g = grid[None, None, :]
+
+    in0 = g <= k1
+    in1 = (g > k1) & (g <= k2)
+    base = np.where(
+        in0,
+        o + (e1 - o) * (g / k1),
+        np.where(
+            in1,
+            e1 + (e2 - e1) * ((g - k1) / (k2 - k1)),
+            e2 + (c - e2) * ((g - k2) / (n_steps - k2)),
+        ),
+    )
+
+    dt = 1.0 / n_steps
+    steps = rng.standard_normal((m, n_paths, n_steps)) * math.sqrt(dt)
+    walk = np.concatenate([np.zeros((m, n_paths, 1)), np.cumsum(steps, axis=-1)], axis=-1)
+    w_k1 = np.take_along_axis(walk, k1.astype(int), axis=-1)
+    w_k2 = np.take_along_axis(walk, k2.astype(int), axis=-1)
+    w_end = walk[..., -1:]
+    anchor = np.where(
+        in0,
+        w_k1 * (g / k1),
+        np.where(
+            in1,
+            w_k1 + (w_k2 - w_k1) * ((g - k1) / (k2 - k1)),
+            w_k2 + (w_end - w_k2) * ((g - k2) / (n_steps - k2)),
+        ),
+    )
+    path = np.clip(base + noise_scale * (walk - anchor), 0.0, 1.0)
+
+    n_points = n_steps + 1
+    live_from = np.zeros((m, n_paths), dtype=int)
+    if require_touch.any():
+        touched = path >= entry_n[..., None]
+        touch_idx = np.where(touched.any(axis=-1), touched.argmax(axis=-1), 0)
+        live_from = np.where(require_touch[:, None], touch_idx, 0)
+    live = grid[None, None, :] >= live_from[..., None]
+
+    tp_cross = (path >= tp_n[..., None]) & live
+    sl_cross = (path <= sl_n[..., None]) & live
+    first_tp = np.where(tp_cross.any(axis=-1), tp_cross.argmax(axis=-1), n_points)
+    first_sl = np.where(sl_cross.any(axis=-1), sl_cross.argmax(axis=-1), n_points)
+    tp_first = first_tp < first_sl
+
+    sl_idx = np.minimum(first_sl, n_steps)[..., None]
+    sl_fill = np.take_along_axis(path, sl_idx, axis=-1)[..., 0]
+    sl_fill = np.minimum(sl_fill, sl_n)
+    exit_level = np.where(tp_first, np.broadcast_to(tp_n, (m, n_paths)), sl_fill)
+    exits = exit_level - entry_n
+    return tp_first.astype(float), exits
+
+
+def calibrate_fill_table(
+    samples: Sequence[CollisionSample],
+    *,
+    n_paths: int = 2000,
+    n_steps: int = 60,
+    noise_scale: float = 0.35,
+    seed: Optional[int] = 0,
+    range_atr_axis: CalibrationAxis = DEFAULT_RANGE_ATR_AXIS,
+    d_tp_axis: CalibrationAxis = DEFAULT_DISTANCE_AXIS,
+    d_sl_axis: CalibrationAxis = DEFAULT_DISTANCE_AXIS,
+    min_trades: int = 3,
+    max_batch_elements: int = 4_000_000,
+) -> FillCalibrationTable:
+    """Simulate all collision samples and aggregate them into a lookup table."""
+
+    np = _require_numpy()
+    table = FillCalibrationTable(
+        range_atr_axis=range_atr_axis,
+        d_tp_axis=d_tp_axis,
+        d_sl_axis=d_sl_axis,
+        min_trades=max(1, int(min_trades)),
+    )
+    usable: List[CollisionSample] = []
+    keys: List[Tuple[Optional[int], int, int]] = []
+    for sample in samples:
+        feats = table.features(
+            entry_px=sample.entry_px,
+            tp_px=sample.tp_px,
+            stop_px=sample.stop_px,
+            high=sample.h,
+            low=sample.l,
+            atr=sample.atr,
+        )
+        if feats is None:
+            continue
+        usable.append(sample)
+        keys.append(table.key_for(*feats))
+
+    table.meta = {
+        "samples": len(usable),
+        "n_paths": int(n_paths),
+        "n_steps": int(n_steps),
+        "noise_scale": float(noise_scale),
+        "seed": seed,
+    }
+    if not usable:
+        return table
+
+    result = simulate_collision_paths(
+        usable,
+        n_paths=n_paths,
+        n_steps=n_steps,
+        noise_scale=noise_scale,
+        seed=seed,
+        max_batch_elements=max_batch_elements,
+    )
+
+    full_groups: Dict[Tuple[int, int, int], List[int]] = {}
+    pooled_groups: Dict[Tuple[int, int], List[int]] = {}
+    for idx, (ra_idx, tp_idx, sl_idx) in enumerate(keys):
+        pooled_groups.setdefault((tp_idx, sl_idx), []).append(idx)
+        if ra_idx is not None:
+            full_groups.setdefault((ra_idx, tp_idx, sl_idx), []).append(idx)
+
+    def _aggregate(indices: List[int]) -> FillCalibrationCell:
+        sel = np.asarray(indices, dtype=int)
+        exits = result.exit_r[sel].ravel()
+        q10, q50, q90 = np.quantile(exits, [0.1, 0.5, 0.9])
+        return FillCalibrationCell(
+            p_tp=float(np.clip(result.p_tp[sel].mean(), 0.001, 0.999)),
+            exit_mean_r=float(exits.mean()),
+            exit_q10_r=float(q10),
+            exit_q50_r=float(q50),
+            exit_q90_r=float(q90),
+            trades=int(sel.size),
+        )
+
+    table.cells = {key: _aggregate(idx) for key, idx in full_groups.items()}
+    table.pooled = {key: _aggregate(idx) for key, idx in pooled_groups.items()}
+    return table
+
+
+__all__ = [
+    "CalibrationAxis",
+    "CollisionSample",
+    "FillCalibrationCell",
+    "FillCalibrationTable",
+    "PathSimulationResult",
+    "calibrate_fill_table",
+    "simulate_collision_paths",
+]
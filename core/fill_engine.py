@@ -5,7 +5,11 @@ from __future__ import annotations
 import math
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:
+    from core.fill_calibration import CollisionSample, FillCalibrationTable
+    from core.sub_bar_replay import SubBarReplay
 
 
 class SameBarPolicy(str, Enum):
@@ -40,15 +44,39 @@ def resolve_same_bar_collision(
     lam: float,
     drift_scale: float,
     include_prob: bool,
+    calibration: Optional["FillCalibrationTable"] = None,
+    atr: Optional[float] = None,
+    sub_bars: Optional["SubBarReplay"] = None,
+    require_entry_touch: bool = False,
 ) -> Tuple[float, str, Optional[float]]:
     """Resolve TP/SL collisions within a single bar.
 
     This helper mirrors the behaviour implemented by ``_BaseFill`` so the
     runner can reuse the same resolution flow when finalising trades outside
     of the fill engine (e.g. conservative exits processed via
-    ``RunnerExecutionManager``).
+    ``RunnerExecutionManager``). When a calibration table covers the
+    collision geometry, the probabilistic policy uses its simulated TP-first
+    probability and mean exit price instead of the closed-form blend.
+    Sub-bar data, when attached and covering the bar, takes precedence over
+    every policy because it observes the actual order of the two exits.
     """
 
+    if sub_bars is not None:
+        resolution = sub_bars.resolve(
+            parent_ts=bar.get("timestamp"),
+            side=side,
+            entry_px=entry_px,
+            tp_px=tp_px,
+            stop_px=stop_px,
+            stop_reason=stop_reason,
+            require_entry_touch=require_entry_touch,
+        )
+        if resolution is not None:
+            p_exact: Optional[float] = None
+            if include_prob:
+                p_exact = 1.0 if resolution.exit_reason == "tp" else 0.0
+            return resolution.exit_px, resolution.exit_reason, p_exact
+
     if policy == SameBarPolicy.TP_FIRST:
         p_tp = 1.0 if include_prob else None
         return tp_px, "tp", p_tp
@@ -56,6 +84,23 @@ def resolve_same_bar_collision(
         p_tp = 0.0 if include_prob else None
         return stop_px, stop_reason, p_tp
 
+    if calibration is not None:
+        cell = calibration.lookup_collision(
+            entry_px=entry_px,
+            tp_px=tp_px,
+            stop_px=stop_px,
+            bar=bar,
+            atr=atr,
+        )
+        if cell is not None:
+            exit_px = cell.exit_price(
+                side=side,
+                entry_px=entry_px,
+                range_px=float(bar["h"]) - float(bar["l"]),
+            )
+            exit_reason = "tp" if cell.p_tp >= 0.5 else stop_reason
+            return exit_px, exit_reason, cell.p_tp
+
     p_tp = BridgeFill.compute_same_bar_probability(
         side=side,
         entry_px=entry_px,
@@ -81,10 +126,16 @@ class _BaseFill:
         default_policy: SameBarPolicy,
         lam: float = 0.35,
         drift_scale: float = 2.5,
+        calibration: Optional["FillCalibrationTable"] = None,
     ) -> None:
         self.default_policy = default_policy
         self.lam = lam
         self.drift_scale = drift_scale
+        self.calibration = calibration
+        # Optional 1m/tick replay consulted before the same-bar policy.
+        self.sub_bars: Optional["SubBarReplay"] = None
+        # Set to a list to capture same-bar collisions for offline calibration.
+        self.collision_log: Optional[List["CollisionSample"]] = None
 
     def _policy(self, spec: OrderSpec) -> SameBarPolicy:
         return spec.same_bar_policy or self.default_policy
@@ -136,6 +187,35 @@ class _BaseFill:
             return False, trail_px
         return False, None
 
+    def record_collision(
+        self,
+        *,
+        side: str,
+        entry_px: float,
+        tp_px: float,
+        stop_px: float,
+        bar: Mapping[str, Any],
+        atr: Optional[float] = None,
+        require_entry_touch: bool = False,
+    ) -> None:
+        """Append a collision sample when ``collision_log`` is enabled."""
+
+        if self.collision_log is None:
+            return
+        from core.fill_calibration import CollisionSample
+
+        self.collision_log.append(
+            CollisionSample.from_bar(
+                side=side,
+                entry_px=entry_px,
+                tp_px=tp_px,
+                stop_px=stop_px,
+                bar=bar,
+                atr=atr,
+                require_entry_touch=require_entry_touch,
+            )
+        )
+
     def _resolve_same_bar(
         self,
         spec: OrderSpec,
@@ -146,6 +226,16 @@ class _BaseFill:
         include_prob: bool,
     ) -> Tuple[float, str, Optional[float]]:
         policy = self._policy(spec)
+        atr = bar.get("atr")
+        self.record_collision(
+            side=spec.side,
+            entry_px=spec.entry,
+            tp_px=tp_px,
+            stop_px=stop_info[0],
+            bar=bar,
+            atr=atr,
+            require_entry_touch=True,
+        )
         return resolve_same_bar_collision(
             policy=policy,
             side=spec.side,
@@ -158,6 +248,10 @@ class _BaseFill:
             lam=self.lam,
             drift_scale=self.drift_scale,
             include_prob=include_prob,
+            calibration=self.calibration,
+            atr=atr,
+            sub_bars=self.sub_bars,
+            require_entry_touch=True,
         )
 
     def _simulate_bar(
@@ -294,8 +388,11 @@ class BridgeFill(_BaseFill):
         same_bar_policy: SameBarPolicy = SameBarPolicy.PROBABILISTIC,
         lam: float = DEFAULT_LAM,
         drift_scale: float = DEFAULT_DRIFT_SCALE,
+        calibration: Optional["FillCalibrationTable"] = None,
     ) -> None:
-        super().__init__(same_bar_policy, lam=lam, drift_scale=drift_scale)
+        super().__init__(
+            same_bar_policy, lam=lam, drift_scale=drift_scale, calibration=calibration
+        )
 
     @staticmethod
     def _config_value(config: Any, attr: str, fallback: float) -> float:
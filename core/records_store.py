@@ -0,0 +1,562 @@
+"""Columnar storage for run trade/debug records.
+
+``records.csv`` is convenient to eyeball but expensive for downstream tools:
+multi-year debug runs produce very large files and every consumer pays the
+full CSV parse even when it only needs a handful of columns of the ``trade``
+rows. ``RecordsWriter`` streams records in fixed-size batches to
+
+* ``records.parquet`` (one row group per batch) when pyarrow is installed, or
+* ``records.npz`` otherwise: a deflated zip holding one ``.npy`` member per
+  batch and column plus a small ``_index.json`` with per-batch statistics.
+
+The column layout is fixed when the first batch is flushed: known text
+columns (timestamps, stage, session/band labels, ...) are stored as strings,
+other columns whose values are all numeric as ``float64`` (missing -> NaN)
+and everything else as strings. Keys first seen in a later batch are kept in
+a JSON ``extra`` column so no information is dropped.
+
+``iter_record_batches``/``read_columns``/``iter_records`` read any of the
+three formats with column projection and simple predicates
+(``{"stage": "trade", "session": ["LDN", "NY"], "date": ("2024-01-01",
+"2024-03-31")}``). Columnar files skip whole batches from their statistics
+(Parquet row-group stats, the ``.npz`` index) before filtering rows.
+
+numpy is only needed for the ``.npz`` format and :func:`read_columns`; CSV
+writing/reading and :func:`find_records_file` stay pure Python.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import math
+import numbers
+import zipfile
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+RECORD_FORMATS = ("csv", "parquet", "npz")
+RECORD_FILENAMES = {fmt: f"records.{fmt}" for fmt in RECORD_FORMATS}
+DEFAULT_BATCH_SIZE = 4096
+NPZ_INDEX_MEMBER = "_index.json"
+EXTRA_COLUMN = "extra"
+
+# Columns that hold labels or timestamps and must stay text even when a
+# batch happens to contain only numeric-looking values.
+STRING_COLUMNS = frozenset(
+    {
+        "ts",
+        "entry_ts",
+        "stage",
+        "side",
+        "exit",
+        "session",
+        "rv_band",
+        "spread_band",
+        "reason",
+        "reason_stage",
+        "error",
+    }
+)
+# Low-cardinality columns whose distinct values are indexed per batch.
+INDEXED_COLUMNS = ("stage", "side", "session", "rv_band", "spread_band", "exit")
+
+Filters = Mapping[str, Any]
+
+
+def _require_numpy():
+    try:
+        import numpy as np  # type: ignore
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError(
+            "numpy is required for .npz records and read_columns. Install it via `pip install numpy`."
+        ) from exc
+    return np
+
+
+def _parquet_modules() -> Tuple[Any, Any]:
+    try:
+        import pyarrow as pa  # type: ignore[import-not-found]
+        import pyarrow.parquet as pq  # type: ignore[import-not-found]
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise RuntimeError(
+            "pyarrow is required for Parquet records. Install it via `pip install pyarrow`."
+        ) from exc
+    return pa, pq
+
+
+def parquet_available() -> bool:
+    try:
+        _parquet_modules()
+    except RuntimeError:
+        return False
+    return True
+
+
+def resolve_format(fmt: str) -> str:
+    """Map ``auto`` to ``parquet`` (pyarrow installed) or ``npz``."""
+
+    if fmt == "auto":
+        return "parquet" if parquet_available() else "npz"
+    if fmt not in RECORD_FORMATS:
+        raise ValueError(f"unsupported records format '{fmt}'")
+    return fmt
+
+
+def find_records_file(run_dir: Union[str, Path]) -> Optional[Path]:
+    """Return the records file of a run directory, preferring columnar ones."""
+
+    run_dir = Path(run_dir)
+    for fmt in ("parquet", "npz", "csv"):
+        candidate = run_dir / RECORD_FILENAMES[fmt]
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+def _number(value: Any) -> float:
+    if value is None or value == "":
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class RecordsWriter:
+    """Stream record dicts to a Parquet or ``.npz`` file in batches."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        fmt: str = "auto",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        self.format = resolve_format(fmt)
+        if self.format == "csv":
+            raise ValueError("RecordsWriter writes columnar formats only (parquet/npz)")
+        self.path = Path(path)
+        self.batch_size = max(int(batch_size), 1)
+        self.columns: Optional[Dict[str, str]] = None
+        self.rows = 0
+        self._pending: List[Mapping[str, Any]] = []
+        self._batches: List[Dict[str, Any]] = []
+        self._parquet_writer: Any = None
+        self._zip: Optional[zipfile.ZipFile] = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def __enter__(self) -> "RecordsWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def append(self, record: Mapping[str, Any]) -> None:
+        self._pending.append(record)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def extend(self, records: Iterable[Mapping[str, Any]]) -> None:
+        for record in records:
+            self.append(record)
+
+    def _infer_columns(self, batch: Sequence[Mapping[str, Any]]) -> Dict[str, str]:
+        names: Dict[str, None] = {}
+        for record in batch:
+            for key in record:
+                names.setdefault(key, None)
+        columns: Dict[str, str] = {}
+        for name in sorted(names):
+            if name in STRING_COLUMNS:
+                columns[name] = "str"
+                continue
+            values = [record[name] for record in batch if record.get(name) is not None]
+            columns[name] = "float" if values and all(_is_number(v) for v in values) else "str"
+        columns[EXTRA_COLUMN] = "str"
+        return columns
+
+    def _columnize(self, batch: Sequence[Mapping[str, Any]]) -> Dict[str, List[Any]]:
+        assert self.columns is not None
+        data: Dict[str, List[Any]] = {name: [] for name in self.columns}
+        known = self.columns
+        for record in batch:
+            extra = {key: value for key, value in record.items() if key not in known}
+            for name, kind in known.items():
+                if name == EXTRA_COLUMN:
+                    data[name].append(json.dumps(extra, default=str, sort_keys=True) if extra else None)
+                elif kind == "float":
+                    data[name].append(_number(record.get(name)))
+                else:
+                    data[name].append(_text(record.get(name)))
+        return data
+
+    def _batch_stats(self, data: Mapping[str, List[Any]]) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {}
+        ts_values = [value for value in data.get("ts", []) if value]
+        if ts_values:
+            stats["ts"] = {"min": min(ts_values), "max": max(ts_values)}
+        for name in INDEXED_COLUMNS:
+            if name in data:
+                stats[name] = {"values": sorted({v for v in data[name] if v is not None})}
+        return stats
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        if self.columns is None:
+            self.columns = self._infer_columns(batch)
+        data = self._columnize(batch)
+        if self.format == "parquet":
+            self._write_parquet(data)
+        else:
+            self._write_npz(data)
+        self._batches.append({"rows": len(batch), "stats": self._batch_stats(data)})
+        self.rows += len(batch)
+
+    def _write_parquet(self, data: Mapping[str, List[Any]]) -> None:
+        pa, pq = _parquet_modules()
+        assert self.columns is not None
+        schema = pa.schema(
+            [(name, pa.float64() if kind == "float" else pa.string()) for name, kind in self.columns.items()]
+        )
+        table = pa.table({name: data[name] for name in self.columns}, schema=schema)
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(str(self.path), schema, compression="zstd")
+        self._parquet_writer.write_table(table, row_group_size=len(table))
+
+    def _write_npz(self, data: Mapping[str, List[Any]]) -> None:
+        np = _require_numpy()
+        assert self.columns is not None
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_DEFLATED)
+        index = len(self._batches)
+        for name, kind in self.columns.items():
+            if kind == "float":
+                array = np.asarray(data[name], dtype=np.float64)
+            else:
+                array = np.asarray(["" if v is None else v for v in data[name]], dtype=np.str_)
+            with self._zip.open(f"b{index:06d}/{name}.npy", "w", force_zip64=True) as handle:
+                np.lib.format.write_array(handle, array, allow_pickle=False)
+
+    def close(self) -> None:
+        self.flush()
+        if self.format == "parquet":
+            if self._parquet_writer is None:
+                pa, pq = _parquet_modules()
+                self._parquet_writer = pq.ParquetWriter(str(self.path), pa.schema([]))
+            self._parquet_writer.close()
+            self._parquet_writer = None
+            return
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_DEFLATED)
+        index = {"version": 1, "columns": self.columns or {}, "batches": self._batches}
+        self._zip.writestr(NPZ_INDEX_MEMBER, json.dumps(index, ensure_ascii=False))
+        self._zip.close()
+        self._zip = None
+
+
+def write_records(
+    path: Union[str, Path],
+    records: Iterable[Mapping[str, Any]],
+    *,
+    fmt: str = "auto",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Path:
+    """Write ``records`` to ``path`` (suffix adjusted to the resolved format)."""
+
+    resolved = resolve_format(fmt)
+    target = Path(path).with_suffix(f".{resolved}")
+    if resolved == "csv":
+        rows = records if isinstance(records, list) else list(records)
+        header = sorted({key for record in rows for key in record.keys()})
+        with target.open("w", newline="", encoding="utf-8") as handle:
+            writer = csv.DictWriter(handle, fieldnames=header)
+            writer.writeheader()
+            for record in rows:
+                writer.writerow(record)
+        return target
+    with RecordsWriter(target, fmt=resolved, batch_size=batch_size) as writer:
+        writer.extend(records)
+    return target
+
+
+# -- reading -------------------------------------------------------------------
+
+
+def _normalise_filters(filters: Optional[Filters]) -> Dict[str, Any]:
+    """Turn user filters into ``{column: set}`` and an optional ts range."""
+
+    normalised: Dict[str, Any] = {}
+    for name, value in (filters or {}).items():
+        if name == "date":
+            start, end = value if isinstance(value, (tuple, list)) else (value, value)
+            low = str(start) if start is not None else None
+            # Inclusive end date: any timestamp on that day sorts below "<date>~".
+            high = f"{str(end)[:10]}~" if end is not None else None
+            normalised["ts"] = (low, high)
+        elif isinstance(value, (str, bytes)) or not isinstance(value, Iterable):
+            normalised[name] = {str(value)}
+        else:
+            normalised[name] = {str(item) for item in value}
+    return normalised
+
+
+def _needed_columns(columns: Optional[Sequence[str]], filters: Mapping[str, Any]) -> Optional[List[str]]:
+    if columns is None:
+        return None
+    needed = list(columns)
+    for name in filters:
+        if name not in needed:
+            needed.append(name)
+    return needed
+
+
+def _batch_may_match(stats: Mapping[str, Any], filters: Mapping[str, Any]) -> bool:
+    for name, wanted in filters.items():
+        stat = stats.get(name)
+        if stat is None:
+            continue
+        if name == "ts":
+            low, high = wanted
+            if low is not None and stat["max"] < low:
+                return False
+            if high is not None and stat["min"] > high:
+                return False
+        elif "values" in stat and not wanted.intersection(stat["values"]):
+            return False
+        elif "min" in stat and not any(stat["min"] <= value <= stat["max"] for value in wanted):
+            return False
+    return True
+
+
+def _row_mask(data: Mapping[str, Any], filters: Mapping[str, Any], rows: int) -> List[bool]:
+    mask = [True] * rows
+    for name, wanted in filters.items():
+        if name not in data:
+            return [False] * rows
+        values = data[name]
+        if name == "ts":
+            low, high = wanted
+            for position, value in enumerate(values):
+                text = "" if value is None else str(value)
+                if (low is not None and text < low) or (high is not None and text > high):
+                    mask[position] = False
+        else:
+            for position, value in enumerate(values):
+                if value is None or str(value) not in wanted:
+                    mask[position] = False
+    return mask
+
+
+def _select(data: Mapping[str, Any], columns: Optional[Sequence[str]], mask: Sequence[bool]) -> Dict[str, Any]:
+    names = list(columns) if columns is not None else list(data)
+    keep_all = all(mask)
+    selected: Dict[str, Any] = {}
+    for name in names:
+        if name not in data:
+            continue
+        values = data[name]
+        if keep_all:
+            selected[name] = values
+        elif hasattr(values, "dtype"):
+            # numpy array (npz/parquet float columns): boolean indexing.
+            selected[name] = values[_require_numpy().asarray(mask, dtype=bool)]
+        else:
+            selected[name] = [value for value, keep in zip(values, mask) if keep]
+    return selected
+
+
+def _iter_npz(path: Path, columns: Optional[Sequence[str]], filters: Mapping[str, Any]) -> Iterator[Dict[str, Any]]:
+    np = _require_numpy()
+    with zipfile.ZipFile(path) as archive:
+        index = json.loads(archive.read(NPZ_INDEX_MEMBER))
+        kinds: Dict[str, str] = index.get("columns", {})
+        needed = _needed_columns(columns, filters)
+        names = [name for name in (needed if needed is not None else kinds) if name in kinds]
+        for position, batch in enumerate(index.get("batches", [])):
+            if not _batch_may_match(batch.get("stats", {}), filters):
+                continue
+            data: Dict[str, Any] = {}
+            for name in names:
+                with archive.open(f"b{position:06d}/{name}.npy") as handle:
+                    array = np.lib.format.read_array(handle, allow_pickle=False)
+                if kinds[name] == "str":
+                    array = np.array([value or None for value in array.tolist()], dtype=object)
+                data[name] = array
+            mask = _row_mask(data, filters, int(batch["rows"]))
+            if any(mask):
+                yield _select(data, columns, mask)
+
+
+def _row_group_stats(metadata: Any, index: int, names: Sequence[str]) -> Dict[str, Any]:
+    """Translate Parquet row-group min/max statistics into ``_batch_may_match`` form."""
+
+    group = metadata.row_group(index)
+    stats: Dict[str, Any] = {}
+    for position in range(group.num_columns):
+        column = group.column(position)
+        name = column.path_in_schema
+        if name not in names:
+            continue
+        statistics = column.statistics
+        if statistics is None or not statistics.has_min_max:
+            continue
+        low, high = statistics.min, statistics.max
+        if name == "ts":
+            stats["ts"] = {"min": low, "max": high}
+        elif name in INDEXED_COLUMNS:
+            stats[name] = {"min": low, "max": high}
+    return stats
+
+
+def _iter_parquet(
+    path: Path, columns: Optional[Sequence[str]], filters: Mapping[str, Any], batch_size: int
+) -> Iterator[Dict[str, Any]]:
+    _, pq = _parquet_modules()
+    handle = pq.ParquetFile(str(path))
+    schema_names = list(handle.schema_arrow.names)
+    if any(name not in schema_names for name in filters):
+        return
+    needed = _needed_columns(columns, filters)
+    names = [name for name in (needed if needed is not None else schema_names) if name in schema_names]
+    metadata = handle.metadata
+    for index in range(metadata.num_row_groups):
+        if not _batch_may_match(_row_group_stats(metadata, index, list(filters)), filters):
+            continue
+        # Decode one row group at a time so memory stays bounded by batch size.
+        for batch in handle.iter_batches(batch_size=batch_size, row_groups=[index], columns=names):
+            data: Dict[str, Any] = {}
+            for name in names:
+                column = batch.column(batch.schema.get_field_index(name))
+                if str(column.type) == "double":
+                    data[name] = column.to_numpy(zero_copy_only=False)
+                else:
+                    data[name] = column.to_pylist()
+            mask = _row_mask(data, filters, batch.num_rows)
+            if any(mask):
+                yield _select(data, columns, mask)
+
+
+def _iter_csv(path: Path, columns: Optional[Sequence[str]], filters: Mapping[str, Any], batch_size: int) -> Iterator[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        reader = csv.DictReader(handle)
+        fieldnames = list(reader.fieldnames or [])
+        needed = _needed_columns(columns, filters)
+        names = [name for name in (needed if needed is not None else fieldnames) if name in fieldnames]
+        while True:
+            rows = [row for _, row in zip(range(batch_size), reader)]
+            if not rows:
+                return
+            data = {name: [row.get(name) or None for row in rows] for name in names}
+            mask = _row_mask(data, filters, len(rows))
+            if any(mask):
+                yield _select(data, columns, mask)
+
+
+def iter_record_batches(
+    path: Union[str, Path],
+    *,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[Filters] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """Yield ``{column: values}`` batches of the matching records.
+
+    Float columns of columnar files come back as ``float64`` arrays, other
+    columns as object arrays or lists (``None`` for missing). CSV values stay
+    text in plain lists.
+    """
+
+    path = Path(path)
+    normalised = _normalise_filters(filters)
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        yield from _iter_parquet(path, columns, normalised, batch_size)
+    elif suffix == ".npz":
+        yield from _iter_npz(path, columns, normalised)
+    else:
+        yield from _iter_csv(path, columns, normalised, batch_size)
+
+
+def read_columns(
+    path: Union[str, Path],
+    *,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[Filters] = None,
+) -> Dict[str, Any]:
+    """Concatenate :func:`iter_record_batches` into one numpy array per column."""
+
+    np = _require_numpy()
+    parts: Dict[str, List[Any]] = {}
+    for batch in iter_record_batches(path, columns=columns, filters=filters):
+        for name, values in batch.items():
+            parts.setdefault(name, []).append(
+                values if hasattr(values, "dtype") else np.asarray(values, dtype=object)
+            )
+    return {name: np.concatenate(chunks) for name, chunks in parts.items()}
+
+
+def iter_records(
+    path: Union[str, Path],
+    *,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[Filters] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Row-wise view over :func:`iter_record_batches` (``extra`` merged back)."""
+
+    for batch in iter_record_batches(path, columns=columns, filters=filters):
+        names = list(batch)
+        if not names:
+            continue
+        for row_values in zip(*(batch[name] for name in names)):
+            row: Dict[str, Any] = {}
+            for name, value in zip(names, row_values):
+                if name == EXTRA_COLUMN:
+                    if value:
+                        row.update(json.loads(value))
+                    continue
+                if isinstance(value, float):
+                    # numpy.float64 subclasses float, so this covers columnar values.
+                    value = None if math.isnan(value) else float(value)
+                row[name] = value
+            yield row
+
+
+__all__ = [
+    "DEFAULT_BATCH_SIZE",
+    "RECORD_FILENAMES",
+    "RECORD_FORMATS",
+    "RecordsWriter",
+    "find_records_file",
+    "iter_record_batches",
+    "iter_records",
+    "parquet_available",
+    "read_columns",
+    "resolve_format",
+    "write_records",
+]
@@ -8,13 +8,13 @@ Backtest/Replay Runner (skeleton)
 NOTE: Placeholder thresholds and simplified assumptions to keep dependencies minimal.
 """
 from __future__ import annotations
-from typing import Any, Callable, ClassVar, Dict, Iterable, List, Mapping, Optional, Tuple, Set, Union
+from typing import Any, Callable, ClassVar, Dict, Iterable, List, Mapping, Optional, Tuple, Set, TYPE_CHECKING, Union
 from collections import deque
 from copy import deepcopy
 import hashlib
 import math
 from datetime import datetime, timezone, timedelta
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, replace as dataclass_replace
 
 from strategies.day_orb_5m import DayORB5m
 from core.strategy_api import Strategy
@@ -37,8 +37,20 @@ from core.runner_entry import (
 )
 from core.runner_execution import ExitDecision, RunnerExecutionManager
 from core.runner_lifecycle import RunnerLifecycleManager
+from core.runner_metrics import DrawdownTracker, EquityCurveSampler, RunningStats
 from core.runner_state import ActivePositionState, CalibrationPositionState, PositionState
-from core.runner_features import FeatureBundle, FeaturePipeline
+from core.runner_features import (
+    FeatureBundle,
+    FeaturePipeline,
+    parse_session_timestamp,
+    session_for_timestamp,
+)
+
+if TYPE_CHECKING:
+    from core.feature_cache import FeatureReplay
+    from core.fill_calibration import FillCalibrationTable
+    from core.runner_checkpoint import RunCheckpointer
+    from core.sub_bar_replay import SubBarReplay
 
 
 def _normalise_timeframes(values: Optional[Iterable[Any]]) -> Tuple[str, ...]:
@@ -93,10 +105,21 @@ class Metrics:
     debug: Dict[str, Any] = field(default_factory=dict)
     runtime: Dict[str, Any] = field(default_factory=dict)
     starting_equity: float = 0.0
+    # ``None`` keeps the full history; an int bounds the stored curve points /
+    # recent trade returns (Sharpe and max drawdown stay exact either way).
+    equity_curve_points: Optional[int] = None
+    trade_returns_window: Optional[int] = None
     _equity_seed: Optional[Tuple[str, float]] = field(default=None, init=False, repr=False)
+    _return_stats: RunningStats = field(default_factory=RunningStats, init=False, repr=False)
+    _drawdown: DrawdownTracker = field(default_factory=DrawdownTracker, init=False, repr=False)
+    _curve_sampler: EquityCurveSampler = field(
+        default_factory=EquityCurveSampler, init=False, repr=False
+    )
+    _last_equity: Optional[float] = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
         self.starting_equity = float(self.starting_equity)
+        self._curve_sampler.max_points = self.equity_curve_points
 
     @staticmethod
     def _normalise_timestamp(timestamp: Any) -> Tuple[str, Optional[datetime]]:
@@ -140,22 +163,77 @@ class Metrics:
         except (TypeError, ValueError):
             win_value = 0.0
         self.wins += win_value
+        self._sync_stream_state()
         self.trade_returns.append(pnl_equity)
+        if self.trade_returns_window is not None and len(self.trade_returns) > self.trade_returns_window:
+            del self.trade_returns[0]
+        self._return_stats.push(pnl_equity)
         ts_value, dt_value = self._normalise_timestamp(timestamp)
         if self._equity_seed is None:
             seed_ts = ts_value
             if dt_value is not None:
                 seed_ts = self._format_timestamp(dt_value - timedelta(microseconds=1))
             self._equity_seed = (seed_ts, self.starting_equity)
+            self._drawdown.push(self.starting_equity)
         last_equity = (
-            self.equity_curve[-1][1]
+            self._last_equity
+            if self._last_equity is not None
+            else self.equity_curve[-1][1]
             if self.equity_curve
             else self._equity_seed[1]
             if self._equity_seed
             else self.starting_equity
         )
         new_equity = last_equity + pnl_equity
-        self.equity_curve.append((ts_value, new_equity))
+        self._last_equity = new_equity
+        self._drawdown.push(new_equity)
+        self._curve_sampler.append(self.equity_curve, (ts_value, new_equity))
+
+    def _sync_stream_state(self) -> None:
+        """Rebuild the accumulators when the lists were populated directly."""
+
+        if self._return_stats.count == 0 and self.trade_returns:
+            self._return_stats = RunningStats.from_values(self.trade_returns)
+        if not self._drawdown.started and (self.equity_curve or self._equity_seed):
+            self._drawdown = DrawdownTracker.from_values(self._curve_values())
+        if self._last_equity is None and self.equity_curve:
+            self._last_equity = self.equity_curve[-1][1]
+
+    def _curve_values(self) -> List[float]:
+        values: List[float] = []
+        if self._equity_seed is not None:
+            values.append(self._equity_seed[1])
+        values.extend(point[1] for point in self.equity_curve)
+        return values
+
+    def stream_state(self) -> Dict[str, Any]:
+        """Serialisable accumulator state (for runner state/checkpoints)."""
+
+        self._sync_stream_state()
+        return {
+            "returns": self._return_stats.to_dict(),
+            "drawdown": self._drawdown.to_dict(),
+            "curve": self._curve_sampler.to_dict(),
+            "last_equity": self._last_equity,
+        }
+
+    def restore_stream_state(self, payload: Optional[Mapping[str, Any]]) -> None:
+        """Restore accumulators, or rebuild them from the lists (legacy state)."""
+
+        self._return_stats = RunningStats()
+        self._drawdown = DrawdownTracker()
+        self._last_equity = None
+        self._curve_sampler.restore(payload.get("curve") if payload else None, self.equity_curve)
+        if payload:
+            try:
+                self._return_stats = RunningStats.from_dict(payload["returns"])
+                self._drawdown = DrawdownTracker.from_dict(payload["drawdown"])
+                last_equity = payload.get("last_equity")
+                self._last_equity = None if last_equity is None else float(last_equity)
+            except (KeyError, TypeError, ValueError):
+                self._return_stats = RunningStats()
+                self._drawdown = DrawdownTracker()
+        self._sync_stream_state()
 
     def as_dict(self):
         win_rate: Optional[float]
@@ -184,34 +262,14 @@ class Metrics:
         return data
 
     def _compute_sharpe(self) -> Optional[float]:
-        if not self.trade_returns:
-            return None
-        n = len(self.trade_returns)
-        if n < 2:
-            return 0.0
-        mean_ret = sum(self.trade_returns) / n
-        variance = sum((r - mean_ret) ** 2 for r in self.trade_returns) / n
-        std_dev = math.sqrt(variance)
-        if std_dev == 0.0:
-            return 0.0
-        return mean_ret / std_dev * math.sqrt(float(n))
+        self._sync_stream_state()
+        return self._return_stats.sharpe()
 
     def _compute_max_drawdown(self) -> Optional[float]:
-        values: List[float] = []
-        if self._equity_seed is not None:
-            values.append(self._equity_seed[1])
-        values.extend(point[1] for point in self.equity_curve)
-        if not values:
+        self._sync_stream_state()
+        if not self._drawdown.started:
             return None
-        peak = values[0]
-        max_drawdown = 0.0
-        for equity in values:
-            if equity > peak:
-                peak = equity
-            drawdown = equity - peak
-            if drawdown < max_drawdown:
-                max_drawdown = drawdown
-        return max_drawdown
+        return self._drawdown.max_drawdown
 
 
 @dataclass
@@ -320,6 +378,19 @@ class RunnerConfig:
     fill_same_bar_policy_bridge: Union[str, SameBarPolicy] = SameBarPolicy.PROBABILISTIC.value
     fill_bridge_lambda: float = 0.35
     fill_bridge_drift_scale: float = 2.5
+    # Optional Monte Carlo calibration table (see core.fill_calibration)
+    fill_bridge_calibration: Optional[str] = None
+    # Optional 1m/tick CSV used to resolve same-bar TP/SL hits exactly
+    fill_sub_bar_path: Optional[str] = None
+    # Metrics memory (opt-in): Sharpe/max drawdown are streamed, so the stored
+    # equity curve can be downsampled to this many points and trade returns
+    # limited to a recent window. ``None`` keeps the full history, which
+    # drawdown/VaR consumers of metrics.json and state files rely on.
+    equity_curve_points: Optional[int] = None
+    trade_returns_window: Optional[int] = None
+    # Optional core.feature_cache root: replay per-bar indicators computed by
+    # an earlier run (or ingestion) over the same bar stream.
+    feature_cache_dir: Optional[str] = None
 
     @property
     def or_n(self) -> int:
@@ -554,9 +625,14 @@ class BacktestRunner:
             same_bar_policy=bridge_policy,
             lam=float(self.rcfg.fill_bridge_lambda),
             drift_scale=float(self.rcfg.fill_bridge_drift_scale),
+            calibration=self._load_fill_calibration(),
         )
+        self.sub_bar_replay = self._build_sub_bar_replay()
+        self.fill_engine_c.sub_bars = self.sub_bar_replay
+        self.fill_engine_b.sub_bars = self.sub_bar_replay
         self.lifecycle.reset_runtime_state()
         self._ev_profile_lookup: Dict[tuple, Dict[str, Any]] = {}
+        self._ev_profile_compiled: Optional[Tuple[Any, Dict[str, Any]]] = None
         # Slip/size expectation tracking
         self.lifecycle.reset_slip_learning()
 
@@ -566,6 +642,23 @@ class BacktestRunner:
         self._initialise_strategy_instance()
         self._apply_ev_profile()
 
+    def _load_fill_calibration(self) -> Optional["FillCalibrationTable"]:
+        path = getattr(self.rcfg, "fill_bridge_calibration", None)
+        if not path:
+            return None
+        from core.fill_calibration import FillCalibrationTable
+
+        return FillCalibrationTable.load(path)
+
+    def _build_sub_bar_replay(self) -> Optional["SubBarReplay"]:
+        path = getattr(self.rcfg, "fill_sub_bar_path", None)
+        if not path:
+            return None
+        from core.sub_bar_replay import SubBarReplay
+
+        # The replay opens its file lazily on the first collision.
+        return SubBarReplay(path)
+
     def _init_ev_state(self) -> None:
         self.lifecycle.init_ev_state()
 
@@ -587,7 +680,11 @@ class BacktestRunner:
         return deque(maxlen=self.rcfg.rv_q_lookback_bars)
 
     def _create_metrics(self) -> Metrics:
-        return Metrics(starting_equity=self._equity_live)
+        return Metrics(
+            starting_equity=self._equity_live,
+            equity_curve_points=self.rcfg.equity_curve_points,
+            trade_returns_window=self.rcfg.trade_returns_window,
+        )
 
     def _hash_payload(self, payload: str) -> str:
         return hashlib.sha256(payload.encode()).hexdigest()[:16]
@@ -675,6 +772,8 @@ class BacktestRunner:
         resume_skipped = getattr(self.lifecycle, "resume_skipped_bars", 0)
         if resume_skipped:
             runtime["resume_skipped_bars"] = int(resume_skipped)
+        if self._feature_replay is not None:
+            runtime["feature_cache"] = self._feature_replay.stats()
         return runtime
 
     @staticmethod
@@ -993,6 +1092,7 @@ class BacktestRunner:
             rv_hist=self.rv_hist,
             ctx_builder=self._build_ctx,
             context_consumer=self.stg.update_context,
+            feature_cache=self._feature_replay_for(bar),
         )
         features, _ = pipeline.compute(
             bar,
@@ -1000,8 +1100,31 @@ class BacktestRunner:
             new_session=new_session,
             calibrating=calibrating,
         )
+        self._last_atr14 = features.atr14
         return features
 
+    def _feature_replay_for(self, bar: Mapping[str, Any]) -> Optional["FeatureReplay"]:
+        if not self._feature_replay_ready:
+            self._feature_replay_ready = True
+            cache_dir = getattr(self.rcfg, "feature_cache_dir", None)
+            # Cached rows are only valid for a stream replayed from its start.
+            if cache_dir and not self.window and not self.session_bars:
+                from core.feature_cache import open_replay
+
+                self._feature_replay = open_replay(
+                    cache_dir,
+                    symbol=self.symbol,
+                    tf=str(bar.get("tf") or "5m"),
+                    or_n=self.rcfg.or_n,
+                )
+        return self._feature_replay
+
+    def flush_feature_cache(self) -> None:
+        """Persist indicator rows recorded since the last feature cache save."""
+
+        if self._feature_replay is not None:
+            self._feature_replay.flush(force=True)
+
     def _compute_exit_decision(
         self,
         *,
@@ -1184,6 +1307,9 @@ class BacktestRunner:
     def load_state_file(self, path: str) -> bool:
         return self.lifecycle.load_state_file(path)
 
+    def load_checkpoint(self, payload: Mapping[str, Any]) -> bool:
+        return self.lifecycle.load_checkpoint(payload)
+
     def _band_spread(self, spread_pips: float) -> str:
         bands = self.rcfg.spread_bands
         eps = 1e-9
@@ -1221,22 +1347,27 @@ class BacktestRunner:
         from core.ev_gate import PooledEVManager
         return PooledEVManager(self.ev_buckets, self.ev_global, key, self._neighbor_keys(key))
 
-    def _apply_ev_profile(self) -> None:
-        if not self.ev_profile:
-            return
+    @staticmethod
+    def _profile_seed(stats: Mapping[str, Any]) -> Tuple[Optional[float], Optional[float]]:
+        alpha = beta = None
+        try:
+            if "alpha_avg" in stats:
+                alpha = float(stats["alpha_avg"])
+            if "beta_avg" in stats:
+                beta = float(stats["beta_avg"])
+        except Exception:
+            pass
+        return alpha, beta
 
-        self._ev_profile_lookup = {}
+    def _compile_ev_profile(self) -> Dict[str, Any]:
+        """Parse ``ev_profile`` once; ``reset`` re-applies the compiled seeds."""
+
+        if self._ev_profile_compiled is not None and self._ev_profile_compiled[0] is self.ev_profile:
+            return self._ev_profile_compiled[1]
         global_profile = self.ev_profile.get("global", {})
         seed_global = global_profile.get("recent") or global_profile.get("long_term")
-        if seed_global:
-            try:
-                self.ev_global.alpha = float(seed_global.get("alpha_avg", self.ev_global.alpha))
-                self.ev_global.beta = float(seed_global.get("beta_avg", self.ev_global.beta))
-            except Exception:
-                pass
-
-        buckets = self.ev_profile.get("buckets", [])
-        for entry in buckets:
+        buckets: List[Tuple[tuple, Optional[Tuple[Optional[float], Optional[float]]], Dict[str, Any]]] = []
+        for entry in self.ev_profile.get("buckets", []):
             bucket_info = entry.get("bucket", {})
             try:
                 key = (
@@ -1246,27 +1377,45 @@ class BacktestRunner:
                 )
             except KeyError:
                 continue
+            stats = entry.get("recent") or entry.get("long_term")
+            lookup = {
+                "long_term": entry.get("long_term") or {},
+                "recent": entry.get("recent") or {},
+            }
+            buckets.append((key, self._profile_seed(stats) if stats else None, lookup))
+        compiled = {
+            "global": self._profile_seed(seed_global) if seed_global else None,
+            "buckets": buckets,
+        }
+        self._ev_profile_compiled = (self.ev_profile, compiled)
+        return compiled
+
+    def _apply_ev_profile(self) -> None:
+        if not self.ev_profile:
+            return
 
+        compiled = self._compile_ev_profile()
+        self._ev_profile_lookup = {}
+        if compiled["global"] is not None:
+            alpha, beta = compiled["global"]
+            if alpha is not None:
+                self.ev_global.alpha = alpha
+            if beta is not None:
+                self.ev_global.beta = beta
+
+        for key, seed, lookup in compiled["buckets"]:
             if key not in self.ev_buckets:
                 self.ev_buckets[key] = BetaBinomialEV(conf_level=self.ev_global.conf_level,
                                                       decay=self.ev_global.decay,
                                                       prior_alpha=self.ev_global.prior_alpha,
                                                       prior_beta=self.ev_global.prior_beta)
-
-            stats = entry.get("recent") or entry.get("long_term")
-            if stats:
-                try:
-                    self.ev_buckets[key].alpha = float(stats.get("alpha_avg", self.ev_buckets[key].alpha))
-                    self.ev_buckets[key].beta = float(stats.get("beta_avg", self.ev_buckets[key].beta))
-                except Exception:
-                    pass
-
-            long_term = entry.get("long_term") or {}
-            recent = entry.get("recent") or {}
-            self._ev_profile_lookup[key] = {
-                "long_term": long_term,
-                "recent": recent,
-            }
+            if seed is not None:
+                alpha, beta = seed
+                if alpha is not None:
+                    self.ev_buckets[key].alpha = alpha
+                if beta is not None:
+                    self.ev_buckets[key].beta = beta
+            self._ev_profile_lookup[key] = lookup
 
     def _build_ctx(
         self,
@@ -1400,67 +1549,7 @@ class BacktestRunner:
 
     def _parse_session_timestamp(self, ts: str) -> Optional[datetime]:
         """Parse a timestamp string into a timezone-aware ``datetime``."""
-        if not isinstance(ts, str):
-            return None
-        text = ts.strip()
-        if not text:
-            return None
-
-        candidates: List[str] = []
-        if text.endswith("Z"):
-            candidates.append(f"{text[:-1]}+00:00")
-        candidates.append(text)
-
-        parsed: Optional[datetime] = None
-        for candidate in candidates:
-            if "-" not in candidate and ":" not in candidate:
-                continue
-            try:
-                parsed = datetime.fromisoformat(candidate)
-            except ValueError:
-                continue
-            else:
-                break
-
-        if parsed is not None:
-            if parsed.tzinfo is None:
-                parsed = parsed.replace(tzinfo=timezone.utc)
-            return parsed
-
-        def _collapse_offset(value: str) -> str:
-            if len(value) >= 6 and value[-3] == ":" and value[-6] in ("+", "-"):
-                return value[:-3] + value[-2:]
-            return value
-
-        fallback_candidates: List[str] = [text]
-        if text.endswith("Z"):
-            fallback_candidates.append(f"{text[:-1]}+0000")
-
-        extended_candidates = list(fallback_candidates)
-        for candidate in extended_candidates:
-            collapsed = _collapse_offset(candidate)
-            if collapsed != candidate:
-                fallback_candidates.append(collapsed)
-
-        patterns: Tuple[str, ...] = (
-            "%Y%m%dT%H%M%S.%f%z",
-            "%Y%m%dT%H%M%S%z",
-            "%Y%m%dT%H%M%S.%fZ",
-            "%Y%m%dT%H%M%SZ",
-            "%Y%m%dT%H%M%S.%f",
-            "%Y%m%dT%H%M%S",
-        )
-
-        for candidate in fallback_candidates:
-            for pattern in patterns:
-                try:
-                    parsed = datetime.strptime(candidate, pattern)
-                except ValueError:
-                    continue
-                if parsed.tzinfo is None:
-                    parsed = parsed.replace(tzinfo=timezone.utc)
-                return parsed
-        return None
+        return parse_session_timestamp(ts)
 
     def _session_of_ts(self, ts: str) -> str:
         """Very simple UTC-based session mapping.
@@ -1474,13 +1563,7 @@ class BacktestRunner:
             self.debug_counts["session_parse_error"] += 1
             if self.debug:
                 self._append_debug_record("session_parse_error", text=str(ts))
-            return "TOK"
-        hour = parsed.astimezone(timezone.utc).hour
-        if 8 <= hour <= 12:
-            return "LDN"
-        if 13 <= hour <= 21:
-            return "NY"
-        return "TOK"
+        return session_for_timestamp(parsed)
 
     def _resolve_allowed_timeframes(
         self, override: Optional[Iterable[Any]] = None
@@ -1490,53 +1573,68 @@ class BacktestRunner:
         config_timeframes = getattr(self.rcfg, "allowed_timeframes", None)
         return _normalise_timeframes(config_timeframes)
 
+    def _process_bar(
+        self,
+        bar: Dict[str, Any],
+        *,
+        mode: str,
+        pip_size_value: float,
+        allowed_tf: Tuple[str, ...],
+    ) -> None:
+        if not validate_bar(bar, allowed_timeframes=allowed_tf):
+            return
+        new_session, session, calibrating = self._update_daily_state(bar)
+        features = self._compute_features(
+            bar,
+            session=session,
+            new_session=new_session,
+            calibrating=calibrating,
+        )
+        if self._handle_active_position(
+            bar=bar,
+            ctx=features.ctx,
+            mode=mode,
+            pip_size_value=pip_size_value,
+            new_session=new_session,
+        ):
+            return
+        self._resolve_calibration_positions(
+            bar=bar,
+            ctx=features.ctx,
+            new_session=new_session,
+            calibrating=calibrating,
+            mode=mode,
+            pip_size_value=pip_size_value,
+        )
+        self._maybe_enter_trade(
+            bar=bar,
+            features=features,
+            mode=mode,
+            pip_size_value=pip_size_value,
+            calibrating=calibrating,
+        )
+
     def run_partial(
         self,
         bars: List[Dict[str, Any]],
         mode: str = "conservative",
         allowed_timeframes: Optional[Iterable[Any]] = None,
+        checkpoint: Optional["RunCheckpointer"] = None,
     ) -> Metrics:
         ps = pip_size(self.symbol)
         allowed_tf = self._resolve_allowed_timeframes(allowed_timeframes)
         for bar in bars:
             if self.lifecycle.should_skip_bar(bar):
                 continue
-            if not validate_bar(bar, allowed_timeframes=allowed_tf):
-                continue
-            new_session, session, calibrating = self._update_daily_state(bar)
-            features = self._compute_features(
-                bar,
-                session=session,
-                new_session=new_session,
-                calibrating=calibrating,
-            )
-            if self._handle_active_position(
-                bar=bar,
-                ctx=features.ctx,
-                mode=mode,
-                pip_size_value=ps,
-                new_session=new_session,
-            ):
-                continue
-            self._resolve_calibration_positions(
-                bar=bar,
-                ctx=features.ctx,
-                new_session=new_session,
-                calibrating=calibrating,
-                mode=mode,
-                pip_size_value=ps,
-            )
-            self._maybe_enter_trade(
-                bar=bar,
-                features=features,
-                mode=mode,
-                pip_size_value=ps,
-                calibrating=calibrating,
-            )
+            self._process_bar(bar, mode=mode, pip_size_value=ps, allowed_tf=allowed_tf)
+            if checkpoint is not None:
+                checkpoint.after_bar(self)
 
         self.metrics.records = list(self.records)
         if self.daily:
             self.metrics.daily = dict(self.daily)
+        if self._feature_replay is not None:
+            self._feature_replay.flush()
 
         self.metrics.runtime = self._build_runtime_snapshot()
 
@@ -1548,12 +1646,22 @@ class BacktestRunner:
                 self.metrics.daily = dict(self.daily)
         return self.metrics
 
-    def run(self, bars: List[Dict[str, Any]], mode: str = "conservative") -> Metrics:
+    def run(
+        self,
+        bars: List[Dict[str, Any]],
+        mode: str = "conservative",
+        checkpoint: Optional["RunCheckpointer"] = None,
+    ) -> Metrics:
         """Run a full batch simulation resetting runtime and learning state first.
 
         Each invocation reinstantiates the strategy so per-strategy caches and
-        pending signals are cleared before processing the provided bars.
+        pending signals are cleared before processing the provided bars. A
+        state or checkpoint loaded beforehand is re-applied after the reset.
         """
+        self._reset_for_run()
+        return self.replay(bars, mode=mode, checkpoint=checkpoint)
+
+    def _reset_for_run(self) -> None:
         self._initialise_strategy_instance()
         self._reset_runtime_state()
         self._init_ev_state()
@@ -1561,5 +1669,40 @@ class BacktestRunner:
         self._ev_profile_lookup = {}
         self._apply_ev_profile()
         self._restore_loaded_state_snapshot()
+
+    def reset(self, params: Optional[Mapping[str, Any]] = None, *, replace: bool = False) -> None:
+        """Prepare the runner for another ``replay`` without reconstructing it.
+
+        ``params`` are merged into a copy of the strategy config (``replace``
+        drops previous extra params first), so the ``RunnerConfig`` passed to
+        the constructor is never mutated. Fill engines, calibration tables and
+        the compiled EV profile are kept; a state loaded via ``load_state`` /
+        ``load_state_file`` is re-applied on every reset.
+        """
+
+        if params is not None:
+            strategy = deepcopy(self.rcfg.strategy)
+            strategy.merge(dict(params), replace=replace)
+            self.rcfg = dataclass_replace(self.rcfg, strategy=strategy)
+            self._strategy_cfg = deepcopy(strategy.as_dict())
+        self.lifecycle.rearm_loaded_state()
+        self._reset_for_run()
+
+    def replay(
+        self,
+        bars: Iterable[Dict[str, Any]],
+        mode: str = "conservative",
+        checkpoint: Optional["RunCheckpointer"] = None,
+    ) -> Metrics:
+        """Run ``bars`` from the current (freshly reset) state.
+
+        ``run`` resets and replays in one call; grid workers instead keep one
+        runner per process and call ``reset(params)`` then ``replay(bars)``.
+        """
+
         allowed_tf = self._resolve_allowed_timeframes()
-        return self.run_partial(bars, mode=mode, allowed_timeframes=allowed_tf)
+        metrics = self.run_partial(
+            bars, mode=mode, allowed_timeframes=allowed_tf, checkpoint=checkpoint
+        )
+        self.flush_feature_cache()
+        return metrics
@@ -0,0 +1,196 @@
+"""Periodic, crash-safe checkpoints for long ``BacktestRunner`` jobs.
+
+``RunCheckpointer`` is handed to ``BacktestRunner.run_partial`` and writes the
+runner state every N bars and/or N trading days. Each checkpoint bundles the
+regular ``export_state`` payload, the in-flight runtime snapshot (feature
+windows, records, strategy bookkeeping) and the byte offset of the data file
+just after the last processed bar, so a restarted job can seek straight to the
+resume point instead of re-parsing every bar from the start of the CSV.
+
+Files are written to a temporary sibling, fsynced and moved into place with
+``os.replace`` so a crash never leaves a truncated checkpoint behind.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Union
+
+if TYPE_CHECKING:
+    from core.runner import BacktestRunner
+
+
+CHECKPOINT_VERSION = 1
+# Bytes preceding the resume offset that are hashed to detect a rewritten file.
+_ANCHOR_BYTES = 512
+
+
+def write_json_atomic(path: Union[str, Path], payload: Mapping[str, Any]) -> Path:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{target.name}.", suffix=".tmp", dir=str(target.parent)
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False, separators=(",", ":"))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_name, target)
+    finally:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+    return target
+
+
+def _anchor_digest(path: Path, offset: int) -> Optional[str]:
+    start = max(0, offset - _ANCHOR_BYTES)
+    try:
+        with path.open("rb") as handle:
+            handle.seek(start)
+            chunk = handle.read(offset - start)
+    except OSError:
+        return None
+    if len(chunk) != offset - start:
+        return None
+    return hashlib.sha256(chunk).hexdigest()
+
+
+def load_checkpoint(path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """Return the checkpoint payload at ``path`` or ``None`` if unusable."""
+
+    try:
+        with Path(path).open("r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != CHECKPOINT_VERSION:
+        return None
+    return payload
+
+
+def resume_offset(payload: Mapping[str, Any], data_path: Union[str, Path]) -> int:
+    """Byte offset to resume reading ``data_path`` from (``0`` if unsafe).
+
+    The offset is only trusted when the checkpoint refers to the same file and
+    the bytes just before it are unchanged; otherwise the caller falls back to
+    reading from the start and skipping bars by timestamp.
+    """
+
+    source = payload.get("source")
+    if not isinstance(source, Mapping):
+        return 0
+    try:
+        offset = int(source.get("offset") or 0)
+    except (TypeError, ValueError):
+        return 0
+    path = Path(data_path)
+    if offset <= 0 or str(source.get("path")) != str(path.resolve()):
+        return 0
+    try:
+        if path.stat().st_size < offset:
+            return 0
+    except OSError:
+        return 0
+    if _anchor_digest(path, offset) != source.get("anchor_sha256"):
+        return 0
+    return offset
+
+
+class RunCheckpointer:
+    """Write runner checkpoints every ``every_bars`` bars / ``every_days`` days.
+
+    ``source`` is the bar iterator feeding the runner (see
+    ``scripts.run_sim.load_bars_csv``); its ``path`` and ``offset`` attributes
+    are recorded so the resume point can be located without a rescan.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        every_bars: int = 0,
+        every_days: int = 0,
+        source: Any = None,
+        meta: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.every_bars = max(0, int(every_bars or 0))
+        self.every_days = max(0, int(every_days or 0))
+        self.source = source
+        self.meta: Dict[str, Any] = dict(meta or {})
+        self.bars_since_write = 0
+        self.days_since_write = 0
+        self.bars_total = 0
+        self.writes = 0
+        self._last_date: Optional[str] = None
+
+    def after_bar(self, runner: "BacktestRunner") -> bool:
+        """Record one processed bar and write a checkpoint when due."""
+
+        self.bars_since_write += 1
+        self.bars_total += 1
+        current_date = getattr(runner, "_current_date", None)
+        if current_date is not None and current_date != self._last_date:
+            if self._last_date is not None:
+                self.days_since_write += 1
+            self._last_date = current_date
+        due = (self.every_bars and self.bars_since_write >= self.every_bars) or (
+            self.every_days and self.days_since_write >= self.every_days
+        )
+        if not due:
+            return False
+        self.write(runner)
+        return True
+
+    def _source_payload(self) -> Optional[Dict[str, Any]]:
+        if self.source is None:
+            return None
+        raw_path = getattr(self.source, "path", None)
+        offset = getattr(self.source, "offset", None)
+        if raw_path is None or offset is None:
+            return None
+        path = Path(raw_path).resolve()
+        return {
+            "path": str(path),
+            "offset": int(offset),
+            "anchor_sha256": _anchor_digest(path, int(offset)),
+        }
+
+    def write(self, runner: "BacktestRunner") -> Path:
+        payload: Dict[str, Any] = {
+            "version": CHECKPOINT_VERSION,
+            "meta": dict(self.meta),
+            "bars_processed": self.bars_total,
+            "state": runner.export_state(),
+            "runtime": runner.lifecycle.export_runtime_snapshot(),
+        }
+        source = self._source_payload()
+        if source is not None:
+            payload["source"] = source
+        write_json_atomic(self.path, payload)
+        self.bars_since_write = 0
+        self.days_since_write = 0
+        self.writes += 1
+        return self.path
+
+    def clear(self) -> None:
+        """Remove the checkpoint once the job has finished successfully."""
+
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+__all__ = [
+    "CHECKPOINT_VERSION",
+    "RunCheckpointer",
+    "load_checkpoint",
+    "resume_offset",
+    "write_json_atomic",
+]
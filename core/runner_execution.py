@@ -153,6 +153,20 @@ class RunnerExecutionManager:
 
         if sl_hit and tp_hit:
             policy = self._runner.rcfg.resolve_same_bar_policy(mode)
+            fill_engine = (
+                self._runner.fill_engine_c
+                if mode == "conservative"
+                else self._runner.fill_engine_b
+            )
+            atr_hint = getattr(self._runner, "_last_atr14", None)
+            fill_engine.record_collision(
+                side=side,
+                entry_px=entry_px,
+                tp_px=tp_px,
+                stop_px=sl_px,
+                bar=bar,
+                atr=atr_hint,
+            )
             if mode == "conservative":
                 lam = getattr(self._runner.fill_engine_c, "lam", BridgeFill.DEFAULT_LAM)
                 drift_scale = getattr(
@@ -184,6 +198,9 @@ class RunnerExecutionManager:
                 lam=float(lam),
                 drift_scale=float(drift_scale),
                 include_prob=include_prob,
+                calibration=getattr(fill_engine, "calibration", None),
+                atr=atr_hint,
+                sub_bars=getattr(fill_engine, "sub_bars", None),
             )
             exited = True
         elif sl_hit:
@@ -377,7 +394,10 @@ class RunnerExecutionManager:
             "c": bar["c"],
             "pip": pip_size_value,
             "spread": bar["spread"],
+            "timestamp": bar.get("timestamp"),
         }
+        if math.isfinite(features.atr14):
+            bar_ctx["atr"] = features.atr14
 
         current_ev_result = ev_result
         base_sizing_ctx = sizing_ctx
@@ -11,8 +11,21 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from collections.abc import MutableMapping as MutableMappingABC
+from datetime import datetime, timezone
 import math
-from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Tuple,
+)
 
 from core.feature_store import (
     atr as calc_atr,
@@ -27,6 +40,91 @@ from core.feature_store import (
 )
 from core.runner_entry import EntryContext
 
+if TYPE_CHECKING:
+    from core.feature_cache import FeatureReplay
+
+
+def parse_session_timestamp(ts: Any) -> Optional[datetime]:
+    """Parse a bar timestamp string into a timezone-aware ``datetime``."""
+    if not isinstance(ts, str):
+        return None
+    text = ts.strip()
+    if not text:
+        return None
+
+    candidates: List[str] = []
+    if text.endswith("Z"):
+        candidates.append(f"{text[:-1]}+00:00")
+    candidates.append(text)
+
+    parsed: Optional[datetime] = None
+    for candidate in candidates:
+        if "-" not in candidate and ":" not in candidate:
+            continue
+        try:
+            parsed = datetime.fromisoformat(candidate)
+        except ValueError:
+            continue
+        else:
+            break
+
+    if parsed is not None:
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed
+
+    def _collapse_offset(value: str) -> str:
+        if len(value) >= 6 and value[-3] == ":" and value[-6] in ("+", "-"):
+            return value[:-3] + value[-2:]
+        return value
+
+    fallback_candidates: List[str] = [text]
+    if text.endswith("Z"):
+        fallback_candidates.append(f"{text[:-1]}+0000")
+
+    extended_candidates = list(fallback_candidates)
+    for candidate in extended_candidates:
+        collapsed = _collapse_offset(candidate)
+        if collapsed != candidate:
+            fallback_candidates.append(collapsed)
+
+    patterns: Tuple[str, ...] = (
+        "%Y%m%dT%H%M%S.%f%z",
+        "%Y%m%dT%H%M%S%z",
+        "%Y%m%dT%H%M%S.%fZ",
+        "%Y%m%dT%H%M%SZ",
+        "%Y%m%dT%H%M%S.%f",
+        "%Y%m%dT%H%M%S",
+    )
+
+    for candidate in fallback_candidates:
+        for pattern in patterns:
+            try:
+                parsed = datetime.strptime(candidate, pattern)
+            except ValueError:
+                continue
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return parsed
+    return None
+
+
+def session_for_timestamp(parsed: Optional[datetime]) -> str:
+    """Very simple UTC-based session mapping.
+    - TOK: 00:00–07:59 (inclusive of first hour), outside LDN/NY
+    - LDN: 08:00–12:59
+    - NY : 13:00–21:59
+    else: TOK (also for unparseable timestamps)
+    """
+    if parsed is None:
+        return "TOK"
+    hour = parsed.astimezone(timezone.utc).hour
+    if 8 <= hour <= 12:
+        return "LDN"
+    if 13 <= hour <= 21:
+        return "NY"
+    return "TOK"
+
 
 @dataclass
 class RunnerContext(MutableMappingABC[str, Any]):
@@ -74,6 +172,18 @@ class RunnerContext(MutableMappingABC[str, Any]):
         return dict(self.values)
 
 
+MICRO_FEATURES: Tuple[str, ...] = ("micro_zscore", "micro_trend", "mid_price", "trend_score", "pullback")
+# Per-bar indicator values produced by ``FeaturePipeline.compute_indicators``
+# (the columns persisted by ``core.feature_cache``).
+INDICATOR_COLUMNS: Tuple[str, ...] = (
+    "atr14",
+    "adx14",
+    "or_high",
+    "or_low",
+    "realized_vol",
+) + MICRO_FEATURES
+
+
 @dataclass
 class FeatureBundle:
     bar_input: Dict[str, Any]
@@ -104,8 +214,9 @@ class FeaturePipeline:
         window: List[Dict[str, Any]],
         session_bars: List[Dict[str, Any]],
         rv_hist: MutableMapping[str, Any],
-        ctx_builder: Callable[..., Dict[str, Any]],
+        ctx_builder: Optional[Callable[..., Dict[str, Any]]],
         context_consumer: Optional[Callable[[Dict[str, Any]], None]] = None,
+        feature_cache: Optional["FeatureReplay"] = None,
     ) -> None:
         self._rcfg = rcfg
         self._window = window
@@ -113,6 +224,7 @@ class FeaturePipeline:
         self._rv_hist = rv_hist
         self._ctx_builder = ctx_builder
         self._context_consumer = context_consumer
+        self._feature_cache = feature_cache
 
     def compute(
         self,
@@ -122,13 +234,13 @@ class FeaturePipeline:
         new_session: bool,
         calibrating: bool,
     ) -> Tuple[FeatureBundle, RunnerContext]:
-        self._ingest_bar(bar, new_session=new_session)
-        realized_vol_value = self._compute_realized_vol(session)
-        atr14, adx14 = self._compute_atr_adx()
-        or_high_raw, or_low_raw = opening_range(self._session_bars, n=self._rcfg.or_n)
-        or_high = self._sanitize_optional(or_high_raw)
-        or_low = self._sanitize_optional(or_low_raw)
-        micro_features = self._compute_micro_features(bar)
+        values = self.compute_indicators(bar, session=session, new_session=new_session)
+        realized_vol_value = values["realized_vol"]
+        atr14 = values["atr14"]
+        adx14 = values["adx14"]
+        or_high = self._sanitize_optional(values["or_high"])
+        or_low = self._sanitize_optional(values["or_low"])
+        micro_features = {key: values[key] for key in MICRO_FEATURES}
 
         bar_input = self._build_bar_input(
             bar,
@@ -170,6 +282,41 @@ class FeaturePipeline:
         )
         return feature_bundle, runner_ctx
 
+    def compute_indicators(
+        self,
+        bar: Mapping[str, Any],
+        *,
+        session: str,
+        new_session: bool,
+    ) -> Dict[str, float]:
+        """Ingest ``bar`` and return its ``INDICATOR_COLUMNS`` values.
+
+        With a feature cache attached, rows recorded by an earlier pass over
+        the same bar stream are replayed instead of recomputed; the rolling
+        windows are still updated so a cache miss can resume computing.
+        """
+
+        self._ingest_bar(bar, new_session=new_session)
+        ts = bar.get("timestamp")
+        cached = self._feature_cache.lookup(ts, bar) if self._feature_cache is not None else None
+        if cached is not None:
+            self._append_rv_hist(session, cached["realized_vol"])
+            return cached
+        rv_value = self._compute_realized_vol(session)
+        atr14, adx14 = self._compute_atr_adx()
+        or_high, or_low = opening_range(self._session_bars, n=self._rcfg.or_n)
+        values = {
+            "atr14": atr14,
+            "adx14": adx14,
+            "or_high": or_high,
+            "or_low": or_low,
+            "realized_vol": rv_value,
+        }
+        values.update(self._compute_micro_features(bar))
+        if self._feature_cache is not None:
+            self._feature_cache.record(ts, values, bar)
+        return values
+
     def _ingest_bar(self, bar: Mapping[str, Any], *, new_session: bool) -> None:
         self._window.append({key: bar[key] for key in ("o", "h", "l", "c")})
         if len(self._window) > self.WINDOW_LIMIT:
@@ -190,11 +337,14 @@ class FeaturePipeline:
             rv_computed = None
         if rv_computed is not None:
             rv_value = self._sanitize(rv_computed)
+        self._append_rv_hist(session, rv_value)
+        return 0.0 if math.isnan(rv_value) else rv_value
+
+    def _append_rv_hist(self, session: str, rv_value: float) -> None:
         try:
             self._rv_hist[session].append(rv_value)
         except Exception:
             pass
-        return 0.0 if math.isnan(rv_value) else rv_value
 
     def _compute_atr_adx(self) -> Tuple[float, float]:
         if len(self._window) >= 15:
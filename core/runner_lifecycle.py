@@ -11,6 +11,7 @@ from core.runner_state import (
     deserialize_position_state,
     serialize_position_state,
 )
+from core.state_snapshots import load_snapshot
 
 if TYPE_CHECKING:
     from core.runner import BacktestRunner
@@ -26,6 +27,7 @@ class RunnerLifecycleManager:
         self._resume_cutoff_dt: Optional[datetime] = None
         self._resume_skipped_bars: int = 0
         self._pending_state_warnings: list[str] = []
+        self._loaded_runtime_snapshot: Optional[Dict[str, Any]] = None
 
     # ----- Initialisation helpers -------------------------------------------------
     def init_ev_state(self) -> None:
@@ -55,6 +57,8 @@ class RunnerLifecycleManager:
         runner.records = []
         runner.window = []
         runner.session_bars = []
+        runner._feature_replay = None
+        runner._feature_replay_ready = False
         runner.debug_counts = {key: 0 for key in runner.DEBUG_COUNT_KEYS}
         runner.debug_records = []
         runner.daily = {}
@@ -73,6 +77,7 @@ class RunnerLifecycleManager:
         runner._current_date = None
         runner._day_count = 0
         runner._last_timestamp = None
+        runner._last_atr14 = None
         runner._loss_streak = 0
         runner._daily_loss_pips = 0.0
         runner._daily_trade_count = 0
@@ -182,6 +187,8 @@ class RunnerLifecycleManager:
             metrics._equity_seed = (seed_ts, seed_equity)
         elif equity_seed is None:
             metrics._equity_seed = None
+        stream_payload = payload.get("stream")
+        metrics.restore_stream_state(stream_payload if isinstance(stream_payload, Mapping) else None)
 
         runtime_payload = payload.get("runtime")
         if isinstance(runtime_payload, Mapping):
@@ -274,6 +281,7 @@ class RunnerLifecycleManager:
         }
         if runner.metrics._equity_seed is not None:
             metrics_state["equity_seed"] = list(runner.metrics._equity_seed)
+        metrics_state["stream"] = runner.metrics.stream_state()
         if runner.metrics.runtime:
             runtime_snapshot = dict(runner.metrics.runtime)
             if self._resume_skipped_bars:
@@ -450,7 +458,104 @@ class RunnerLifecycleManager:
 
         return True
 
+    def export_runtime_snapshot(self) -> Dict[str, Any]:
+        """Capture the in-flight state that ``export_state`` leaves out.
+
+        ``export_state`` only carries learning state between runs. A mid-run
+        checkpoint additionally needs the feature windows, trade records and
+        strategy bookkeeping so that a resumed job reproduces the
+        uninterrupted result.
+        """
+
+        runner = self._runner
+        strategy_state = getattr(getattr(runner, "stg", None), "state", None)
+        return {
+            "starting_equity": runner.metrics.starting_equity,
+            "window": [dict(bar) for bar in runner.window],
+            "session_bars": [dict(bar) for bar in runner.session_bars],
+            "rv_hist": {
+                session: list(values) for session, values in runner.rv_hist.items()
+            },
+            "records": [dict(record) for record in runner.records],
+            "debug_counts": dict(runner.debug_counts),
+            "debug_records": [dict(record) for record in runner.debug_records],
+            "last_day": runner._last_day,
+            "last_atr14": runner._last_atr14,
+            "loss_streak": runner._loss_streak,
+            "daily_loss_pips": runner._daily_loss_pips,
+            "daily_trade_count": runner._daily_trade_count,
+            "daily_pnl_pips": runner._daily_pnl_pips,
+            "strategy_state": (
+                copy.deepcopy(dict(strategy_state))
+                if isinstance(strategy_state, Mapping)
+                else None
+            ),
+        }
+
+    def apply_runtime_snapshot(self, snapshot: Mapping[str, Any]) -> None:
+        runner = self._runner
+        try:
+            runner.metrics.starting_equity = float(
+                snapshot.get("starting_equity", runner.metrics.starting_equity)
+            )
+        except (TypeError, ValueError):
+            pass
+        runner.window = [dict(bar) for bar in snapshot.get("window", []) or []]
+        runner.session_bars = [
+            dict(bar) for bar in snapshot.get("session_bars", []) or []
+        ]
+        rv_payload = snapshot.get("rv_hist")
+        if isinstance(rv_payload, Mapping):
+            for session, values in rv_payload.items():
+                window = runner._build_rv_window()
+                window.extend(values or [])
+                runner.rv_hist[session] = window
+        runner.records = [dict(record) for record in snapshot.get("records", []) or []]
+        debug_counts = snapshot.get("debug_counts")
+        if isinstance(debug_counts, Mapping):
+            runner.debug_counts.update(debug_counts)
+        runner.debug_records = [
+            dict(record) for record in snapshot.get("debug_records", []) or []
+        ]
+        runner._last_day = snapshot.get("last_day", runner._last_day)
+        runner._last_atr14 = snapshot.get("last_atr14", runner._last_atr14)
+        try:
+            runner._loss_streak = int(snapshot.get("loss_streak", runner._loss_streak))
+            runner._daily_loss_pips = float(
+                snapshot.get("daily_loss_pips", runner._daily_loss_pips)
+            )
+            runner._daily_trade_count = int(
+                snapshot.get("daily_trade_count", runner._daily_trade_count)
+            )
+            runner._daily_pnl_pips = float(
+                snapshot.get("daily_pnl_pips", runner._daily_pnl_pips)
+            )
+        except (TypeError, ValueError):
+            pass
+        strategy_state = snapshot.get("strategy_state")
+        stg = getattr(runner, "stg", None)
+        if isinstance(strategy_state, Mapping) and isinstance(
+            getattr(stg, "state", None), dict
+        ):
+            stg.state.update(copy.deepcopy(dict(strategy_state)))
+
+    def load_checkpoint(self, payload: Mapping[str, Any]) -> bool:
+        """Load a mid-run checkpoint written by ``core.runner_checkpoint``."""
+
+        state = payload.get("state")
+        if not isinstance(state, Mapping) or not self.load_state(dict(state)):
+            self._loaded_runtime_snapshot = None
+            return False
+        runtime = payload.get("runtime")
+        if isinstance(runtime, Mapping):
+            self._loaded_runtime_snapshot = copy.deepcopy(dict(runtime))
+            self.apply_runtime_snapshot(self._loaded_runtime_snapshot)
+        else:
+            self._loaded_runtime_snapshot = None
+        return True
+
     def load_state(self, state: Dict[str, Any]) -> bool:
+        self._loaded_runtime_snapshot = None
         applied = self.apply_state_dict(state)
         if not applied:
             self._loaded_state_snapshot = None
@@ -475,12 +580,20 @@ class RunnerLifecycleManager:
             self._restore_loaded_state = False
             return
         self.apply_state_dict(self._loaded_state_snapshot)
+        if self._loaded_runtime_snapshot is not None:
+            self.apply_runtime_snapshot(self._loaded_runtime_snapshot)
+            self._loaded_runtime_snapshot = None
         self._restore_loaded_state = False
 
+    def rearm_loaded_state(self) -> None:
+        """Re-apply the last loaded state on the next restore (prepared runners)."""
+
+        self._restore_loaded_state = bool(self._loaded_state_snapshot)
+
     def load_state_file(self, path: str) -> bool:
+        # Archive snapshots may be delta-encoded (see core.state_snapshots).
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = load_snapshot(path)
         except Exception:
             return False
         return self.load_state(data)
@@ -0,0 +1,155 @@
+"""Constant-memory accumulators backing ``core.runner.Metrics``.
+
+``RunningStats`` keeps Welford's running mean/variance of trade returns and
+``DrawdownTracker`` the running equity peak and worst drawdown, so Sharpe and
+max drawdown no longer need the full ``trade_returns``/``equity_curve``
+history. ``EquityCurveSampler`` bounds the stored equity curve to a fixed
+number of points by keeping every ``stride``-th point (doubling the stride
+whenever the budget is exceeded) plus the latest point.
+
+All three serialise to small dicts so runner state/checkpoints carry the
+exact statistics even when the curve itself is downsampled.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Iterable, List, Mapping, Optional, Tuple
+
+
+@dataclass
+class RunningStats:
+    """Welford mean/variance (population) over a stream of values."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def push(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    def sharpe(self) -> Optional[float]:
+        """Per-trade mean / std scaled by ``sqrt(n)`` (matches the legacy formula)."""
+
+        if not self.count:
+            return None
+        if self.count < 2:
+            return 0.0
+        std_dev = math.sqrt(self.variance)
+        if std_dev == 0.0:
+            return 0.0
+        return self.mean / std_dev * math.sqrt(float(self.count))
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> "RunningStats":
+        stats = cls()
+        for value in values:
+            stats.push(float(value))
+        return stats
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any]) -> "RunningStats":
+        return cls(int(payload["count"]), float(payload["mean"]), float(payload["m2"]))
+
+
+@dataclass
+class DrawdownTracker:
+    """Running peak and most negative ``equity - peak`` over equity points."""
+
+    peak: Optional[float] = None
+    max_drawdown: float = 0.0
+
+    def push(self, equity: float) -> None:
+        if self.peak is None or equity > self.peak:
+            self.peak = equity
+        drawdown = equity - self.peak
+        if drawdown < self.max_drawdown:
+            self.max_drawdown = drawdown
+
+    @property
+    def started(self) -> bool:
+        return self.peak is not None
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> "DrawdownTracker":
+        tracker = cls()
+        for value in values:
+            tracker.push(float(value))
+        return tracker
+
+    def to_dict(self) -> dict:
+        return {"peak": self.peak, "max_drawdown": self.max_drawdown}
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any]) -> "DrawdownTracker":
+        peak = payload.get("peak")
+        return cls(None if peak is None else float(peak), float(payload.get("max_drawdown", 0.0)))
+
+
+@dataclass
+class EquityCurveSampler:
+    """Keep an equity curve list within ``max_points`` (``None``: keep all).
+
+    ``index`` holds the stream position of each stored point. Every point on
+    the ``stride`` grid is kept; the latest point is always stored last and is
+    replaced by its successor when it is not on the grid.
+    """
+
+    max_points: Optional[int] = None
+    stride: int = 1
+    seen: int = 0
+    index: List[int] = field(default_factory=list)
+
+    def sync(self, curve: List[Tuple[str, float]]) -> None:
+        # Curves assigned from outside (legacy state, tests) have no index yet.
+        if len(self.index) != len(curve):
+            self.index = list(range(len(curve)))
+            self.seen = len(curve)
+            self.stride = 1
+
+    def append(self, curve: List[Tuple[str, float]], point: Tuple[str, float]) -> None:
+        self.sync(curve)
+        position = self.seen
+        self.seen += 1
+        if self.index and self.index[-1] % self.stride != 0:
+            curve[-1] = point
+            self.index[-1] = position
+        else:
+            curve.append(point)
+            self.index.append(position)
+        if self.max_points is not None and len(curve) > max(self.max_points, 2):
+            self._decimate(curve)
+
+    def _decimate(self, curve: List[Tuple[str, float]]) -> None:
+        self.stride *= 2
+        keep = [i for i, position in enumerate(self.index) if position % self.stride == 0]
+        if keep[-1] != len(curve) - 1:
+            keep.append(len(curve) - 1)
+        curve[:] = [curve[i] for i in keep]
+        self.index = [self.index[i] for i in keep]
+
+    def to_dict(self) -> dict:
+        return {"stride": self.stride, "seen": self.seen, "index": list(self.index)}
+
+    def restore(self, payload: Optional[Mapping[str, Any]], curve: List[Tuple[str, float]]) -> None:
+        index = list(payload.get("index") or []) if payload else []
+        if payload and len(index) == len(curve):
+            self.stride = max(int(payload.get("stride", 1)), 1)
+            self.seen = int(payload.get("seen", len(curve)))
+            self.index = [int(position) for position in index]
+        else:
+            self.index = []
+            self.sync(curve)
+
+
+__all__ = ["DrawdownTracker", "EquityCurveSampler", "RunningStats"]
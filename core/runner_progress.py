@@ -0,0 +1,198 @@
+"""Chunked ``BacktestRunner`` execution with per-period progress reports.
+
+``run_in_chunks`` drives the runner through ``run_partial`` one calendar
+period (month / quarter / year) at a time and hands a partial summary to a
+callback after every chunk. Parameter sweeps use these intermediate metrics to
+stop clearly bad trials early (see ``scripts._sweep_pruning``); the final
+metrics are identical to a single ``BacktestRunner.run`` call.
+
+``partial_summary`` mirrors the metric keys produced by the sweep's
+``_compute_summary`` without requiring pandas, so constraints and scoring
+terms written against ``metrics.*`` can be evaluated on partial runs.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:
+    from core.runner import BacktestRunner, Metrics
+    from core.runner_checkpoint import RunCheckpointer
+
+
+PROGRESS_PERIODS = ("month", "quarter", "year")
+
+
+def period_key(timestamp: Any, period: str) -> str:
+    """Return the calendar bucket (``2024``, ``2024Q1``, ``2024-01``) of a bar."""
+
+    text = timestamp.isoformat() if isinstance(timestamp, datetime) else str(timestamp)
+    year = text[:4]
+    if period == "year":
+        return year
+    month = text[5:7]
+    if period == "month":
+        return f"{year}-{month}"
+    if period == "quarter":
+        return f"{year}Q{(int(month) - 1) // 3 + 1}"
+    raise ValueError(f"unsupported progress period '{period}'")
+
+
+def iter_period_chunks(
+    bars: Iterable[Dict[str, Any]], period: str
+) -> Iterator[Tuple[str, Iterator[Dict[str, Any]]]]:
+    """Split ``bars`` into consecutive per-period sub-iterators.
+
+    The chunks stream from the underlying iterator, so each one must be
+    exhausted before the next is requested (``run_partial`` always does).
+    """
+
+    iterator = iter(bars)
+    pending: List[Optional[Dict[str, Any]]] = [next(iterator, None)]
+
+    def _chunk(key: str) -> Iterator[Dict[str, Any]]:
+        while pending[0] is not None and period_key(pending[0].get("timestamp"), period) == key:
+            yield pending[0]
+            pending[0] = next(iterator, None)
+
+    while pending[0] is not None:
+        key = period_key(pending[0].get("timestamp"), period)
+        yield key, _chunk(key)
+
+
+def partial_summary(metrics: "Metrics", daily: Mapping[str, Mapping[str, Any]]) -> Dict[str, Any]:
+    """Summary metrics for the bars processed so far (pandas-free)."""
+
+    trades = int(metrics.trades or 0)
+    wins = int(metrics.wins or 0)
+    total_pips = float(metrics.total_pips or 0.0)
+    dates = sorted(daily)
+    pnl = [float(daily[day].get("pnl_pips", 0.0) or 0.0) for day in dates]
+    sharpe = 0.0
+    max_drawdown = 0.0
+    gains = sum(value for value in pnl if value > 0)
+    losses = sum(value for value in pnl if value < 0)
+    if pnl:
+        mean = sum(pnl) / len(pnl)
+        std = math.sqrt(sum((value - mean) ** 2 for value in pnl) / len(pnl))
+        sharpe = mean / std if std else 0.0
+        cumulative = 0.0
+        peak = 0.0
+        for index, value in enumerate(pnl):
+            cumulative += value
+            peak = cumulative if index == 0 else max(peak, cumulative)
+            max_drawdown = min(max_drawdown, cumulative - peak)
+    months = {day[:7] for day in dates}
+    fills = sum(float(daily[day].get("fills", 0) or 0) for day in dates)
+    return {
+        "trades": trades,
+        "wins": wins,
+        "losses": max(trades - wins, 0),
+        "total_pips": total_pips,
+        "win_rate": (wins / trades) if trades else 0.0,
+        "pips_per_trade": (total_pips / trades) if trades else 0.0,
+        "sharpe": sharpe,
+        "max_drawdown": max_drawdown,
+        "profit_factor": (gains / abs(losses)) if gains and losses else 0.0,
+        "trades_per_month": (fills / len(months)) if months else 0.0,
+    }
+
+
+class ProgressLog:
+    """Append one JSON line per finished chunk, flushed for live readers."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text("", encoding="utf-8")
+
+    def __call__(self, record: Mapping[str, Any]) -> None:
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+            handle.flush()
+
+
+def run_in_chunks(
+    runner: "BacktestRunner",
+    bars: Iterable[Dict[str, Any]],
+    *,
+    mode: str = "conservative",
+    period: str = "quarter",
+    on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None,
+    checkpoint: Optional["RunCheckpointer"] = None,
+) -> "Metrics":
+    """Equivalent of ``runner.run`` that reports after every calendar period.
+
+    The first chunk goes through ``run`` (which resets runtime state and
+    re-applies any loaded state) and later chunks through ``run_partial``.
+    ``on_chunk`` receives ``{"step", "period", "bars", "metrics"}`` where
+    ``metrics`` is :func:`partial_summary` of everything processed so far.
+    """
+
+    if period not in PROGRESS_PERIODS:
+        raise ValueError(f"unsupported progress period '{period}'")
+    metrics: Optional["Metrics"] = None
+    bars_total = 0
+    step = 0
+    for key, chunk in iter_period_chunks(bars, period):
+        counted = _CountingIterator(chunk)
+        if metrics is None:
+            metrics = runner.run(counted, mode=mode, checkpoint=checkpoint)
+        else:
+            metrics = runner.run_partial(counted, mode=mode, checkpoint=checkpoint)
+        step += 1
+        bars_total += counted.count
+        if on_chunk is not None:
+            on_chunk(
+                {
+                    "step": step,
+                    "period": key,
+                    "bars": bars_total,
+                    "metrics": partial_summary(runner.metrics, runner.daily),
+                }
+            )
+    if metrics is None:
+        metrics = runner.run([], mode=mode, checkpoint=checkpoint)
+    return metrics
+
+
+class _CountingIterator:
+    """Iterator wrapper that counts the bars it yields."""
+
+    def __init__(self, source: Iterator[Dict[str, Any]]) -> None:
+        self._source = source
+        self.count = 0
+
+    def __iter__(self) -> "_CountingIterator":
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        bar = next(self._source)
+        self.count += 1
+        return bar
+
+
+__all__ = [
+    "PROGRESS_PERIODS",
+    "ProgressLog",
+    "iter_period_chunks",
+    "partial_summary",
+    "period_key",
+    "run_in_chunks",
+]
@@ -0,0 +1,277 @@
+"""Compact, delta-encoded runner state snapshots for the EV state archive.
+
+Each archive leaf (``ops/state_archive/<strategy>/<symbol>/<mode>/``) holds a
+timestamp-ordered sequence of snapshots:
+
+* keyframes – the full ``export_state()`` payload as minified JSON
+  (``<name>.json``), readable by anything that understands the legacy files;
+* deltas – a gzip-compressed JSON patch against the previous snapshot
+  (``<name>.delta.gz``) carrying ``base`` (previous file name) and ``chain``
+  (number of deltas since the keyframe).
+
+A keyframe is written every ``keyframe_every`` snapshots, whenever the
+previous snapshot cannot be loaded, or when the patch would not be smaller
+than the state itself. ``load_snapshot`` rebuilds any snapshot by replaying
+the chain from its keyframe; ``prune_snapshots`` keeps the chains that the
+retained snapshots depend on.
+
+Patches are nested dicts: ``s`` (keys to set), ``d`` (keys to delete),
+``a`` (list tails to append, e.g. ``trade_returns``) and ``p`` (child
+patches). Lists are otherwise replaced as a whole.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+DELTA_SUFFIX = ".delta.gz"
+DELTA_FORMAT = "state-delta/1"
+DEFAULT_KEYFRAME_EVERY = 10
+
+# Non-state JSON files that share archive leaves with the snapshots.
+_IGNORED_SUFFIXES = ("_diff.json",)
+
+
+def diff_state(previous: Mapping[str, Any], current: Mapping[str, Any]) -> Dict[str, Any]:
+    """Return the patch turning ``previous`` into ``current`` (``{}`` if equal)."""
+
+    patch: Dict[str, Any] = {}
+    removed = [key for key in previous if key not in current]
+    if removed:
+        patch["d"] = removed
+    for key, value in current.items():
+        if key not in previous:
+            patch.setdefault("s", {})[key] = value
+            continue
+        old = previous[key]
+        if old == value:
+            continue
+        if isinstance(old, dict) and isinstance(value, dict):
+            child = diff_state(old, value)
+            if child:
+                patch.setdefault("p", {})[key] = child
+        elif (
+            isinstance(old, list)
+            and isinstance(value, list)
+            and old
+            and len(value) > len(old)
+            and value[: len(old)] == old
+        ):
+            patch.setdefault("a", {})[key] = value[len(old):]
+        else:
+            patch.setdefault("s", {})[key] = value
+    return patch
+
+
+def apply_patch(base: Mapping[str, Any], patch: Mapping[str, Any]) -> Dict[str, Any]:
+    """Return a new dict with ``patch`` (from :func:`diff_state`) applied to ``base``."""
+
+    result = dict(base)
+    for key in patch.get("d", ()):
+        result.pop(key, None)
+    for key, value in (patch.get("s") or {}).items():
+        result[key] = value
+    for key, tail in (patch.get("a") or {}).items():
+        result[key] = list(result.get(key) or []) + list(tail)
+    for key, child in (patch.get("p") or {}).items():
+        current = result.get(key)
+        result[key] = apply_patch(current if isinstance(current, dict) else {}, child)
+    return result
+
+
+def is_snapshot_file(path: Path) -> bool:
+    name = path.name
+    if name.endswith(DELTA_SUFFIX):
+        return True
+    return name.endswith(".json") and not name.endswith(_IGNORED_SUFFIXES)
+
+
+def is_delta_file(path: Path) -> bool:
+    return path.name.endswith(DELTA_SUFFIX)
+
+
+def snapshot_stem(path: Path) -> str:
+    name = path.name
+    if name.endswith(DELTA_SUFFIX):
+        return name[: -len(DELTA_SUFFIX)]
+    return name[: -len(".json")] if name.endswith(".json") else path.stem
+
+
+def list_snapshots(archive_dir: Path) -> List[Path]:
+    """Snapshot files (keyframes and deltas) in ``archive_dir`` ordered by name."""
+
+    archive_dir = Path(archive_dir)
+    if not archive_dir.is_dir():
+        return []
+    files = [p for p in archive_dir.iterdir() if p.is_file() and is_snapshot_file(p)]
+    return sorted(files, key=lambda p: (snapshot_stem(p), p.name))
+
+
+def latest_snapshot(archive_dir: Path) -> Optional[Path]:
+    files = list_snapshots(archive_dir)
+    return files[-1] if files else None
+
+
+def _read_delta(path: Path) -> Dict[str, Any]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        payload = json.load(f)
+    if not isinstance(payload, dict) or payload.get("format") != DELTA_FORMAT:
+        raise ValueError(f"not a state delta: {path}")
+    return payload
+
+
+def load_snapshot(path: Path, cache: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Load the full state stored at ``path`` (a keyframe or a delta).
+
+    ``cache`` (keyed by file path) lets callers loading many snapshots of the
+    same leaf replay each chain only once.
+    """
+
+    path = Path(path)
+    chain: List[Dict[str, Any]] = []
+    current = path
+    state: Optional[Dict[str, Any]] = None
+    while True:
+        if cache is not None and str(current) in cache:
+            state = cache[str(current)]
+            break
+        if not is_delta_file(current):
+            with current.open("r", encoding="utf-8") as f:
+                state = json.load(f)
+            if cache is not None:
+                cache[str(current)] = state
+            break
+        delta = _read_delta(current)
+        chain.append({"path": current, "patch": delta.get("patch") or {}})
+        current = current.parent / str(delta["base"])
+    for item in reversed(chain):
+        state = apply_patch(state, item["patch"])
+        if cache is not None:
+            cache[str(item["path"])] = state
+    return state
+
+
+def chain_length(path: Path) -> int:
+    return int(_read_delta(path).get("chain", 0)) if is_delta_file(path) else 0
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    # A snapshot rewritten under the same name must not leave the other kind behind.
+    if is_delta_file(path):
+        stale = path.with_name(snapshot_stem(path) + ".json")
+    else:
+        stale = path.with_name(snapshot_stem(path) + DELTA_SUFFIX)
+    if stale.exists():
+        stale.unlink()
+
+
+def _dumps(payload: Any) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_snapshot(
+    archive_dir: Path,
+    name: str,
+    state: Mapping[str, Any],
+    *,
+    keyframe_every: int = DEFAULT_KEYFRAME_EVERY,
+    encoded: Optional[bytes] = None,
+) -> Path:
+    """Append ``state`` to the archive as ``<name>.json`` or ``<name>.delta.gz``.
+
+    ``keyframe_every <= 1`` always writes keyframes. ``encoded`` may pass the
+    minified UTF-8 JSON of ``state`` when the caller already serialized it.
+    """
+
+    archive_dir = Path(archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    full = encoded if encoded is not None else _dumps(state)
+    previous = latest_snapshot(archive_dir)
+    if previous is not None and snapshot_stem(previous) != name and keyframe_every > 1:
+        try:
+            chain = chain_length(previous) + 1
+            base_state = load_snapshot(previous) if chain < keyframe_every else None
+        except (OSError, ValueError, KeyError):
+            base_state = None
+        if isinstance(base_state, dict):
+            payload = {
+                "format": DELTA_FORMAT,
+                "base": previous.name,
+                "chain": chain,
+                "patch": diff_state(base_state, state),
+            }
+            encoded = gzip.compress(_dumps(payload), mtime=0)
+            if len(encoded) < len(full):
+                path = archive_dir / f"{name}{DELTA_SUFFIX}"
+                _atomic_write(path, encoded)
+                return path
+    path = archive_dir / f"{name}.json"
+    _atomic_write(path, full)
+    return path
+
+
+def _dependencies(path: Path) -> Iterable[Path]:
+    current = path
+    while is_delta_file(current):
+        yield current
+        try:
+            current = current.parent / str(_read_delta(current)["base"])
+        except (OSError, ValueError, KeyError):
+            return
+    yield current
+
+
+def prune_snapshots(
+    archive_dir: Path,
+    keep: int,
+    *,
+    stem_suffix: Optional[str] = None,
+    dry_run: bool = False,
+) -> List[Path]:
+    """Remove all but the latest ``keep`` snapshots, preserving their base chains.
+
+    ``stem_suffix`` limits pruning to snapshots whose name ends with it (e.g.
+    ``"_state"`` for update_state exports); other snapshots in the leaf are
+    kept, and so are the chains they depend on.
+    """
+
+    files = list_snapshots(archive_dir)
+    candidates = [p for p in files if stem_suffix is None or snapshot_stem(p).endswith(stem_suffix)]
+    if keep <= 0 or len(candidates) <= keep:
+        return []
+    dropped = candidates[:-keep]
+    dropped_names = {str(p) for p in dropped}
+    needed = set()
+    for path in files:
+        if str(path) not in dropped_names:
+            needed.update(str(p) for p in _dependencies(path))
+    removed = [p for p in dropped if str(p) not in needed]
+    if not dry_run:
+        for path in removed:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+    return removed
+
+
+__all__ = [
+    "DEFAULT_KEYFRAME_EVERY",
+    "DELTA_SUFFIX",
+    "apply_patch",
+    "diff_state",
+    "is_snapshot_file",
+    "latest_snapshot",
+    "list_snapshots",
+    "load_snapshot",
+    "prune_snapshots",
+    "snapshot_stem",
+    "write_snapshot",
+]
@@ -0,0 +1,350 @@
+"""Lazy 1m/tick replay used to resolve same-bar TP/SL collisions exactly.
+
+``_BaseFill`` only sees the 5m OHLC bar, so when both TP and SL fall inside
+the bar range it has to fall back on a ``SameBarPolicy``. When finer data is
+available (for example 1m bars or ticks exported via
+``scripts/dukascopy_fetch.py``) ``SubBarReplay`` looks up the sub-bars that
+belong to the colliding parent bar and walks them in time order to find which
+level printed first. Ticks give an exact order; a 1m OHLC row only tells
+which levels its range reached, so a single row that spans both exits is left
+to the ``SameBarPolicy``/calibration fallback instead of guessing a path.
+
+Collisions are rare, so nothing is loaded up front: the CSV is memory-mapped
+on first use and the rows of a parent bar are located by bisecting the
+(time-sorted) file on its timestamp column. Parsed parent buckets are kept in
+a small LRU so repeated lookups for the same bar are free.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+
+@dataclass(frozen=True)
+class SubBarResolution:
+    exit_px: float
+    exit_reason: str
+    sub_bar_ts: str
+
+
+@dataclass(frozen=True)
+class _SubBarRow:
+    """(bid, ask) price points visited inside one sub-bar.
+
+    Tick rows carry a single ordered point. OHLC rows carry their (low, high)
+    range with ``ordered=False``: the bar says which prices printed, not in
+    which order.
+    """
+
+    ts: str
+    points: Tuple[Tuple[float, float], ...]
+    ordered: bool = True
+
+
+def _parse_epoch(text: str) -> Optional[float]:
+    value = text.strip().strip('"')
+    if not value:
+        return None
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    value = value.replace(" ", "T", 1)
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class SubBarReplay:
+    """Resolve same-bar collisions from a time-sorted 1m or tick CSV.
+
+    Supported layouts (header required, timestamp in the first column):
+
+    * bars: ``timestamp,...,o,h,l,c`` (aliases ``open/high/low/close``)
+    * ticks: ``timestamp,bid,ask`` or ``timestamp,price``
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        parent_minutes: int = 5,
+        cache_size: int = 256,
+    ) -> None:
+        self.path = Path(path)
+        self.parent_seconds = max(1, int(parent_minutes)) * 60
+        self.cache_size = max(1, int(cache_size))
+        self._handle = None
+        self._mm: Optional[mmap.mmap] = None
+        self._data_start = 0
+        self._columns: Dict[str, int] = {}
+        self._cache: "OrderedDict[int, List[_SubBarRow]]" = OrderedDict()
+        self.lookups = 0
+        self.resolved = 0
+        self.buckets_loaded = 0
+
+    # ----- File access ------------------------------------------------------------
+    def _ensure_open(self) -> Optional[mmap.mmap]:
+        if self._mm is not None:
+            return self._mm
+        if not self.path.exists() or os.path.getsize(self.path) == 0:
+            return None
+        self._handle = self.path.open("rb")
+        self._mm = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        header_end = self._mm.find(b"\n")
+        if header_end < 0:
+            header_end = len(self._mm)
+        header = self._mm[:header_end].decode("utf-8").strip().lstrip("\ufeff")
+        self._columns = {
+            name.strip().lower(): idx for idx, name in enumerate(header.split(","))
+        }
+        self._data_start = min(len(self._mm), header_end + 1)
+        return self._mm
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        self._cache.clear()
+
+    def __del__(self) -> None:  # pragma: no cover - best effort cleanup
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _line_end(self, mm: mmap.mmap, start: int) -> int:
+        end = mm.find(b"\n", start)
+        return len(mm) if end < 0 else end
+
+    def _line_epoch(self, mm: mmap.mmap, start: int) -> Optional[float]:
+        end = self._line_end(mm, start)
+        comma = mm.find(b",", start, end)
+        field_end = end if comma < 0 else comma
+        return _parse_epoch(mm[start:field_end].decode("utf-8", "replace"))
+
+    def _seek_first_at_or_after(self, mm: mmap.mmap, target: float) -> int:
+        lo, hi = self._data_start, len(mm)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = mm.rfind(b"\n", self._data_start, mid) + 1
+            start = max(start, self._data_start)
+            epoch = self._line_epoch(mm, start)
+            if epoch is not None and epoch < target:
+                lo = self._line_end(mm, start) + 1
+            else:
+                hi = start
+        return lo
+
+    def _iter_lines(self, mm: mmap.mmap, start: int) -> Iterator[Tuple[float, List[str]]]:
+        pos = start
+        size = len(mm)
+        while pos < size:
+            end = self._line_end(mm, pos)
+            text = mm[pos:end].decode("utf-8", "replace").strip()
+            pos = end + 1
+            if not text:
+                continue
+            fields = text.split(",")
+            epoch = _parse_epoch(fields[0])
+            if epoch is None:
+                continue
+            yield epoch, fields
+
+    # ----- Parsing ----------------------------------------------------------------
+    def _column(self, *names: str) -> Optional[int]:
+        for name in names:
+            idx = self._columns.get(name)
+            if idx is not None:
+                return idx
+        return None
+
+    def _row_points(
+        self, fields: Sequence[str]
+    ) -> Tuple[Tuple[Tuple[float, float], ...], bool]:
+        def _value(idx: Optional[int]) -> Optional[float]:
+            if idx is None or idx >= len(fields):
+                return None
+            try:
+                return float(fields[idx])
+            except ValueError:
+                return None
+
+        bid = _value(self._column("bid"))
+        ask = _value(self._column("ask"))
+        if bid is not None or ask is not None:
+            bid_px = bid if bid is not None else ask
+            ask_px = ask if ask is not None else bid
+            return ((bid_px, ask_px),), True  # type: ignore[return-value]
+        price = _value(self._column("price", "mid", "last"))
+        if price is not None:
+            return ((price, price),), True
+        h = _value(self._column("h", "high"))
+        low = _value(self._column("l", "low"))
+        if h is None or low is None:
+            return (), True
+        return ((low, low), (h, h)), False
+
+    def _parent_key(self, parent_ts: Union[str, datetime]) -> Optional[int]:
+        if isinstance(parent_ts, datetime):
+            dt = parent_ts if parent_ts.tzinfo else parent_ts.replace(tzinfo=timezone.utc)
+            epoch: Optional[float] = dt.timestamp()
+        else:
+            epoch = _parse_epoch(str(parent_ts))
+        if epoch is None:
+            return None
+        return int(epoch) - int(epoch) % self.parent_seconds
+
+    def rows_for(self, parent_ts: Union[str, datetime]) -> List[_SubBarRow]:
+        """Return the parsed sub-bars that belong to ``parent_ts``."""
+
+        key = self._parent_key(parent_ts)
+        if key is None:
+            return []
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+        mm = self._ensure_open()
+        if mm is None:
+            return []
+        rows: List[_SubBarRow] = []
+        end_epoch = key + self.parent_seconds
+        start = self._seek_first_at_or_after(mm, float(key))
+        for epoch, fields in self._iter_lines(mm, start):
+            if epoch >= end_epoch:
+                break
+            points, ordered = self._row_points(fields)
+            if points:
+                rows.append(_SubBarRow(ts=fields[0].strip(), points=points, ordered=ordered))
+        self.buckets_loaded += 1
+        self._cache[key] = rows
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return rows
+
+    # ----- Resolution -------------------------------------------------------------
+    def resolve(
+        self,
+        *,
+        parent_ts: Union[str, datetime, None],
+        side: str,
+        entry_px: float,
+        tp_px: float,
+        stop_px: float,
+        stop_reason: str = "sl",
+        require_entry_touch: bool = False,
+    ) -> Optional[SubBarResolution]:
+        """Walk the parent bar's sub-bars and report which exit printed first.
+
+        Exits are evaluated on the side of the book that closes the trade
+        (bid for longs, ask for shorts). ``None`` is returned when no finer
+        data covers the bar or when a single sub-bar still spans both levels;
+        for OHLC rows the latter also covers a row that triggers a stop entry
+        and reaches the stop level, since the row does not say which came
+        first.
+        """
+
+        if parent_ts is None:
+            return None
+        self.lookups += 1
+        rows = self.rows_for(parent_ts)
+        if not rows:
+            return None
+        is_buy = str(side).upper() == "BUY"
+        live = not require_entry_touch
+        for row in rows:
+            if not row.ordered:
+                outcome = self._resolve_range(row, is_buy, entry_px, tp_px, stop_px, live)
+                if outcome is None:
+                    continue
+                if outcome == "ambiguous":
+                    return None
+                live = True
+                if outcome == "live":
+                    continue
+                self.resolved += 1
+                if outcome == "tp":
+                    return SubBarResolution(float(tp_px), "tp", row.ts)
+                return SubBarResolution(float(stop_px), stop_reason, row.ts)
+            for bid, ask in row.points:
+                if not live:
+                    # Stop entries trigger on the opening side of the book.
+                    live = ask >= entry_px if is_buy else bid <= entry_px
+                    if not live:
+                        continue
+                exit_quote = bid if is_buy else ask
+                if is_buy:
+                    tp_hit = exit_quote >= tp_px
+                    sl_hit = exit_quote <= stop_px
+                else:
+                    tp_hit = exit_quote <= tp_px
+                    sl_hit = exit_quote >= stop_px
+                if tp_hit and sl_hit:
+                    return None
+                if tp_hit:
+                    self.resolved += 1
+                    return SubBarResolution(float(tp_px), "tp", row.ts)
+                if sl_hit:
+                    self.resolved += 1
+                    return SubBarResolution(float(stop_px), stop_reason, row.ts)
+        return None
+
+    @staticmethod
+    def _resolve_range(
+        row: _SubBarRow,
+        is_buy: bool,
+        entry_px: float,
+        tp_px: float,
+        stop_px: float,
+        live: bool,
+    ) -> Optional[str]:
+        """Classify an unordered OHLC row against the entry and exit levels.
+
+        Returns ``None`` when the row touches nothing relevant, ``"live"``
+        when it only triggers the entry, ``"tp"``/``"sl"`` for a single exit
+        and ``"ambiguous"`` when the range cannot tell the order apart.
+        """
+
+        low = min(bid for bid, _ in row.points)
+        high = max(ask for _, ask in row.points)
+        if is_buy:
+            tp_hit, sl_hit = high >= tp_px, low <= stop_px
+        else:
+            tp_hit, sl_hit = low <= tp_px, high >= stop_px
+        if not live:
+            if not (high >= entry_px if is_buy else low <= entry_px):
+                return None
+            # The TP lies beyond the entry, so reaching it implies the entry
+            # printed first; the stop may have printed before the entry.
+            if sl_hit:
+                return "ambiguous"
+            return "tp" if tp_hit else "live"
+        if tp_hit and sl_hit:
+            return "ambiguous"
+        if tp_hit:
+            return "tp"
+        if sl_hit:
+            return "sl"
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "lookups": self.lookups,
+            "resolved": self.resolved,
+            "buckets_loaded": self.buckets_loaded,
+        }
+
+
+__all__ = ["SubBarReplay", "SubBarResolution"]
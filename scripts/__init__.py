@@ -1,9 +1,20 @@
-"""Helper exports for scripting utilities."""
+"""Helper exports for scripting utilities.
 
-from . import generate_experiment_report as generate_experiment_report
-from . import propose_param_update as propose_param_update
-from .generate_experiment_report import build_markdown_report, generate_report
-from .propose_param_update import create_proposal
+The reporting helpers are resolved lazily so that importing any
+``scripts.<tool>`` module (e.g. ``scripts.run_sim``, which sweeps spawn once
+per trial) does not pay for loading them.
+"""
+
+from importlib import import_module
+from typing import Any
+
+_LAZY_EXPORTS = {
+    "generate_experiment_report": ("scripts.generate_experiment_report", None),
+    "propose_param_update": ("scripts.propose_param_update", None),
+    "build_markdown_report": ("scripts.generate_experiment_report", "build_markdown_report"),
+    "generate_report": ("scripts.generate_experiment_report", "generate_report"),
+    "create_proposal": ("scripts.propose_param_update", "create_proposal"),
+}
 
 __all__ = [
     "build_markdown_report",
@@ -12,3 +23,18 @@ __all__ = [
     "generate_report",
     "propose_param_update",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attr = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    module = import_module(module_name)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
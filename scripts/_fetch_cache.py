@@ -0,0 +1,243 @@
+"""On-disk cache of provider responses for the ingestion fetchers.
+
+Ingest passes re-request ``lookback_minutes`` of already-ingested history on
+every run. ``fetch_chunked`` splits a request window into fixed, epoch-aligned
+time chunks and stores each chunk's normalized rows under::
+
+    <root>/<provider>/<SYMBOL>/<tf>/<chunk_minutes>m/<chunk-start>.json
+
+A chunk whose end lies ``settle_minutes`` in the past and that holds every
+bar of its span is *final* and served from disk without touching the
+network; only newer chunks (normally just the latest, still-growing one) are
+refetched. Settled chunks that came back empty or short (late publication,
+a transient empty response, or a genuine market gap such as a weekend) are
+not final: they are served from disk for ``recheck_minutes`` and then
+fetched again. Fetchers receive the previous cache
+entry so HTTP providers can revalidate it with ``If-None-Match`` /
+``If-Modified-Since`` and reuse the stored rows on ``304 Not Modified``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from scripts._time_utils import utcnow_naive
+from scripts._ts_utils import parse_naive_utc_timestamp
+
+DEFAULT_CHUNK_MINUTES = 60
+DEFAULT_SETTLE_MINUTES = 60
+DEFAULT_RECHECK_MINUTES = 24 * 60
+CACHE_VERSION = 1
+
+_EPOCH = datetime(1970, 1, 1)
+
+# ``fetch(chunk_start, chunk_end, cached_entry)`` returns ``None`` when the
+# cached entry is still valid (HTTP 304) or a mapping with ``rows`` and
+# optional ``etag`` / ``last_modified`` / ``url_hash`` validators.
+ChunkFetcher = Callable[[datetime, datetime, Optional[Mapping[str, Any]]], Optional[Mapping[str, Any]]]
+
+
+@dataclass
+class FetchCache:
+    root: Path
+    chunk_minutes: int = DEFAULT_CHUNK_MINUTES
+    settle_minutes: int = DEFAULT_SETTLE_MINUTES
+    recheck_minutes: int = DEFAULT_RECHECK_MINUTES
+
+    def __post_init__(self) -> None:
+        self.root = Path(self.root)
+        self.chunk_minutes = max(1, int(self.chunk_minutes))
+        self.settle_minutes = max(0, int(self.settle_minutes))
+        self.recheck_minutes = max(0, int(self.recheck_minutes))
+
+    @classmethod
+    def from_config(cls, value: Any) -> Optional["FetchCache"]:
+        """Build from a path or a ``{dir, chunk_minutes, settle_minutes, recheck_minutes}`` mapping."""
+
+        if not value:
+            return None
+        if isinstance(value, FetchCache):
+            return value
+        if isinstance(value, Mapping):
+            if not value.get("dir"):
+                return None
+            return cls(
+                Path(value["dir"]),
+                chunk_minutes=int(value.get("chunk_minutes", DEFAULT_CHUNK_MINUTES)),
+                settle_minutes=int(value.get("settle_minutes", DEFAULT_SETTLE_MINUTES)),
+                recheck_minutes=int(value.get("recheck_minutes", DEFAULT_RECHECK_MINUTES)),
+            )
+        return cls(Path(value))
+
+    def chunks(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+        """Half-open, epoch-aligned ``[chunk_start, chunk_end)`` windows covering ``start``..``end``."""
+
+        size = timedelta(minutes=self.chunk_minutes)
+        offset = (start - _EPOCH) // size
+        cursor = _EPOCH + offset * size
+        windows: List[Tuple[datetime, datetime]] = []
+        while cursor <= end:
+            windows.append((cursor, cursor + size))
+            cursor += size
+        return windows
+
+    def path(self, provider: str, symbol: str, tf: str, chunk_start: datetime) -> Path:
+        return (
+            self.root
+            / provider
+            / symbol.upper()
+            / tf
+            / f"{self.chunk_minutes}m"
+            / f"{chunk_start.strftime('%Y%m%dT%H%M')}.json"
+        )
+
+    def load(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("version") != CACHE_VERSION:
+            return None
+        if not isinstance(entry.get("rows"), list):
+            return None
+        return entry
+
+    def store(self, path: Path, entry: Mapping[str, Any]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix="chunk_", suffix=".json", dir=str(path.parent))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(dict(entry), handle, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+
+def _tf_minutes(tf: str) -> Optional[int]:
+    text = str(tf).strip().lower()
+    units = {"m": 1, "min": 1, "h": 60, "d": 1440}
+    for suffix in ("min", "m", "h", "d"):
+        if text.endswith(suffix) and text[: -len(suffix)].isdigit():
+            return int(text[: -len(suffix)]) * units[suffix]
+    return None
+
+
+def _chunk_complete(rows: List[Dict[str, Any]], tf: str, chunk_minutes: int) -> bool:
+    """True when ``rows`` hold every bar of the chunk (non-empty if ``tf`` is unknown)."""
+
+    if not rows:
+        return False
+    step = _tf_minutes(tf)
+    if not step:
+        return True
+    return len({row.get("timestamp") for row in rows}) >= max(1, chunk_minutes // step)
+
+
+def _is_fresh(entry: Mapping[str, Any], now: datetime) -> bool:
+    if entry.get("final"):
+        return True
+    recheck_at = entry.get("recheck_at")
+    if not recheck_at:
+        return False
+    try:
+        return now < parse_naive_utc_timestamp(str(recheck_at))
+    except ValueError:
+        return False
+
+
+def _row_dt(row: Mapping[str, Any]) -> Optional[datetime]:
+    try:
+        return parse_naive_utc_timestamp(str(row.get("timestamp", "")))
+    except ValueError:
+        return None
+
+
+def fetch_chunked(
+    fetch: ChunkFetcher,
+    *,
+    cache: FetchCache,
+    provider: str,
+    symbol: str,
+    tf: str,
+    start: datetime,
+    end: datetime,
+    now: Optional[datetime] = None,
+    stats: Optional[Dict[str, int]] = None,
+) -> List[Dict[str, Any]]:
+    """Return the rows between ``start`` and ``end`` (inclusive), chunk by chunk.
+
+    Each chunk is fetched over its whole span (capped at ``now``) so the
+    stored entry can serve any later window that overlaps it. ``stats``
+    (when given) counts ``hits`` / ``revalidated`` / ``fetched`` chunks.
+    Settled but incomplete chunks are stored with ``recheck_at`` instead of
+    ``final`` and are fetched again once that time has passed.
+    """
+
+    now = now or utcnow_naive(dt_cls=datetime)
+    settled_before = now - timedelta(minutes=cache.settle_minutes)
+    counters = stats if stats is not None else {}
+    for name in ("hits", "revalidated", "fetched"):
+        counters.setdefault(name, 0)
+
+    rows: List[Dict[str, Any]] = []
+    for chunk_start, chunk_end in cache.chunks(start, end):
+        path = cache.path(provider, symbol, tf, chunk_start)
+        entry = cache.load(path)
+        if entry is not None and _is_fresh(entry, now):
+            counters["hits"] += 1
+        else:
+            fetch_end = min(chunk_end, now)
+            if fetch_end <= chunk_start:
+                continue
+            fetched = fetch(chunk_start, fetch_end, entry)
+            if fetched is None and entry is not None:
+                counters["revalidated"] += 1
+                fetched = entry
+            else:
+                counters["fetched"] += 1
+            fetched = fetched or {"rows": []}
+            chunk_rows = [
+                dict(row)
+                for row in fetched.get("rows", [])
+                if (dt := _row_dt(row)) is not None and chunk_start <= dt < chunk_end
+            ]
+            settled = chunk_end <= settled_before
+            final = settled and _chunk_complete(chunk_rows, tf, cache.chunk_minutes)
+            recheck_at = None
+            if settled and not final:
+                recheck_at = (now + timedelta(minutes=cache.recheck_minutes)).isoformat()
+            entry = {
+                "version": CACHE_VERSION,
+                "provider": provider,
+                "symbol": symbol.upper(),
+                "tf": tf,
+                "chunk_start": chunk_start.isoformat(),
+                "final": final,
+                "recheck_at": recheck_at,
+                "fetched_at": now.replace(tzinfo=timezone.utc).isoformat(),
+                "etag": fetched.get("etag"),
+                "last_modified": fetched.get("last_modified"),
+                "url_hash": fetched.get("url_hash"),
+                "rows": chunk_rows,
+            }
+            cache.store(path, entry)
+        for row in entry["rows"]:
+            dt = _row_dt(row)
+            if dt is not None and start <= dt <= end:
+                rows.append(row)
+    return rows
+
+
+__all__ = [
+    "DEFAULT_CHUNK_MINUTES",
+    "DEFAULT_RECHECK_MINUTES",
+    "DEFAULT_SETTLE_MINUTES",
+    "FetchCache",
+    "fetch_chunked",
+]
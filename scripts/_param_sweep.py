@@ -213,6 +213,55 @@ class BayesConfig:
         )
 
 
+@dataclass(frozen=True)
+class PruningConfig:
+    """Early-stopping settings for sweep trials (``pruning`` section)."""
+
+    enabled: bool
+    rule: str
+    period: str
+    warmup_steps: int
+    min_trials: int
+    min_resource: int
+    reduction_factor: int
+    hard_constraints: bool
+    constraint_margin: Optional[float]
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "PruningConfig":
+        if not isinstance(data, Mapping):
+            raise ValueError("pruning configuration must be a mapping")
+        rule = str(data.get("rule", "median")).strip().lower()
+        if rule not in {"median", "successive_halving", "none"}:
+            raise ValueError("pruning.rule must be one of median/successive_halving/none")
+        period = str(data.get("period", "quarter")).strip().lower()
+        if period not in {"month", "quarter", "year"}:
+            raise ValueError("pruning.period must be one of month/quarter/year")
+        warmup_steps = int(data.get("warmup_steps", 2))
+        min_trials = int(data.get("min_trials", 3))
+        min_resource = int(data.get("min_resource", 1))
+        reduction_factor = int(data.get("reduction_factor", 3))
+        if warmup_steps < 0 or min_trials < 1 or min_resource < 1:
+            raise ValueError("pruning warmup_steps must be >= 0, min_trials/min_resource >= 1")
+        if reduction_factor < 2:
+            raise ValueError("pruning.reduction_factor must be >= 2")
+        margin_raw = data.get("constraint_margin")
+        constraint_margin = float(margin_raw) if margin_raw is not None else None
+        if constraint_margin is not None and constraint_margin < 0:
+            raise ValueError("pruning.constraint_margin must be >= 0")
+        return cls(
+            enabled=bool(data.get("enabled", True)),
+            rule=rule,
+            period=period,
+            warmup_steps=warmup_steps,
+            min_trials=min_trials,
+            min_resource=min_resource,
+            reduction_factor=reduction_factor,
+            hard_constraints=bool(data.get("hard_constraints", True)),
+            constraint_margin=constraint_margin,
+        )
+
+
 @dataclass(frozen=True)
 class SeasonalSlice:
     """Defines a seasonal evaluation window."""
@@ -497,6 +546,7 @@ class ExperimentConfig:
     history_notes: Optional[str]
     portfolio: Optional[PortfolioConfig]
     bayes: Optional[BayesConfig]
+    pruning: Optional[PruningConfig] = None
 
     def __post_init__(self) -> None:
         self._dimension_map: Dict[str, SearchDimension] = {dim.name: dim for dim in self.dimensions}
@@ -533,6 +583,8 @@ class ExperimentConfig:
         history_notes = history_block.get("notes")
         bayes_block = data.get("bayes")
         bayes = BayesConfig.from_dict(bayes_block) if bayes_block else None
+        pruning_block = data.get("pruning")
+        pruning = PruningConfig.from_dict(pruning_block) if pruning_block else None
         portfolio_block = data.get("portfolio")
         portfolio = PortfolioConfig.from_dict(portfolio_block) if portfolio_block else None
         return cls(
@@ -554,6 +606,7 @@ class ExperimentConfig:
             history_notes=str(history_notes) if history_notes else None,
             portfolio=portfolio,
             bayes=bayes,
+            pruning=pruning,
         )
 
     @property
@@ -666,7 +719,7 @@ def resolve_experiment_path(identifier: str | Path) -> Path:
 
 def load_experiment_config(identifier: str | Path) -> ExperimentConfig:
     path = resolve_experiment_path(identifier)
-    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    data = yaml.load_file(path)
     if data is None:
         raise ValueError(f"experiment configuration '{path}' is empty")
     return ExperimentConfig.from_dict(path, data)
@@ -681,6 +734,7 @@ __all__ = [
     "PortfolioConfig",
     "PortfolioStrategyConfig",
     "PortfolioVaRConfig",
+    "PruningConfig",
     "ScoreConfig",
     "ScoreTerm",
     "SearchDimension",
@@ -0,0 +1,172 @@
+"""Single-pass writer for ``scripts/run_sim.py`` run artifacts.
+
+Artifacts are serialized once and handed to ``RunOutputWriter``, whose single
+background thread writes them in submission order and hashes the bytes on
+their way to disk, so ``checksums.json`` no longer re-reads the files it
+describes. JSON payloads are rendered to bytes on the caller's thread; CSV
+artifacts are lazy ``iter_csv_chunks``/``iter_dict_csv_chunks`` generators
+and columnar records (parquet/npz) are writer callables, so both are
+serialized on the writer thread (columnar files are hashed right after being
+written).
+
+Because of that, the objects a queued CSV/columnar write reads (for
+``run_sim`` the run's ``metrics.daily`` and ``metrics.records``) must not be
+mutated until the write has finished. This matters when one writer outlives
+a job, as in ``run_basket``'s sequential mode, where each symbol gets a fresh
+runner and therefore fresh metrics.
+
+Callers drain the writer with ``close()`` (or ``wait()`` to keep it open for
+the next job of a batch); background failures are re-raised there.
+"""
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+Chunks = Union[bytes, Iterable[bytes]]
+
+_CSV_CHUNK_ROWS = 2048
+
+
+def render_json(payload: Any, *, pretty: bool = False) -> bytes:
+    """Encode ``payload`` as UTF-8 JSON (compact unless ``pretty``)."""
+
+    if pretty:
+        text = json.dumps(payload, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return text.encode("utf-8")
+
+
+def iter_csv_chunks(header: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """Yield a CSV document (header + ``rows``) as encoded chunks."""
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for index, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if index % _CSV_CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def iter_dict_csv_chunks(records: Sequence[Mapping[str, Any]]) -> Iterator[bytes]:
+    """Same layout as ``core.records_store.write_records`` for ``fmt="csv"``."""
+
+    header = sorted({key for record in records for key in record.keys()})
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=header)
+    writer.writeheader()
+    for index, record in enumerate(records, start=1):
+        writer.writerow(record)
+        if index % _CSV_CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def write_hashed(path: Path, data: Chunks) -> str:
+    """Write ``data`` to ``path`` and return the sha256 of the written bytes."""
+
+    digest = hashlib.sha256()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    chunks = (data,) if isinstance(data, (bytes, bytearray)) else data
+    with path.open("wb") as handle:
+        for chunk in chunks:
+            digest.update(chunk)
+            handle.write(chunk)
+    return digest.hexdigest()
+
+
+def sha256_file(path: Path, *, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class RunOutputWriter:
+    """Run artifact writes in order on one background thread.
+
+    ``background=False`` performs every write immediately (the returned
+    futures are already resolved), which keeps tests and debugging simple.
+    """
+
+    def __init__(self, *, background: bool = True) -> None:
+        self._executor: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="run-outputs") if background else None
+        )
+        self._pending: List[Future] = []
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        if self._executor is None:
+            future: Future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as exc:  # surfaced by wait(), as in background mode
+                future.set_exception(exc)
+        else:
+            future = self._executor.submit(fn, *args, **kwargs)
+        self._pending.append(future)
+        return future
+
+    def write(self, path: Path, data: Chunks) -> Future:
+        """Queue ``data`` (bytes or an iterable of byte chunks); resolves to its sha256."""
+
+        return self.submit(write_hashed, Path(path), data)
+
+    def write_with(self, writer: Callable[[], Path]) -> Future:
+        """Queue a writer that produces a file itself; resolves to ``(path, sha256)``."""
+
+        def _run() -> tuple:
+            path = Path(writer())
+            return path, sha256_file(path)
+
+        return self.submit(_run)
+
+    def wait(self) -> None:
+        """Block until every queued write finished; re-raise the first failure."""
+
+        pending, self._pending = self._pending, []
+        error: Optional[BaseException] = None
+        for future in pending:
+            exc = future.exception()
+            if exc is not None and error is None:
+                error = exc
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        try:
+            self.wait()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def __enter__(self) -> "RunOutputWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+__all__ = [
+    "RunOutputWriter",
+    "iter_csv_chunks",
+    "iter_dict_csv_chunks",
+    "render_json",
+    "sha256_file",
+    "write_hashed",
+]
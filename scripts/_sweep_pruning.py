@@ -0,0 +1,251 @@
+"""Early stopping of sweep trials from partial-run metrics.
+
+Trials launched with ``run_sim --progress-out`` append one JSON line per
+finished calendar period (see ``core.runner_progress``). ``watch_process``
+tails that file while the simulation runs and terminates it as soon as the
+pruner rejects the trial, so clearly bad parameter sets stop after a quarter
+or two instead of simulating the whole date range.
+
+Two kinds of checks are applied to every progress record:
+
+* constraints on metrics that can only get worse as more bars are processed
+  (``max_drawdown`` only falls, ``trades``/``losses`` only rise) are final as
+  soon as they are breached; other ``metrics.*`` constraints can optionally
+  prune after the warm-up when missed by more than ``constraint_margin``;
+* a relative rule comparing the partial score with other trials at the same
+  step (median stopping or asynchronous successive halving).
+"""
+from __future__ import annotations
+
+import json
+import statistics
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from scripts._param_sweep import (
+    ConstraintConfig,
+    ExperimentConfig,
+    PruningConfig,
+    resolve_metric_path,
+)
+
+# Direction in which a cumulative metric moves as bars are added (-1: never
+# increases, +1: never decreases). Breaching a bound on the "worsening" side
+# can therefore never recover.
+MONOTONE_METRICS: Dict[str, int] = {
+    "max_drawdown": -1,
+    "trades": 1,
+    "wins": 1,
+    "losses": 1,
+}
+
+
+class MedianPruner:
+    """Stop a trial whose value falls below the median of its peers at a step."""
+
+    name = "median"
+
+    def __init__(self, *, warmup_steps: int = 2, min_trials: int = 3) -> None:
+        self.warmup_steps = int(warmup_steps)
+        self.min_trials = int(min_trials)
+        self._values: Dict[int, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def report(self, trial_id: str, step: int, value: float) -> bool:
+        with self._lock:
+            at_step = self._values.setdefault(step, {})
+            peers = [other for key, other in at_step.items() if key != trial_id]
+            at_step[trial_id] = value
+        if step <= self.warmup_steps or len(peers) < self.min_trials:
+            return False
+        return value < statistics.median(peers)
+
+
+class SuccessiveHalvingPruner:
+    """Asynchronous successive halving over rungs ``min_resource * eta**k``.
+
+    At each rung a trial continues only if it ranks within the top
+    ``1 / reduction_factor`` of the values recorded there so far.
+    """
+
+    name = "successive_halving"
+
+    def __init__(self, *, min_resource: int = 1, reduction_factor: int = 3, min_trials: int = 3) -> None:
+        self.min_resource = int(min_resource)
+        self.reduction_factor = int(reduction_factor)
+        self.min_trials = int(min_trials)
+        self._rungs: Dict[int, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def is_rung(self, step: int) -> bool:
+        rung = self.min_resource
+        while rung < step:
+            rung *= self.reduction_factor
+        return rung == step
+
+    def report(self, trial_id: str, step: int, value: float) -> bool:
+        if not self.is_rung(step):
+            return False
+        with self._lock:
+            competing = self._rungs.setdefault(step, {})
+            competing[trial_id] = value
+            ranked = sorted(competing.values(), reverse=True)
+        if len(ranked) < self.min_trials:
+            return False
+        cutoff = ranked[max(len(ranked) // self.reduction_factor - 1, 0)]
+        return value < cutoff
+
+
+def build_rule(config: PruningConfig) -> Optional[Union[MedianPruner, SuccessiveHalvingPruner]]:
+    if config.rule == "median":
+        return MedianPruner(warmup_steps=config.warmup_steps, min_trials=config.min_trials)
+    if config.rule == "successive_halving":
+        return SuccessiveHalvingPruner(
+            min_resource=config.min_resource,
+            reduction_factor=config.reduction_factor,
+            min_trials=config.min_trials,
+        )
+    return None
+
+
+class TrialPruner:
+    """Shared pruning state for all trials of one sweep (thread-safe)."""
+
+    def __init__(
+        self,
+        config: PruningConfig,
+        experiment: ExperimentConfig,
+        constraints: Sequence[ConstraintConfig],
+    ) -> None:
+        self.config = config
+        self.experiment = experiment
+        self.constraints = list(constraints)
+        self.rule = build_rule(config)
+
+    def _constraint_breach(self, context: Mapping[str, Any], step: int) -> Optional[ConstraintConfig]:
+        for constraint in self.constraints:
+            if not constraint.metric.startswith("metrics."):
+                continue
+            try:
+                value = float(resolve_metric_path(context, constraint.metric))
+            except (TypeError, ValueError):
+                continue
+            direction = MONOTONE_METRICS.get(constraint.metric[len("metrics."):])
+            if direction is not None:
+                if not self.config.hard_constraints:
+                    continue
+                if direction < 0 and constraint.op == ">=" and value < constraint.threshold:
+                    return constraint
+                if direction > 0 and constraint.op == "<=" and value > constraint.threshold:
+                    return constraint
+                continue
+            margin = self.config.constraint_margin
+            if margin is None or step <= self.config.warmup_steps:
+                continue
+            slack = margin * abs(constraint.threshold)
+            if constraint.op == ">=" and value < constraint.threshold - slack:
+                return constraint
+            if constraint.op == "<=" and value > constraint.threshold + slack:
+                return constraint
+        return None
+
+    def check(
+        self, trial_id: str, params: Mapping[str, Any], record: Mapping[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Return a prune verdict for a progress ``record`` or ``None`` to continue."""
+
+        step = int(record.get("step") or 0)
+        metrics = dict(record.get("metrics") or {})
+        context = self.experiment.make_context(params=params, metrics=metrics)
+        verdict: Dict[str, Any] = {
+            "step": step,
+            "period": record.get("period"),
+            "bars": record.get("bars"),
+            "metrics": metrics,
+        }
+        breached = self._constraint_breach(context, step)
+        if breached is not None:
+            verdict["reason"] = f"constraint:{breached.id}"
+            return verdict
+        if self.rule is None:
+            return None
+        value, _ = self.experiment.scoring.compute(context)
+        if self.rule.report(trial_id, step, value):
+            verdict.update({"reason": self.rule.name, "value": value})
+            return verdict
+        return None
+
+
+def _read_new_records(path: Path, position: int) -> Tuple[List[Dict[str, Any]], int]:
+    try:
+        with path.open("rb") as handle:
+            handle.seek(position)
+            chunk = handle.read()
+    except FileNotFoundError:
+        return [], position
+    complete = chunk.rfind(b"\n") + 1
+    records: List[Dict[str, Any]] = []
+    for line in chunk[:complete].splitlines():
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return records, position + complete
+
+
+def watch_process(
+    command: Sequence[str],
+    *,
+    progress_path: Path,
+    on_progress: Callable[[Dict[str, Any]], Optional[Any]],
+    cwd: Optional[Path] = None,
+    stdout: Optional[IO[Any]] = None,
+    stderr: Optional[IO[Any]] = None,
+    poll_interval: float = 0.2,
+    kill_timeout: float = 10.0,
+) -> Tuple[int, Optional[Any]]:
+    """Run ``command`` and feed its progress records to ``on_progress``.
+
+    The process is terminated as soon as ``on_progress`` returns a non-``None``
+    verdict, which is returned alongside the exit code. Records read after the
+    process has already exited are still reported (so peers see them) but
+    cannot prune a trial that finished.
+    """
+
+    progress_path = Path(progress_path)
+    position = 0
+    process = subprocess.Popen(command, cwd=cwd, stdout=stdout, stderr=stderr)
+    try:
+        while True:
+            finished = process.poll() is not None
+            records, position = _read_new_records(progress_path, position)
+            for record in records:
+                verdict = on_progress(record)
+                if verdict is not None and not finished:
+                    process.terminate()
+                    try:
+                        process.wait(timeout=kill_timeout)
+                    except subprocess.TimeoutExpired:  # pragma: no cover - stuck child
+                        process.kill()
+                        process.wait()
+                    return process.returncode, verdict
+            if finished:
+                return process.returncode, None
+            time.sleep(poll_interval)
+    finally:
+        if process.poll() is None:  # pragma: no cover - interrupted watcher
+            process.kill()
+            process.wait()
+
+
+__all__ = [
+    "MONOTONE_METRICS",
+    "MedianPruner",
+    "SuccessiveHalvingPruner",
+    "TrialPruner",
+    "build_rule",
+    "watch_process",
+]
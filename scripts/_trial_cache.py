@@ -0,0 +1,433 @@
+"""Content-addressed cache of finished simulation trials.
+
+Sweeps, Optuna searches, the target loop and grid runs frequently re-simulate
+parameter sets that an earlier invocation already evaluated. ``TrialCache``
+stores each finished trial in a local SQLite database keyed by
+
+* the sha256 of the input dataset,
+* a canonical JSON description of everything else that defines the run
+  (resolved manifest, runner configuration, CLI options, side files such as
+  the EV profile or a fill calibration table), and
+* a code version: the sha256 of every module on the run path (``core/``,
+  ``strategies/``, ``router/``, ``configs/`` loaders, ``scripts/run_sim.py``
+  and the private ``scripts/_*.py`` helpers such as the output writer), so
+  uncommitted edits invalidate entries as well.
+
+``run_sim`` invocations are cached as a bundle of their outputs (stdout,
+``--json-out``/``--out-daily-csv`` files and the run directory). A hit writes
+the bundle back to the requested locations, so callers keep reading the same
+files and only scoring/constraint evaluation is repeated. Runs that read or
+write the state archive (``auto_state``) or resume checkpoints are never
+cached because their result depends on state outside the key.
+
+Bundles hold whole run directories, so the database is capped at
+``max_bytes`` of payload (``DEFAULT_MAX_BYTES``): after each store the least
+recently used entries (by last hit, else creation time) are evicted.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import pickle
+import sqlite3
+import subprocess
+import threading
+import zlib
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+from scripts._time_utils import utcnow_iso
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_PATH = ROOT / "runs" / "trial_cache.sqlite3"
+CACHE_SCHEMA_VERSION = 1
+DEFAULT_MAX_BYTES = 1 << 30
+
+# Directories are hashed recursively (``*.py``); other entries are globs.
+_CODE_SOURCES = (
+    "core",
+    "strategies",
+    "router",
+    "configs",
+    "scripts/run_sim.py",
+    "scripts/config_utils.py",
+    "scripts/_*.py",
+)
+
+_code_version_lock = threading.Lock()
+_code_version: Optional[str] = None
+
+
+def code_version() -> str:
+    """sha256 over the simulation sources (computed once per process)."""
+
+    global _code_version
+    with _code_version_lock:
+        if _code_version is not None:
+            return _code_version
+        hasher = hashlib.sha256(f"trial-cache:{CACHE_SCHEMA_VERSION}".encode())
+        files: List[Path] = []
+        for entry in _CODE_SOURCES:
+            path = ROOT / entry
+            if path.is_dir():
+                files.extend(sorted(path.rglob("*.py")))
+            else:
+                files.extend(sorted(p for p in ROOT.glob(entry) if p.is_file()))
+        for path in files:
+            hasher.update(path.relative_to(ROOT).as_posix().encode())
+            hasher.update(b"\0")
+            hasher.update(path.read_bytes())
+        _code_version = hasher.hexdigest()
+        return _code_version
+
+
+def trial_key(*, entry: str, dataset_sha256: str, params: Mapping[str, Any], code: str) -> str:
+    material = json.dumps(
+        {"entry": entry, "dataset": dataset_sha256, "params": params, "code": code},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class RunSimLookup:
+    """Result of looking up a ``run_sim`` invocation in the cache."""
+
+    key: Optional[str]
+    json_out: Optional[Path] = None
+    daily_csv_out: Optional[Path] = None
+    out_dir: Optional[Path] = None
+    bundle: Optional[Dict[str, Any]] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+    dataset_sha256: Optional[str] = None
+
+    @property
+    def hit(self) -> bool:
+        return self.bundle is not None
+
+
+def run_sim_argv(command: Sequence[str]) -> List[str]:
+    """Strip the interpreter/script prefix from a ``run_sim`` command line."""
+
+    tokens = [str(token) for token in command]
+    for index, token in enumerate(tokens):
+        if token.endswith("run_sim.py"):
+            return tokens[index + 1 :]
+    return tokens
+
+
+class TrialCache:
+    """SQLite-backed store of finished trials (safe to share across threads)."""
+
+    def __init__(
+        self, path: Union[str, Path] = DEFAULT_CACHE_PATH, *, max_bytes: Optional[int] = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._stats_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS trials ("
+                " key TEXT PRIMARY KEY, entry TEXT NOT NULL, dataset_sha256 TEXT NOT NULL,"
+                " code_version TEXT NOT NULL, params TEXT NOT NULL, created_at TEXT NOT NULL,"
+                " last_hit_at TEXT, hits INTEGER NOT NULL DEFAULT 0, payload BLOB NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS file_hashes ("
+                " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,"
+                " sha256 TEXT NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.path), timeout=30.0)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # -- generic entries -------------------------------------------------
+    def file_sha256(self, path: Union[str, Path]) -> Optional[str]:
+        """sha256 of a file's bytes, memoised by (path, size, mtime)."""
+
+        resolved = Path(path).resolve()
+        try:
+            stat = resolved.stat()
+        except OSError:
+            return None
+        if not resolved.is_file():
+            return None
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT size, mtime_ns, sha256 FROM file_hashes WHERE path = ?", (str(resolved),)
+            ).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+        hasher = hashlib.sha256()
+        with resolved.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+                (str(resolved), stat.st_size, stat.st_mtime_ns, digest),
+            )
+        return digest
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT payload FROM trials WHERE key = ?", (key,)).fetchone()
+            value: Any = None
+            if row is not None:
+                try:
+                    value = pickle.loads(zlib.decompress(row[0]))
+                except Exception:
+                    conn.execute("DELETE FROM trials WHERE key = ?", (key,))
+                    row = None
+            if row is not None:
+                conn.execute(
+                    "UPDATE trials SET hits = hits + 1, last_hit_at = ? WHERE key = ?",
+                    (utcnow_iso(), key),
+                )
+        with self._stats_lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        *,
+        entry: str,
+        dataset_sha256: str,
+        params: Mapping[str, Any],
+    ) -> None:
+        payload = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO trials"
+                " (key, entry, dataset_sha256, code_version, params, created_at, hits, payload)"
+                " VALUES (?, ?, ?, ?, ?, ?, 0, ?)",
+                (
+                    key,
+                    entry,
+                    dataset_sha256,
+                    code_version(),
+                    json.dumps(params, sort_keys=True, ensure_ascii=False, default=str),
+                    utcnow_iso(),
+                    payload,
+                ),
+            )
+        self.prune()
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """Evict least recently used entries until payloads fit ``max_bytes``."""
+
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        if limit is None:
+            return 0
+        with self._connect() as conn:
+            total = conn.execute("SELECT COALESCE(SUM(LENGTH(payload)), 0) FROM trials").fetchone()[0]
+            if total <= limit:
+                return 0
+            rows = conn.execute(
+                "SELECT key, LENGTH(payload) FROM trials ORDER BY COALESCE(last_hit_at, created_at), rowid"
+            ).fetchall()
+            victims: List[str] = []
+            for key, size in rows:
+                if total <= limit:
+                    break
+                victims.append(key)
+                total -= size
+            conn.executemany("DELETE FROM trials WHERE key = ?", [(key,) for key in victims])
+        with self._stats_lock:
+            self.evicted += len(victims)
+        return len(victims)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": str(self.path), "hits": self.hits, "misses": self.misses, "evicted": self.evicted}
+
+    # -- run_sim invocations ---------------------------------------------
+    def _side_files(self, values: Iterable[Any]) -> Dict[str, Optional[str]]:
+        files: Dict[str, Optional[str]] = {}
+        for value in values:
+            if not isinstance(value, str) or not value or len(value) > 1024:
+                continue
+            candidate = Path(value)
+            if not candidate.is_absolute():
+                candidate = ROOT / candidate
+            if candidate.is_file():
+                files[value] = self.file_sha256(candidate)
+        return files
+
+    def lookup_run_sim(self, argv: Sequence[str]) -> RunSimLookup:
+        """Resolve ``run_sim`` arguments to a cache key and fetch any bundle."""
+
+        from scripts.run_sim import _prepare_runtime_config, parse_args
+
+        try:
+            config = _prepare_runtime_config(parse_args(list(argv)))
+        except (Exception, SystemExit):
+            return RunSimLookup(key=None)
+        lookup = RunSimLookup(
+            key=None,
+            json_out=config.json_out,
+            daily_csv_out=config.daily_csv_out,
+            out_dir=config.out_dir,
+        )
+        if config.auto_state or config.checkpoint_path is not None:
+            return lookup
+        dataset_sha = self.file_sha256(config.csv_path)
+        manifest_sha = self.file_sha256(config.manifest_path)
+        if dataset_sha is None or manifest_sha is None:
+            return lookup
+        runner_config = asdict(config.runner_config)
+        params: Dict[str, Any] = {
+            "manifest_sha256": manifest_sha,
+            "strategy": config.manifest.strategy.class_path,
+            "symbol": config.symbol,
+            "timeframe": config.timeframe,
+            "mode": config.mode,
+            "equity": config.equity,
+            "start_ts": config.start_ts,
+            "end_ts": config.end_ts,
+            "aggregate_ev": config.aggregate_ev,
+            "strict": config.strict,
+            "debug": config.debug,
+            "debug_sample_limit": config.debug_sample_limit,
+            "ev_profile_sha256": (
+                self.file_sha256(config.ev_profile_path) if config.ev_profile_path else None
+            ),
+            "runner_config": runner_config,
+            "side_files": self._side_files(runner_config.values()),
+            "outputs": {
+                "json_out": config.json_out is not None,
+                "daily_csv_out": config.daily_csv_out is not None,
+                "out_dir": config.out_dir is not None,
+            },
+        }
+        lookup.params = params
+        lookup.dataset_sha256 = dataset_sha
+        lookup.key = trial_key(
+            entry="run_sim", dataset_sha256=dataset_sha, params=params, code=code_version()
+        )
+        bundle = self.get(lookup.key)
+        if isinstance(bundle, dict):
+            lookup.bundle = bundle
+        return lookup
+
+    def restore_run_sim(self, lookup: RunSimLookup) -> str:
+        """Write a cached bundle to the requested outputs; returns stdout."""
+
+        bundle = lookup.bundle or {}
+        old_run_dir = bundle.get("run_dir")
+        new_run_dir: Optional[Path] = None
+        if old_run_dir and lookup.out_dir is not None:
+            new_run_dir = lookup.out_dir / Path(old_run_dir).name
+        # Paths recorded inside the outputs point at the original run.
+        renames = [
+            (str(old), str(new))
+            for old, new in (
+                (old_run_dir, new_run_dir),
+                (bundle.get("json_out_path"), lookup.json_out),
+                (bundle.get("daily_csv_out_path"), lookup.daily_csv_out),
+            )
+            if old and new is not None and str(old) != str(new)
+        ]
+
+        def _rewrite(data: bytes) -> bytes:
+            for old, new in renames:
+                data = data.replace(old.encode("utf-8"), new.encode("utf-8"))
+            return data
+
+        if new_run_dir is not None:
+            for relative, data in (bundle.get("run_files") or {}).items():
+                target = new_run_dir / relative
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_bytes(_rewrite(data))
+        for name, target in (("json_out", lookup.json_out), ("daily_csv_out", lookup.daily_csv_out)):
+            data = bundle.get(name)
+            if data is not None and target is not None:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_bytes(_rewrite(data))
+        return _rewrite(str(bundle.get("stdout") or "").encode("utf-8")).decode("utf-8")
+
+    def store_run_sim(self, lookup: RunSimLookup, stdout: str) -> None:
+        """Capture the outputs of a successful ``run_sim`` run under its key."""
+
+        if lookup.key is None or lookup.dataset_sha256 is None:
+            return
+        bundle: Dict[str, Any] = {"stdout": stdout}
+        for name, target in (("json_out", lookup.json_out), ("daily_csv_out", lookup.daily_csv_out)):
+            if target is not None and target.is_file():
+                bundle[name] = target.read_bytes()
+                bundle[f"{name}_path"] = str(target)
+        run_dir = _run_dir_from_outputs(bundle)
+        if run_dir is not None and run_dir.is_dir():
+            bundle["run_dir"] = str(run_dir)
+            bundle["run_files"] = {
+                path.relative_to(run_dir).as_posix(): path.read_bytes()
+                for path in sorted(run_dir.rglob("*"))
+                if path.is_file()
+            }
+        self.put(
+            lookup.key,
+            bundle,
+            entry="run_sim",
+            dataset_sha256=lookup.dataset_sha256,
+            params=lookup.params,
+        )
+
+    def run_sim(
+        self,
+        command: Sequence[str],
+        execute: Callable[[List[str]], "subprocess.CompletedProcess[str]"],
+    ) -> "subprocess.CompletedProcess[str]":
+        """Return a cached ``run_sim`` result or ``execute(command)`` and store it."""
+
+        lookup = self.lookup_run_sim(run_sim_argv(command))
+        if lookup.hit:
+            return subprocess.CompletedProcess(list(command), 0, stdout=self.restore_run_sim(lookup), stderr="")
+        result = execute(list(command))
+        if result.returncode == 0:
+            self.store_run_sim(lookup, result.stdout or "")
+        return result
+
+
+def _run_dir_from_outputs(bundle: Mapping[str, Any]) -> Optional[Path]:
+    for source in (bundle.get("json_out"), (bundle.get("stdout") or "").encode("utf-8")):
+        if not source:
+            continue
+        try:
+            payload = json.loads(source)
+        except (TypeError, ValueError):
+            continue
+        if isinstance(payload, Mapping) and payload.get("run_dir"):
+            return Path(str(payload["run_dir"]))
+    return None
+
+
+__all__ = [
+    "DEFAULT_CACHE_PATH",
+    "DEFAULT_MAX_BYTES",
+    "RunSimLookup",
+    "TrialCache",
+    "code_version",
+    "run_sim_argv",
+    "trial_key",
+]
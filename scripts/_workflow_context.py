@@ -0,0 +1,202 @@
+"""In-process stage execution for ``scripts/run_daily_workflow.py``.
+
+Every workflow step is built as ``[sys.executable, <repo script>, *argv]``.
+While a ``WorkflowContext`` is active, ``run_main`` imports that script as a
+module and calls its ``main(argv)`` inside the current interpreter instead of
+spawning a new one, so imports, parsed manifests (``load_manifest_cached``)
+and any data loaded through the context are paid for once per workflow run.
+
+Consumers that read large inputs ask ``shared_csv_rows(path)`` for parsed
+rows; outside an active context it returns ``None`` and they keep streaming
+from disk. Cached entries are keyed by the file's resolved path, mtime and
+size, so a step that rewrites a file invalidates it for later steps. CSVs
+larger than ``max_csv_bytes`` are not held in memory and keep streaming.
+
+Memory cost: a shared CSV is kept as ``List[List[str]]`` for the whole
+workflow run. Python string and list overhead makes that several times the
+file size, so the default 128 MiB limit can mean well over 1 GiB resident
+in the worst case. Lower ``max_csv_bytes`` (or use ``--subprocess-stages``)
+on constrained hosts.
+
+In-process steps share stdout, the working directory and module globals, so
+they must not run concurrently: ``run_daily_workflow`` only dispatches steps
+in-process when they run one at a time, and spawns them when ``--dag-workers``
+runs stages in parallel. Loads themselves are thread-safe: each key is loaded
+once outside the lock and concurrent callers wait on its future.
+"""
+from __future__ import annotations
+
+import csv
+import importlib
+import os
+import threading
+import traceback
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_MAX_CSV_BYTES = 128 * 1024 * 1024
+
+_ACTIVE: Optional["WorkflowContext"] = None
+
+
+class WorkflowContext:
+    """Shared loaded data plus the in-process runner for one workflow run."""
+
+    def __init__(self, root: Path, *, max_csv_bytes: int = DEFAULT_MAX_CSV_BYTES) -> None:
+        self.root = Path(root).resolve()
+        self.max_csv_bytes = int(max_csv_bytes)
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "inprocess": 0}
+        self._cache: Dict[Tuple[str, str, int, int], "Future[Any]"] = {}
+        self._lock = threading.Lock()
+
+    def load(self, kind: str, path: Path, loader: Callable[[Path], Any]) -> Any:
+        """Return ``loader(path)``, reusing the result while the file is unchanged."""
+
+        resolved = Path(path).resolve()
+        stat = resolved.stat()
+        key = (kind, str(resolved), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            future = self._cache.get(key)
+            if future is not None:
+                self.stats["hits"] += 1
+                owner = False
+            else:
+                stale = [k for k in self._cache if k[:2] == key[:2]]
+                for k in stale:
+                    del self._cache[k]
+                future = self._cache[key] = Future()
+                self.stats["misses"] += 1
+                owner = True
+        if not owner:
+            return future.result()
+        # Parse outside the lock; other keys (and other stages) are not blocked.
+        try:
+            value = loader(resolved)
+        except BaseException as exc:
+            with self._lock:
+                if self._cache.get(key) is future:
+                    del self._cache[key]
+            future.set_exception(exc)
+            raise
+        future.set_result(value)
+        return value
+
+    def csv_rows(self, path: Path) -> Optional[List[List[str]]]:
+        if Path(path).stat().st_size > self.max_csv_bytes:
+            return None
+        return self.load("csv_rows", path, _read_csv_rows)
+
+    def module_for(self, script: str) -> Optional[str]:
+        """Dotted module name for a repository script path, or ``None``."""
+
+        path = Path(script)
+        if path.suffix != ".py":
+            return None
+        try:
+            relative = path.resolve().relative_to(self.root)
+        except ValueError:
+            return None
+        parts = relative.with_suffix("").parts
+        if len(parts) < 2 or not (self.root / parts[0] / "__init__.py").exists():
+            return None
+        return ".".join(parts)
+
+    def run_main(self, cmd: Sequence[str], *, python: str) -> Optional[int]:
+        """Run ``cmd`` in-process; ``None`` means it has to be spawned instead."""
+
+        if len(cmd) < 2 or cmd[0] != python:
+            return None
+        module_name = self.module_for(cmd[1])
+        if module_name is None:
+            return None
+        try:
+            module = importlib.import_module(module_name)
+        except Exception:
+            traceback.print_exc()
+            return 1
+        entry = getattr(module, "main", None)
+        if not callable(entry):
+            return None
+        with self._lock:
+            self.stats["inprocess"] += 1
+        try:
+            result = entry([str(token) for token in cmd[2:]])
+        except SystemExit as exc:
+            result = exc.code
+        except Exception:
+            traceback.print_exc()
+            return 1
+        if result is None:
+            return 0
+        if isinstance(result, int):
+            return result
+        print(result)
+        return 1
+
+    @contextmanager
+    def activate(self) -> Iterator["WorkflowContext"]:
+        """Make this the active context and run from the repository root."""
+
+        global _ACTIVE
+        previous, previous_cwd = _ACTIVE, os.getcwd()
+        _ACTIVE = self
+        os.chdir(self.root)
+        try:
+            yield self
+        finally:
+            os.chdir(previous_cwd)
+            _ACTIVE = previous
+
+
+def _read_csv_rows(path: Path) -> List[List[str]]:
+    with path.open(newline="", encoding="utf-8") as handle:
+        return list(csv.reader(handle))
+
+
+def current() -> Optional[WorkflowContext]:
+    return _ACTIVE
+
+
+def shared_csv_rows(path: Path) -> Optional[List[List[str]]]:
+    """Parsed CSV rows from the active context, or ``None`` when there is none."""
+
+    context = _ACTIVE
+    if context is None:
+        return None
+    try:
+        return context.csv_rows(Path(path))
+    except OSError:
+        return None
+
+
+def dict_rows(rows: Iterable[List[str]], fieldnames: Optional[Sequence[str]] = None) -> Iterator[Dict[Any, Any]]:
+    """``csv.DictReader`` semantics over already parsed rows."""
+
+    iterator = iter(rows)
+    if fieldnames is None:
+        try:
+            fieldnames = next(iterator)
+        except StopIteration:
+            return
+    width = len(fieldnames)
+    for row in iterator:
+        if row == []:
+            continue
+        record: Dict[Any, Any] = dict(zip(fieldnames, row))
+        if width < len(row):
+            record[None] = row[width:]
+        elif width > len(row):
+            for key in fieldnames[len(row):]:
+                record[key] = None
+        yield record
+
+
+__all__ = [
+    "DEFAULT_MAX_CSV_BYTES",
+    "WorkflowContext",
+    "current",
+    "dict_rows",
+    "shared_csv_rows",
+]
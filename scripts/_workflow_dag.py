@@ -0,0 +1,262 @@
+"""DAG executor for ``scripts/run_daily_workflow.py`` stages.
+
+Each ``WorkflowStage`` declares the paths it reads (``inputs``) and writes
+(``outputs``). Edges are derived against the declaration order, which is the
+order the sequential workflow used:
+
+* read-after-write  – a stage reading a path an earlier stage writes,
+* write-after-read  – a stage writing a path an earlier stage reads,
+* write-after-write – two stages writing the same path,
+
+plus explicit ``after`` names. Paths overlap when equal or when one is a
+directory containing the other, so every schedule produces what the
+sequential run produced while stages without a hazard run concurrently.
+
+A ``cacheable`` stage is skipped when the fingerprint of its argv and inputs
+(file contents; name/size/mtime for directories) matches its last successful
+run recorded in ``state_path`` and all of its outputs still exist. Every
+``StageResult`` (with its timing) is passed to ``on_result`` as it completes.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+Runner = Callable[[Sequence[str]], int]
+
+
+@dataclass(frozen=True)
+class WorkflowStage:
+    name: str
+    build: Callable[[], Sequence[str]]
+    inputs: Tuple[Path, ...] = ()
+    outputs: Tuple[Path, ...] = ()
+    after: Tuple[str, ...] = ()
+    cacheable: bool = False
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str  # ok | error | cached | blocked
+    exit_code: int = 0
+    started_ms: int = 0
+    duration_ms: int = 0
+    fingerprint: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "status": self.status,
+            "exit_code": self.exit_code,
+            "started_ms": self.started_ms,
+            "duration_ms": self.duration_ms,
+        }
+
+
+@dataclass
+class DagRun:
+    results: Dict[str, StageResult] = field(default_factory=dict)
+    wall_ms: int = 0
+
+    @property
+    def exit_code(self) -> int:
+        for result in self.results.values():
+            if result.status == "error":
+                return result.exit_code or 1
+        return 0
+
+
+def _overlaps(left: Path, right: Path) -> bool:
+    return left == right or left in right.parents or right in left.parents
+
+
+def _any_overlap(left: Sequence[Path], right: Sequence[Path]) -> bool:
+    return any(_overlaps(a, b) for a in left for b in right)
+
+
+def stage_dependencies(stages: Sequence[WorkflowStage]) -> Dict[str, Set[str]]:
+    """Return ``{stage: {stages it must wait for}}`` (see module docstring)."""
+
+    names = {stage.name for stage in stages}
+    resolved = {
+        stage.name: (
+            tuple(Path(p).resolve() for p in stage.inputs),
+            tuple(Path(p).resolve() for p in stage.outputs),
+        )
+        for stage in stages
+    }
+    deps: Dict[str, Set[str]] = {}
+    for index, stage in enumerate(stages):
+        inputs, outputs = resolved[stage.name]
+        wanted = {name for name in stage.after if name in names}
+        for earlier in stages[:index]:
+            e_inputs, e_outputs = resolved[earlier.name]
+            if (
+                _any_overlap(inputs, e_outputs)
+                or _any_overlap(outputs, e_inputs)
+                or _any_overlap(outputs, e_outputs)
+            ):
+                wanted.add(earlier.name)
+        deps[stage.name] = wanted
+    return deps
+
+
+def _hash_path(digest: "hashlib._Hash", path: Path) -> None:
+    digest.update(str(path).encode("utf-8"))
+    if path.is_file():
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+                digest.update(chunk)
+    elif path.is_dir():
+        for child in sorted(path.rglob("*")):
+            if child.is_file():
+                stat = child.stat()
+                digest.update(f"{child.relative_to(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    else:
+        digest.update(b"<missing>")
+
+
+def input_fingerprint(stage: WorkflowStage, argv: Sequence[str]) -> str:
+    digest = hashlib.sha256(json.dumps([str(token) for token in argv]).encode("utf-8"))
+    for path in stage.inputs:
+        _hash_path(digest, Path(path))
+    return digest.hexdigest()
+
+
+class _StageState:
+    """Last successful fingerprint per stage, persisted as JSON."""
+
+    def __init__(self, path: Optional[Path]) -> None:
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self.data: Dict[str, Dict[str, Any]] = {}
+        if self.path is not None and self.path.exists():
+            try:
+                loaded = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                loaded = {}
+            if isinstance(loaded, dict):
+                self.data = {k: v for k, v in loaded.get("stages", {}).items() if isinstance(v, dict)}
+
+    def fingerprint(self, name: str) -> Optional[str]:
+        return self.data.get(name, {}).get("fingerprint")
+
+    def record(self, name: str, fingerprint: str, duration_ms: int) -> None:
+        with self._lock:
+            self.data[name] = {
+                "fingerprint": fingerprint,
+                "duration_ms": duration_ms,
+                "completed_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            }
+            if self.path is None:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix="dag_state_", suffix=".json", dir=str(self.path.parent))
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    json.dump({"stages": self.data}, handle, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+
+
+def run_dag(
+    stages: Sequence[WorkflowStage],
+    *,
+    runner: Runner,
+    workers: int = 1,
+    state_path: Optional[Path] = None,
+    force: bool = False,
+    on_result: Optional[Callable[[StageResult], None]] = None,
+) -> DagRun:
+    """Execute ``stages`` respecting their dependencies.
+
+    After the first failure no new stage is started; stages already running
+    finish and the rest are reported as ``blocked``.
+    """
+
+    deps = stage_dependencies(stages)
+    by_name = {stage.name: stage for stage in stages}
+    state = _StageState(state_path)
+    run = DagRun()
+    origin = time.perf_counter()
+
+    def _elapsed_ms() -> int:
+        return int((time.perf_counter() - origin) * 1000)
+
+    def _finish(result: StageResult) -> None:
+        run.results[result.name] = result
+        if on_result is not None:
+            on_result(result)
+
+    def _execute(stage: WorkflowStage, argv: Sequence[str], fingerprint: str) -> StageResult:
+        started = _elapsed_ms()
+        exit_code = runner(list(argv))
+        duration = _elapsed_ms() - started
+        status = "ok" if exit_code == 0 else "error"
+        if status == "ok" and stage.cacheable:
+            state.record(stage.name, fingerprint, duration)
+        return StageResult(stage.name, status, exit_code, started, duration, fingerprint)
+
+    pending: List[str] = [stage.name for stage in stages]
+    running: Dict[Future, str] = {}
+    failed = False
+    with ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="wf-stage") as pool:
+        while pending or running:
+            progressed = False
+            for name in list(pending):
+                if failed or len(running) >= max(1, int(workers)):
+                    break
+                if any(dep not in run.results for dep in deps[name]):
+                    continue
+                pending.remove(name)
+                progressed = True
+                stage = by_name[name]
+                argv = list(stage.build())
+                fingerprint = input_fingerprint(stage, argv)
+                if (
+                    stage.cacheable
+                    and not force
+                    and state.fingerprint(name) == fingerprint
+                    and all(Path(path).exists() for path in stage.outputs)
+                ):
+                    print(f"[wf] stage {name}: inputs unchanged, skipping")
+                    _finish(StageResult(name, "cached", 0, _elapsed_ms(), 0, fingerprint))
+                    continue
+                running[pool.submit(_execute, stage, argv, fingerprint)] = name
+            if progressed:
+                continue
+            if not running:
+                break
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                result = future.result()
+                _finish(result)
+                if result.status == "error":
+                    failed = True
+    for name in pending:
+        _finish(StageResult(name, "blocked", 0, _elapsed_ms(), 0))
+    run.wall_ms = _elapsed_ms()
+    return run
+
+
+__all__ = [
+    "DagRun",
+    "StageResult",
+    "WorkflowStage",
+    "input_fingerprint",
+    "run_dag",
+    "stage_dependencies",
+]
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import argparse
 import csv
-import json
 import sys
 from collections import defaultdict
 from dataclasses import dataclass
@@ -25,6 +24,7 @@ def resolve_repo_path(path: Path) -> Path:
 
     return path if path.is_absolute() else REPO_ROOT / path
 
+from core.state_snapshots import list_snapshots, load_snapshot
 from core.utils import yaml_compat as yaml
 
 
@@ -64,17 +64,19 @@ def parse_timestamp(name: str) -> Optional[datetime]:
     return None
 
 
-def load_state(path: Path) -> Dict:
-    with path.open() as f:
-        return json.load(f)
+def load_state(path: Path, cache: Optional[Dict[str, Dict]] = None) -> Dict:
+    return load_snapshot(path, cache)
 
 
 def aggregate_states(paths: Iterable[Path]) -> Dict[str, Dict[str, float]]:
     stats: Dict[str, Dict[str, float]] = defaultdict(lambda: {"alpha_sum": 0.0, "beta_sum": 0.0, "count": 0.0})
     global_stats = {"alpha_sum": 0.0, "beta_sum": 0.0, "count": 0.0}
 
+    cache: Dict[str, Dict] = {}
     for path in paths:
-        data = load_state(path)
+        data = load_state(path, cache)
+        # Paths are time-ordered, so the next delta's base is this snapshot.
+        cache = {str(path): data}
         buckets = data.get("ev_buckets", {})
         for key, vals in buckets.items():
             alpha = float(vals.get("alpha", 0.0))
@@ -236,7 +238,7 @@ def main() -> int:
         raise SystemExit(f"archive directory not found: {archive_dir}")
 
     files: List[Tuple[Path, Optional[datetime]]] = []
-    for path in sorted(archive_dir.glob("*.json")):
+    for path in list_snapshots(archive_dir):
         files.append((path, parse_timestamp(path.name)))
 
     if not files:
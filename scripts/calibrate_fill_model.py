@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Calibrate the Bridge fill same-bar model with Monte Carlo path simulation.
+
+The tool replays a manifest over a CSV, captures every same-bar TP/SL
+collision encountered by the fill engine, simulates intra-bar paths for all of
+them in NumPy batches and writes a lookup table that ``BridgeFill`` consults
+when ``runner.runner_config.fill_bridge_calibration`` points to it.
+
+```
+python3 scripts/calibrate_fill_model.py \
+    --manifest configs/strategies/day_orb_5m.yaml \
+    --csv validated/USDJPY/5m.csv \
+    --out reports/fill_calibration/USDJPY_bridge.json
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from configs.strategies.loader import load_manifest  # noqa: E402
+from core.fill_calibration import CollisionSample, calibrate_fill_table  # noqa: E402
+from core.runner import BacktestRunner  # noqa: E402
+from scripts.run_sim import (  # noqa: E402
+    _iso8601_arg,
+    _load_strategy_class,
+    _resolve_repo_path,
+    _runner_config_from_manifest,
+    _select_instrument,
+    load_bars_csv,
+)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Calibrate the Bridge fill same-bar model")
+    parser.add_argument("--manifest", required=True, help="Strategy manifest YAML")
+    parser.add_argument("--csv", help="Override CSV input path (manifest defaults otherwise)")
+    parser.add_argument("--symbol", help="Select manifest instrument by symbol")
+    parser.add_argument("--mode", default="bridge", choices=["conservative", "bridge"])
+    parser.add_argument("--equity", type=float, default=100000.0)
+    parser.add_argument("--start-ts", type=_iso8601_arg, help="Start timestamp (ISO8601)")
+    parser.add_argument("--end-ts", type=_iso8601_arg, help="End timestamp (ISO8601)")
+    parser.add_argument("--out", required=True, help="Destination JSON for the calibration table")
+    parser.add_argument("--paths", type=int, default=1000, help="Simulated paths per collision")
+    parser.add_argument("--steps", type=int, default=60, help="Grid steps per simulated bar")
+    parser.add_argument("--noise-scale", type=float, default=0.35)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-trades", type=int, default=3, help="Minimum collisions per table cell")
+    return parser.parse_args(argv)
+
+
+def collect_collisions(
+    runner: BacktestRunner, bars, *, mode: str
+) -> List[CollisionSample]:
+    """Run ``runner`` over ``bars`` and return all same-bar collisions."""
+
+    runner.fill_engine_c.collision_log = []
+    runner.fill_engine_b.collision_log = []
+    try:
+        runner.run(bars, mode=mode)
+        return list(runner.fill_engine_c.collision_log) + list(
+            runner.fill_engine_b.collision_log
+        )
+    finally:
+        runner.fill_engine_c.collision_log = None
+        runner.fill_engine_b.collision_log = None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    manifest = load_manifest(_resolve_repo_path(Path(args.manifest)))
+    instrument = _select_instrument(manifest, symbol=args.symbol)
+    manifest_cli = dict(manifest.runner.cli_args or {})
+    csv_value = args.csv or manifest_cli.get("csv") or manifest_cli.get("default_csv")
+    if not csv_value:
+        print(json.dumps({"error": "csv_required"}))
+        return 1
+
+    rcfg = _runner_config_from_manifest(manifest)
+    # Never let an existing table influence the collisions it is calibrated from.
+    rcfg.fill_bridge_calibration = None
+    runner = BacktestRunner(
+        equity=args.equity,
+        symbol=instrument.symbol,
+        runner_cfg=rcfg,
+        strategy_cls=_load_strategy_class(manifest.strategy.class_path),
+    )
+    bars = load_bars_csv(
+        str(_resolve_repo_path(Path(csv_value))),
+        symbol=instrument.symbol,
+        start_ts=args.start_ts,
+        end_ts=args.end_ts,
+        default_symbol=instrument.symbol,
+        default_tf=instrument.timeframe,
+    )
+    samples = collect_collisions(runner, bars, mode=args.mode)
+    table = calibrate_fill_table(
+        samples,
+        n_paths=args.paths,
+        n_steps=args.steps,
+        noise_scale=args.noise_scale,
+        seed=args.seed,
+        min_trades=args.min_trades,
+    )
+    table.meta.update(
+        {
+            "manifest_id": manifest.id,
+            "symbol": instrument.symbol,
+            "mode": args.mode,
+            "csv": str(csv_value),
+        }
+    )
+    out_path = table.save(_resolve_repo_path(Path(args.out)))
+    summary = {
+        "out": str(out_path),
+        "samples": table.meta.get("samples", 0),
+        "cells": len(table.cells),
+        "pooled_cells": len(table.pooled),
+    }
+    print(json.dumps(summary, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
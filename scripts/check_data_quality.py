@@ -10,6 +10,7 @@ import sys
 import urllib.error
 import urllib.request
 from collections import Counter, defaultdict
+from contextlib import nullcontext
 from datetime import date, datetime, timezone
 from pathlib import Path
 from statistics import median
@@ -20,6 +21,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from scripts._time_utils import utcnow_iso
+from scripts._workflow_context import dict_rows, shared_csv_rows
 
 REQUIRED_COLS = ["timestamp", "symbol", "tf", "o", "h", "l", "c", "spread"]
 DEFAULT_INTERVAL_MINUTES = 5.0
@@ -542,8 +544,11 @@ def _audit_internal(
 
     timestamp_line_numbers: defaultdict[datetime, List[int]] = defaultdict(list)
 
-    with csv_path.open(newline="", encoding="utf-8") as f:
-        raw_reader = csv.reader(f)
+    # Inside run_daily_workflow the bars are parsed once and shared between steps.
+    shared_rows = shared_csv_rows(csv_path)
+    source = nullcontext() if shared_rows is not None else csv_path.open(newline="", encoding="utf-8")
+    with source as f:
+        raw_reader = iter(shared_rows) if shared_rows is not None else csv.reader(f)
         try:
             first_row = next(raw_reader)
         except StopIteration:
@@ -573,7 +578,10 @@ def _audit_internal(
 
             if has_header:
                 fieldnames = [cell.strip() for cell in first_row]
-                row_iterator = csv.DictReader(f, fieldnames=fieldnames)
+                if shared_rows is not None:
+                    row_iterator = dict_rows(raw_reader, fieldnames)
+                else:
+                    row_iterator = csv.DictReader(f, fieldnames=fieldnames)
                 start_line = 2
             else:
                 start_line = 1
@@ -6,8 +6,9 @@ import argparse
 import csv
 import sys
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from scripts._time_utils import utcnow_naive
-from typing import Dict, Iterable, Iterator
+from typing import Dict, Iterable, Iterator, Union
 
 
 def _ensure_module():
@@ -37,6 +38,9 @@ def _resolve_timeframe(tf: str):
     tf_key = tf.lower()
     if tf_key == "5m":
         return 5, dukascopy_python.TIME_UNIT_MIN
+    if tf_key == "1m":
+        # 1m exports feed core.sub_bar_replay for exact same-bar resolution.
+        return 1, dukascopy_python.TIME_UNIT_MIN
     raise ValueError(f"Unsupported timeframe for Dukascopy fetch: {tf}")
 
 
@@ -64,8 +68,13 @@ def fetch_bars(
     start: datetime,
     end: datetime,
     offer_side: str = "bid",
+    cache_dir: Union[str, Path, None] = None,
 ) -> Iterator[Dict[str, object]]:
-    """Yield normalized bar dictionaries from Dukascopy."""
+    """Yield normalized bar dictionaries from Dukascopy.
+
+    With ``cache_dir`` the window is served through ``scripts._fetch_cache``:
+    settled time chunks come from disk and only newer chunks are fetched.
+    """
 
     dukascopy_python, _ = _ensure_module()
     instrument = _resolve_instrument(symbol)
@@ -75,6 +84,38 @@ def fetch_bars(
     if end <= start:
         raise ValueError("end must be greater than start")
 
+    if cache_dir is not None:
+        from scripts._fetch_cache import FetchCache, fetch_chunked
+
+        def _fetch_chunk(chunk_start, chunk_end, _cached):
+            rows = _live_rows(
+                dukascopy_python, instrument, period, time_unit, offer, symbol, tf, chunk_start, chunk_end
+            )
+            return {"rows": list(rows)}
+
+        yield from fetch_chunked(
+            _fetch_chunk,
+            cache=FetchCache.from_config(cache_dir),
+            provider=f"dukascopy_{offer_side.lower()}",
+            symbol=symbol,
+            tf=tf,
+            start=_naive_utc(start),
+            end=_naive_utc(end),
+        )
+        return
+
+    yield from _live_rows(dukascopy_python, instrument, period, time_unit, offer, symbol, tf, start, end)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _live_rows(
+    dukascopy_python, instrument, period, time_unit, offer, symbol: str, tf: str, start: datetime, end: datetime
+) -> Iterator[Dict[str, object]]:
     iterator = dukascopy_python.live_fetch(
         instrument,
         period,
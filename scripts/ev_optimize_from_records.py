@@ -9,7 +9,7 @@ from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Mapping, Optional
 
 import os
 import sys
@@ -55,9 +55,26 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--output-json", default=None, help="Optional path to write JSON summary")
     parser.add_argument("--min-trades", type=int, default=5, help="Minimum trades per bucket to include in profile")
     parser.add_argument("--quiet", action="store_true", help="Suppress stdout output")
+    parser.add_argument("--sessions", default=None, help="Comma-separated sessions to include (e.g. LDN,NY)")
+    parser.add_argument("--start-date", default=None, help="Only use trades on/after this date (YYYY-MM-DD)")
+    parser.add_argument("--end-date", default=None, help="Only use trades on/before this date (YYYY-MM-DD)")
     return parser.parse_args()
 
 
+# Columns read from each records file; the rest is never decoded.
+RECORD_COLUMNS = ["ts", "pnl_pips", "ev_lcb", "exit", "session", "spread_band", "rv_band"]
+
+
+def build_filters(args: argparse.Namespace) -> Dict[str, Any]:
+    filters: Dict[str, Any] = {}
+    if getattr(args, "sessions", None):
+        filters["session"] = [item.strip() for item in args.sessions.split(",") if item.strip()]
+    start, end = getattr(args, "start_date", None), getattr(args, "end_date", None)
+    if start or end:
+        filters["date"] = (start, end)
+    return filters
+
+
 def determine_hit(row: pd.Series) -> bool:
     exit_reason = str(row.get("exit", "")).strip().lower()
     if exit_reason:
@@ -68,11 +85,13 @@ def determine_hit(row: pd.Series) -> bool:
     return float(pnl) > 0
 
 
-def aggregate_records(record_paths: Iterable[Path]) -> Dict[str, BucketStats]:
+def aggregate_records(
+    record_paths: Iterable[Path], filters: Optional[Mapping[str, Any]] = None
+) -> Dict[str, BucketStats]:
     stats: Dict[str, BucketStats] = defaultdict(BucketStats)
     for path in record_paths:
-        df = _load_records(path)
-        if df.empty:
+        df = _load_records(path, columns=RECORD_COLUMNS, filters=filters)
+        if df.empty or "pnl_pips" not in df.columns:
             continue
         trade_mask = df["pnl_pips"].notna()
         trades = df.loc[trade_mask].copy()
@@ -175,9 +194,9 @@ def main() -> None:
     runs_dir = Path(args.runs_dir).expanduser().resolve()
     record_paths = _collect_record_paths(runs_dir)
     if not record_paths:
-        raise SystemExit(f"No records.csv files found under {runs_dir}")
+        raise SystemExit(f"No records files found under {runs_dir}")
 
-    stats = aggregate_records(record_paths)
+    stats = aggregate_records(record_paths, build_filters(args))
     profile = build_profile(
         stats,
         alpha_prior=args.alpha_prior,
@@ -13,12 +13,19 @@ import json
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import math
+import sys
 from os import PathLike
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
 
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.records_store import find_records_file, read_columns  # noqa: E402
+
 
 NUMERIC_COLUMNS = [
     "ev_lcb",
@@ -71,10 +78,24 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def _load_records(path: Path) -> pd.DataFrame:
+# Columns the EV/PnL summaries actually use (projection for large record files).
+TRADE_COLUMNS = ["ts", "stage", "pnl_pips", "ev_lcb"]
+
+
+def _load_records(
+    path: Path,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[Mapping[str, Any]] = None,
+) -> pd.DataFrame:
+    """Load run records (csv/parquet/npz) with optional projection and filters."""
+
     if not path.exists():
-        raise FileNotFoundError(f"records.csv not found at {path}")
-    df = pd.read_csv(path)
+        raise FileNotFoundError(f"{path.name} not found at {path}")
+    if path.suffix.lower() == ".csv" and not filters:
+        wanted = set(columns) if columns is not None else None
+        df = pd.read_csv(path, usecols=(lambda name: name in wanted) if wanted is not None else None)
+    else:
+        df = pd.DataFrame(read_columns(path, columns=columns, filters=filters))
     if "ts" in df.columns:
         df["ts"] = pd.to_datetime(df["ts"], errors="coerce")
     for col in NUMERIC_COLUMNS:
@@ -95,12 +116,13 @@ def _load_daily(path: Optional[Path]) -> Optional[pd.DataFrame]:
 def _collect_record_paths(runs_dir: Path) -> List[Path]:
     if not runs_dir.exists():
         return []
-    return sorted(runs_dir.glob("*/records.csv"))
+    paths = (find_records_file(run_dir) for run_dir in sorted(runs_dir.iterdir()) if run_dir.is_dir())
+    return [path for path in paths if path is not None]
 
 
 def _select_run(record_paths: List[Path], run_id: Optional[str]) -> Path:
     if not record_paths:
-        raise SystemExit("No runs with records.csv were found.")
+        raise SystemExit("No runs with records (csv/parquet/npz) were found.")
     if run_id is None:
         return record_paths[-1]
     for path in record_paths:
@@ -237,7 +259,7 @@ def process_single_run(
 ) -> Dict[str, object]:
     run_id = record_path.parent.name
     run_dir = record_path.parent
-    records_df = _load_records(record_path)
+    records_df = _load_records(record_path, columns=TRADE_COLUMNS)
     trade_daily = _summarise_trade_records(records_df)
 
     daily_path = run_dir / "daily.csv"
@@ -270,7 +292,9 @@ def process_single_run(
 def process_all_runs(record_paths: Iterable[Path]) -> Dict[str, object]:
     frames: List[pd.DataFrame] = []
     for path in record_paths:
-        df = _load_records(path)
+        df = _load_records(path, columns=TRADE_COLUMNS)
+        if "pnl_pips" not in df.columns:
+            continue
         trades = df.loc[df["pnl_pips"].notna()].copy()
         if trades.empty or "ts" not in trades.columns:
             continue
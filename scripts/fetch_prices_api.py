@@ -1,19 +1,38 @@
-"""REST API fetcher for price ingestion."""
+"""REST API fetcher for price ingestion.
+
+``fetch_prices`` issues one request for a (short) window. ``backfill_prices``
+covers long ranges: it splits them into provider-sized chunks (``backfill``
+block of the provider config), fetches chunks concurrently under the shared
+``rate_limit``, hands each chunk's rows to a sink in chronological order as
+soon as every earlier chunk has been delivered, and records delivered chunks
+in a JSON manifest so an interrupted backfill resumes where it stopped.
+
+A provider ``cache`` block (or ``fetch_prices(cache_dir=...)``) routes
+``fetch_prices`` through ``scripts._fetch_cache``: the window is split into
+time chunks, settled chunks are read from disk and the rest are requested
+with ``If-None-Match`` / ``If-Modified-Since`` when a previous response for
+the same URL is cached.
+"""
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
+import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
 
 from core.utils import yaml_compat as yaml
 
+from scripts._fetch_cache import FetchCache, fetch_chunked
 from scripts._secrets import load_api_credentials
 from scripts._time_utils import utcnow_naive
 from scripts._ts_utils import parse_naive_utc_timestamp
@@ -22,6 +41,9 @@ ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_CONFIG_PATH = ROOT / "configs/api_ingest.yml"
 DEFAULT_CREDENTIALS_PATH = ROOT / "configs/api_keys.yml"
 DEFAULT_ANOMALY_LOG = ROOT / "ops/logs/ingest_anomalies.jsonl"
+DEFAULT_BACKFILL_CHUNK_MINUTES = 1440
+DEFAULT_BACKFILL_WORKERS = 2
+BACKFILL_MANIFEST_VERSION = 1
 
 _SLEEP = time.sleep
 
@@ -253,6 +275,8 @@ def _format_context(
         "end_iso": end.replace(tzinfo=timezone.utc).isoformat(timespec="seconds"),
         "start_date": start.strftime("%Y-%m-%d"),
         "end_date": end.strftime("%Y-%m-%d"),
+        "start_ts": start.strftime("%Y-%m-%d %H:%M:%S"),
+        "end_ts": end.strftime("%Y-%m-%d %H:%M:%S"),
     }
     context.update(credentials)
     return context
@@ -295,13 +319,56 @@ def _append_anomaly(entry: Mapping[str, object], path: Path) -> None:
         fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
 
 
+class _RateLimiter:
+    """Space requests shared by several threads at least ``interval`` seconds apart."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = max(0.0, float(interval))
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    @classmethod
+    def from_provider(cls, provider: ProviderConfig) -> "_RateLimiter":
+        rate_cfg = provider.get("rate_limit", {}) or {}
+        interval = float(rate_cfg.get("cooldown_seconds", 0.0) or 0.0)
+        per_minute = rate_cfg.get("max_requests_per_minute")
+        if per_minute:
+            interval = max(interval, 60.0 / float(per_minute))
+        return cls(interval)
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_at)
+            self._next_at = slot + self.interval
+        if slot > now:
+            _SLEEP(slot - now)
+
+
 def _request_json(
     url: str,
     headers: Mapping[str, str],
     *,
     provider: ProviderConfig,
     anomaly_log_path: Path,
-) -> Mapping[str, object]:
+    limiter: Optional[_RateLimiter] = None,
+    validators: Optional[Mapping[str, Optional[str]]] = None,
+    response_meta: Optional[Dict[str, Optional[str]]] = None,
+) -> Optional[Mapping[str, object]]:
+    """GET ``url`` and return the decoded JSON payload.
+
+    ``validators`` (``etag`` / ``last_modified`` of a cached response) turn
+    the request into a conditional one; ``None`` is returned on ``304 Not
+    Modified``. The response's own validators are copied into
+    ``response_meta``.
+    """
+
+    request_headers = dict(headers)
+    if validators:
+        if validators.get("etag"):
+            request_headers["If-None-Match"] = str(validators["etag"])
+        if validators.get("last_modified"):
+            request_headers["If-Modified-Since"] = str(validators["last_modified"])
     retry_cfg = provider.get("retry", {})
     attempts = int(retry_cfg.get("attempts", 3))
     backoff = float(retry_cfg.get("backoff_seconds", 1.0))
@@ -317,14 +384,16 @@ def _request_json(
 
     last_error: Optional[Exception] = None
     for attempt in range(1, attempts + 1):
-        if cooldown > 0 and last_request is not None:
+        if limiter is not None:
+            limiter.wait()
+        elif cooldown > 0 and last_request is not None:
             elapsed = time.monotonic() - last_request
             delay = cooldown - elapsed
             if delay > 0:
                 _SLEEP(delay)
         last_request = time.monotonic()
 
-        request = urllib.request.Request(url, headers=dict(headers))
+        request = urllib.request.Request(url, headers=request_headers)
         try:
             with urllib.request.urlopen(request, timeout=timeout) as resp:
                 if resp.status >= 400:
@@ -333,7 +402,12 @@ def _request_json(
                     )
                 body = resp.read().decode("utf-8")
                 data = json.loads(body)
+                if response_meta is not None:
+                    response_meta["etag"] = resp.headers.get("ETag")
+                    response_meta["last_modified"] = resp.headers.get("Last-Modified")
         except urllib.error.HTTPError as exc:
+            if exc.code == 304 and validators:
+                return None
             if exc.code not in retryable_statuses or attempt == attempts:
                 last_error = exc
                 break
@@ -497,17 +571,77 @@ def fetch_prices(
     config_path: Path | str = DEFAULT_CONFIG_PATH,
     credentials_path: Path | str = DEFAULT_CREDENTIALS_PATH,
     anomaly_log_path: Path | str = DEFAULT_ANOMALY_LOG,
+    cache_dir: Path | str | None = None,
 ) -> List[Dict[str, object]]:
-    """Fetch normalized bar records from the configured provider."""
+    """Fetch normalized bar records from the configured provider.
+
+    ``cache_dir`` (or the provider's ``cache`` block) enables the chunked
+    on-disk response cache.
+    """
 
     config = _load_config(config_path)
     provider_cfg = _select_provider(config, provider)
-    required_credentials = provider_cfg.get("credentials", [])
-    credentials = load_api_credentials(
+    credentials = _provider_credentials(provider_cfg, credentials_path)
+    cache_cfg = provider_cfg.get("cache") or {}
+    if cache_dir is not None:
+        cache_cfg = {**cache_cfg, "dir": str(cache_dir)} if isinstance(cache_cfg, Mapping) else str(cache_dir)
+    cache = FetchCache.from_config(cache_cfg)
+    if cache is None:
+        return _fetch_window(
+            provider_cfg,
+            credentials,
+            symbol,
+            tf,
+            start=start,
+            end=end,
+            anomaly_log_path=Path(anomaly_log_path),
+        )
+
+    limiter = _RateLimiter.from_provider(provider_cfg)
+
+    def _fetch_chunk(chunk_start, chunk_end, cached):
+        return _fetch_window_cached(
+            provider_cfg,
+            credentials,
+            symbol,
+            tf,
+            start=chunk_start,
+            end=chunk_end,
+            anomaly_log_path=Path(anomaly_log_path),
+            limiter=limiter,
+            cached=cached,
+        )
+
+    return fetch_chunked(
+        _fetch_chunk,
+        cache=cache,
+        provider=provider_cfg.name,
+        symbol=symbol,
+        tf=tf,
+        start=start,
+        end=end,
+    )
+
+
+def _provider_credentials(provider_cfg: ProviderConfig, credentials_path: Path | str) -> Mapping[str, str]:
+    return load_api_credentials(
         provider_cfg.name,
-        required=required_credentials,
+        required=provider_cfg.get("credentials", []),
         path=credentials_path,
     )
+
+
+def _fetch_window(
+    provider_cfg: ProviderConfig,
+    credentials: Mapping[str, str],
+    symbol: str,
+    tf: str,
+    *,
+    start: datetime,
+    end: datetime,
+    anomaly_log_path: Path,
+    limiter: Optional[_RateLimiter] = None,
+) -> List[Dict[str, object]]:
     context = _format_context(
         symbol,
         tf,
@@ -521,7 +655,8 @@ def fetch_prices(
         url,
         headers,
         provider=provider_cfg,
-        anomaly_log_path=Path(anomaly_log_path),
+        anomaly_log_path=anomaly_log_path,
+        limiter=limiter,
     )
     data_section = _resolve_data_path(payload, provider_cfg, context)
     return _normalize_rows(
@@ -535,6 +670,232 @@ def fetch_prices(
     )
 
 
+def _fetch_window_cached(
+    provider_cfg: ProviderConfig,
+    credentials: Mapping[str, str],
+    symbol: str,
+    tf: str,
+    *,
+    start: datetime,
+    end: datetime,
+    anomaly_log_path: Path,
+    limiter: Optional[_RateLimiter],
+    cached: Optional[Mapping[str, Any]],
+) -> Optional[Dict[str, object]]:
+    """``_fetch_window`` for one cache chunk, revalidating a cached response."""
+
+    context = _format_context(
+        symbol,
+        tf,
+        start=start,
+        end=end,
+        provider=provider_cfg,
+        credentials=credentials,
+    )
+    url, headers = _build_url(provider_cfg, context)
+    url_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    validators = cached if cached is not None and cached.get("url_hash") == url_hash else None
+    meta: Dict[str, Optional[str]] = {}
+    payload = _request_json(
+        url,
+        headers,
+        provider=provider_cfg,
+        anomaly_log_path=anomaly_log_path,
+        limiter=limiter,
+        validators=validators,
+        response_meta=meta,
+    )
+    if payload is None:
+        return None
+    data_section = _resolve_data_path(payload, provider_cfg, context)
+    rows = _normalize_rows(
+        data_section,
+        provider=provider_cfg,
+        context=context,
+        symbol=symbol,
+        tf=tf,
+        start=start,
+        end=end,
+    )
+    return {"rows": rows, "url_hash": url_hash, **meta}
+
+
+def _format_manifest_ts(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def plan_chunks(start: datetime, end: datetime, chunk_minutes: int) -> List[tuple[datetime, datetime]]:
+    """Split ``[start, end]`` into consecutive windows of ``chunk_minutes``.
+
+    Windows are half-open except the last one: a bar stamped exactly on a
+    boundary belongs to the later chunk, so chunks never overlap.
+    """
+
+    if chunk_minutes <= 0:
+        raise ValueError("chunk_minutes must be positive")
+    step = timedelta(minutes=int(chunk_minutes))
+    chunks: List[tuple[datetime, datetime]] = []
+    cursor = start
+    while cursor <= end:
+        upper = cursor + step
+        if upper > end:
+            chunks.append((cursor, end))
+            break
+        chunks.append((cursor, upper - timedelta(seconds=1)))
+        cursor = upper
+    return chunks
+
+
+class BackfillManifest:
+    """Chunks already delivered to the sink for one symbol/tf/provider backfill."""
+
+    def __init__(self, path: Optional[Path], *, symbol: str, tf: str, provider: str, chunk_minutes: int) -> None:
+        self.path = Path(path) if path is not None else None
+        self.data: Dict[str, Any] = {
+            "version": BACKFILL_MANIFEST_VERSION,
+            "symbol": symbol.upper(),
+            "tf": tf,
+            "provider": provider,
+            "chunk_minutes": int(chunk_minutes),
+            "chunks": {},
+        }
+        if self.path is not None and self.path.exists():
+            with self.path.open(encoding="utf-8") as fh:
+                stored = json.load(fh)
+            for key in ("symbol", "tf", "provider"):
+                if stored.get(key) != self.data[key]:
+                    raise RuntimeError(f"backfill_manifest_mismatch:{key}")
+            self.data = stored
+
+    @property
+    def chunk_minutes(self) -> int:
+        return int(self.data["chunk_minutes"])
+
+    def is_done(self, chunk_start: datetime) -> bool:
+        return _format_manifest_ts(chunk_start) in self.data["chunks"]
+
+    def mark_done(self, chunk_start: datetime, chunk_end: datetime, rows: int) -> None:
+        self.data["chunks"][_format_manifest_ts(chunk_start)] = {
+            "end": _format_manifest_ts(chunk_end),
+            "rows": int(rows),
+        }
+        self.save()
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump(self.data, fh, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def backfill_prices(
+    symbol: str,
+    tf: str,
+    *,
+    start: datetime,
+    end: datetime,
+    sink: Callable[[List[Dict[str, object]]], object],
+    manifest_path: Optional[Path | str] = None,
+    provider: Optional[str] = None,
+    config_path: Path | str = DEFAULT_CONFIG_PATH,
+    credentials_path: Path | str = DEFAULT_CREDENTIALS_PATH,
+    anomaly_log_path: Path | str = DEFAULT_ANOMALY_LOG,
+    chunk_minutes: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, object]:
+    """Fetch ``[start, end]`` chunk by chunk and stream the rows into ``sink``.
+
+    ``sink`` receives each chunk's normalized rows in chronological order
+    (``ingest_records`` skips rows at or before its last timestamp, so order
+    matters). Chunks are fetched by up to ``max_workers`` threads sharing one
+    rate limiter; at most ``2 * max_workers`` chunks are held in memory. A
+    chunk is recorded in the manifest only after ``sink`` returned, and on a
+    failure every chunk before the failed one is still delivered and
+    recorded before the error is re-raised.
+    """
+
+    config = _load_config(config_path)
+    provider_cfg = _select_provider(config, provider)
+    credentials = _provider_credentials(provider_cfg, credentials_path)
+    backfill_cfg = provider_cfg.get("backfill", {}) or {}
+    manifest = BackfillManifest(
+        Path(manifest_path) if manifest_path is not None else None,
+        symbol=symbol,
+        tf=tf,
+        provider=provider_cfg.name,
+        chunk_minutes=int(
+            chunk_minutes or backfill_cfg.get("chunk_minutes") or DEFAULT_BACKFILL_CHUNK_MINUTES
+        ),
+    )
+    workers = max(1, int(max_workers or backfill_cfg.get("max_workers") or DEFAULT_BACKFILL_WORKERS))
+    limiter = _RateLimiter.from_provider(provider_cfg)
+    log_path = Path(anomaly_log_path)
+
+    chunks = plan_chunks(start, end, manifest.chunk_minutes)
+    pending = [chunk for chunk in chunks if not manifest.is_done(chunk[0])]
+    summary: Dict[str, object] = {
+        "symbol": symbol.upper(),
+        "tf": tf,
+        "provider": provider_cfg.name,
+        "chunk_minutes": manifest.chunk_minutes,
+        "chunks_total": len(chunks),
+        "chunks_skipped": len(chunks) - len(pending),
+    }
+
+    def _fetch(chunk: tuple[datetime, datetime]) -> List[Dict[str, object]]:
+        return _fetch_window(
+            provider_cfg,
+            credentials,
+            symbol,
+            tf,
+            start=chunk[0],
+            end=chunk[1],
+            anomaly_log_path=log_path,
+            limiter=limiter,
+        )
+
+    in_flight: Dict[int, Future] = {}
+    next_submit = 0
+    next_deliver = 0
+    rows_total = 0
+    failure: Optional[BaseException] = None
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill") as pool:
+        while next_deliver < len(pending):
+            while failure is None and next_submit < len(pending) and len(in_flight) < 2 * workers:
+                in_flight[next_submit] = pool.submit(_fetch, pending[next_submit])
+                next_submit += 1
+            head = in_flight.get(next_deliver)
+            if head is None:
+                break
+            if not head.done():
+                # Only the head can be delivered next; waiting on any in-flight
+                # future would return immediately once a later chunk finished.
+                wait([head])
+                continue
+            del in_flight[next_deliver]
+            error = head.exception()
+            if error is not None:
+                failure = error
+                break
+            rows = head.result()
+            sink(rows)
+            chunk_start, chunk_end = pending[next_deliver]
+            manifest.mark_done(chunk_start, chunk_end, len(rows))
+            rows_total += len(rows)
+            next_deliver += 1
+        for future in in_flight.values():
+            future.cancel()
+    manifest.save()
+    if failure is not None:
+        raise failure
+    summary["chunks_fetched"] = next_deliver
+    summary["rows"] = rows_total
+    return summary
+
+
 def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Fetch price bars from REST API")
     parser.add_argument("--symbol", default="USDJPY")
@@ -547,9 +908,64 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser.add_argument("--end-ts", default=None)
     parser.add_argument("--lookback-minutes", type=int, default=None)
     parser.add_argument("--out", default=None, help="Optional JSON output path")
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Fetch --start-ts..--end-ts in chunks and ingest them via pull_prices storage",
+    )
+    parser.add_argument(
+        "--manifest",
+        default=None,
+        help="Backfill chunk manifest (default ops/backfill/<provider>_<symbol>_<tf>.json)",
+    )
+    parser.add_argument("--chunk-minutes", type=int, default=None, help="Backfill chunk size override")
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent backfill requests")
+    parser.add_argument("--snapshot", default=None, help="Runtime snapshot path used for backfill ingestion")
     return parser.parse_args(argv)
 
 
+def _run_backfill(args: argparse.Namespace, provider_cfg: ProviderConfig, *, start: datetime, end: datetime) -> int:
+    from scripts.pull_prices import SNAPSHOT_PATH, ingest_records
+
+    symbol = args.symbol.upper()
+    manifest_path = Path(args.manifest) if args.manifest else (
+        ROOT / "ops/backfill" / f"{provider_cfg.name}_{symbol}_{args.tf}.json"
+    )
+    snapshot_path = Path(args.snapshot) if args.snapshot else SNAPSHOT_PATH
+    ingested = {"rows_validated": 0}
+
+    def _ingest(rows: List[Dict[str, object]]) -> None:
+        if not rows:
+            return
+        result = ingest_records(
+            rows,
+            symbol=symbol,
+            tf=args.tf,
+            snapshot_path=snapshot_path,
+            source_name=f"api_backfill:{provider_cfg.name}",
+        )
+        ingested["rows_validated"] += int(result.get("rows_validated", 0))
+
+    summary = backfill_prices(
+        symbol,
+        args.tf,
+        start=start,
+        end=end,
+        sink=_ingest,
+        manifest_path=manifest_path,
+        provider=provider_cfg.name,
+        config_path=args.config,
+        credentials_path=args.credentials,
+        anomaly_log_path=args.anomaly_log,
+        chunk_minutes=args.chunk_minutes,
+        max_workers=args.workers,
+    )
+    summary.update(ingested)
+    summary["manifest"] = str(manifest_path)
+    print(json.dumps(summary, ensure_ascii=False))
+    return 0
+
+
 def main(argv: Optional[Sequence[str]] = None) -> int:
     args = parse_args(argv)
     now = utcnow_naive(dt_cls=datetime)
@@ -561,6 +977,9 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     end = parse_naive_utc_timestamp(args.end_ts) if args.end_ts else now
     start = parse_naive_utc_timestamp(args.start_ts) if args.start_ts else end - timedelta(minutes=lookback)
 
+    if args.backfill:
+        return _run_backfill(args, provider_cfg, start=start, end=end)
+
     rows = fetch_prices(
         args.symbol,
         args.tf,
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 from functools import partial
+from pathlib import Path
 from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from scripts._time_utils import parse_naive_utc as _shared_parse_naive_utc
@@ -66,12 +67,20 @@ def fetch_dukascopy_records(
     init_error: Optional[Exception],
     freshness_threshold: Optional[int],
     timestamp_parser: Callable[[str], Optional[datetime]] = parse_naive_utc,
+    cache_dir: Optional[Path] = None,
 ) -> List[Dict[str, object]]:
-    """Fetch Dukascopy records and validate freshness."""
+    """Fetch Dukascopy records and validate freshness.
+
+    ``cache_dir`` is forwarded to the fetcher (``scripts._fetch_cache``) only
+    when set, so fetch implementations without cache support keep working.
+    """
 
     if fetch_impl is None:
         raise ProviderError(f"initialization error: {init_error}")
 
+    fetch_kwargs: Dict[str, object] = {}
+    if cache_dir is not None:
+        fetch_kwargs["cache_dir"] = cache_dir
     records = list(
         fetch_impl(
             symbol,
@@ -79,6 +88,7 @@ def fetch_dukascopy_records(
             start=start,
             end=end,
             offer_side=offer_side,
+            **fetch_kwargs,
         )
     )
 
@@ -139,15 +149,20 @@ def fetch_yfinance_records(
     start: datetime,
     end: datetime,
     empty_reason: str,
+    cache_dir: Optional[Path] = None,
 ) -> List[Dict[str, object]]:
     """Fetch yfinance records and ensure the response is non-empty."""
 
+    fetch_kwargs: Dict[str, object] = {}
+    if cache_dir is not None:
+        fetch_kwargs["cache_dir"] = cache_dir
     records = list(
         fetch_bars(
             symbol,
             tf,
             start=start,
             end=end,
+            **fetch_kwargs,
         )
     )
     if not records:
@@ -236,6 +251,8 @@ class YFinanceFallbackRunner:
             self._now.isoformat(timespec="seconds"),
         )
 
+        cache_dir = getattr(self._args, "fetch_cache_dir", None)
+        fetch_kwargs = {"cache_dir": Path(cache_dir)} if cache_dir else {}
         fetch_callable = partial(
             fetch_yfinance_records,
             yfinance_module.fetch_bars,
@@ -244,6 +261,7 @@ class YFinanceFallbackRunner:
             start=fallback_start,
             end=self._now,
             empty_reason="yfinance fallback returned no rows",
+            **fetch_kwargs,
         )
 
         return self._ingest_runner(
@@ -47,6 +47,8 @@ class WorkerConfig:
     shutdown_file: Optional[Path]
     max_iterations: Optional[int]
     or_n: int
+    feature_cache_dir: Optional[Path] = None
+    fetch_cache_dir: Optional[Path] = None
 
 
 class StopSignal:
@@ -95,6 +97,7 @@ def _load_dukascopy_records(
     end: datetime,
     offer_side: str,
     freshness_threshold: Optional[int],
+    cache_dir: Optional[Path] = None,
 ) -> List[dict]:
     fetch_impl, init_error = ingest_providers.resolve_dukascopy_fetch()
 
@@ -107,10 +110,13 @@ def _load_dukascopy_records(
         offer_side=offer_side,
         init_error=init_error,
         freshness_threshold=freshness_threshold,
+        cache_dir=cache_dir,
     )
 
 
-def _load_yfinance_records(symbol: str, tf: str, start: datetime, end: datetime) -> List[dict]:
+def _load_yfinance_records(
+    symbol: str, tf: str, start: datetime, end: datetime, cache_dir: Optional[Path] = None
+) -> List[dict]:
     yfinance_module = ingest_providers.load_yfinance_module()
 
     return ingest_providers.fetch_yfinance_records(
@@ -120,6 +126,7 @@ def _load_yfinance_records(symbol: str, tf: str, start: datetime, end: datetime)
         start=start,
         end=end,
         empty_reason="yfinance fallback returned no rows",
+        cache_dir=cache_dir,
     )
 
 
@@ -159,6 +166,10 @@ def _ingest_symbol(symbol: str, config: WorkerConfig, *, now: datetime) -> Optio
     else:
         start = last_ts - timedelta(minutes=config.lookback_minutes)
 
+    fetch_kwargs = {}
+    if config.fetch_cache_dir is not None:
+        fetch_kwargs["cache_dir"] = config.fetch_cache_dir
+
     try:
         dukascopy_records = _load_dukascopy_records(
             symbol,
@@ -167,6 +178,7 @@ def _ingest_symbol(symbol: str, config: WorkerConfig, *, now: datetime) -> Optio
             end=now,
             offer_side=config.offer_side,
             freshness_threshold=config.freshness_threshold,
+            **fetch_kwargs,
         )
         records: Iterable[dict] = dukascopy_records
         source_name = "dukascopy"
@@ -198,7 +210,7 @@ def _ingest_symbol(symbol: str, config: WorkerConfig, *, now: datetime) -> Optio
                 fallback_start.isoformat(timespec="seconds"),
                 now.isoformat(timespec="seconds"),
             )
-            records = _load_yfinance_records(symbol, tf, start=fallback_start, end=now)
+            records = _load_yfinance_records(symbol, tf, start=fallback_start, end=now, **fetch_kwargs)
             source_name = "yfinance"
         except ingest_providers.ProviderError as exc:
             print(f"[live-ingest] yfinance fallback failed: {exc}")
@@ -210,6 +222,10 @@ def _ingest_symbol(symbol: str, config: WorkerConfig, *, now: datetime) -> Optio
         records = dukascopy_records
         source_name = "dukascopy"
 
+    ingest_kwargs = {}
+    if config.feature_cache_dir is not None:
+        ingest_kwargs["feature_cache_dir"] = config.feature_cache_dir
+
     try:
         result = ingest_records(
             records,
@@ -221,6 +237,7 @@ def _ingest_symbol(symbol: str, config: WorkerConfig, *, now: datetime) -> Optio
             features_path=features_path,
             or_n=config.or_n,
             source_name=source_name,
+            **ingest_kwargs,
         )
     except Exception as exc:
         print(f"[live-ingest] ingestion failed for {symbol}: {exc}")
@@ -332,6 +349,16 @@ def parse_args(argv=None):
         default=6,
         help="Opening range length passed to feature generation",
     )
+    parser.add_argument(
+        "--feature-cache-dir",
+        default=None,
+        help="Also extend the backtest indicator cache (core.feature_cache) under this directory",
+    )
+    parser.add_argument(
+        "--fetch-cache-dir",
+        default=None,
+        help="Cache provider responses per time chunk under this directory (scripts/_fetch_cache.py)",
+    )
     return parser.parse_args(argv)
 
 
@@ -369,6 +396,12 @@ def _build_config(args) -> WorkerConfig:
             int(args.max_iterations) if args.max_iterations is not None else None
         ),
         or_n=max(1, int(args.or_n)),
+        feature_cache_dir=(
+            Path(args.feature_cache_dir).resolve() if args.feature_cache_dir else None
+        ),
+        fetch_cache_dir=(
+            Path(args.fetch_cache_dir).resolve() if args.fetch_cache_dir else None
+        ),
     )
 
 
@@ -8,6 +8,7 @@ import sys
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from core.records_store import find_records_file
 from experiments.history import (
     REPO_ROOT,
     PARQUET_PATH,
@@ -55,7 +56,7 @@ def _require_file(path: Path, description: str) -> None:
 def _load_run_artifacts(run_dir: Path) -> Tuple[Dict[str, Any], Dict[str, Any], Path, Path, Path]:
     metrics_path = run_dir / "metrics.json"
     daily_path = run_dir / "daily.csv"
-    records_path = run_dir / "records.csv"
+    records_path = find_records_file(run_dir) or run_dir / "records.csv"
     params_path = run_dir / "params.json"
     _require_file(metrics_path, "metrics.json")
     _require_file(daily_path, "daily.csv")
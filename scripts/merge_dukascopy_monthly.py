@@ -1,13 +1,26 @@
 #!/usr/bin/env python3
-"""Merge monthly Dukascopy CSV exports into a single normalized file."""
+"""Merge monthly Dukascopy CSV exports into a single normalized file.
+
+``merge_files`` keeps the whole dataset in memory and returns the merged rows.
+``merge_files_parallel`` (used by the CLI) parses the monthly files in a
+process pool into sorted, de-duplicated runs spilled to a temporary
+directory, then streams them through a k-way heap merge straight into the
+output CSV (and optionally Parquet), so memory is bounded by one month per
+worker. Both resolve duplicate timestamps the same way: the row from the
+later file (in path order) wins, and within a file the later row wins.
+"""
 from __future__ import annotations
 
 import argparse
 import csv
+import heapq
+import os
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -17,6 +30,8 @@ from scripts._ts_utils import parse_naive_utc_timestamp
 
 
 HEADER = ["timestamp", "symbol", "tf", "o", "h", "l", "c", "v", "spread"]
+NUMERIC_COLUMNS = ("o", "h", "l", "c", "v", "spread")
+PARQUET_CHUNK_ROWS = 65536
 
 
 @dataclass
@@ -66,25 +81,11 @@ def merge_files(
 
     for path in sorted(paths):
         stats.files_processed += 1
-        with path.open(newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                stats.rows_read += 1
-                ts_raw = (row.get("timestamp") or "").strip()
-                if not ts_raw:
-                    continue
-                try:
-                    dt = parse_naive_utc_timestamp(ts_raw)
-                except ValueError:
-                    continue
-                ts_norm = dt.strftime("%Y-%m-%dT%H:%M:%S")
-
-                normalized = _normalize_row(row, symbol, tf, spread_default)
-                normalized["timestamp"] = ts_norm
-
-                if ts_norm in rows:
-                    stats.duplicates_skipped += 1
-                rows[ts_norm] = normalized
+        for normalized in _iter_normalized(path, symbol, tf, spread_default, stats):
+            ts_norm = normalized["timestamp"]
+            if ts_norm in rows:
+                stats.duplicates_skipped += 1
+            rows[ts_norm] = normalized
 
     ordered_keys = sorted(rows.keys())
     merged = [rows[key] for key in ordered_keys]
@@ -92,12 +93,176 @@ def merge_files(
     return merged, stats
 
 
-def write_csv(path: Path, rows: List[Dict[str, str]]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", newline="", encoding="utf-8") as f:
+def _iter_normalized(
+    path: Path, symbol: str, tf: str, spread_default: float, stats: MergeStats
+) -> Iterator[Dict[str, str]]:
+    with Path(path).open(newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            stats.rows_read += 1
+            ts_raw = (row.get("timestamp") or "").strip()
+            if not ts_raw:
+                continue
+            try:
+                dt = parse_naive_utc_timestamp(ts_raw)
+            except ValueError:
+                continue
+            normalized = _normalize_row(row, symbol, tf, spread_default)
+            normalized["timestamp"] = dt.strftime("%Y-%m-%dT%H:%M:%S")
+            yield normalized
+
+
+def _write_sorted_run(task: Tuple[str, str, str, str, float]) -> Tuple[int, int]:
+    """Parse one monthly file into a sorted, de-duplicated run file.
+
+    Returns ``(rows_read, rows_valid)``; runs in a worker process.
+    """
+
+    source, run_path, symbol, tf, spread_default = task
+    stats = MergeStats()
+    rows: Dict[str, Dict[str, str]] = {}
+    valid = 0
+    for normalized in _iter_normalized(Path(source), symbol, tf, spread_default, stats):
+        rows[normalized["timestamp"]] = normalized
+        valid += 1
+    with open(run_path, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=HEADER)
         writer.writeheader()
-        writer.writerows(rows)
+        writer.writerows(rows[key] for key in sorted(rows))
+    return stats.rows_read, valid
+
+
+def _iter_run(index: int, path: Path) -> Iterator[Tuple[str, int, Dict[str, str]]]:
+    with Path(path).open(newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield row["timestamp"], index, row
+
+
+def iter_merged_runs(run_paths: Sequence[Path]) -> Iterator[Dict[str, str]]:
+    """k-way merge sorted run files, keeping the last run's row per timestamp."""
+
+    streams = [_iter_run(index, path) for index, path in enumerate(run_paths)]
+    pending: Optional[Dict[str, str]] = None
+    for ts, _, row in heapq.merge(*streams, key=lambda item: (item[0], item[1])):
+        if pending is not None and pending["timestamp"] != ts:
+            yield pending
+        pending = row
+    if pending is not None:
+        yield pending
+
+
+def merge_files_parallel(
+    paths: Iterable[Path],
+    *,
+    symbol: str,
+    tf: str,
+    spread_default: float,
+    out_path: Path,
+    parquet_path: Optional[Path] = None,
+    workers: int = 1,
+    work_dir: Optional[Path] = None,
+) -> MergeStats:
+    """Merge ``paths`` into ``out_path`` without materializing the dataset.
+
+    Produces the same rows as ``merge_files`` + ``write_csv``. Monthly files
+    are parsed by ``workers`` processes (in-process when ``workers <= 1``);
+    ``parquet_path`` additionally writes the merged rows as Parquet (needs
+    pyarrow).
+    """
+
+    if parquet_path is not None:
+        _parquet_modules()  # fail before the (slow) parse phase
+    ordered = sorted(Path(path) for path in paths)
+    stats = MergeStats(files_processed=len(ordered))
+    if work_dir is not None:
+        Path(work_dir).mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="merge_runs_", dir=work_dir) as tmp_dir:
+        tasks = [
+            (str(path), str(Path(tmp_dir) / f"run_{index:05d}.csv"), symbol, tf, spread_default)
+            for index, path in enumerate(ordered)
+        ]
+        if workers <= 1 or len(tasks) <= 1:
+            counts = [_write_sorted_run(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                counts = list(pool.map(_write_sorted_run, tasks))
+        stats.rows_read = sum(read for read, _ in counts)
+        merged = iter_merged_runs([Path(task[1]) for task in tasks])
+        stats.rows_merged = write_outputs(Path(out_path), merged, parquet_path=parquet_path)
+    stats.duplicates_skipped = sum(valid for _, valid in counts) - stats.rows_merged
+    return stats
+
+
+def write_csv(path: Path, rows: Iterable[Dict[str, str]]) -> int:
+    return write_outputs(path, rows)
+
+
+def _parquet_modules() -> Tuple[Any, Any]:
+    try:
+        import pyarrow as pa  # type: ignore[import-not-found]
+        import pyarrow.parquet as pq  # type: ignore[import-not-found]
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise RuntimeError(
+            "pyarrow is required for --parquet-out. Install it via `pip install pyarrow`."
+        ) from exc
+    return pa, pq
+
+
+class _ParquetSink:
+    """Append merged rows to a Parquet file one row group at a time."""
+
+    def __init__(self, path: Path) -> None:
+        pa, pq = _parquet_modules()
+        self._pa = pa
+        fields = [pa.field(name, pa.string()) for name in ("timestamp", "symbol", "tf")]
+        fields += [pa.field(name, pa.float64()) for name in NUMERIC_COLUMNS]
+        self._schema = pa.schema(fields)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = pq.ParquetWriter(str(path), self._schema)
+        self._rows: List[Dict[str, str]] = []
+
+    def append(self, row: Dict[str, str]) -> None:
+        self._rows.append(row)
+        if len(self._rows) >= PARQUET_CHUNK_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        columns: Dict[str, List[Any]] = {
+            name: [row[name] for row in self._rows] for name in ("timestamp", "symbol", "tf")
+        }
+        for name in NUMERIC_COLUMNS:
+            columns[name] = [float(row[name]) if row[name] not in (None, "") else None for row in self._rows]
+        self._writer.write_table(self._pa.table(columns, schema=self._schema))
+        self._rows = []
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.close()
+
+
+def write_outputs(
+    path: Path, rows: Iterable[Dict[str, str]], *, parquet_path: Optional[Path] = None
+) -> int:
+    """Stream ``rows`` into ``path`` (and ``parquet_path``); return the row count."""
+
+    sink = _ParquetSink(Path(parquet_path)) if parquet_path is not None else None
+    count = 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=HEADER)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                if sink is not None:
+                    sink.append(row)
+                count += 1
+    finally:
+        if sink is not None:
+            sink.close()
+    return count
 
 
 def parse_args(argv=None):
@@ -125,6 +290,17 @@ def parse_args(argv=None):
         default=0.0,
         help="Default spread to use when source rows omit the column",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes parsing monthly files (default: CPU count, capped at the file count)",
+    )
+    parser.add_argument(
+        "--parquet-out",
+        default=None,
+        help="Also write the merged rows as Parquet to this path (requires pyarrow)",
+    )
     return parser.parse_args(argv)
 
 
@@ -136,25 +312,31 @@ def main(argv=None) -> int:
         print(f"no files matched pattern: {base_dir}/{args.pattern}")
         return 1
 
-    rows, stats = merge_files(
+    out_path = Path(args.out)
+    parquet_path = Path(args.parquet_out) if args.parquet_out else None
+    workers = args.workers if args.workers is not None else min(len(files), os.cpu_count() or 1)
+    stats = merge_files_parallel(
         files,
         symbol=args.symbol,
         tf=args.tf,
         spread_default=args.spread_default,
+        out_path=out_path,
+        parquet_path=parquet_path,
+        workers=workers,
+        work_dir=out_path.parent,
     )
 
-    out_path = Path(args.out)
-    write_csv(out_path, rows)
-
-    print(
-        {
-            "files_processed": stats.files_processed,
-            "rows_read": stats.rows_read,
-            "rows_merged": stats.rows_merged,
-            "duplicates_skipped": stats.duplicates_skipped,
-            "out_path": str(out_path),
-        }
-    )
+    summary = {
+        "files_processed": stats.files_processed,
+        "rows_read": stats.rows_read,
+        "rows_merged": stats.rows_merged,
+        "duplicates_skipped": stats.duplicates_skipped,
+        "out_path": str(out_path),
+        "workers": workers,
+    }
+    if parquet_path is not None:
+        summary["parquet_path"] = str(parquet_path)
+    print(summary)
     return 0
 
 
@@ -2,15 +2,23 @@
 """Prune old state archive files, keeping the latest N per leaf directory.
 
 Leaf = ops/state_archive/<strategy>/<symbol>/<mode>/
-Files are expected to be timestamp-prefixed JSON. We sort by filename and
-remove older files beyond --keep.
+Files are expected to be timestamp-prefixed snapshots (JSON keyframes or
+``.delta.gz`` deltas, see ``core.state_snapshots``). We sort by filename and
+remove older files beyond --keep, except keyframes/deltas that a retained
+delta still depends on.
 """
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
 from typing import List
-import os
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.state_snapshots import prune_snapshots  # noqa: E402
 
 
 def list_leaf_dirs(base: Path) -> List[Path]:
@@ -30,23 +38,10 @@ def list_leaf_dirs(base: Path) -> List[Path]:
 
 
 def prune_dir(leaf: Path, keep: int, dry_run: bool = False) -> int:
-    files = sorted([p for p in leaf.glob("*.json") if p.is_file()])
-    if len(files) <= keep:
-        return 0
-    to_delete = files[:-keep]
-    removed = 0
-    for f in to_delete:
-        if dry_run:
-            print(f"[prune] would remove {f}")
-            removed += 1
-            continue
-        try:
-            os.remove(f)
-            print(f"[prune] removed {f}")
-            removed += 1
-        except OSError:
-            pass
-    return removed
+    removed = prune_snapshots(leaf, keep, dry_run=dry_run)
+    for f in removed:
+        print(f"[prune] {'would remove' if dry_run else 'removed'} {f}")
+    return len(removed)
 
 
 def parse_args(argv=None):
@@ -10,6 +10,11 @@ The workflow mirrors the design backlog requirement:
   `ops/runtime_snapshot.json` under `ingest`.
 - Record anomalies (parse errors, gaps, duplicates) in
   `ops/logs/ingest_anomalies.jsonl` so the run can be replayed or inspected.
+- Guard every batch with a write-ahead journal
+  (`ops/ingest_journal/<symbol>_<tf>.json`) holding the absolute paths and
+  byte offsets of the three CSVs; the atomic snapshot write is the commit
+  point, so a crash is recovered on the next run by truncating back to those
+  offsets. Anomalies are appended after the commit and are not journaled.
 
 The script remains idempotent: repeated invocations only touch rows newer than
 the last processed timestamp. Use `--dry-run` to preview without writing.
@@ -19,7 +24,9 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import os
 import sys
+import tempfile
 from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -49,6 +56,9 @@ ANOMALY_LOG = Path("ops/logs/ingest_anomalies.jsonl")
 RAW_HEADER = ["timestamp", "symbol", "tf", "o", "h", "l", "c", "v", "spread"]
 VALIDATED_HEADER = RAW_HEADER.copy()
 FEATURE_HEADER = RAW_HEADER + ["atr14", "adx14", "or_high", "or_low", "rv12"]
+# Accepted rows per committed batch (see ingest_records).
+DEFAULT_BATCH_SIZE = 5000
+HISTORY_ROWS = 400
 
 
 def default_source_for_symbol(symbol: str) -> Path:
@@ -79,10 +89,93 @@ def _load_snapshot(path: Path) -> dict:
         return {}
 
 
-def _save_snapshot(path: Path, data: dict) -> None:
+def _write_json_atomic(path: Path, data: dict, *, prefix: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    fd, tmp_path = tempfile.mkstemp(prefix=prefix, suffix=".json", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w") as tmp_file:
+            json.dump(data, tmp_file, ensure_ascii=False, indent=2)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        try:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def _save_snapshot(path: Path, data: dict) -> None:
+    _write_json_atomic(path, data, prefix="snapshot_")
+
+
+def journal_path_for(snapshot_path: Path, symbol: str, tf: str) -> Path:
+    """Location of the ingest commit journal for ``symbol``/``tf``."""
+
+    return Path(snapshot_path).parent / "ingest_journal" / f"{symbol.upper()}_{tf}.json"
+
+
+def _begin_journal(journal_path: Path, *, key: str, watermark: datetime, paths: Iterable[Path]) -> None:
+    # Absolute paths: the default stores are relative to the working directory
+    # and recovery may run from another one.
+    files: Dict[str, Optional[int]] = {}
+    for path in paths:
+        path = Path(path).resolve()
+        files[str(path)] = path.stat().st_size if path.exists() else None
+    _write_json_atomic(
+        journal_path,
+        {"key": key, "watermark": watermark.isoformat(), "files": files, "created_at": _utcnow_iso()},
+        prefix="journal_",
+    )
+
+
+def recover_ingest_journal(
+    symbol: str,
+    tf: str,
+    *,
+    snapshot_path: Path = SNAPSHOT_PATH,
+) -> Optional[Dict[str, object]]:
+    """Resolve a batch left behind by an interrupted ``ingest_records`` run.
+
+    The batch counts as committed when the snapshot watermark already equals
+    the journal's; otherwise each store is truncated back to the offset it
+    had before the batch (files created by the batch are removed). Only the
+    journal and the file ends are touched, so recovery is O(batch).
+    """
+
+    journal_path = journal_path_for(snapshot_path, symbol, tf)
+    if not journal_path.exists():
+        return None
+    try:
+        journal = json.loads(journal_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        # The journal is replaced atomically; an unreadable one never began a batch.
+        journal_path.unlink(missing_ok=True)
+        return {"action": "discarded", "journal": str(journal_path)}
+
+    snapshot = _load_snapshot(Path(snapshot_path))
+    key = journal.get("key") or f"{symbol.upper()}_{tf}"
+    committed = snapshot.get("ingest", {}).get(key) == journal.get("watermark")
+    truncated: Dict[str, Optional[int]] = {}
+    if not committed:
+        for name, offset in (journal.get("files") or {}).items():
+            path = Path(name)
+            if not path.exists():
+                continue
+            if offset is None:
+                path.unlink()
+            elif path.stat().st_size > int(offset):
+                os.truncate(path, int(offset))
+            else:
+                continue
+            truncated[name] = offset
+    journal_path.unlink(missing_ok=True)
+    return {
+        "action": "rolled_forward" if committed else "rolled_back",
+        "watermark": journal.get("watermark"),
+        "truncated": truncated,
+    }
 
 
 def _parse_ts(value: str) -> datetime:
@@ -128,28 +221,52 @@ def _update_snapshot(snapshot: dict, key: str, value: datetime) -> dict:
     return snapshot
 
 
+def _tail_csv_rows(path: Path, count: int) -> Tuple[List[Dict[str, str]], bool]:
+    """Return up to the last ``count`` CSV rows and whether the file start was reached."""
+
+    block = 64 * 1024
+    with path.open("rb") as f:
+        header = f.readline()
+        body_start = f.tell()
+        end = f.seek(0, os.SEEK_END)
+        start = end
+        data = b""
+        while start > body_start and data.count(b"\n") <= count:
+            start = max(body_start, start - block)
+            f.seek(start)
+            data = f.read(end - start)
+    lines = data.splitlines()
+    if start > body_start:
+        lines = lines[1:]  # the first line may be partial
+    complete = start <= body_start and len(lines) <= count
+    text = (header + b"\n".join(lines[-count:])).decode("utf-8")
+    return list(csv.DictReader(text.splitlines())), complete
+
+
 def _infer_last_ts_from_csv(path: Path) -> Optional[datetime]:
     if not path.exists():
         return None
     try:
-        with path.open(newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            last_ts = None
-            for row in reader:
+        count = 16
+        while True:
+            rows, complete = _tail_csv_rows(path, count)
+            for row in reversed(rows):
                 ts_raw = row.get("timestamp")
                 if not ts_raw:
                     continue
                 try:
-                    last_ts = _parse_ts(ts_raw)
+                    return _parse_ts(ts_raw)
                 except Exception:
                     continue
-            return last_ts
+            if complete:
+                return None
+            count *= 8
     except Exception:
         return None
 
 
 def _append_csv(path: Path, header: List[str], rows: Iterable[Iterable[object]], *, dry_run: bool) -> int:
-    rows_list = list(rows)
+    rows_list = rows if isinstance(rows, list) else list(rows)
     if dry_run or not rows_list:
         return len(rows_list)
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -159,11 +276,13 @@ def _append_csv(path: Path, header: List[str], rows: Iterable[Iterable[object]],
         if write_header:
             writer.writerow(header)
         writer.writerows(rows_list)
+        f.flush()
+        os.fsync(f.fileno())
     return len(rows_list)
 
 
 def _log_anomalies(entries: Iterable[Dict[str, object]], *, dry_run: bool) -> int:
-    entries_list = list(entries)
+    entries_list = entries if isinstance(entries, list) else list(entries)
     if dry_run or not entries_list:
         return len(entries_list)
     ANOMALY_LOG.parent.mkdir(parents=True, exist_ok=True)
@@ -173,29 +292,37 @@ def _log_anomalies(entries: Iterable[Dict[str, object]], *, dry_run: bool) -> in
     return len(entries_list)
 
 
-def _load_recent_validated(path: Path, limit: int = 400) -> List[Dict[str, object]]:
+def _load_recent_validated(path: Path, limit: int = HISTORY_ROWS) -> List[Dict[str, object]]:
     if not path.exists():
         return []
+    count = limit
+    while True:
+        rows, complete = _tail_csv_rows(path, count)
+        buf = _parse_validated_rows(rows, limit)
+        if complete or len(buf) >= limit:
+            return buf
+        count *= 2
+
+
+def _parse_validated_rows(rows: Iterable[Dict[str, str]], limit: int) -> List[Dict[str, object]]:
     buf: Deque[Dict[str, object]] = deque(maxlen=limit)
-    with path.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                ts = _parse_ts(row["timestamp"])
-                buf.append({
-                    "dt": ts,
-                    "timestamp": ts.strftime("%Y-%m-%dT%H:%M:%S"),
-                    "symbol": row.get("symbol", ""),
-                    "tf": row.get("tf", ""),
-                    "o": float(row["o"]),
-                    "h": float(row["h"]),
-                    "l": float(row["l"]),
-                    "c": float(row["c"]),
-                    "v": float(row.get("v", 0.0) or 0.0),
-                    "spread": float(row.get("spread", 0.0) or 0.0),
-                })
-            except Exception:
-                continue
+    for row in rows:
+        try:
+            ts = _parse_ts(row["timestamp"])
+            buf.append({
+                "dt": ts,
+                "timestamp": ts.strftime("%Y-%m-%dT%H:%M:%S"),
+                "symbol": row.get("symbol", ""),
+                "tf": row.get("tf", ""),
+                "o": float(row["o"]),
+                "h": float(row["h"]),
+                "l": float(row["l"]),
+                "c": float(row["c"]),
+                "v": float(row.get("v", 0.0) or 0.0),
+                "spread": float(row.get("spread", 0.0) or 0.0),
+            })
+        except Exception:
+            continue
     return list(buf)
 
 
@@ -284,6 +411,52 @@ def get_last_processed_ts(
     return _infer_last_ts_from_csv(validated_path)
 
 
+def _validated_bar(row: List[object]) -> Dict[str, object]:
+    return {"timestamp": row[0], "o": row[3], "h": row[4], "l": row[5], "c": row[6]}
+
+
+def _read_validated_bars(path: Path) -> Iterable[Dict[str, object]]:
+    with path.open(newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            try:
+                yield {
+                    "timestamp": row["timestamp"],
+                    "o": float(row["o"]),
+                    "h": float(row["h"]),
+                    "l": float(row["l"]),
+                    "c": float(row["c"]),
+                }
+            except (KeyError, TypeError, ValueError):
+                continue
+
+
+def _extend_feature_cache(
+    root: Path,
+    *,
+    symbol: str,
+    tf: str,
+    or_n: int,
+    history: Iterable[Dict[str, object]],
+    validated_rows: List[List[object]],
+    validated_path: Path,
+) -> Dict[str, object]:
+    from core.feature_cache import extend_feature_table
+
+    bars: List[Dict[str, object]] = [
+        {"timestamp": row["timestamp"], "o": row["o"], "h": row["h"], "l": row["l"], "c": row["c"]}
+        for row in history
+    ]
+    bars.extend(_validated_bar(row) for row in validated_rows)
+    return extend_feature_table(
+        root,
+        symbol=symbol,
+        tf=tf,
+        or_n=or_n,
+        bars=bars,
+        load_all=lambda: _read_validated_bars(validated_path),
+    )
+
+
 def ingest_records(
     records: Iterable[Dict[str, object]],
     *,
@@ -296,8 +469,28 @@ def ingest_records(
     or_n: int = 6,
     dry_run: bool = False,
     source_name: Optional[str] = None,
+    feature_cache_dir: Optional[Path] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
 ) -> Dict[str, object]:
-    """Ingest pre-normalized bar records into raw/validated/feature storage."""
+    """Ingest pre-normalized bar records into raw/validated/feature storage.
+
+    ``records`` is consumed as a stream: every ``batch_size`` accepted rows
+    the raw/validated/feature rows and the anomalies of the batch are
+    appended together and the snapshot watermark advances to the batch's
+    last timestamp, so memory stays bounded and a crash only loses the
+    uncommitted batch. Each batch is journaled first (``journal_path_for``)
+    and a leftover journal is resolved by ``recover_ingest_journal`` before
+    the watermark is read.
+
+    The anomaly log is shared by every symbol and is not journaled: a
+    batch's anomalies are appended only after its snapshot commit, so a
+    rolled-back batch never leaves entries behind, but a crash between the
+    commit and the append loses that batch's anomaly entries (at most once).
+
+    With ``feature_cache_dir`` the versioned indicator cache read by
+    ``BacktestRunner`` (``core.feature_cache``) is extended with the newly
+    validated bars as well.
+    """
 
     symbol = symbol.upper()
     tf = tf
@@ -306,6 +499,8 @@ def ingest_records(
     validated_path = validated_path or VALIDATED_ROOT / symbol / f"{tf}.csv"
     features_path = features_path or FEATURES_ROOT / symbol / f"{tf}.csv"
     snapshot_path = Path(snapshot_path)
+    journal_path = journal_path_for(snapshot_path, symbol, tf)
+    recovery = None if dry_run else recover_ingest_journal(symbol, tf, snapshot_path=snapshot_path)
 
     snapshot = _load_snapshot(snapshot_path)
     key = f"{symbol}_{tf}"
@@ -318,14 +513,58 @@ def ingest_records(
     ctx.bootstrap(history)
     prev_dt = history[-1]["dt"] if history else None
 
+    batch_size = max(1, int(batch_size))
     raw_rows: List[List[object]] = []
     validated_rows: List[List[object]] = []
     feature_rows: List[List[object]] = []
     anomalies: List[Dict[str, object]] = []
-    gaps: List[Dict[str, object]] = []
+    # Last validated bars preceding the current batch (feature cache warm start).
+    recent: Deque[Dict[str, object]] = deque(history, maxlen=HISTORY_ROWS)
+    totals: Dict[str, int] = {"raw": 0, "validated": 0, "featured": 0, "anomalies": 0, "gaps": 0}
+    feature_cache: Optional[Dict[str, object]] = None
 
     latest_ts: Optional[datetime] = last_ts
 
+    def _commit_batch() -> None:
+        nonlocal feature_cache
+        journaled = not dry_run and bool(raw_rows) and latest_ts is not None
+        if journaled:
+            _begin_journal(
+                journal_path,
+                key=key,
+                watermark=latest_ts,
+                paths=(raw_path, validated_path, features_path),
+            )
+        totals["raw"] += _append_csv(raw_path, RAW_HEADER, raw_rows, dry_run=dry_run)
+        totals["validated"] += _append_csv(
+            validated_path, VALIDATED_HEADER, validated_rows, dry_run=dry_run
+        )
+        totals["featured"] += _append_csv(
+            features_path, FEATURE_HEADER, feature_rows, dry_run=dry_run
+        )
+        if journaled:
+            # The snapshot write is the commit point of the batch.
+            _save_snapshot(snapshot_path, _update_snapshot(snapshot, key, latest_ts))
+            journal_path.unlink(missing_ok=True)
+        totals["anomalies"] += _log_anomalies(anomalies, dry_run=dry_run)
+        if feature_cache_dir is not None and not dry_run and validated_rows:
+            batch_cache = _extend_feature_cache(
+                Path(feature_cache_dir),
+                symbol=symbol,
+                tf=tf,
+                or_n=or_n,
+                history=recent,
+                validated_rows=validated_rows,
+                validated_path=validated_path,
+            )
+            if feature_cache is not None:
+                batch_cache["appended"] = int(batch_cache["appended"]) + int(feature_cache["appended"])
+                batch_cache["rebuilt"] = bool(batch_cache["rebuilt"] or feature_cache["rebuilt"])
+            feature_cache = batch_cache
+        recent.extend(_validated_bar(row) for row in validated_rows)
+        for pending in (raw_rows, validated_rows, feature_rows, anomalies):
+            pending.clear()
+
     for row in records:
         ts_raw = str(row.get("timestamp", ""))
         try:
@@ -414,7 +653,7 @@ def ingest_records(
                 "end_ts": _format_ts(ts),
                 "minutes": (ts - prev_dt).total_seconds() / 60.0,
             }
-            gaps.append(gap_entry)
+            totals["gaps"] += 1
             anomalies.append(gap_entry)
 
         prev_dt = ts
@@ -465,36 +704,28 @@ def ingest_records(
                 _format_float(feature_vals[4]),
             ]
         )
+        if len(raw_rows) >= batch_size:
+            _commit_batch()
 
-    raw_rows_count = _append_csv(raw_path, RAW_HEADER, raw_rows, dry_run=dry_run)
-    validated_rows_count = _append_csv(
-        validated_path, VALIDATED_HEADER, validated_rows, dry_run=dry_run
-    )
-    feature_rows_count = _append_csv(
-        features_path, FEATURE_HEADER, feature_rows, dry_run=dry_run
-    )
-    anomalies_logged = _log_anomalies(anomalies, dry_run=dry_run)
+    _commit_batch()
 
     result = {
         "source": source_name or "inline",
         "raw_path": str(raw_path),
         "validated_path": str(validated_path),
         "features_path": str(features_path),
-        "rows_raw": raw_rows_count,
-        "rows_validated": validated_rows_count,
-        "rows_featured": feature_rows_count,
-        "anomalies_logged": anomalies_logged,
-        "gaps_detected": len(gaps),
+        "rows_raw": totals["raw"],
+        "rows_validated": totals["validated"],
+        "rows_featured": totals["featured"],
+        "anomalies_logged": totals["anomalies"],
+        "gaps_detected": totals["gaps"],
         "last_ts_prev": last_ts.isoformat() if last_ts else None,
         "last_ts_now": latest_ts.isoformat() if latest_ts else None,
     }
-
-    if dry_run or raw_rows_count == 0 or latest_ts is None:
-        return result
-
-    if last_ts is None or latest_ts > last_ts:
-        updated = _update_snapshot(snapshot, key, latest_ts)
-        _save_snapshot(snapshot_path, updated)
+    if feature_cache is not None:
+        result["feature_cache"] = feature_cache
+    if recovery is not None:
+        result["journal_recovery"] = recovery
 
     return result
 
@@ -507,6 +738,17 @@ def parse_args(argv=None):
     parser.add_argument("--snapshot", default=str(SNAPSHOT_PATH), help="Runtime snapshot JSON path")
     parser.add_argument("--or-n", type=int, default=6, help="Opening range length for feature calc")
     parser.add_argument("--dry-run", action="store_true", help="Scan without writing output or snapshot")
+    parser.add_argument(
+        "--feature-cache-dir",
+        default=None,
+        help="Also extend the backtest indicator cache (core.feature_cache) under this directory",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Rows appended (and snapshot advanced) per batch (default {DEFAULT_BATCH_SIZE})",
+    )
     return parser.parse_args(argv)
 
 
@@ -537,6 +779,8 @@ def main(argv=None) -> int:
             or_n=args.or_n,
             dry_run=args.dry_run,
             source_name=str(source),
+            feature_cache_dir=Path(args.feature_cache_dir) if args.feature_cache_dir else None,
+            batch_size=args.batch_size,
         )
 
     print(json.dumps(result, ensure_ascii=False))
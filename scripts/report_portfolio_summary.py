@@ -18,7 +18,8 @@ summary can surface category and risk metadata directly from the manifests.
 
 The script writes a JSON payload to `reports/portfolio_summary.json` by default.
 The output mirrors the schema returned by
-`analysis.portfolio_monitor.build_portfolio_summary`.
+`analysis.portfolio_monitor.build_portfolio_summary`, including the
+per-category equity change in `category_contributions`.
 """
 
 from __future__ import annotations
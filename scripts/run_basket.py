@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""Run one manifest over a basket of symbols in parallel and merge the results.
+
+```
+python3 scripts/run_basket.py \
+    --manifest configs/strategies/day_orb_5m.yaml \
+    --csv validated/basket_5m.csv --symbols USDJPY,EURUSD,GBPJPY \
+    --out-dir runs/basket --workers 3 -- --mode conservative --debug
+```
+
+The multi-symbol CSV is partitioned by symbol in a single pass (raw lines are
+copied, not parsed) into ``<out-dir>/shards/<SYMBOL>.csv``; ``--shard-dir``
+reuses existing ``<SYMBOL>.csv`` shards instead. Each symbol then runs in its
+own process through ``run_sim.run_with_config`` (one ``BacktestRunner`` per
+symbol) and writes the usual run_sim artefacts under ``<out-dir>/<SYMBOL>/``.
+Finally the per-symbol metrics, daily tables and records are merged into
+``<out-dir>/portfolio.json``, ``daily.csv`` and ``records.<fmt>``. The merged
+equity curve holds each symbol at its starting equity until its first trade;
+``daily_sharpe`` is mean / std of the merged daily ``pnl_pips`` (unannualised,
+the same per-day definition as ``run_param_sweep``).
+
+Arguments not recognised here are forwarded to run_sim. Symbols that the
+manifest does not list reuse its first (or ``--mode``) instrument and run
+without the manifest's EV profile/state archive, which belong to the listed
+symbols. EV aggregation is skipped for basket runs; run ``aggregate_ev.py``
+per symbol afterwards if needed.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import heapq
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.runner_metrics import DrawdownTracker, RunningStats  # noqa: E402
+from scripts import run_sim  # noqa: E402
+from scripts._run_outputs import RunOutputWriter  # noqa: E402
+
+
+def _normalize_symbol(value: Any) -> str:
+    return str(value or "").strip().upper()
+
+
+def _parse_symbols(value: Optional[str]) -> Optional[List[str]]:
+    if not value:
+        return None
+    symbols = [_normalize_symbol(token) for token in value.split(",")]
+    return [symbol for symbol in dict.fromkeys(symbols) if symbol]
+
+
+def _symbol_column(header: Sequence[str]) -> Optional[int]:
+    lookup = {str(name).strip().lower(): index for index, name in enumerate(header)}
+    for alias in run_sim.CSV_COLUMN_ALIASES["symbol"]:
+        if alias in lookup:
+            return lookup[alias]
+    if not any(token in run_sim._KNOWN_HEADER_TOKENS for token in lookup):
+        # Headerless files follow run_sim's fallback column order.
+        return None
+    raise run_sim.CSVFormatError("symbol_required", details="basket CSV needs a symbol column")
+
+
+def partition_csv(
+    path: Path,
+    shard_dir: Path,
+    *,
+    symbols: Optional[Sequence[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Split ``path`` into ``<shard_dir>/<SYMBOL>.csv`` in one pass.
+
+    Rows are copied byte-for-byte (header included) so run_sim parses each
+    shard exactly as it would the original file. Returns
+    ``{symbol: {"path", "rows"}}`` for the symbols found (and selected).
+    """
+
+    wanted = set(symbols) if symbols else None
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    handles: Dict[str, Any] = {}
+    counts: Dict[str, int] = {}
+    try:
+        with path.open("r", encoding="utf-8", newline="") as source:
+            first = source.readline()
+            if not first:
+                return {}
+            header_row = next(csv.reader([first]))
+            column = _symbol_column(header_row)
+            header: Optional[str] = first
+            if column is None:
+                column = run_sim._HEADERLESS_FALLBACK_COLUMNS.index("symbol")
+                header = None
+                lines: Iterator[str] = _chain_first(first, source)
+            else:
+                lines = iter(source)
+            for line in lines:
+                if not line.strip():
+                    continue
+                if '"' in line:
+                    fields = next(csv.reader([line]))
+                else:
+                    fields = line.split(",", column + 1)
+                if len(fields) <= column:
+                    continue
+                symbol = _normalize_symbol(fields[column])
+                if not symbol or (wanted is not None and symbol not in wanted):
+                    continue
+                handle = handles.get(symbol)
+                if handle is None:
+                    handle = (shard_dir / f"{symbol}.csv").open("w", encoding="utf-8", newline="")
+                    if header is not None:
+                        handle.write(header if header.endswith("\n") else header + "\n")
+                    handles[symbol] = handle
+                    counts[symbol] = 0
+                handle.write(line if line.endswith("\n") else line + "\n")
+                counts[symbol] += 1
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return {
+        symbol: {"path": shard_dir / f"{symbol}.csv", "rows": counts[symbol]}
+        for symbol in sorted(handles)
+    }
+
+
+def _chain_first(first: str, rest: Iterator[str]) -> Iterator[str]:
+    yield first
+    yield from rest
+
+
+def _existing_shards(shard_dir: Path, symbols: Optional[Sequence[str]]) -> Dict[str, Dict[str, Any]]:
+    found = {_normalize_symbol(path.stem): path for path in sorted(shard_dir.glob("*.csv"))}
+    selected = symbols or sorted(found)
+    missing = [symbol for symbol in selected if symbol not in found]
+    if missing:
+        raise SystemExit(json.dumps({"error": "shard_missing", "symbols": missing, "shard_dir": str(shard_dir)}))
+    return {symbol: {"path": found[symbol], "rows": None} for symbol in selected}
+
+
+def _symbol_config(sim_argv: Sequence[str], symbol: str) -> "run_sim.RuntimeConfig":
+    """Prepare run_sim's config for ``symbol`` (re-targeting the manifest if needed)."""
+
+    args = run_sim.parse_args(list(sim_argv))
+    manifest = run_sim.load_manifest_cached(run_sim._resolve_repo_path(Path(args.manifest)))
+    declared = [inst for inst in manifest.strategy.instruments if _normalize_symbol(inst.symbol) == symbol]
+    if declared:
+        args.symbol = symbol
+        if not args.mode:
+            # Like run_sim without --symbol: the first listed instrument wins.
+            args.mode = getattr(declared[0], "mode", None) or "conservative"
+        return replace(run_sim._prepare_runtime_config(args), aggregate_ev=False)
+    config = run_sim._prepare_runtime_config(args)
+    return replace(
+        config,
+        symbol=symbol,
+        auto_state=False,
+        aggregate_ev=False,
+        ev_profile_path=None,
+        use_ev_profile=False,
+    )
+
+
+def _run_symbol(task: Mapping[str, Any], outputs: Optional[RunOutputWriter] = None) -> Dict[str, Any]:
+    symbol = task["symbol"]
+    symbol_dir = Path(task["out_dir"]) / symbol
+    sim_argv = [
+        "--manifest", task["manifest"],
+        *task["sim_argv"],
+        "--csv", str(task["csv"]),
+        "--out-dir", str(symbol_dir / "runs"),
+        "--json-out", str(symbol_dir / "metrics.json"),
+        "--out-daily-csv", str(symbol_dir / "daily.csv"),
+    ]
+    started = time.perf_counter()
+    config = _symbol_config(sim_argv, symbol)
+    exit_code = run_sim.run_with_config(
+        config,
+        command_line=["scripts/run_basket.py", "--symbol", symbol, *sim_argv],
+        outputs=outputs,
+    )
+    return {
+        "symbol": symbol,
+        "exit_code": exit_code,
+        "metrics_path": str(symbol_dir / "metrics.json"),
+        "daily_path": str(symbol_dir / "daily.csv"),
+        "records_format": config.records_format,
+        "elapsed_sec": round(time.perf_counter() - started, 3),
+    }
+
+
+def run_symbols(tasks: Sequence[Mapping[str, Any]], workers: int) -> List[Dict[str, Any]]:
+    """Run ``tasks`` across ``workers`` processes (in-process when ``workers <= 1``)."""
+
+    if workers <= 1 or len(tasks) <= 1:
+        # One shared writer lets the next symbol simulate while the previous
+        # symbol's files are still being written.
+        with RunOutputWriter() as outputs:
+            return [_run_symbol(task, outputs) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run_symbol, tasks))
+
+
+# -- merging ---------------------------------------------------------------------
+
+
+def _read_daily(path: Path) -> Dict[str, Dict[str, float]]:
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        return {
+            row["date"]: {key: float(value or 0.0) for key, value in row.items() if key != "date"}
+            for row in csv.DictReader(handle)
+        }
+
+
+def merge_daily(tables: Sequence[Mapping[str, Mapping[str, float]]]) -> Dict[str, Dict[str, float]]:
+    merged: Dict[str, Dict[str, float]] = {}
+    for table in tables:
+        for day, entry in table.items():
+            target = merged.setdefault(day, {})
+            for key, value in entry.items():
+                target[key] = target.get(key, 0.0) + float(value)
+    return merged
+
+
+def _curve_events(symbol: str, curve: Sequence[Sequence[Any]]) -> Iterator[tuple]:
+    for point in curve:
+        yield str(point[0]), symbol, float(point[1])
+
+
+def merge_equity_curves(
+    curves: Mapping[str, Sequence[Sequence[Any]]],
+    starting_equity: Optional[Mapping[str, float]] = None,
+) -> List[List[Any]]:
+    """Sum per-symbol equity curves into one step curve ordered by timestamp.
+
+    Until a symbol's first curve point, it contributes its starting equity
+    (``starting_equity[symbol]``), not the equity after its first trade.
+    Symbols without a known start fall back to their first curve point.
+    """
+
+    starts = starting_equity or {}
+    latest = {
+        symbol: float(starts[symbol]) if starts.get(symbol) is not None else float(curve[0][1])
+        for symbol, curve in curves.items()
+        if curve
+    }
+    total = sum(latest.values())
+    events = heapq.merge(
+        *(_curve_events(symbol, curve) for symbol, curve in curves.items()),
+        key=lambda event: event[0],
+    )
+    merged: List[List[Any]] = []
+    for ts, symbol, equity in events:
+        total += equity - latest[symbol]
+        latest[symbol] = equity
+        if merged and merged[-1][0] == ts:
+            merged[-1][1] = total
+        else:
+            merged.append([ts, total])
+    return merged
+
+
+def _iter_symbol_records(symbol: str, run_dir: Optional[str]) -> Iterator[Dict[str, Any]]:
+    if not run_dir:
+        return
+    from core.records_store import find_records_file, iter_records
+
+    path = find_records_file(run_dir)
+    if path is None:
+        return
+    for row in iter_records(path):
+        record = {key: value for key, value in row.items() if value not in (None, "")}
+        record.setdefault("symbol", symbol)
+        yield record
+
+
+def merge_records(run_dirs: Mapping[str, Optional[str]], out_base: Path, fmt: str) -> Optional[Path]:
+    from core.records_store import write_records
+
+    # Runner records are not time-ordered (trades land at exit, debug samples
+    # at the gate), so the merged table is sorted rather than k-way merged.
+    rows = sorted(
+        (record for symbol, run_dir in run_dirs.items() for record in _iter_symbol_records(symbol, run_dir)),
+        key=lambda record: str(record.get("ts") or ""),
+    )
+    if not rows:
+        return None
+    return write_records(out_base, rows, fmt=fmt)
+
+
+def build_portfolio(
+    per_symbol: Mapping[str, Mapping[str, Any]],
+    daily: Mapping[str, Mapping[str, float]],
+) -> Dict[str, Any]:
+    trades = sum(int(out.get("trades") or 0) for out in per_symbol.values())
+    wins = sum(float(out.get("wins") or 0.0) for out in per_symbol.values())
+    curve = merge_equity_curves(
+        {symbol: out.get("equity_curve") or [] for symbol, out in per_symbol.items()},
+        {symbol: out.get("equity") for symbol, out in per_symbol.items()},
+    )
+    drawdown = DrawdownTracker.from_values(equity for _, equity in curve)
+    daily_stats = RunningStats.from_values(daily[day].get("pnl_pips", 0.0) for day in sorted(daily))
+    # Same definition as run_param_sweep: mean / population std of daily pips,
+    # without the sqrt(n) scaling RunningStats.sharpe() applies per trade.
+    daily_std = math.sqrt(daily_stats.variance)
+    daily_sharpe = (daily_stats.mean / daily_std if daily_std else 0.0) if daily_stats.count else None
+    return {
+        "symbols": sorted(per_symbol),
+        "trades": trades,
+        "wins": wins,
+        "win_rate": wins / trades if trades else None,
+        "total_pips": sum(float(out.get("total_pips") or 0.0) for out in per_symbol.values()),
+        "total_pnl_value": sum(float(out.get("total_pnl_value") or 0.0) for out in per_symbol.values()),
+        "max_drawdown": drawdown.max_drawdown if drawdown.started else None,
+        "daily_sharpe": daily_sharpe,
+        "equity_curve": curve,
+    }
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> tuple[argparse.Namespace, List[str]]:
+    parser = argparse.ArgumentParser(
+        description="Run a manifest over several symbols in parallel and merge portfolio outputs",
+        allow_abbrev=False,
+    )
+    parser.add_argument("--manifest", required=True, help="Strategy manifest YAML")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--csv", help="Multi-symbol bars CSV (partitioned by symbol in one pass)")
+    source.add_argument("--shard-dir", help="Directory of existing per-symbol <SYMBOL>.csv shards")
+    parser.add_argument("--symbols", help="Comma-separated symbols (default: every symbol in the data)")
+    parser.add_argument("--out-dir", required=True, help="Basket output directory")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per symbol, capped at CPU count)")
+    parser.add_argument("--json-out", help="Also write the portfolio summary JSON here")
+    args, sim_argv = parser.parse_known_args(argv)
+    if sim_argv and sim_argv[0] == "--":
+        sim_argv = sim_argv[1:]
+    return args, sim_argv
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args, sim_argv = parse_args(argv)
+    started = time.perf_counter()
+    out_dir = Path(args.out_dir)
+    symbols = _parse_symbols(args.symbols)
+
+    if args.shard_dir:
+        shards = _existing_shards(Path(args.shard_dir), symbols)
+    else:
+        shards = partition_csv(Path(args.csv), out_dir / "shards", symbols=symbols)
+    if not shards:
+        print(json.dumps({"error": "no_bars"}))
+        return 1
+
+    tasks = [
+        {"symbol": symbol, "csv": str(info["path"]), "manifest": args.manifest, "sim_argv": sim_argv, "out_dir": str(out_dir)}
+        for symbol, info in shards.items()
+    ]
+    workers = args.workers if args.workers is not None else min(len(tasks), os.cpu_count() or 1)
+    results = run_symbols(tasks, workers)
+
+    per_symbol: Dict[str, Dict[str, Any]] = {}
+    daily_tables = []
+    for result in results:
+        metrics_path = Path(result["metrics_path"])
+        out = json.loads(metrics_path.read_text(encoding="utf-8")) if metrics_path.exists() else {}
+        out.update({"exit_code": result["exit_code"], "elapsed_sec": result["elapsed_sec"], "bars": shards[result["symbol"]]["rows"]})
+        per_symbol[result["symbol"]] = out
+        daily_tables.append(_read_daily(Path(result["daily_path"])))
+
+    daily = merge_daily(daily_tables)
+    portfolio = build_portfolio(per_symbol, daily)
+    if daily:
+        run_sim._write_daily_csv(out_dir / "daily.csv", daily)
+        portfolio["daily_path"] = str(out_dir / "daily.csv")
+    records_format = results[0]["records_format"] if results else "csv"
+    records_path = merge_records(
+        {symbol: out.get("run_dir") for symbol, out in per_symbol.items()},
+        out_dir / "records",
+        records_format,
+    )
+    if records_path is not None:
+        portfolio["records_path"] = str(records_path)
+    portfolio["per_symbol"] = {
+        symbol: {key: value for key, value in out.items() if key not in ("equity_curve", "debug")}
+        for symbol, out in per_symbol.items()
+    }
+    portfolio["workers"] = workers
+    portfolio["elapsed_sec"] = round(time.perf_counter() - started, 3)
+
+    rendered = json.dumps(portfolio, ensure_ascii=False, indent=2)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / "portfolio.json").write_text(rendered, encoding="utf-8")
+    if args.json_out:
+        Path(args.json_out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json_out).write_text(rendered, encoding="utf-8")
+    else:
+        print(rendered)
+    return max((int(result["exit_code"]) for result in results), default=0)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
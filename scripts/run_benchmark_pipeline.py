@@ -277,6 +277,12 @@ def parse_args(argv=None) -> argparse.Namespace:
         help="Abs diff in max_drawdown (pips) to trigger alert",
     )
     parser.add_argument("--webhook", default=None, help="Webhook URL(s) for alerts (comma separated)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Parallel processes for run_benchmark_runs (baseline + windows from in-memory bars)",
+    )
     parser.add_argument("--dry-run", action="store_true", help="Skip writes and subprocess execution")
     return parser.parse_args(argv)
 
@@ -314,6 +320,8 @@ def _build_benchmark_cmd(args: argparse.Namespace, snapshot_path: Path) -> List[
         cmd += ["--alert-max-drawdown", str(args.alert_max_drawdown)]
     if args.webhook:
         cmd += ["--webhook", args.webhook]
+    if args.workers > 1:
+        cmd += ["--workers", str(args.workers)]
     return cmd
 
 
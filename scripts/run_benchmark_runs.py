@@ -1,5 +1,12 @@
 #!/usr/bin/env python3
-"""Execute baseline and rolling benchmark simulations on demand."""
+"""Execute baseline and rolling benchmark simulations on demand.
+
+By default each simulation is a ``run_sim.py`` subprocess fed from a temp
+CSV. ``--workers N`` (N > 1) instead converts the already loaded rows to bars
+once, hands them to a process pool (one copy per worker, via the pool
+initializer) and runs the baseline and every rolling window concurrently,
+slicing the windows in memory and writing each metrics JSON directly.
+"""
 from __future__ import annotations
 
 import argparse
@@ -8,11 +15,13 @@ import json
 import subprocess
 import sys
 import tempfile
+import time
 import urllib.error
 import urllib.request
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 
 SNAPSHOT_PATH = Path("ops/runtime_snapshot.json")
@@ -235,6 +244,136 @@ def _run_sim(csv_path: Path, args: argparse.Namespace, json_out: Path,
     return result.returncode
 
 
+# -- in-memory parallel executor ---------------------------------------------------
+
+_WORKER_BARS: List[Dict[str, Any]] = []
+
+
+def _float_or_zero(value: Any) -> float:
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _bars_from_rows(rows: Iterable[dict], symbol: str) -> List[Dict[str, Any]]:
+    """Runner bars for ``symbol``, as run_sim would load them from ``_write_temp`` output."""
+
+    target = symbol.strip().upper()
+    bars: List[Dict[str, Any]] = []
+    for row in rows:
+        ts_raw = row.get("timestamp")
+        if not ts_raw:
+            continue
+        try:
+            prices = {key: float(row[key]) for key in ("o", "h", "l", "c")}
+        except (KeyError, TypeError, ValueError):
+            continue
+        row_symbol = str(row.get("symbol") or symbol).strip()
+        if row_symbol.upper() != target:
+            continue
+        bars.append(
+            {
+                "timestamp": ts_raw,
+                "symbol": row_symbol,
+                "tf": str(row.get("tf") or "5m").strip().lower() or "5m",
+                **prices,
+                "v": _float_or_zero(row.get("v")),
+                "spread": _float_or_zero(row.get("spread")),
+            }
+        )
+    return bars
+
+
+def _init_worker(bars: List[Dict[str, Any]]) -> None:
+    global _WORKER_BARS
+    _WORKER_BARS = bars
+
+
+def _simulate(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one benchmark simulation on the worker's bars and write its metrics JSON.
+
+    The runner is built from the benchmark flags alone (``build_runner_config``
+    and the default strategy; no manifest, EV profile or state archive). The
+    baseline run directory gets ``params.json``, ``daily.csv``,
+    ``metrics.json`` and ``checksums.json``; there is no ``session.log``
+    because no run_sim invocation or manifest exists to describe.
+    """
+
+    from core.runner import BacktestRunner
+    from scripts import run_sim
+    from scripts._run_outputs import RunOutputWriter, iter_csv_chunks, render_json, write_hashed
+    from scripts.config_utils import build_runner_config
+
+    args = task["args"]
+    started = time.perf_counter()
+    bars = _WORKER_BARS
+    if task.get("cutoff") is not None:
+        cutoff = datetime.fromisoformat(task["cutoff"])
+        bars = [bar for bar in bars if _parse_ts(bar["timestamp"]) >= cutoff]
+    try:
+        rcfg = build_runner_config(args)
+        runner = BacktestRunner(equity=args.equity, symbol=args.symbol, runner_cfg=rcfg)
+        metrics = runner.run(bars, mode=args.mode)
+        out = metrics.as_dict()
+        out["decay"] = runner.ev_global.decay
+        out["symbol"] = args.symbol
+        out["mode"] = args.mode
+        out["equity"] = args.equity
+        if task.get("run_base_dir"):
+            stamp = utcnow_aware(dt_cls=datetime).strftime("%Y%m%d_%H%M%S")
+            run_dir = Path(task["run_base_dir"]) / f"{args.symbol}_{args.mode}_{stamp}"
+            run_dir.mkdir(parents=True, exist_ok=True)
+            out["run_dir"] = str(run_dir)
+            params = {
+                "csv": task["bars_path"],
+                "symbol": args.symbol,
+                "mode": args.mode,
+                "equity": args.equity,
+                **run_sim._runner_config_snapshot(rcfg),
+            }
+            outputs = RunOutputWriter(background=False)
+            artifacts = {"params.json": outputs.write(run_dir / "params.json", render_json(params))}
+            daily = getattr(metrics, "daily", None)
+            if daily:
+                artifacts["daily.csv"] = outputs.write(
+                    run_dir / "daily.csv",
+                    iter_csv_chunks(run_sim.DAILY_CSV_COLUMNS, run_sim._daily_rows(daily)),
+                )
+            artifacts["metrics.json"] = outputs.write(run_dir / "metrics.json", render_json(out))
+            outputs.close()
+            run_sim._write_checksums(run_dir, artifacts)
+        write_hashed(Path(task["json_out"]), render_json(out))
+    except Exception as exc:
+        print(f"[benchmark] {task['label']} failed: {type(exc).__name__}: {exc}", file=sys.stderr)
+        return {"label": task["label"], "exit_code": 1}
+    return {
+        "label": task["label"],
+        "exit_code": 0,
+        "bars": len(bars),
+        "elapsed_sec": round(time.perf_counter() - started, 3),
+    }
+
+
+def run_parallel(
+    rows: List[dict],
+    args: argparse.Namespace,
+    tasks: List[Dict[str, Any]],
+    workers: int,
+) -> Dict[Any, Dict[str, Any]]:
+    """Run ``tasks`` (baseline + windows) across ``workers`` processes, keyed by label."""
+
+    bars = _bars_from_rows(rows, args.symbol)
+    for task in tasks:
+        task["args"] = args
+    with ProcessPoolExecutor(
+        max_workers=max(1, min(workers, len(tasks))),
+        initializer=_init_worker,
+        initargs=(bars,),
+    ) as pool:
+        return {result["label"]: result for result in pool.map(_simulate, tasks)}
+
+
 def parse_args(argv=None):
     parser = argparse.ArgumentParser(description="Run baseline + rolling benchmarks")
     parser.add_argument("--bars", default=None, help="CSV path (default: validated/<symbol>/5m.csv)")
@@ -275,6 +414,15 @@ def parse_args(argv=None):
     parser.add_argument("--include-expected-slip", action="store_true")
     parser.add_argument("--ev-mode", choices=["lcb", "off", "mean"], default=None)
     parser.add_argument("--size-floor", type=float, default=None)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Run baseline and windows concurrently in this many processes from in-memory bars "
+            "(default 1: sequential run_sim subprocesses)"
+        ),
+    )
     parser.add_argument("--dry-run", action="store_true")
     return parser.parse_args(argv)
 
@@ -305,8 +453,37 @@ def main(argv=None) -> int:
     runs_dir_path = Path(args.runs_dir) if args.runs_dir else None
     webhook_urls = _parse_webhook_urls(args.webhook)
 
+    windows = [int(x.strip()) for x in args.windows.split(',') if x.strip()]
+
     rc = 0
-    if not args.dry_run:
+    parallel_results: Optional[Dict[Any, Dict[str, Any]]] = None
+    if not args.dry_run and args.workers > 1:
+        latest = _parse_ts(rows[-1]["timestamp"])
+        tasks: List[Dict[str, Any]] = [
+            {
+                "label": "baseline",
+                "cutoff": None,
+                "json_out": str(baseline_out),
+                "run_base_dir": str(runs_dir_path) if runs_dir_path else None,
+                "bars_path": str(bars_path),
+            }
+        ]
+        for window in windows:
+            out_dir = reports_dir / "rolling" / str(window)
+            out_dir.mkdir(parents=True, exist_ok=True)
+            tasks.append(
+                {
+                    "label": window,
+                    "cutoff": (latest - timedelta(days=window)).isoformat(),
+                    "json_out": str(out_dir / f"{args.symbol}_{args.mode}.json"),
+                    "run_base_dir": None,
+                }
+            )
+        parallel_results = run_parallel(rows, args, tasks, args.workers)
+        rc = parallel_results["baseline"]["exit_code"]
+        if rc != 0:
+            return rc
+    elif not args.dry_run:
         rc = _run_sim(bars_path, args, baseline_out, out_dir=runs_dir_path)
         if rc != 0:
             return rc
@@ -357,11 +534,20 @@ def main(argv=None) -> int:
     elif not args.dry_run:
         alert_info = {"triggered": False, "reason": "no_previous_baseline"}
 
-    windows = [int(x.strip()) for x in args.windows.split(',') if x.strip()]
     tmp_files: List[Path] = []
     rolling_outputs: List[Dict[str, object]] = []
-    try:
+    if parallel_results is not None:
         for window in windows:
+            result = parallel_results[window]
+            if result["exit_code"] != 0:
+                return result["exit_code"]
+            json_out = reports_dir / "rolling" / str(window) / f"{args.symbol}_{args.mode}.json"
+            rolling_outputs.append({"window": window, "path": str(json_out)})
+        windows_to_run: List[int] = []
+    else:
+        windows_to_run = windows
+    try:
+        for window in windows_to_run:
             subset = _filter_window(rows, window)
             if not subset:
                 continue
@@ -7,6 +7,7 @@ import json
 import math
 import subprocess
 import sys
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from functools import partial
@@ -19,6 +20,15 @@ if str(ROOT) not in sys.path:
 
 from core.utils import yaml_compat as yaml
 from scripts import ingest_providers
+from scripts._automation_logging import (
+    AUTOMATION_SCHEMA_PATH,
+    AutomationLogError,
+    AutomationLogSchemaError,
+    generate_job_id,
+    log_automation_event,
+)
+from scripts._workflow_context import WorkflowContext, current as _current_workflow_context
+from scripts._workflow_dag import StageResult, WorkflowStage, run_dag
 from scripts._time_utils import (
     parse_naive_utc as _shared_parse_naive_utc,
     utcnow_naive as _shared_utcnow_naive,
@@ -48,6 +58,10 @@ _OBSERVABILITY_DASHBOARD_SUMMARY = ROOT / "reports/dashboard_export_summary.json
 
 _DAY_ORB_BUNDLE_CONFIG = ROOT / "configs/day_orb/optimization_bundle.yaml"
 
+_WORKFLOW_DAG_STATE = ROOT / "ops/workflow_dag_state.json"
+_WORKFLOW_DAG_LOG = ROOT / "ops/automation_runs.log"
+_WORKFLOW_DAG_STATUS = {"ok": "ok", "error": "error", "cached": "skipped", "blocked": "skipped"}
+
 
 @dataclass
 class DayOrbStepResult:
@@ -1220,6 +1234,13 @@ def _finalize_ingest_result(
     return result, 0
 
 
+def _fetch_cache_kwargs(args: argparse.Namespace) -> Dict[str, object]:
+    """``cache_dir`` for provider fetchers, passed only with ``--fetch-cache-dir``."""
+
+    cache_dir = getattr(args, "fetch_cache_dir", None)
+    return {"cache_dir": Path(cache_dir)} if cache_dir else {}
+
+
 def _run_dukascopy_ingest(
     ctx: IngestContext,
     args: argparse.Namespace,
@@ -1254,6 +1275,7 @@ def _run_dukascopy_ingest(
         offer_side=offer_side,
         init_error=init_error,
         freshness_threshold=args.dukascopy_freshness_threshold_minutes,
+        **_fetch_cache_kwargs(args),
     )
 
     fallback_runner = _build_yfinance_fallback(
@@ -1327,6 +1349,7 @@ def _run_yfinance_ingest(
             start=start,
             end=now,
             empty_reason="yfinance ingestion returned no rows",
+            **_fetch_cache_kwargs(args),
         )
 
     result, source_label = _ingest_with_provider(
@@ -1390,6 +1413,8 @@ def _run_api_ingest(
 
         fetch_callable = _missing_api
     else:
+        api_kwargs = _fetch_cache_kwargs(args)
+
         def _api_fetch() -> Iterable[Dict[str, object]]:
             records = list(
                 fetch_prices(
@@ -1400,6 +1425,7 @@ def _run_api_ingest(
                     provider=args.api_provider,
                     config_path=args.api_config,
                     credentials_path=args.api_credentials,
+                    **api_kwargs,
                 )
             )
             if not records:
@@ -1427,12 +1453,27 @@ def _run_api_ingest(
         empty_message="[wf] API ingestion produced no result",
     )
 
-def run_cmd(cmd, *, cwd: Path = ROOT):
+def run_cmd(cmd, *, cwd: Path = ROOT, in_process: bool = True):
+    """Run a workflow step, in-process when a ``WorkflowContext`` is active.
+
+    Repository scripts invoked with the current interpreter are dispatched to
+    their ``main(argv)``; anything else (and every step under
+    ``--subprocess-stages`` or with ``in_process=False``) is spawned with
+    ``cwd``. Callers running steps concurrently must pass
+    ``in_process=False``: in-process steps share stdout, the working
+    directory and module globals.
+    """
+
     print(f"[wf] running: {' '.join(cmd)}")
-    result = subprocess.run(cmd, check=False, cwd=cwd)
-    if result.returncode != 0:
-        print(f"[wf] command failed with exit code {result.returncode}")
-    return result.returncode
+    context = _current_workflow_context()
+    returncode = None
+    if in_process and context is not None and Path(cwd).resolve() == context.root:
+        returncode = context.run_main(cmd, python=sys.executable)
+    if returncode is None:
+        returncode = subprocess.run(cmd, check=False, cwd=cwd).returncode
+    if returncode != 0:
+        print(f"[wf] command failed with exit code {returncode}")
+    return returncode
 
 
 def _apply_alert_threshold_args(cmd, args):
@@ -1478,6 +1519,8 @@ def _build_benchmark_pipeline_cmd(args, bars_csv):
     _apply_benchmark_threshold_args(cmd, args)
     if args.webhook:
         cmd.extend(["--webhook", args.webhook])
+    if args.benchmark_workers > 1:
+        cmd.extend(["--workers", str(args.benchmark_workers)])
     return cmd
 
 
@@ -1699,11 +1742,9 @@ def _load_observability_config(path: Optional[Path]) -> Mapping[str, Any]:
     if path is None:
         return {}
     try:
-        text = path.read_text(encoding="utf-8")
+        loaded = yaml.load_file(path) or {}
     except FileNotFoundError:
         return {}
-    try:
-        loaded = yaml.safe_load(text) or {}
     except Exception:
         return {}
     if not isinstance(loaded, Mapping):
@@ -1755,7 +1796,9 @@ def _extract_observability_argv(section: Mapping[str, Any]) -> List[str]:
     return argv
 
 
-def _run_observability_chain(args: argparse.Namespace) -> int:
+def _observability_commands(args: argparse.Namespace) -> List[tuple[str, List[str]]]:
+    """Return ``(step, argv)`` for each enabled observability step, in chain order."""
+
     config_path_value = _resolve_path_argument(
         getattr(args, "observability_config", None),
         default=_OBSERVABILITY_AUTOMATION_CONFIG,
@@ -1775,6 +1818,7 @@ def _run_observability_chain(args: argparse.Namespace) -> int:
 
     dry_run = bool(getattr(args, "dry_run", False))
 
+    commands: List[tuple[str, List[str]]] = []
     for name, builder in steps:
         section = config.get(name, {}) if isinstance(config, Mapping) else {}
         if isinstance(section, Mapping) and section.get("enabled") is False:
@@ -1786,6 +1830,12 @@ def _run_observability_chain(args: argparse.Namespace) -> int:
             for flag in _OBSERVABILITY_DRY_RUN_FLAGS.get(name, []):
                 if flag not in cmd:
                     cmd.append(flag)
+        commands.append((name, cmd))
+    return commands
+
+
+def _run_observability_chain(args: argparse.Namespace) -> int:
+    for _name, cmd in _observability_commands(args):
         exit_code = run_cmd(cmd)
         if exit_code:
             return exit_code
@@ -1814,6 +1864,212 @@ def _build_state_health_cmd():
     ]
 
 
+def _build_workflow_stages(args: argparse.Namespace, bars_csv: str) -> List[WorkflowStage]:
+    """Declare the enabled post-ingest steps for ``--dag-workers``.
+
+    Stages are listed in the sequential order used by ``main``. Paths are
+    deliberately coarse (a directory when a tool writes several files under
+    it) so derived edges never allow an interleaving the sequential run would
+    not produce. Only steps whose result is a pure function of their inputs
+    are ``cacheable``; alerting, history and freshness steps always run.
+    """
+
+    bars = Path(bars_csv)
+    runs_dir = ROOT / "runs"
+    state_json = ROOT / "runs/active/state.json"
+    snapshot = ROOT / "ops/runtime_snapshot.json"
+    latency_inputs = (ROOT / "ops/signal_latency.csv", ROOT / "configs/observability/latency_alert.yaml")
+    latency_outputs = (
+        ROOT / "ops/signal_latency_rollup.csv",
+        ROOT / "ops/latency_job_heartbeat.json",
+        ROOT / "ops/signal_latency_archive",
+        ROOT / "ops/.latency.lock",
+        ROOT / "reports/signal_latency_summary.json",
+    )
+    observability_paths = {
+        "latency": (latency_inputs, latency_outputs, ()),
+        "weekly": (
+            (
+                _OBSERVABILITY_WEEKLY_CONFIG,
+                runs_dir,
+                ROOT / "reports/portfolio_summary.json",
+                ROOT / "reports/benchmark_summary.json",
+                ROOT / "ops/health/state_checks.json",
+                ROOT / "ops/signal_latency_rollup.csv",
+            ),
+            (_OBSERVABILITY_WEEKLY_SUMMARY,),
+            ("latency",),
+        ),
+        "dashboard": (
+            (
+                _OBSERVABILITY_DASHBOARD_CONFIG,
+                runs_dir,
+                ROOT / "ops/state_archive",
+                ROOT / "reports/portfolio_samples",
+                ROOT / "ops/signal_latency_rollup.csv",
+            ),
+            (
+                ROOT / "ops/dashboard_export_heartbeat.json",
+                ROOT / "ops/dashboard_export_history",
+                ROOT / "ops/dashboard_export_archive_manifest.jsonl",
+                _OBSERVABILITY_DASHBOARD_SUMMARY,
+            ),
+            ("weekly",),
+        ),
+    }
+
+    stages: List[WorkflowStage] = []
+    if args.observability:
+        for name, cmd in _observability_commands(args):
+            inputs, outputs, after = observability_paths[name]
+            stages.append(
+                WorkflowStage(name, partial(list, cmd), inputs=inputs, outputs=outputs, after=after)
+            )
+
+    data_quality_outputs = tuple(
+        path for path in _resolve_data_quality_outputs(args, bars_csv=bars_csv).values() if path is not None
+    )
+    candidates = [
+        (
+            args.check_data_quality,
+            WorkflowStage(
+                "data_quality",
+                lambda: _build_data_quality_cmd(args, bars_csv),
+                inputs=(bars,),
+                outputs=data_quality_outputs,
+                cacheable=True,
+            ),
+        ),
+        (
+            args.update_state,
+            WorkflowStage(
+                "update_state",
+                lambda: _build_update_state_cmd(args, bars_csv),
+                inputs=(bars,),
+                outputs=(state_json,),
+                cacheable=True,
+            ),
+        ),
+        (
+            args.benchmarks,
+            WorkflowStage(
+                "benchmarks",
+                lambda: _build_benchmark_pipeline_cmd(args, bars_csv),
+                inputs=(bars,),
+                outputs=(ROOT / "reports", runs_dir, snapshot),
+            ),
+        ),
+        (
+            args.state_health,
+            WorkflowStage(
+                "state_health",
+                _build_state_health_cmd,
+                inputs=(state_json,),
+                outputs=(ROOT / "ops/health/state_checks.json",),
+            ),
+        ),
+        (
+            args.benchmark_summary,
+            WorkflowStage(
+                "benchmark_summary",
+                lambda: _build_benchmark_summary_cmd(args),
+                inputs=(ROOT / "reports/baseline", ROOT / "reports/rolling"),
+                outputs=(ROOT / "reports/benchmark_summary.json", ROOT / "reports/benchmark_summary.png"),
+                cacheable=True,
+            ),
+        ),
+        (
+            args.check_benchmark_freshness,
+            WorkflowStage(
+                "benchmark_freshness",
+                lambda: _build_benchmark_freshness_cmd(args),
+                inputs=(snapshot,),
+            ),
+        ),
+        (
+            args.optimize,
+            WorkflowStage(
+                "optimize",
+                lambda: _build_optimize_cmd(args),
+                inputs=(Path(_resolve_optimize_csv_path(args.symbol, args.bars)),),
+                outputs=(ROOT / "reports/auto_optimize.json", runs_dir),
+                cacheable=True,
+            ),
+        ),
+        (
+            args.analyze_latency and not args.observability,
+            WorkflowStage(
+                "latency", _build_analyze_latency_cmd, inputs=latency_inputs, outputs=latency_outputs
+            ),
+        ),
+        (
+            args.archive_state,
+            WorkflowStage(
+                "archive_state",
+                _build_archive_state_cmd,
+                inputs=(runs_dir,),
+                outputs=(ROOT / "ops/state_archive",),
+            ),
+        ),
+    ]
+    stages.extend(stage for enabled, stage in candidates if enabled)
+    return stages
+
+
+def _log_workflow_stage(log_path: Path, result: StageResult) -> None:
+    diagnostics = result.as_dict()
+    try:
+        log_automation_event(
+            generate_job_id(f"daily-workflow-{result.name}"),
+            _WORKFLOW_DAG_STATUS[result.status],
+            log_path=log_path,
+            schema_path=ROOT / AUTOMATION_SCHEMA_PATH,
+            duration_ms=result.duration_ms,
+            diagnostics=diagnostics,
+        )
+    except (AutomationLogError, AutomationLogSchemaError, OSError) as exc:
+        print(f"[wf] failed to log stage {result.name}: {exc}")
+
+
+def _run_workflow_dag(args: argparse.Namespace, bars_csv: str) -> int:
+    stages = _build_workflow_stages(args, bars_csv)
+    if not stages:
+        return 0
+    log_path = _resolve_path_argument(args.dag_log, default=_WORKFLOW_DAG_LOG)
+    state_path = _resolve_path_argument(args.dag_state, default=_WORKFLOW_DAG_STATE)
+    # Parallel stages are spawned; only a sequential DAG runs steps in-process.
+    in_process = args.dag_workers <= 1
+    run = run_dag(
+        stages,
+        runner=lambda cmd: run_cmd(cmd, in_process=in_process),
+        workers=args.dag_workers,
+        state_path=state_path,
+        force=args.dag_force,
+        on_result=partial(_log_workflow_stage, log_path),
+    )
+    busy_ms = sum(result.duration_ms for result in run.results.values())
+    print(
+        f"[wf] dag finished in {run.wall_ms} ms "
+        f"(stage time {busy_ms} ms, workers={args.dag_workers})"
+    )
+    try:
+        log_automation_event(
+            generate_job_id("daily-workflow"),
+            "ok" if run.exit_code == 0 else "error",
+            log_path=log_path,
+            schema_path=ROOT / AUTOMATION_SCHEMA_PATH,
+            duration_ms=run.wall_ms,
+            diagnostics={
+                "workers": args.dag_workers,
+                "stage_ms": busy_ms,
+                "stages": {name: result.status for name, result in run.results.items()},
+            },
+        )
+    except (AutomationLogError, AutomationLogSchemaError, OSError) as exc:
+        print(f"[wf] failed to log workflow summary: {exc}")
+    return run.exit_code
+
+
 def _build_pull_prices_cmd(args, *, source_override: Optional[Path] = None):
     from scripts import pull_prices
 
@@ -2018,6 +2274,11 @@ def main(argv=None) -> int:
         default=None,
         help="Override history window when using API ingestion",
     )
+    parser.add_argument(
+        "--fetch-cache-dir",
+        default=None,
+        help="Cache provider responses per time chunk under this directory (scripts/_fetch_cache.py)",
+    )
     parser.add_argument("--update-state", action="store_true", help="Replay new bars and update state.json")
     parser.add_argument("--benchmarks", action="store_true", help="Run baseline + rolling benchmarks")
     parser.add_argument("--state-health", action="store_true", help="Run state health checker")
@@ -2110,6 +2371,12 @@ def main(argv=None) -> int:
         help="Override webhook delivery timeout (seconds) for data quality alerts",
     )
     parser.add_argument("--benchmark-windows", default="365,180,90", help="Rolling windows in days for benchmarks")
+    parser.add_argument(
+        "--benchmark-workers",
+        type=int,
+        default=1,
+        help="Run the benchmark baseline and rolling windows concurrently in this many processes",
+    )
     parser.add_argument(
         "--min-sharpe",
         type=float,
@@ -2217,6 +2484,39 @@ def main(argv=None) -> int:
         default=None,
         help="Comma-separated symbol:mode targets for freshness checks",
     )
+    parser.add_argument(
+        "--subprocess-stages",
+        action="store_true",
+        help=(
+            "Spawn a separate interpreter per step instead of calling each script's main() "
+            "in-process with shared loaded bars (always the case with --dag-workers > 1). "
+            "Shared bars CSVs up to 128 MiB stay parsed in memory for the whole run"
+        ),
+    )
+    parser.add_argument(
+        "--dag-workers",
+        type=int,
+        default=None,
+        help=(
+            "Run the post-ingest steps as a dependency graph with this many concurrent "
+            "stages (default: sequential)"
+        ),
+    )
+    parser.add_argument(
+        "--dag-state",
+        default=None,
+        help="Stage fingerprint state for --dag-workers (default: ops/workflow_dag_state.json)",
+    )
+    parser.add_argument(
+        "--dag-force",
+        action="store_true",
+        help="Run cacheable stages even when their inputs are unchanged",
+    )
+    parser.add_argument(
+        "--dag-log",
+        default=None,
+        help="Automation log receiving per-stage timings (default: ops/automation_runs.log)",
+    )
     args = parser.parse_args(argv)
 
     local_backup_path = _resolve_path_argument(args.local_backup_csv)
@@ -2267,8 +2567,32 @@ def main(argv=None) -> int:
         raise SystemExit(
             "--data-quality-duplicate-occurrences-threshold must be at least 0"
         )
+    if args.dag_workers is not None and args.dag_workers < 1:
+        raise SystemExit("--dag-workers must be at least 1")
+
+    context = None if args.subprocess_stages else WorkflowContext(ROOT)
+    with context.activate() if context is not None else nullcontext():
+        exit_code = _run_workflow(
+            args,
+            bars_csv=bars_csv,
+            local_backup_path=local_backup_path,
+            synthetic_allowed=synthetic_allowed,
+        )
+    if context is not None and context.stats["inprocess"]:
+        print(
+            f"[wf] in-process steps: {context.stats['inprocess']} "
+            f"(shared data cache hits={context.stats['hits']} misses={context.stats['misses']})"
+        )
+    return exit_code
 
 
+def _run_workflow(
+    args: argparse.Namespace,
+    *,
+    bars_csv: str,
+    local_backup_path: Optional[Path],
+    synthetic_allowed: bool,
+) -> int:
     if args.day_orb_optimization:
         exit_code = _run_day_orb_bundle(args)
         if exit_code:
@@ -2282,6 +2606,8 @@ def main(argv=None) -> int:
         )
         if exit_code:
             return exit_code
+    if args.dag_workers is not None:
+        return _run_workflow_dag(args, bars_csv)
     if args.observability:
         exit_code = _run_observability_chain(args)
         if exit_code:
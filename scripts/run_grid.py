@@ -17,10 +17,10 @@ import csv
 import json
 import os
 import sys
-from dataclasses import replace
+from dataclasses import asdict, replace
 from itertools import product
 from time import strftime
-from typing import List, Dict, Any
+from typing import Any, Dict, List, Optional
 
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if ROOT not in sys.path:
@@ -28,6 +28,7 @@ if ROOT not in sys.path:
 
 from scripts.run_sim import load_bars_csv
 from scripts.config_utils import build_runner_config
+from scripts._trial_cache import DEFAULT_CACHE_PATH, TrialCache, code_version, trial_key
 from core.runner import BacktestRunner, RunnerConfig
 
 
@@ -68,6 +69,9 @@ def parse_args(argv=None):
     p.add_argument("--load-state", default=None, help="Path to baseline state.json to load for each trial")
     p.add_argument("--ev-mode", default=None, choices=["lcb","off","mean"])
     p.add_argument("--size-floor", type=float, default=None)
+    p.add_argument("--trial-cache", nargs="?", const=str(DEFAULT_CACHE_PATH), default=None,
+                   help="Enable the SQLite trial result cache (PATH defaults to runs/trial_cache.sqlite3)")
+    p.add_argument("--no-trial-cache", action="store_true", help="Always simulate; skip the trial cache")
     return p.parse_args(argv)
 
 
@@ -187,6 +191,14 @@ def run_grid(argv=None) -> Dict[str,Any]:
     ktp_vals = parse_list_floats(args.k_tp)
     ksl_vals = parse_list_floats(args.k_sl)
 
+    cache = TrialCache(args.trial_cache) if args.trial_cache and not args.no_trial_cache else None
+    dataset_sha = cache.file_sha256(args.csv) if cache is not None else None
+    load_state_sha = cache.file_sha256(args.load_state) if cache is not None and args.load_state else None
+
+    # One prepared runner is reused across combos: reset() swaps the strategy
+    # params and keeps fill engines, the compiled EV profile and loaded state.
+    runner: Optional[BacktestRunner] = None
+
     combos = list(product(or_vals, ktp_vals, ksl_vals))
     total = len(combos)
     start_ts = __import__("time").time()
@@ -208,10 +220,33 @@ def run_grid(argv=None) -> Dict[str,Any]:
             ev_mode=(args.ev_mode or rcfg_base.ev_mode),
             size_floor_mult=(args.size_floor if args.size_floor is not None else rcfg_base.size_floor_mult),
         )
-        runner = BacktestRunner(equity=args.equity, symbol=symbol, runner_cfg=rcfg, debug=args.dump_daily, debug_sample_limit=0)
-        if args.load_state:
-            runner.load_state_file(args.load_state)
-        metrics = runner.run(bars, mode=args.mode)
+        cache_key = None
+        cached = None
+        if cache is not None and dataset_sha is not None:
+            key_params = {
+                "symbol": symbol, "mode": args.mode, "equity": args.equity,
+                "runner_config": asdict(rcfg), "load_state_sha256": load_state_sha,
+                "dump_daily": bool(args.dump_daily),
+            }
+            cache_key = trial_key(entry="run_grid", dataset_sha256=dataset_sha, params=key_params, code=code_version())
+            cached = cache.get(cache_key)
+        if cached is not None:
+            metrics, state_blob = cached
+        else:
+            if runner is None:
+                runner = BacktestRunner(equity=args.equity, symbol=symbol, runner_cfg=rcfg, debug=args.dump_daily, debug_sample_limit=0)
+                if args.load_state:
+                    runner.load_state_file(args.load_state)
+            runner.reset({"or_n": or_n, "k_tp": k_tp, "k_sl": k_sl})
+            metrics = runner.replay(bars, mode=args.mode)
+            # export state for index and persistence
+            state_blob = None
+            try:
+                state_blob = runner.export_state()
+            except Exception:
+                state_blob = None
+            if cache_key is not None:
+                cache.put(cache_key, (metrics, state_blob), entry="run_grid", dataset_sha256=dataset_sha, params=key_params)
         params = {
             "csv": args.csv, "symbol": symbol, "equity": args.equity,
             "mode": args.mode, "or_n": or_n, "k_tp": k_tp, "k_sl": k_sl,
@@ -219,12 +254,6 @@ def run_grid(argv=None) -> Dict[str,Any]:
             "rv_cuts": args.rv_cuts, "allow_low_rv": args.allow_low_rv, "allowed_sessions": args.allowed_sessions,
             "warmup": args.warmup,
         }
-        # export state for index and persistence
-        state_blob = None
-        try:
-            state_blob = runner.export_state()
-        except Exception:
-            state_blob = None
         run_dir = save_run(args.out_dir, symbol, args.mode, params, metrics, state_blob)
 
         results.append({
@@ -240,6 +269,8 @@ def run_grid(argv=None) -> Dict[str,Any]:
         "out_dir": args.out_dir,
         "mode": args.mode,
     }
+    if cache is not None:
+        summary["trial_cache"] = cache.stats()
     print(json.dumps(summary, ensure_ascii=False))
     return summary
 
@@ -6,23 +6,69 @@ import json
 import optuna
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
+from scripts._sweep_pruning import watch_process  # noqa: E402
+from scripts._trial_cache import DEFAULT_CACHE_PATH, TrialCache, run_sim_argv  # noqa: E402
 
-def run_sim(args_list):
+
+def run_sim(args_list, trial=None, progress_every="quarter", cache=None):
     cmd = [sys.executable, str(ROOT / "scripts/run_sim.py")] + args_list
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
+    lookup = cache.lookup_run_sim(run_sim_argv(cmd)) if cache is not None else None
+    if lookup is not None and lookup.hit:
+        returncode, stdout = 0, cache.restore_run_sim(lookup)
+    elif trial is None:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        returncode, stdout = result.returncode, result.stdout
+    else:
+        returncode, stdout = _run_sim_reporting(cmd, trial, progress_every)
+    if lookup is not None and not lookup.hit and returncode == 0:
+        cache.store_run_sim(lookup, stdout)
+    if returncode != 0:
         return None
     try:
-        return json.loads(result.stdout.strip())
+        return json.loads(stdout.strip())
     except json.JSONDecodeError:
         return None
 
 
-def objective(trial, base_args):
+def _run_sim_reporting(cmd, trial, progress_every):
+    """Run ``cmd`` reporting quarterly -total_pips to ``trial`` for pruning."""
+
+    def on_progress(record):
+        trial.report(-float(record["metrics"].get("total_pips", 0.0)), int(record["step"]))
+        return True if trial.should_prune() else None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        progress_path = Path(tmp) / "progress.jsonl"
+        stdout_path = Path(tmp) / "stdout.json"
+        with stdout_path.open("w", encoding="utf-8") as stdout:
+            returncode, pruned = watch_process(
+                cmd + ["--progress-out", str(progress_path), "--progress-every", progress_every],
+                progress_path=progress_path,
+                on_progress=on_progress,
+                stdout=stdout,
+                stderr=subprocess.DEVNULL,
+            )
+        if pruned:
+            raise optuna.TrialPruned()
+        return returncode, stdout_path.read_text(encoding="utf-8")
+
+
+def build_pruner(name, warmup_steps):
+    if name == "median":
+        return optuna.pruners.MedianPruner(n_warmup_steps=warmup_steps)
+    if name == "halving":
+        return optuna.pruners.SuccessiveHalvingPruner()
+    return optuna.pruners.NopPruner()
+
+
+def objective(trial, base_args, pruner="none", progress_every="quarter", cache=None):
     or_n = trial.suggest_int("or_n", 4, 8)
     k_tp = trial.suggest_float("k_tp", 0.8, 1.2)
     k_sl = trial.suggest_float("k_sl", 0.4, 0.8)
@@ -34,7 +80,7 @@ def objective(trial, base_args):
         "--k-sl", f"{k_sl:.2f}",
         "--threshold-lcb", f"{threshold:.2f}",
     ]
-    metrics = run_sim(run_args)
+    metrics = run_sim(run_args, trial if pruner != "none" else None, progress_every, cache)
     if not metrics:
         return float("inf")
     total_pips = metrics.get("total_pips", 0.0)
@@ -46,6 +92,17 @@ def parse_args(argv=None):
     p = argparse.ArgumentParser(description="Optuna hyperparameter search")
     p.add_argument("--trials", type=int, default=10)
     p.add_argument("--out", default="analysis/optuna_best.json")
+    p.add_argument("--pruner", choices=("none", "median", "halving"), default="none",
+                   help="stop unpromising trials early from run_sim progress reports")
+    p.add_argument("--progress-every", choices=("month", "quarter", "year"), default="quarter",
+                   help="period between intermediate reports when pruning")
+    p.add_argument("--warmup-steps", type=int, default=2,
+                   help="reports to wait before the median pruner may stop a trial")
+    p.add_argument("--trial-cache", nargs="?", const=str(DEFAULT_CACHE_PATH), default=None,
+                   help="enable the SQLite trial result cache shared with run_param_sweep/run_grid"
+                        " (PATH defaults to runs/trial_cache.sqlite3)")
+    p.add_argument("--no-trial-cache", action="store_true",
+                   help="always simulate, neither reading nor writing the trial cache")
     p.add_argument("--base-args", nargs=argparse.REMAINDER,
                    default=["--csv", "data/usdjpy_5m_2018-2024_utc.csv",
                             "--symbol", "USDJPY",
@@ -57,8 +114,12 @@ def parse_args(argv=None):
 
 def main(argv=None) -> int:
     args = parse_args(argv)
-    study = optuna.create_study(direction="minimize")
-    study.optimize(lambda t: objective(t, args.base_args), n_trials=args.trials)
+    study = optuna.create_study(direction="minimize", pruner=build_pruner(args.pruner, args.warmup_steps))
+    cache = TrialCache(args.trial_cache) if args.trial_cache and not args.no_trial_cache else None
+    study.optimize(
+        lambda t: objective(t, args.base_args, args.pruner, args.progress_every, cache),
+        n_trials=args.trials,
+    )
     Path(args.out).write_text(json.dumps({"best_params": study.best_params, "best_value": study.best_value}, ensure_ascii=False, indent=2), encoding="utf-8")
     print(json.dumps({"best_params": study.best_params, "best_value": study.best_value}, ensure_ascii=False, indent=2))
     return 0
@@ -10,11 +10,13 @@ import random
 import shlex
 import subprocess
 import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 try:
     import pandas as pd
@@ -36,7 +38,9 @@ from scripts._param_sweep import (  # noqa: E402
     evaluate_constraints,
     load_experiment_config,
 )
+from scripts._sweep_pruning import TrialPruner, watch_process  # noqa: E402
 from scripts._time_utils import utcnow_aware, utcnow_iso  # noqa: E402
+from scripts._trial_cache import DEFAULT_CACHE_PATH, TrialCache, run_sim_argv  # noqa: E402
 
 
 @dataclass
@@ -76,6 +80,24 @@ def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser.add_argument("--seed", type=int, help="Random seed for sampling order")
     parser.add_argument("--log-history", action="store_true", help="Log runs to experiments/history")
     parser.add_argument("--dry-run", action="store_true", help="Plan trials without executing run_sim")
+    parser.add_argument(
+        "--trial-cache",
+        nargs="?",
+        const=str(DEFAULT_CACHE_PATH),
+        default=None,
+        help="Enable the SQLite trial result cache shared by sweep/grid/optuna entry points"
+        " (PATH defaults to runs/trial_cache.sqlite3)",
+    )
+    parser.add_argument(
+        "--no-trial-cache",
+        action="store_true",
+        help="Always simulate, neither reading nor writing the trial result cache",
+    )
+    parser.add_argument(
+        "--no-prune",
+        action="store_true",
+        help="Ignore the experiment's pruning section and run every trial to completion",
+    )
     parser.add_argument(
         "--portfolio-config",
         help="Optional portfolio configuration override (YAML file or inline mapping)",
@@ -328,8 +350,23 @@ class SweepRunner:
         self.dataset_path = self._discover_dataset_path()
         self.dataset_fingerprint = self._compute_dataset_fingerprint()
         self.portfolio_config = self._resolve_portfolio_config()
-        self._portfolio_metrics_cache: Dict[Path, Dict[str, Any]] = {}
+        self._portfolio_metrics_cache: Dict[Path, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
         self.active_constraints = self.config.constraints_for(self.portfolio_config)
+        self.pruner: Optional[TrialPruner] = None
+        pruning = self.config.pruning
+        if pruning is not None and pruning.enabled and not getattr(args, "no_prune", False):
+            self.pruner = TrialPruner(pruning, self.config, self.active_constraints)
+        self.trial_cache: Optional[TrialCache] = None
+        self._trial_cache_lock = threading.Lock()
+
+    def _get_trial_cache(self) -> Optional[TrialCache]:
+        path = getattr(self.args, "trial_cache", None)
+        if self.args.dry_run or not path or getattr(self.args, "no_trial_cache", False):
+            return None
+        with self._trial_cache_lock:
+            if self.trial_cache is None:
+                self.trial_cache = TrialCache(path)
+            return self.trial_cache
 
     def _apply_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
         manifest_data = copy.deepcopy(self.base_manifest_data)
@@ -409,9 +446,14 @@ class SweepRunner:
 
     def _load_portfolio_metrics(self, path: Path) -> Optional[Mapping[str, Any]]:
         cache_key = path.resolve()
+        try:
+            stat = cache_key.stat()
+        except FileNotFoundError:
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
         cached = self._portfolio_metrics_cache.get(cache_key)
-        if cached is not None:
-            return cached
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
         try:
             payload = json.loads(cache_key.read_text(encoding="utf-8"))
         except FileNotFoundError:
@@ -420,8 +462,8 @@ class SweepRunner:
             return None
         if not isinstance(payload, Mapping):
             return None
-        self._portfolio_metrics_cache[cache_key] = dict(payload)
-        return self._portfolio_metrics_cache[cache_key]
+        self._portfolio_metrics_cache[cache_key] = (stamp, dict(payload))
+        return self._portfolio_metrics_cache[cache_key][1]
 
     def _compute_portfolio_report(
         self,
@@ -607,6 +649,11 @@ class SweepRunner:
         manifest_override.write_text(yaml.safe_dump(manifest_data, sort_keys=False), encoding="utf-8")
         _write_json(params_path, spec.params)
         command = self._build_command(manifest_override, trial_dir)
+        progress_path = trial_dir / "progress.jsonl"
+        if self.pruner is not None:
+            command.extend(
+                ["--progress-out", str(progress_path), "--progress-every", self.pruner.config.period]
+            )
         command_str = _shlex_join(command)
         start_time = utcnow_aware()
         metadata: Dict[str, Any] = {
@@ -628,25 +675,48 @@ class SweepRunner:
             metadata.update({"status": "dry_run", "duration_seconds": 0.0})
             _write_json(result_path, metadata)
             return TrialResult(spec=spec, status="dry_run", result_path=result_path, payload=metadata)
-        process = subprocess.run(
-            command,
-            cwd=self.repo_root,
-            capture_output=True,
-            text=True,
-        )
-        stdout_path.write_text(process.stdout or "", encoding="utf-8")
-        stderr_path.write_text(process.stderr or "", encoding="utf-8")
+        verdict: Optional[Dict[str, Any]] = None
+        trial_cache = self._get_trial_cache()
+        lookup = trial_cache.lookup_run_sim(run_sim_argv(command)) if trial_cache else None
+        if trial_cache is not None and lookup is not None and lookup.hit:
+            stdout_path.write_text(trial_cache.restore_run_sim(lookup), encoding="utf-8")
+            stderr_path.write_text("", encoding="utf-8")
+            returncode = 0
+        elif self.pruner is not None:
+            returncode, verdict = self._run_with_pruning(
+                command, spec, progress_path, stdout_path, stderr_path
+            )
+        else:
+            process = subprocess.run(
+                command,
+                cwd=self.repo_root,
+                capture_output=True,
+                text=True,
+            )
+            stdout_path.write_text(process.stdout or "", encoding="utf-8")
+            stderr_path.write_text(process.stderr or "", encoding="utf-8")
+            returncode = process.returncode
+        if lookup is not None and lookup.key is not None:
+            metadata["trial_cache"] = {"key": lookup.key, "hit": lookup.hit}
+            if not lookup.hit and returncode == 0 and verdict is None:
+                trial_cache.store_run_sim(lookup, stdout_path.read_text(encoding="utf-8"))
         end_time = utcnow_aware()
         metadata.update(
             {
                 "stdout": _relative_path(stdout_path),
                 "stderr": _relative_path(stderr_path),
-                "returncode": process.returncode,
+                "returncode": returncode,
                 "end_time": end_time.isoformat(),
                 "duration_seconds": (end_time - start_time).total_seconds(),
             }
         )
-        if process.returncode != 0:
+        if verdict is not None:
+            metadata.update(
+                {"status": "pruned", "pruned": verdict, "progress": _relative_path(progress_path)}
+            )
+            _write_json(result_path, metadata)
+            return TrialResult(spec=spec, status="pruned", result_path=result_path, payload=metadata)
+        if returncode != 0:
             metadata.update({"status": "failed"})
             _write_json(result_path, metadata)
             return TrialResult(spec=spec, status="failed", result_path=result_path, payload=metadata)
@@ -709,6 +779,28 @@ class SweepRunner:
         _write_json(result_path, metadata)
         return TrialResult(spec=spec, status="completed", result_path=result_path, payload=metadata)
 
+    def _run_with_pruning(
+        self,
+        command: Sequence[str],
+        spec: TrialSpec,
+        progress_path: Path,
+        stdout_path: Path,
+        stderr_path: Path,
+    ) -> Tuple[int, Optional[Dict[str, Any]]]:
+        assert self.pruner is not None
+        pruner = self.pruner
+        with stdout_path.open("w", encoding="utf-8") as stdout, stderr_path.open(
+            "w", encoding="utf-8"
+        ) as stderr:
+            return watch_process(
+                command,
+                progress_path=progress_path,
+                on_progress=lambda record: pruner.check(spec.token, spec.params, record),
+                cwd=self.repo_root,
+                stdout=stdout,
+                stderr=stderr,
+            )
+
     def run_trials(self, plans: Sequence[TrialSpec], out_dir: Path) -> List[TrialResult]:
         results: List[TrialResult] = []
         if self.args.workers <= 1:
@@ -726,7 +818,11 @@ class SweepRunner:
 
 
 class BayesSearchRunner:
-    """Sequential Bayesian-style search helper with optional Optuna integration."""
+    """Bayesian-style search helper with optional Optuna integration.
+
+    With ``--workers 1`` suggestions are evaluated one at a time; with more
+    workers the search runs asynchronously with that many trials in flight.
+    """
 
     def __init__(
         self,
@@ -768,6 +864,12 @@ class BayesSearchRunner:
         self._optuna = None
         self.optuna_available = self._check_optuna()
         self.optimizer_name = "optuna" if self.optuna_available else "heuristic"
+        self._observed_scores: List[float] = []
+        self._study = None
+        self._distributions: Dict[str, Any] = {}
+        if self.optuna_available:
+            self._study = self._create_study()
+            self._distributions = self._optuna_distributions()
 
     def _check_optuna(self) -> bool:
         try:
@@ -959,10 +1061,142 @@ class BayesSearchRunner:
             metadata["fallback"] = self.fallback_message
         return metadata
 
-    def run(self, max_trials: int) -> Tuple[List[TrialResult], Dict[str, Any]]:
+    def _resolve_mode(self, dimension, hint) -> str:
+        mode = hint.mode if hint else "auto"
+        if mode != "auto":
+            return mode
+        if dimension.kind == "float_range":
+            return "continuous"
+        if dimension.kind == "range":
+            return "discrete"
+        return "categorical"
+
+    def _create_study(self):
+        optuna = self._optuna
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        # ``constant_liar`` makes TPE treat in-flight trials as poor results so
+        # concurrent asks spread out instead of piling onto the same region.
+        sampler = optuna.samplers.TPESampler(
+            seed=self.master_seed,
+            constant_liar=True,
+            n_startup_trials=max(1, int(self.bayes_config.initial_random_trials)),
+        )
+        return optuna.create_study(direction="maximize", sampler=sampler)
+
+    def _optuna_distributions(self) -> Dict[str, Any]:
+        distributions = self._optuna.distributions
+        result: Dict[str, Any] = {}
+        for dimension in self.config.dimensions:
+            hint = self.bayes_config.transforms.get(dimension.name)
+            mode = self._resolve_mode(dimension, hint)
+            lower, upper = self._dimension_bounds(dimension, hint)
+            bounded = lower is not None and upper is not None and lower < upper
+            if mode == "continuous" and bounded:
+                log = bool(hint and hint.transform == "log" and lower > 0)
+                result[dimension.name] = distributions.FloatDistribution(lower, upper, log=log)
+            elif mode == "discrete" and dimension.kind == "range" and bounded:
+                result[dimension.name] = distributions.IntDistribution(
+                    int(lower), int(upper), step=int(dimension.step or 1)
+                )
+            else:
+                result[dimension.name] = distributions.CategoricalDistribution(
+                    dimension.discrete_values()
+                )
+        return result
+
+    def _ask_optuna(self) -> Tuple[Dict[str, Any], Any]:
+        study = self._study
+        for _ in range(10):
+            trial = study.ask(self._distributions)
+            params = self._round_params(trial.params)
+            if tuple(sorted(params.items())) not in self._seen_params:
+                return params, trial
+            # Duplicate of an evaluated or in-flight point: discard the ask.
+            study.tell(trial, state=self._optuna.trial.TrialState.FAIL)
+        study.enqueue_trial(self._sample_random_params())
+        trial = study.ask(self._distributions)
+        return self._round_params(trial.params), trial
+
+    def _round_params(self, raw: Mapping[str, Any]) -> Dict[str, Any]:
+        params: Dict[str, Any] = {}
+        for dimension in self.config.dimensions:
+            value = raw.get(dimension.name)
+            if isinstance(value, float) and dimension.kind in {"float_range", "range"}:
+                hint = self.bayes_config.transforms.get(dimension.name)
+                value = self._sample_continuous(dimension, hint, value, value)
+            params[dimension.name] = value
+        return params
+
+    def _observe(self, ticket: Any, result: TrialResult) -> None:
+        """Feed a finished trial back into the optimiser (Optuna ``tell``)."""
+
+        if ticket is None or self._study is None:
+            return
+        payload = result.payload or {}
+        score: Optional[float] = None
+        if result.status == "completed":
+            try:
+                score = float(payload.get("score"))
+            except (TypeError, ValueError):
+                score = None
+            if score is not None and not math.isfinite(score):
+                score = None
+        if result.status == "pruned":
+            self._study.tell(ticket, state=self._optuna.trial.TrialState.PRUNED)
+            return
+        if score is None:
+            self._study.tell(ticket, state=self._optuna.trial.TrialState.FAIL)
+            return
+        self._observed_scores.append(score)
+        if not bool(payload.get("feasible")):
+            # Infeasible trials are reported as the worst score seen so far so
+            # the sampler steers away without discarding the observation.
+            score = min(self._observed_scores)
+        self._study.tell(ticket, score)
+
+    def _next_trial(
+        self, suggestion_index: int, attempt_index: int, index: int
+    ) -> Tuple[TrialSpec, Any]:
+        ticket: Any = None
+        if self._study is not None:
+            params, ticket = self._ask_optuna()
+        else:
+            params = self._propose_params(suggestion_index, attempt_index)
+            key = tuple(sorted(params.items()))
+            dedupe_attempts = 0
+            while key in self._seen_params and dedupe_attempts < 10:
+                params = self._sample_random_params()
+                key = tuple(sorted(params.items()))
+                dedupe_attempts += 1
+        # Pending trials stay in ``_seen_params`` so in-flight points are never
+        # proposed twice (the heuristic sampler's constant-liar equivalent).
+        self._seen_params.add(tuple(sorted(params.items())))
+        seed = self.rng.randrange(1, 2**32 - 1)
+        metadata = self._build_search_metadata(
+            suggestion_index=suggestion_index,
+            attempt_index=attempt_index,
+            seed=seed,
+        )
+        spec = TrialSpec(
+            index=index,
+            params=params,
+            seed=seed,
+            token=_build_trial_token(self.timestamp, seed),
+            metadata=metadata,
+        )
+        return spec, ticket
+
+    def _needs_retry(self, result: TrialResult, attempt_index: int) -> bool:
+        if result.status != "completed":
+            return False
+        if bool((result.payload or {}).get("feasible")):
+            return False
+        return attempt_index <= self.bayes_config.constraint_retry_limit
+
+    def _run_sequential(
+        self, evaluation_limit: Optional[int], suggestion_limit: Optional[int]
+    ) -> List[TrialResult]:
         results: List[TrialResult] = []
-        evaluation_limit = max_trials if max_trials and max_trials > 0 else None
-        suggestion_limit = self.bayes_config.exploration_upper_bound
         break_outer = False
         while True:
             if evaluation_limit is not None and len(results) >= evaluation_limit:
@@ -976,43 +1210,78 @@ class BayesSearchRunner:
                     break_outer = True
                     break
                 attempts_for_suggestion += 1
-                params = self._propose_params(suggestion_index, attempts_for_suggestion)
-                key = tuple(sorted(params.items()))
-                dedupe_attempts = 0
-                while key in self._seen_params and dedupe_attempts < 10:
-                    params = self._sample_random_params()
-                    key = tuple(sorted(params.items()))
-                    dedupe_attempts += 1
-                self._seen_params.add(key)
-                seed = self.rng.randrange(1, 2**32 - 1)
-                metadata = self._build_search_metadata(
-                    suggestion_index=suggestion_index,
-                    attempt_index=attempts_for_suggestion,
-                    seed=seed,
+                spec, ticket = self._next_trial(
+                    suggestion_index, attempts_for_suggestion, index=len(results)
                 )
-                spec = TrialSpec(
-                    index=len(results),
-                    params=params,
-                    seed=seed,
-                    token=_build_trial_token(self.timestamp, seed),
-                    metadata=metadata,
-                )
-                trial_dir = self.output_dir / spec.token
-                result = self.runner._run_single(spec, trial_dir)
+                result = self.runner._run_single(spec, self.output_dir / spec.token)
                 results.append(result)
                 self.history.append(result)
-                payload = result.payload or {}
-                feasible = bool(payload.get("feasible")) if result.status == "completed" else False
-                if result.status != "completed":
-                    break
-                if feasible:
-                    break
-                if attempts_for_suggestion > self.bayes_config.constraint_retry_limit:
+                self._observe(ticket, result)
+                if not self._needs_retry(result, attempts_for_suggestion):
                     break
             self.suggestion_total += 1
             self.retry_total += max(0, attempts_for_suggestion - 1)
             if break_outer:
                 break
+        return results
+
+    def _run_async(
+        self,
+        workers: int,
+        evaluation_limit: Optional[int],
+        suggestion_limit: Optional[int],
+    ) -> List[TrialResult]:
+        """Keep ``workers`` trials in flight, proposing as soon as a slot frees.
+
+        Each completed trial is added to the history (and told to Optuna)
+        before the next proposal, so the search adapts while other trials are
+        still running. Constraint retries are queued ahead of new suggestions.
+        """
+
+        results: List[TrialResult] = []
+        retry_queue: Deque[Tuple[int, int]] = deque()
+        in_flight: Dict[Future, Tuple[int, int, Any]] = {}
+        submitted = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                while len(in_flight) < workers:
+                    if evaluation_limit is not None and submitted >= evaluation_limit:
+                        break
+                    if retry_queue:
+                        suggestion_index, attempt_index = retry_queue.popleft()
+                        self.retry_total += 1
+                    elif suggestion_limit is not None and self.suggestion_total >= suggestion_limit:
+                        break
+                    else:
+                        self.suggestion_total += 1
+                        suggestion_index, attempt_index = self.suggestion_total, 1
+                    spec, ticket = self._next_trial(suggestion_index, attempt_index, index=submitted)
+                    submitted += 1
+                    future = executor.submit(
+                        self.runner._run_single, spec, self.output_dir / spec.token
+                    )
+                    in_flight[future] = (suggestion_index, attempt_index, ticket)
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                finished = [(future.result(), in_flight.pop(future)) for future in done]
+                finished.sort(key=lambda item: item[0].spec.index)
+                for result, (suggestion_index, attempt_index, ticket) in finished:
+                    results.append(result)
+                    self.history.append(result)
+                    self._observe(ticket, result)
+                    if self._needs_retry(result, attempt_index):
+                        retry_queue.append((suggestion_index, attempt_index + 1))
+        return results
+
+    def run(self, max_trials: int) -> Tuple[List[TrialResult], Dict[str, Any]]:
+        evaluation_limit = max_trials if max_trials and max_trials > 0 else None
+        suggestion_limit = self.bayes_config.exploration_upper_bound
+        workers = max(1, int(getattr(self.args, "workers", 1) or 1))
+        if workers > 1:
+            results = self._run_async(workers, evaluation_limit, suggestion_limit)
+        else:
+            results = self._run_sequential(evaluation_limit, suggestion_limit)
         meta: Dict[str, Any] = {
             "enabled": bool(self.config.bayes and self.config.bayes.enabled),
             "seed": self.master_seed,
@@ -1022,6 +1291,8 @@ class BayesSearchRunner:
             "constraint_retries": self.retry_total,
             "optimizer": self.optimizer_name,
             "optuna_available": self.optuna_available,
+            "workers": workers,
+            "mode": "async" if workers > 1 else "sequential",
         }
         if self.bayes_config.acquisition:
             meta["acquisition"] = {
@@ -1131,6 +1402,8 @@ def _build_log_entry(result_path: Path) -> Optional[Dict[str, Any]]:
     dataset = payload.get("dataset")
     if dataset:
         entry["dataset"] = dataset
+    if status == "pruned" and payload.get("pruned"):
+        entry["pruned"] = payload["pruned"]
     return entry
 
 
@@ -1157,6 +1430,7 @@ def _write_sweep_log(config: ExperimentConfig, output_dir: Path) -> None:
             if item.get("status") == "completed" and not bool(item.get("feasible"))
         ),
         "dry_run": sum(1 for item in entries if item.get("status") == "dry_run"),
+        "pruned": sum(1 for item in entries if item.get("status") == "pruned"),
     }
     payload = {
         "experiment": config.identifier,
@@ -1191,7 +1465,8 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         results = runner.run_trials(plans, output_dir)
         total_trials = len(plans)
     completed = sum(1 for item in results if item.status == "completed")
-    failures = sum(1 for item in results if item.status not in {"completed", "dry_run"})
+    pruned = sum(1 for item in results if item.status == "pruned")
+    failures = sum(1 for item in results if item.status not in {"completed", "dry_run", "pruned"})
     summary = {
         "experiment": config.identifier,
         "config_path": _relative_path(config.path),
@@ -1200,10 +1475,13 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         "total_trials": total_trials,
         "completed": completed,
         "failures": failures,
+        "pruned": pruned,
         "dry_run": args.dry_run,
     }
     if bayes_meta:
         summary["bayes"] = bayes_meta
+    if runner.trial_cache is not None:
+        summary["trial_cache"] = runner.trial_cache.stats()
     _write_json(output_dir / "sweep_summary.json", summary)
     _write_sweep_log(config, output_dir)
     print(json.dumps(summary, ensure_ascii=False, indent=2))
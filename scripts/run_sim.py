@@ -19,15 +19,16 @@ flags. See the docs for the expected keys.
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import subprocess
+from concurrent.futures import Future
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, Iterator, Mapping, Optional, Sequence, cast
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Mapping, Optional, Sequence, cast
 
-import hashlib
 import os
 import sys
 
@@ -37,16 +38,23 @@ ROOT_PATH = Path(ROOT)
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
-from configs.strategies.loader import StrategyManifest, load_manifest
-from core.fill_engine import SameBarPolicy
+from configs.strategies.loader import StrategyManifest, load_manifest_cached
 from core.runner import BacktestRunner, RunnerConfig
-from core.runner_execution import RunnerExecutionManager
-from core.runner_lifecycle import RunnerLifecycleManager
-from core.router_pipeline import PortfolioTelemetry, build_portfolio_state
-from core.utils import yaml_compat as yaml
-from router.router_v1 import select_candidates
+from scripts._run_outputs import (
+    RunOutputWriter,
+    iter_csv_chunks,
+    iter_dict_csv_chunks,
+    render_json,
+    write_hashed,
+)
 from scripts._time_utils import utcnow_aware
 
+# Router, checkpoint, YAML and reporting modules are imported where they are
+# used: sweeps and benchmarks spawn this CLI once per trial, so module import
+# time is paid hundreds of times per nightly job.
+if TYPE_CHECKING:
+    from core.runner_checkpoint import RunCheckpointer
+
 
 class CSVFormatError(Exception):
     """Raised when the input CSV lacks required fields or context."""
@@ -118,6 +126,14 @@ _KNOWN_HEADER_TOKENS: set[str] = {
     for canonical, aliases in CSV_COLUMN_ALIASES.items()
     for alias in (canonical, *aliases)
 }
+# Roughly five weeks of 5m bars between checkpoints. Every checkpoint rewrites
+# the full runtime snapshot, including all trade/debug records collected so
+# far, so total checkpoint I/O grows quadratically with run length (about
+# bars**2 / (2 * interval) records written). Raise the interval, or checkpoint
+# by days, for runs that keep many records (e.g. --debug).
+DEFAULT_CHECKPOINT_EVERY_BARS = 10_000
+# Mirrors core.records_store.RECORD_FORMATS (imported lazily to keep startup light).
+RECORDS_FORMAT_CHOICES = ("csv", "parquet", "npz", "auto")
 
 
 def _coerce_bool(value: Any, *, default: bool) -> bool:
@@ -157,8 +173,9 @@ def _strategy_state_key(strategy_cls: type) -> str:
 def _latest_state_file(path: Path) -> Optional[Path]:
     if not path.exists() or not path.is_dir():
         return None
-    candidates = sorted(p for p in path.glob("*.json") if p.is_file())
-    return candidates[-1] if candidates else None
+    from core.state_snapshots import latest_snapshot
+
+    return latest_snapshot(path)
 
 
 def _parse_iso8601(value: str) -> datetime:
@@ -191,14 +208,6 @@ def _float_or_zero(value: Any) -> float:
     return float(value)
 
 
-def _sha256_file(path: Path, *, chunk_size: int = 1024 * 1024) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(chunk_size), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
-
-
 def load_bars_csv(
     path: str,
     *,
@@ -209,10 +218,19 @@ def load_bars_csv(
     default_tf: str = "5m",
     strict: bool = False,
     stats: Optional[CSVLoaderStats] = None,
+    start_offset: int = 0,
 ) -> Iterator[Dict[str, Any]]:
+    """Stream bars from ``path``.
+
+    The returned iterator exposes ``offset``, the byte position just after the
+    last yielded row, which checkpoints record so that a resumed run can pass
+    it back as ``start_offset`` and seek past the processed rows (the header
+    is still read from the top of the file).
+    """
     import csv  # Local import to avoid polluting module namespace unnecessarily
 
     loader_stats = stats or CSVLoaderStats()
+    cursor = {"offset": 0}
     symbol_filter = symbol.strip().upper() if isinstance(symbol, str) else None
 
     def _format_strict_details(
@@ -266,8 +284,20 @@ def load_bars_csv(
         )
         if not default_tf_normalized:
             default_tf_normalized = "5m"
-        with open(path, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
+        with open(path, "rb") as f:
+
+            def _lines() -> Iterator[str]:
+                # Binary iteration keeps line endings intact (like newline="")
+                # while letting us track the exact byte offset of each row.
+                for raw_line in f:
+                    cursor["offset"] += len(raw_line)
+                    yield raw_line.decode("utf-8")
+
+            def _seek(position: int) -> None:
+                f.seek(position)
+                cursor["offset"] = position
+
+            reader = csv.DictReader(_lines())
             if reader.fieldnames is None:
                 raise CSVFormatError("header_missing")
 
@@ -291,9 +321,9 @@ def load_bars_csv(
             if missing_required:
                 if _looks_like_headerless(reader.fieldnames or []):
                     headerless_mode = True
-                    f.seek(0)
+                    _seek(0)
                     reader = csv.DictReader(
-                        f,
+                        _lines(),
                         fieldnames=list(_HEADERLESS_FALLBACK_COLUMNS),
                         restkey=_HEADERLESS_RESTKEY,
                     )
@@ -311,6 +341,9 @@ def load_bars_csv(
                         details=",".join(missing_required),
                     )
 
+            if start_offset and start_offset > cursor["offset"]:
+                _seek(int(start_offset))
+
             used_columns = set(alias_map.values())
             symbol_key = alias_map.get("symbol")
             tf_key = alias_map.get("tf")
@@ -414,6 +447,11 @@ def load_bars_csv(
         def __init__(self, generator: Iterator[Dict[str, Any]], stats_obj: CSVLoaderStats) -> None:
             self._generator = generator
             self.stats = stats_obj
+            self.path = path
+
+        @property
+        def offset(self) -> int:
+            return cursor["offset"]
 
         def __iter__(self) -> "_CSVBarIterator":
             return self
@@ -448,6 +486,13 @@ class RuntimeConfig:
     run_base_dir: Optional[Path]
     debug: bool
     debug_sample_limit: int
+    checkpoint_path: Optional[Path] = None
+    checkpoint_every_bars: int = 0
+    checkpoint_every_days: int = 0
+    progress_path: Optional[Path] = None
+    progress_period: str = "quarter"
+    records_format: str = "csv"
+    pretty_json: bool = False
 
 
 def _load_strategy_class(class_path: str) -> type:
@@ -554,7 +599,7 @@ def _select_instrument(
 
 def _prepare_runtime_config(args: argparse.Namespace) -> RuntimeConfig:
     manifest_path = _resolve_repo_path(Path(args.manifest))
-    manifest = load_manifest(manifest_path)
+    manifest = load_manifest_cached(manifest_path)
     instrument = _select_instrument(
         manifest,
         symbol=args.symbol,
@@ -659,6 +704,42 @@ def _prepare_runtime_config(args: argparse.Namespace) -> RuntimeConfig:
         except (TypeError, ValueError):
             debug_sample_limit = 0
 
+    records_format = str(args.records_format or manifest_cli.get("records_format") or "csv")
+    if records_format not in RECORDS_FORMAT_CHOICES:
+        raise ValueError(f"unsupported records_format '{records_format}'")
+    pretty_json = bool(args.pretty_json) or _coerce_bool(manifest_cli.get("pretty_json"), default=False)
+
+    checkpoint_value = args.checkpoint or manifest_cli.get("checkpoint")
+    checkpoint_path: Optional[Path] = None
+    if checkpoint_value:
+        checkpoint_candidate = Path(checkpoint_value)
+        checkpoint_path = (
+            checkpoint_candidate
+            if checkpoint_candidate.is_absolute()
+            else _resolve_repo_path(checkpoint_candidate)
+        )
+
+    def _interval(cli_value: Optional[int], key: str) -> int:
+        value = cli_value if cli_value is not None else manifest_cli.get(key)
+        try:
+            return max(0, int(value or 0))
+        except (TypeError, ValueError):
+            return 0
+
+    checkpoint_every_bars = _interval(args.checkpoint_every_bars, "checkpoint_every_bars")
+    checkpoint_every_days = _interval(args.checkpoint_every_days, "checkpoint_every_days")
+    if checkpoint_path is not None and not (checkpoint_every_bars or checkpoint_every_days):
+        checkpoint_every_bars = DEFAULT_CHECKPOINT_EVERY_BARS
+
+    progress_path: Optional[Path] = None
+    if args.progress_out:
+        progress_candidate = Path(args.progress_out)
+        progress_path = (
+            progress_candidate
+            if progress_candidate.is_absolute()
+            else _resolve_repo_path(progress_candidate)
+        )
+
     state_archive_root = Path(manifest_cli.get("state_archive", "ops/state_archive"))
     state_archive_root = _resolve_repo_path(state_archive_root)
 
@@ -671,6 +752,13 @@ def _prepare_runtime_config(args: argparse.Namespace) -> RuntimeConfig:
 
     strategy_cls = _load_strategy_class(manifest.strategy.class_path)
     runner_cfg = _runner_config_from_manifest(manifest)
+    if args.equity_curve_points is not None:
+        runner_cfg.equity_curve_points = args.equity_curve_points
+    if args.trade_returns_window is not None:
+        runner_cfg.trade_returns_window = args.trade_returns_window
+    feature_cache_value = args.feature_cache or manifest_cli.get("feature_cache")
+    if feature_cache_value:
+        runner_cfg.feature_cache_dir = str(_resolve_repo_path(Path(feature_cache_value)))
 
     run_base_dir = resolved_out_dir
 
@@ -698,14 +786,22 @@ def _prepare_runtime_config(args: argparse.Namespace) -> RuntimeConfig:
         debug=debug,
         debug_sample_limit=debug_sample_limit,
         daily_csv_out=daily_csv_out,
+        checkpoint_path=checkpoint_path,
+        checkpoint_every_bars=checkpoint_every_bars,
+        checkpoint_every_days=checkpoint_every_days,
+        progress_path=progress_path,
+        progress_period=args.progress_every,
+        records_format=records_format,
+        pretty_json=pretty_json,
     )
 
 
 def _load_ev_profile(path: Path) -> Optional[Dict[str, Any]]:
     if not path.exists():
         return None
-    with path.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+    from core.utils import yaml_compat as yaml
+
+    data = yaml.load_file(path)
     return data if data else None
 
 
@@ -779,7 +875,9 @@ def _store_run_summary(run_dir: Path, config: RuntimeConfig) -> None:
     run_base = config.run_base_dir
     if not run_base:
         return
-    if not (run_dir / "records.csv").exists():
+    from core.records_store import find_records_file
+
+    if find_records_file(run_dir) is None:
         return
     try:
         store_run_summary(
@@ -801,40 +899,41 @@ def _format_ts(dt_value: Optional[datetime]) -> Optional[str]:
     return dt_utc.isoformat().replace("+00:00", "Z")
 
 
-def _write_daily_csv(path: Path, daily: Mapping[str, Mapping[str, Any]]) -> None:
-    import csv as _csv
-
-    cols = [
-        "date",
-        "breakouts",
-        "gate_pass",
-        "gate_block",
-        "ev_pass",
-        "ev_reject",
-        "fills",
-        "wins",
-        "pnl_pips",
-    ]
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", newline="", encoding="utf-8") as f:
-        writer = _csv.writer(f)
-        writer.writerow(cols)
-        for day in sorted(daily.keys()):
-            entry = daily.get(day, {}) or {}
-            wins_value = float(entry.get("wins", 0.0))
-            writer.writerow(
-                [
-                    day,
-                    int(entry.get("breakouts", 0)),
-                    int(entry.get("gate_pass", 0)),
-                    int(entry.get("gate_block", 0)),
-                    int(entry.get("ev_pass", 0)),
-                    int(entry.get("ev_reject", 0)),
-                    int(entry.get("fills", 0)),
-                    wins_value,
-                    float(entry.get("pnl_pips", 0.0)),
-                ]
+DAILY_CSV_COLUMNS = (
+    "date",
+    "breakouts",
+    "gate_pass",
+    "gate_block",
+    "ev_pass",
+    "ev_reject",
+    "fills",
+    "wins",
+    "pnl_pips",
+)
+
+
+def _daily_rows(daily: Mapping[str, Mapping[str, Any]]) -> list:
+    rows = []
+    for day in sorted(daily.keys()):
+        entry = daily.get(day, {}) or {}
+        rows.append(
+            [
+                day,
+                int(entry.get("breakouts", 0)),
+                int(entry.get("gate_pass", 0)),
+                int(entry.get("gate_block", 0)),
+                int(entry.get("ev_pass", 0)),
+                int(entry.get("ev_reject", 0)),
+                int(entry.get("fills", 0)),
+                float(entry.get("wins", 0.0)),
+                float(entry.get("pnl_pips", 0.0)),
+            ]
         )
+    return rows
+
+
+def _write_daily_csv(path: Path, daily: Mapping[str, Mapping[str, Any]]) -> None:
+    write_hashed(path, iter_csv_chunks(DAILY_CSV_COLUMNS, _daily_rows(daily)))
 
 
 def _format_allowed_sessions(sessions: Optional[Sequence[Any]]) -> Optional[str]:
@@ -903,11 +1002,7 @@ def _runner_config_snapshot(rcfg: RunnerConfig) -> Dict[str, Any]:
     return snapshot
 
 
-def _write_run_outputs(
-    config: RuntimeConfig,
-    out: Dict[str, Any],
-    metrics,
-) -> Optional[Path]:
+def _prepare_run_dir(config: RuntimeConfig, out: Dict[str, Any]) -> Optional[Path]:
     if not config.run_base_dir:
         return None
 
@@ -918,6 +1013,17 @@ def _write_run_outputs(
     out["run_dir"] = str(run_dir)
     out["session_log"] = str(run_dir / "session.log")
     out["checksums"] = str(run_dir / "checksums.json")
+    return run_dir
+
+
+def _write_run_outputs(
+    outputs: RunOutputWriter,
+    config: RuntimeConfig,
+    run_dir: Path,
+    out: Dict[str, Any],
+    metrics,
+) -> Dict[str, Future]:
+    """Queue params/daily/records for ``run_dir``; returns checksum futures by file name."""
 
     params = {
         "manifest": str(config.manifest_path),
@@ -935,50 +1041,44 @@ def _write_run_outputs(
 
     params.update(_runner_config_snapshot(config.runner_config))
 
+    artifacts: Dict[str, Future] = {
+        "params.json": outputs.write(run_dir / "params.json", render_json(params, pretty=config.pretty_json)),
+    }
+
     daily = getattr(metrics, "daily", None)
     if daily:
         daily_path = run_dir / "daily.csv"
-        _write_daily_csv(daily_path, daily)
+        artifacts["daily.csv"] = outputs.write(
+            daily_path, iter_csv_chunks(DAILY_CSV_COLUMNS, _daily_rows(daily))
+        )
         out.setdefault("dump_daily", str(daily_path))
 
-    with (run_dir / "params.json").open("w", encoding="utf-8") as f:
-        json.dump(params, f, ensure_ascii=False, indent=2)
-
-    with (run_dir / "metrics.json").open("w", encoding="utf-8") as f:
-        json.dump(out, f, ensure_ascii=False, indent=2)
-
     records = getattr(metrics, "records", None)
     if records:
-        import csv as _csv
+        from core.records_store import resolve_format, write_records
 
-        header = sorted({key for record in records for key in record.keys()})
-        with (run_dir / "records.csv").open("w", newline="", encoding="utf-8") as f:
-            writer = _csv.DictWriter(f, fieldnames=header)
-            writer.writeheader()
-            for record in records:
-                writer.writerow(record)
+        fmt = resolve_format(config.records_format)
+        if fmt == "csv":
+            artifacts["records.csv"] = outputs.write(
+                run_dir / "records.csv", iter_dict_csv_chunks(records)
+            )
+        else:
+            artifacts[f"records.{fmt}"] = outputs.write_with(
+                lambda: write_records(run_dir / "records", records, fmt=fmt)
+            )
 
-    return run_dir
+    return artifacts
 
 
-def _write_checksums(run_dir: Path) -> Dict[str, Any]:
-    files: Dict[str, Path] = {
-        "params.json": run_dir / "params.json",
-        "metrics.json": run_dir / "metrics.json",
-    }
-    optional = {
-        "daily.csv": run_dir / "daily.csv",
-        "records.csv": run_dir / "records.csv",
-        "state.json": run_dir / "state.json",
-    }
-    for name, path in optional.items():
-        if path.exists():
-            files[name] = path
+def _write_checksums(
+    run_dir: Path, artifacts: Mapping[str, Future], *, pretty: bool = False
+) -> Dict[str, Any]:
+    """Write ``checksums.json`` from the hashes computed while writing ``artifacts``."""
 
     checksums: Dict[str, str] = {}
-    for name, path in files.items():
-        if path.exists() and path.is_file():
-            checksums[name] = _sha256_file(path)
+    for name, future in artifacts.items():
+        result = future.result()
+        checksums[name] = result[1] if isinstance(result, tuple) else result
 
     if not checksums:
         return {}
@@ -996,12 +1096,17 @@ def _write_checksums(run_dir: Path) -> Dict[str, Any]:
         "generated_at": generated_at,
         "files": checksums,
     }
-    with (run_dir / "checksums.json").open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, ensure_ascii=False, indent=2)
-        handle.write("\n")
+    write_hashed(run_dir / "checksums.json", render_json(payload, pretty=pretty) + b"\n")
     return payload
 
 
+def _finalize_run_dir(
+    run_dir: Path, artifacts: Mapping[str, Future], session: Dict[str, Any], *, pretty: bool
+) -> None:
+    checksums = _write_checksums(run_dir, artifacts, pretty=pretty)
+    _write_session_log(run_dir, checksums=checksums, pretty=pretty, **session)
+
+
 def _write_session_log(
     run_dir: Path,
     *,
@@ -1017,6 +1122,7 @@ def _write_session_log(
     archive_save_path: Optional[str],
     exit_code: int,
     checksums: Optional[Mapping[str, Any]] = None,
+    pretty: bool = False,
 ) -> None:
     duration = max((end_time - start_time).total_seconds(), 0.0)
     start_iso = cast(str, _format_ts(start_time))
@@ -1066,11 +1172,49 @@ def _write_session_log(
     if checksums:
         payload["hashes"] = checksums
 
-    session_path = run_dir / "session.log"
-    session_path.write_text(
-        json.dumps(payload, ensure_ascii=False, indent=2) + "\n",
-        encoding="utf-8",
+    write_hashed(run_dir / "session.log", render_json(payload, pretty=pretty) + b"\n")
+
+
+def _evaluate_router(config: RuntimeConfig, metrics: Any) -> list:
+    from core.router_pipeline import PortfolioTelemetry, build_portfolio_state
+    from router.router_v1 import select_candidates
+
+    runtime_mapping: Dict[str, Dict[str, Any]] = {}
+    runtime_snapshot = getattr(metrics, "runtime", {}) or {}
+    if runtime_snapshot:
+        runtime_mapping[config.manifest.id] = dict(runtime_snapshot)
+    telemetry_snapshot = PortfolioTelemetry(active_positions={config.manifest.id: 0})
+    portfolio_state = build_portfolio_state(
+        [config.manifest], telemetry=telemetry_snapshot, runtime_metrics=runtime_mapping or None
+    )
+    return select_candidates(
+        {"session": None, "spread_band": None, "rv_band": None},
+        [config.manifest],
+        portfolio=portfolio_state,
+    )
+
+
+def _checkpoint_meta(config: RuntimeConfig) -> Dict[str, Any]:
+    """Run parameters a checkpoint must match before it is resumed."""
+
+    try:
+        manifest_sha256: Optional[str] = hashlib.sha256(config.manifest_path.read_bytes()).hexdigest()
+    except OSError:
+        manifest_sha256 = None
+    runner_config = json.dumps(
+        _runner_config_snapshot(config.runner_config), sort_keys=True, default=str
     )
+    return {
+        "manifest_id": config.manifest.id,
+        "manifest_sha256": manifest_sha256,
+        "runner_config_sha256": hashlib.sha256(runner_config.encode("utf-8")).hexdigest(),
+        "csv": str(config.csv_path.resolve()),
+        "symbol": config.symbol,
+        "mode": config.mode,
+        "equity": config.equity,
+        "start_ts": _format_ts(config.start_ts),
+        "end_ts": _format_ts(config.end_ts),
+    }
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -1135,6 +1279,63 @@ def build_parser() -> argparse.ArgumentParser:
         type=int,
         help="Maximum number of debug records to retain when debug capture is enabled",
     )
+    parser.add_argument(
+        "--equity-curve-points",
+        type=int,
+        help=(
+            "Downsample the stored equity curve to this many points (default: keep all; "
+            "drawdowns recomputed from the curve become approximate)"
+        ),
+    )
+    parser.add_argument(
+        "--trade-returns-window",
+        type=int,
+        help="Keep only the most recent N trade returns (default: keep all)",
+    )
+    parser.add_argument(
+        "--feature-cache",
+        help=(
+            "Feature cache root (core.feature_cache): reuse per-bar indicators from earlier runs "
+            "or ingestion over the same bars and store newly computed ones"
+        ),
+    )
+    parser.add_argument(
+        "--records-format",
+        choices=RECORDS_FORMAT_CHOICES,
+        help=(
+            "Format of the run directory trade/debug records: csv (default), parquet, npz, "
+            "or auto (parquet when pyarrow is installed, npz otherwise)"
+        ),
+    )
+    parser.add_argument(
+        "--pretty-json",
+        action="store_true",
+        help="Indent metrics/params/state JSON outputs (compact single-line JSON by default)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="Write periodic resume checkpoints to this JSON path (resumes from it when present)",
+    )
+    parser.add_argument(
+        "--checkpoint-every-bars",
+        type=int,
+        help=f"Checkpoint interval in bars (default {DEFAULT_CHECKPOINT_EVERY_BARS} when --checkpoint is set)",
+    )
+    parser.add_argument(
+        "--checkpoint-every-days",
+        type=int,
+        help="Checkpoint interval in trading days",
+    )
+    parser.add_argument(
+        "--progress-out",
+        help="Append partial metrics as JSON lines after every --progress-every period",
+    )
+    parser.add_argument(
+        "--progress-every",
+        choices=("month", "quarter", "year"),
+        default="quarter",
+        help="Calendar period between progress reports (default quarter)",
+    )
     parser.set_defaults(auto_state=None, debug=None)
     return parser
 
@@ -1148,13 +1349,57 @@ def main(argv: Optional[list[str]] = None) -> int:
     args = parse_args(argv)
     argv_list = list(argv) if argv is not None else list(sys.argv[1:])
     command_line = ["scripts/run_sim.py", *argv_list]
+    config = _prepare_runtime_config(args)
+    return run_with_config(config, command_line=command_line)
+
+
+def run_with_config(
+    config: RuntimeConfig,
+    *,
+    command_line: Sequence[str],
+    outputs: Optional[RunOutputWriter] = None,
+) -> int:
+    """Run one simulation for an already prepared ``RuntimeConfig``.
+
+    ``scripts/run_basket.py`` calls this per symbol with the manifest config
+    re-targeted via ``dataclasses.replace``. Output files are written by
+    ``outputs`` in the background; without one, a private writer is drained
+    before returning. Callers passing a shared writer (to start the next job
+    while the previous one's files are still being written) must ``wait()``
+    on it before reading the outputs.
+    """
+
+    if outputs is not None:
+        return _run_with_outputs(config, list(command_line), outputs)
+    with RunOutputWriter() as own_outputs:
+        return _run_with_outputs(config, list(command_line), own_outputs)
+
+
+def _run_with_outputs(
+    config: RuntimeConfig, command_line: list, outputs: RunOutputWriter
+) -> int:
     start_time = utcnow_aware()
     session_warnings: list[str] = []
     stdout_payload: Optional[str] = None
 
-    config = _prepare_runtime_config(args)
-
     csv_path = str(config.csv_path)
+    checkpoint_meta = _checkpoint_meta(config)
+    checkpoint_payload: Optional[Dict[str, Any]] = None
+    start_offset = 0
+    if config.checkpoint_path is not None and config.checkpoint_path.exists():
+        from core.runner_checkpoint import load_checkpoint, resume_offset
+
+        checkpoint_payload = load_checkpoint(config.checkpoint_path)
+        if checkpoint_payload is not None and checkpoint_payload.get("meta") != checkpoint_meta:
+            warning_msg = (
+                f"[run_sim] Ignoring checkpoint {config.checkpoint_path}: run parameters changed"
+            )
+            print(warning_msg, file=sys.stderr)
+            session_warnings.append(warning_msg)
+            checkpoint_payload = None
+        if checkpoint_payload is not None:
+            start_offset = resume_offset(checkpoint_payload, config.csv_path)
+
     loader_stats = CSVLoaderStats()
     bars_iter = load_bars_csv(
         csv_path,
@@ -1165,6 +1410,7 @@ def main(argv: Optional[list[str]] = None) -> int:
         default_tf=config.timeframe,
         strict=config.strict,
         stats=loader_stats,
+        start_offset=start_offset,
     )
     target_symbol = config.symbol.strip().upper()
 
@@ -1175,13 +1421,16 @@ def main(argv: Optional[list[str]] = None) -> int:
         return False
 
     try:
-        first_bar = next(bars_iter)
+        first_bar: Optional[Dict[str, Any]] = next(bars_iter)
     except StopIteration:
-        print(json.dumps({"error": "no_bars"}))
-        return 1
+        if checkpoint_payload is None:
+            print(json.dumps({"error": "no_bars"}))
+            return 1
+        # The previous attempt crashed after its last bar; just finish it.
+        first_bar = None
 
     bars_for_runner = chain(
-        [first_bar] if _symbol_matches(first_bar) else [],
+        [first_bar] if first_bar is not None and _symbol_matches(first_bar) else [],
         (bar for bar in bars_iter if _symbol_matches(bar)),
     )
 
@@ -1202,7 +1451,12 @@ def main(argv: Optional[list[str]] = None) -> int:
 
     archive_dir: Optional[Path] = None
     loaded_state_path: Optional[str] = None
-    if config.auto_state:
+    resumed_checkpoint: Optional[str] = None
+    if checkpoint_payload is not None and runner.load_checkpoint(checkpoint_payload):
+        # The checkpoint already contains whatever state the crashed attempt
+        # loaded from the archive, so it supersedes the auto_state lookup.
+        resumed_checkpoint = str(config.checkpoint_path)
+    elif config.auto_state:
         archive_dir = _resolve_state_archive(config)
         latest_state = _latest_state_file(archive_dir)
         if latest_state is not None:
@@ -1214,7 +1468,36 @@ def main(argv: Optional[list[str]] = None) -> int:
             except Exception:
                 loaded_state_path = None
 
-    metrics = runner.run(bars_for_runner, mode=config.mode)
+    checkpointer: Optional[RunCheckpointer] = None
+    if config.checkpoint_path is not None:
+        from core.runner_checkpoint import RunCheckpointer
+
+        checkpointer = RunCheckpointer(
+            config.checkpoint_path,
+            every_bars=config.checkpoint_every_bars,
+            every_days=config.checkpoint_every_days,
+            source=bars_iter,
+            meta=checkpoint_meta,
+        )
+        if checkpoint_payload is not None and resumed_checkpoint:
+            checkpointer.bars_total = int(checkpoint_payload.get("bars_processed") or 0)
+
+    if config.progress_path is not None:
+        from core.runner_progress import ProgressLog, run_in_chunks
+
+        metrics = run_in_chunks(
+            runner,
+            bars_for_runner,
+            mode=config.mode,
+            period=config.progress_period,
+            on_chunk=ProgressLog(config.progress_path),
+            checkpoint=checkpointer,
+        )
+        runner.flush_feature_cache()
+    elif checkpointer is not None:
+        metrics = runner.run(bars_for_runner, mode=config.mode, checkpoint=checkpointer)
+    else:
+        metrics = runner.run(bars_for_runner, mode=config.mode)
     metrics.debug["csv_loader"] = loader_stats.as_dict()
     if loader_stats.skipped_rows:
         last_error = loader_stats.last_error_code or "unknown"
@@ -1229,19 +1512,7 @@ def main(argv: Optional[list[str]] = None) -> int:
                 details=f"skipped={loader_stats.skipped_rows}, last_error={last_error}",
             )
 
-    runtime_mapping: Dict[str, Dict[str, Any]] = {}
-    runtime_snapshot = getattr(metrics, "runtime", {}) or {}
-    if runtime_snapshot:
-        runtime_mapping[config.manifest.id] = dict(runtime_snapshot)
-    telemetry_snapshot = PortfolioTelemetry(active_positions={config.manifest.id: 0})
-    portfolio_state = build_portfolio_state(
-        [config.manifest], telemetry=telemetry_snapshot, runtime_metrics=runtime_mapping or None
-    )
-    router_results = select_candidates(
-        {"session": None, "spread_band": None, "rv_band": None},
-        [config.manifest],
-        portfolio=portfolio_state,
-    )
+    router_results = _evaluate_router(config, metrics)
 
     out = metrics.as_dict()
     if metrics.debug:
@@ -1255,23 +1526,37 @@ def main(argv: Optional[list[str]] = None) -> int:
         out["router"] = [result.as_dict() for result in router_results]
     if loaded_state_path:
         out["loaded_state"] = loaded_state_path
-
-    run_dir = _write_run_outputs(config, out, metrics)
+    if resumed_checkpoint:
+        out["resumed_checkpoint"] = {
+            "path": resumed_checkpoint,
+            "offset": start_offset,
+            "bars_processed": int(checkpoint_payload.get("bars_processed") or 0)
+            if checkpoint_payload
+            else 0,
+        }
+
+    run_dir = _prepare_run_dir(config, out)
+    artifacts: Dict[str, Future] = {}
     if run_dir is not None:
-        _store_run_summary(run_dir, config)
+        artifacts = _write_run_outputs(outputs, config, run_dir, out, metrics)
 
     if config.daily_csv_out:
-        _write_daily_csv(config.daily_csv_out, getattr(metrics, "daily", {}) or {})
+        outputs.write(
+            config.daily_csv_out,
+            iter_csv_chunks(DAILY_CSV_COLUMNS, _daily_rows(getattr(metrics, "daily", {}) or {})),
+        )
         out["dump_daily"] = str(config.daily_csv_out)
 
-    rendered_output = json.dumps(out, ensure_ascii=False, indent=2)
+    # Serialized once: the same bytes feed metrics.json, --json-out and stdout.
+    rendered_output = render_json(out, pretty=config.pretty_json)
+    if run_dir is not None:
+        artifacts["metrics.json"] = outputs.write(run_dir / "metrics.json", rendered_output)
+        outputs.submit(_store_run_summary, run_dir, config)
     if config.json_out:
-        config.json_out.parent.mkdir(parents=True, exist_ok=True)
-        with config.json_out.open("w", encoding="utf-8") as f:
-            f.write(rendered_output)
+        outputs.write(config.json_out, rendered_output)
     else:
-        stdout_payload = rendered_output
-        print(rendered_output)
+        stdout_payload = rendered_output.decode("utf-8")
+        print(stdout_payload)
 
     archive_save_path: Optional[str] = None
     exit_code = 0
@@ -1279,14 +1564,16 @@ def main(argv: Optional[list[str]] = None) -> int:
         archive_dir = archive_dir or _resolve_state_archive(config)
         archive_dir.mkdir(parents=True, exist_ok=True)
         timestamp = utcnow_aware().strftime("%Y%m%d_%H%M%S")
-        archive_path = archive_dir / f"{timestamp}.json"
         state_payload = runner.export_state()
-        with archive_path.open("w", encoding="utf-8") as f:
-            json.dump(state_payload, f, ensure_ascii=False, indent=2)
+        state_bytes = render_json(state_payload)
+        from core.state_snapshots import write_snapshot
+
+        archive_path = write_snapshot(archive_dir, timestamp, state_payload, encoded=state_bytes)
         archive_save_path = str(archive_path)
         if run_dir is not None:
-            with (run_dir / "state.json").open("w", encoding="utf-8") as f:
-                json.dump(state_payload, f, ensure_ascii=False, indent=2)
+            if config.pretty_json:
+                state_bytes = render_json(state_payload, pretty=True)
+            artifacts["state.json"] = outputs.write(run_dir / "state.json", state_bytes)
 
     if config.aggregate_ev and archive_save_path:
         try:
@@ -1297,26 +1584,30 @@ def main(argv: Optional[list[str]] = None) -> int:
             session_warnings.append(warning_msg)
             exit_code = 1
 
-    end_time = utcnow_aware()
-    checksum_payload: Optional[Dict[str, Any]] = None
-    if run_dir is not None:
-        checksum_payload = _write_checksums(run_dir)
+    if checkpointer is not None:
+        checkpointer.clear()
 
+    end_time = utcnow_aware()
     if run_dir is not None:
-        _write_session_log(
+        # Queued last, so every artifact hash is final when it runs.
+        outputs.submit(
+            _finalize_run_dir,
             run_dir,
-            command=command_line,
-            config=config,
-            start_time=start_time,
-            end_time=end_time,
-            loader_stats=loader_stats,
-            warnings=session_warnings,
-            stdout_text=stdout_payload,
-            loaded_state_path=loaded_state_path,
-            archive_dir=archive_dir,
-            archive_save_path=archive_save_path,
-            exit_code=exit_code,
-            checksums=checksum_payload,
+            artifacts,
+            {
+                "command": command_line,
+                "config": config,
+                "start_time": start_time,
+                "end_time": end_time,
+                "loader_stats": loader_stats,
+                "warnings": list(session_warnings),
+                "stdout_text": stdout_payload,
+                "loaded_state_path": loaded_state_path,
+                "archive_dir": archive_dir,
+                "archive_save_path": archive_save_path,
+                "exit_code": exit_code,
+            },
+            pretty=config.pretty_json,
         )
 
     return exit_code
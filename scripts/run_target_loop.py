@@ -16,6 +16,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from core.utils import yaml_compat as yaml
+from scripts._trial_cache import DEFAULT_CACHE_PATH, TrialCache
 
 
 def call(cmd: list[str]) -> subprocess.CompletedProcess:
@@ -23,8 +24,12 @@ def call(cmd: list[str]) -> subprocess.CompletedProcess:
     return subprocess.run(cmd, capture_output=True, text=True)
 
 
-def run_optuna(trials: int, base_args: list[str], out_path: Path) -> dict | None:
-    cmd = [sys.executable, str(ROOT / "scripts/run_optuna_search.py"), "--trials", str(trials), "--out", str(out_path), "--base-args"] + base_args
+def run_optuna(
+    trials: int, base_args: list[str], out_path: Path, cache: TrialCache | None = None
+) -> dict | None:
+    cmd = [sys.executable, str(ROOT / "scripts/run_optuna_search.py"), "--trials", str(trials), "--out", str(out_path)]
+    cmd += ["--no-trial-cache"] if cache is None else ["--trial-cache", str(cache.path)]
+    cmd += ["--base-args"] + base_args
     result = call(cmd)
     if out_path.exists():
         return json.loads(out_path.read_text(encoding="utf-8"))
@@ -114,7 +119,13 @@ def _build_run_sim_args(
     return cmd
 
 
-def run_sim(base_args: list[str], params: dict, metrics_path: Path, daily_path: Path) -> bool:
+def run_sim(
+    base_args: list[str],
+    params: dict,
+    metrics_path: Path,
+    daily_path: Path,
+    cache: TrialCache | None = None,
+) -> bool:
     manifest_arg: Path | None = None
     tokens = list(base_args)
     for idx, token in enumerate(tokens):
@@ -141,7 +152,7 @@ def run_sim(base_args: list[str], params: dict, metrics_path: Path, daily_path:
         with tmp_manifest_path.open("w", encoding="utf-8") as handle:
             yaml.safe_dump(manifest_with_params, handle, sort_keys=False)
         cmd = _build_run_sim_args(tokens, tmp_manifest_path, metrics_path, daily_path)
-        result = call(cmd)
+        result = cache.run_sim(cmd, call) if cache is not None else call(cmd)
 
     if result.returncode != 0:
         print(result.stderr)
@@ -207,21 +218,27 @@ def parse_args(argv=None):
         help="Base arguments for run_sim",
     )
     p.add_argument("--out", default="analysis/target_loop_summary.json")
+    p.add_argument("--trial-cache", nargs="?", const=str(DEFAULT_CACHE_PATH), default=None,
+                   help="enable the SQLite trial result cache shared with the Optuna search"
+                        " (PATH defaults to runs/trial_cache.sqlite3)")
+    p.add_argument("--no-trial-cache", action="store_true",
+                   help="always simulate, neither reading nor writing the trial cache")
     return p.parse_args(argv)
 
 
 def main(argv=None) -> int:
     args = parse_args(argv)
     out_records = []
+    cache = TrialCache(args.trial_cache) if args.trial_cache and not args.no_trial_cache else None
     for i in range(1, args.max_iter + 1):
         optuna_out = Path(f"analysis/optuna_iter{i}.json")
-        best = run_optuna(args.trials, args.base_args, optuna_out)
+        best = run_optuna(args.trials, args.base_args, optuna_out, cache)
         if not best:
             out_records.append({"iteration": i, "status": "optuna_failed"})
             continue
         metrics_path = Path(f"reports/iter{i}_metrics.json")
         daily_path = Path(f"reports/iter{i}_daily.csv")
-        if not run_sim(args.base_args, best.get("best_params", {}), metrics_path, daily_path):
+        if not run_sim(args.base_args, best.get("best_params", {}), metrics_path, daily_path, cache):
             out_records.append({"iteration": i, "status": "sim_failed"})
             continue
         agg_path = Path(f"reports/iter{i}_agg.json")
@@ -6,10 +6,17 @@ import argparse
 import csv
 import json
 import math
+import sys
 from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.records_store import find_records_file, iter_records  # noqa: E402
 
 NUMERIC_FIELDS: tuple[str, ...] = (
     "or_atr_ratio",
@@ -166,31 +173,38 @@ def _resolve_records_path(args: argparse.Namespace) -> Path:
         run_dir = Path(args.run_dir)
         if not run_dir.is_absolute():
             run_dir = Path.cwd() / run_dir
-        return run_dir / "records.csv"
+        return find_records_file(run_dir) or run_dir / "records.csv"
     raise SystemExit("Either --records or --run-dir must be provided")
 
 
-def _load_records(path: Path, stage: str) -> Dict[str, ReasonSummary]:
-    if not path.exists():
-        raise SystemExit(f"records.csv not found at {path}")
-    summaries: Dict[str, ReasonSummary] = {}
+def _iter_rows(path: Path) -> Iterator[Dict[str, Any]]:
+    if path.suffix.lower() != ".csv":
+        yield from iter_records(path)
+        return
     with path.open("r", encoding="utf-8", newline="") as handle:
         reader = csv.DictReader(handle)
-        if "stage" not in reader.fieldnames:
+        if "stage" not in (reader.fieldnames or []):
             raise SystemExit("records.csv is missing the 'stage' column")
-        for row in reader:
-            row_stage = (row.get("stage") or "").strip()
-            reason_stage = (
-                (row.get("reason_stage") or row.get("reason") or "").strip()
-            )
-            if stage not in {row_stage, reason_stage}:
-                continue
-            reason = reason_stage or row_stage or "unknown"
-            summary = summaries.get(reason)
-            if summary is None:
-                summary = ReasonSummary(NUMERIC_FIELDS, CATEGORICAL_FIELDS)
-                summaries[reason] = summary
-            summary.update(row)
+        yield from reader
+
+
+def _load_records(path: Path, stage: str) -> Dict[str, ReasonSummary]:
+    if not path.exists():
+        raise SystemExit(f"records file not found at {path}")
+    summaries: Dict[str, ReasonSummary] = {}
+    for row in _iter_rows(path):
+        row_stage = (row.get("stage") or "").strip()
+        reason_stage = (
+            (row.get("reason_stage") or row.get("reason") or "").strip()
+        )
+        if stage not in {row_stage, reason_stage}:
+            continue
+        reason = reason_stage or row_stage or "unknown"
+        summary = summaries.get(reason)
+        if summary is None:
+            summary = ReasonSummary(NUMERIC_FIELDS, CATEGORICAL_FIELDS)
+            summaries[reason] = summary
+        summary.update(row)
     return summaries
 
 
@@ -19,8 +19,10 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from core.runner import BacktestRunner
+from core.state_snapshots import DEFAULT_KEYFRAME_EVERY, prune_snapshots, write_snapshot
 from notifications import emit_signal
 from scripts._time_utils import utcnow_aware
+from scripts._workflow_context import dict_rows, shared_csv_rows
 from scripts.config_utils import build_runner_config
 from scripts.pull_prices import _parse_ts as _parse_ingest_ts
 
@@ -341,18 +343,10 @@ def _set_last_state_ts(snapshot: dict, key: str, ts: datetime) -> dict:
 
 
 def _prune_archives(archive_dir: Path, keep: int = 5) -> List[Path]:
-    files = sorted(
-        [p for p in archive_dir.glob("*_state.json") if p.is_file()]
-    )
-    if keep <= 0:
-        return []
-    to_remove = files[:-keep]
-    for path in to_remove:
-        try:
-            path.unlink()
-        except OSError:
-            pass
-    return to_remove
+    # Only update_state's own ``*_state`` exports are rotated; run_sim snapshots
+    # in the same leaf are left alone. Snapshots still referenced by a
+    # retained delta chain survive pruning.
+    return prune_snapshots(archive_dir, keep, stem_suffix="_state")
 
 
 def _run_aggregate_ev(archive_root: Path, strategy_key: str, symbol: str, mode: str) -> int:
@@ -393,21 +387,28 @@ def _parse_row(row: Dict[str, str]) -> Dict[str, Any]:
 
 
 def _iter_new_bars(path: Path, since: Optional[datetime]) -> Iterable[Dict[str, Any]]:
+    shared_rows = shared_csv_rows(path)
+    if shared_rows is not None:
+        yield from _filter_new_bars(dict_rows(shared_rows), since)
+        return
     with path.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            ts_raw = row.get("timestamp")
-            if ts_raw is None:
-                continue
-            stamp = _parse_timestamp(ts_raw)
-            if since is not None and stamp is not None and stamp <= since:
-                continue
-            if stamp is not None:
-                row["timestamp"] = _format_timestamp(stamp)
-            try:
-                yield _parse_row(row)
-            except (ValueError, KeyError):
-                continue
+        yield from _filter_new_bars(csv.DictReader(f), since)
+
+
+def _filter_new_bars(reader: Iterable[Dict[str, Any]], since: Optional[datetime]) -> Iterable[Dict[str, Any]]:
+    for row in reader:
+        ts_raw = row.get("timestamp")
+        if ts_raw is None:
+            continue
+        stamp = _parse_timestamp(ts_raw)
+        if since is not None and stamp is not None and stamp <= since:
+            continue
+        if stamp is not None:
+            row["timestamp"] = _format_timestamp(stamp)
+        try:
+            yield _parse_row(row)
+        except (ValueError, KeyError):
+            continue
 
 
 def parse_args(argv=None):
@@ -420,6 +421,12 @@ def parse_args(argv=None):
     parser.add_argument("--state-out", default=str(DEFAULT_STATE), help="Where to write the refreshed state.json")
     parser.add_argument("--snapshot", default=str(SNAPSHOT_PATH))
     parser.add_argument("--archive-dir", default="ops/state_archive", help="Directory for timestamped state snapshots")
+    parser.add_argument(
+        "--keyframe-every",
+        type=int,
+        default=DEFAULT_KEYFRAME_EVERY,
+        help="Write a full state keyframe every N archive snapshots; others are deltas (1 disables deltas)",
+    )
     # Optional overrides for RunnerConfig (mirrors run_sim)
     parser.add_argument("--threshold-lcb", type=float, default=None)
     parser.add_argument("--min-or-atr", type=float, default=None)
@@ -572,7 +579,7 @@ def main(argv=None) -> int:
     archive_root = Path(args.archive_dir)
     archive_dir = archive_root / strategy_key / args.symbol / args.mode
     stamp = utcnow_aware(dt_cls=datetime).strftime("%Y%m%d_%H%M%S")
-    archive_file = archive_dir / f"{stamp}_state.json"
+    archive_name = f"{stamp}_state"
     diff_file = archive_dir / f"{stamp}_diff.json"
 
     state_out_path = Path(args.state_out)
@@ -595,9 +602,9 @@ def main(argv=None) -> int:
         with state_out_path.open("w") as f:
             json.dump(new_state, f, ensure_ascii=False, indent=2)
 
-        archive_dir.mkdir(parents=True, exist_ok=True)
-        with archive_file.open("w") as f:
-            json.dump(new_state, f, ensure_ascii=False, indent=2)
+        archive_file = write_snapshot(
+            archive_dir, archive_name, new_state, keyframe_every=args.keyframe_every
+        )
 
         pruned = _prune_archives(archive_dir, keep=5)
         agg_rc = _run_aggregate_ev(archive_root, strategy_key, args.symbol, args.mode)
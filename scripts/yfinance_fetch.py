@@ -7,7 +7,8 @@ import csv
 import json
 import sys
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Iterable, Iterator, List, Optional
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
@@ -116,8 +117,13 @@ def fetch_bars(
     *,
     start: datetime,
     end: datetime,
+    cache_dir: Union[str, Path, None] = None,
 ) -> Iterator[Dict[str, object]]:
-    """Yield normalized OHLCV rows fetched from yfinance."""
+    """Yield normalized OHLCV rows fetched from yfinance.
+
+    With ``cache_dir`` the window is served through ``scripts._fetch_cache``:
+    settled time chunks come from disk and only newer chunks are downloaded.
+    """
 
     interval = _INTERVAL_MAP.get(tf)
     if interval is None:
@@ -126,21 +132,56 @@ def fetch_bars(
     now_utc = utcnow_naive(dt_cls=datetime)
     ticker = _resolve_ticker(symbol)
 
-    effective_start = start.replace(tzinfo=timezone.utc)
-    effective_end = min(end, now_utc).replace(tzinfo=timezone.utc)
-    if effective_end <= effective_start:
-        return iter(())
+    if cache_dir is not None:
+        from scripts._fetch_cache import FetchCache, fetch_chunked
+
+        def _fetch_chunk(chunk_start, chunk_end, _cached):
+            return {"rows": list(_chart_rows(symbol, tf, ticker, interval, chunk_start, chunk_end, now_utc))}
+
+        try:
+            rows = fetch_chunked(
+                _fetch_chunk,
+                cache=FetchCache.from_config(cache_dir),
+                provider="yfinance",
+                symbol=symbol,
+                tf=tf,
+                start=start.replace(tzinfo=None),
+                end=min(end.replace(tzinfo=None), now_utc),
+                now=now_utc,
+            )
+        except Exception:
+            return iter(())
+        return iter(rows)
 
     try:
-        chart = _download_chart(
-            ticker=ticker,
-            interval=interval,
-            start=effective_start,
-            end=effective_end,
-        )
+        return _chart_rows(symbol, tf, ticker, interval, start, end, now_utc)
     except Exception:
         return iter(())
 
+
+def _chart_rows(
+    symbol: str,
+    tf: str,
+    ticker: str,
+    interval: str,
+    start: datetime,
+    end: datetime,
+    now_utc: datetime,
+) -> Iterator[Dict[str, object]]:
+    """Download one chart window; download errors propagate to the caller."""
+
+    effective_start = start.replace(tzinfo=timezone.utc)
+    effective_end = min(end.replace(tzinfo=None), now_utc).replace(tzinfo=timezone.utc)
+    if effective_end <= effective_start:
+        return iter(())
+
+    chart = _download_chart(
+        ticker=ticker,
+        interval=interval,
+        start=effective_start,
+        end=effective_end,
+    )
+
     timestamps: Optional[List[int]] = chart.get("timestamp") if chart else None
     indicators: Optional[Dict[str, List[Dict[str, object]]]] = chart.get("indicators") if chart else None
 
@@ -159,7 +200,7 @@ def fetch_bars(
     volumes = quote.get("volume") or []
 
     target_start = start.replace(tzinfo=None)
-    target_end = min(end, now_utc).replace(tzinfo=None)
+    target_end = min(end.replace(tzinfo=None), now_utc)
 
     def _iter() -> Iterator[Dict[str, object]]:
         for idx, ts in enumerate(timestamps):
@@ -0,0 +1,20 @@
+"""Shared inputs for tests that run the Day ORB manifest over the sample bars."""
+
+from configs.strategies.loader import load_manifest
+from core.runner import BacktestRunner
+from scripts.run_sim import ROOT_PATH, _load_strategy_class, _runner_config_from_manifest
+
+MANIFEST_PATH = ROOT_PATH / "configs/strategies/day_orb_5m.yaml"
+SAMPLE_CSV = ROOT_PATH / "data/sample_orb.csv"
+
+
+def make_runner() -> BacktestRunner:
+    """A ``BacktestRunner`` configured the way run_sim builds it from the manifest."""
+
+    manifest = load_manifest(MANIFEST_PATH)
+    return BacktestRunner(
+        equity=100000.0,
+        symbol="USDJPY",
+        runner_cfg=_runner_config_from_manifest(manifest),
+        strategy_cls=_load_strategy_class(manifest.strategy.class_path),
+    )
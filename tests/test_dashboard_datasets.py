@@ -78,6 +78,50 @@ def test_manifest_sequence_increments_and_history(tmp_path):
     assert summary_second["status"] == "ok"
 
 
+def test_incremental_export_skips_unchanged_and_matches_full_refresh(tmp_path):
+    latency_path = tmp_path / "latency.csv"
+    _write_latency_rollup(latency_path)
+    output_dir = tmp_path / "dashboard"
+    common = dict(
+        output_dir=output_dir,
+        manifest_path=output_dir / "manifest.json",
+        heartbeat_path=tmp_path / "heartbeat.json",
+        history_dir=tmp_path / "history",
+        archive_manifest=tmp_path / "archive_manifest.jsonl",
+        latency_path=latency_path,
+        history_retention_days=9999,
+    )
+
+    first = _run_cli(job_id="20240101T000000Z-dashboard", **common)
+    assert first["unchanged_datasets"] == []
+    assert (output_dir / "export_state.json").exists()
+
+    second = _run_cli(job_id="20240102T000000Z-dashboard", **common)
+    assert sorted(second["unchanged_datasets"]) == ["ev_history", "latency", "slippage", "turnover"]
+    assert second["datasets"]["latency"] == "ok"
+    assert json.loads((output_dir / "latency.json").read_text())["job_id"] == first["job_id"]
+
+    with latency_path.open("a", encoding="utf-8") as handle:
+        handle.write("2024-01-01T01:00:00Z,2024-01-01T02:00:00Z,12,0,0.0,110,170,210,260\n")
+    third = _run_cli(job_id="20240103T000000Z-dashboard", **common)
+    assert sorted(third["unchanged_datasets"]) == ["ev_history", "slippage", "turnover"]
+
+    full_dir = tmp_path / "full"
+    _run_cli(
+        job_id="20240103T000000Z-full",
+        **{**common, "output_dir": full_dir, "manifest_path": full_dir / "manifest.json"},
+        extra_args=("--full-refresh",),
+    )
+    for name in ("ev_history", "slippage", "turnover", "latency"):
+        incremental = json.loads((output_dir / f"{name}.json").read_text())
+        full = json.loads((full_dir / f"{name}.json").read_text())
+        for key in ("generated_at", "job_id"):
+            incremental.pop(key)
+            full.pop(key)
+        assert incremental == full, name
+    assert len(json.loads((output_dir / "latency.json").read_text())["rows"]) == 2
+
+
 def test_upload_command_failure_sets_error(tmp_path):
     latency_path = tmp_path / "latency.csv"
     _write_latency_rollup(latency_path)
@@ -160,6 +204,7 @@ def _run_cli(
     archive_manifest: Path,
     latency_path: Path,
     history_retention_days: int,
+    extra_args: tuple = (),
 ) -> dict:
     summary_path = output_dir.parent / f"summary_{job_id}.json"
     completed = subprocess.run(
@@ -206,6 +251,7 @@ def _run_cli(
             str(history_retention_days),
             "--indent",
             "0",
+            *extra_args,
         ],
         check=True,
         capture_output=True,
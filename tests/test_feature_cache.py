@@ -0,0 +1,142 @@
+import csv
+import math
+
+import pytest
+
+from core import feature_cache
+from core.feature_cache import FeatureCache, FeatureCacheKey, extend_feature_table
+from scripts import pull_prices
+from scripts.run_sim import load_bars_csv
+from tests.runner_fixtures import SAMPLE_CSV, make_runner
+
+ROWS = 1200
+
+
+def _sample_rows(limit=ROWS):
+    with SAMPLE_CSV.open(encoding="utf-8", newline="") as handle:
+        return [row for _, row in zip(range(limit), csv.DictReader(handle))]
+
+
+def _run(bars, cache_dir):
+    runner = make_runner()
+    runner.rcfg.feature_cache_dir = str(cache_dir)
+    metrics = runner.run(list(bars), mode="conservative")
+    return runner, metrics
+
+
+def _same(left, right):
+    return all(
+        (math.isnan(a) and math.isnan(b)) or a == pytest.approx(b)
+        for a, b in zip(left, right)
+    )
+
+
+def test_runner_records_then_replays_cached_indicators(tmp_path):
+    bars = list(load_bars_csv(str(SAMPLE_CSV)))[:ROWS]
+    baseline = make_runner().run(list(bars), mode="conservative")
+
+    first_runner, first = _run(bars, tmp_path / "cache")
+    assert first_runner._feature_replay.stats()["recorded"] == ROWS
+    second_runner, second = _run(bars, tmp_path / "cache")
+    stats = second_runner._feature_replay.stats()
+    assert stats["hits"] == ROWS and stats["recorded"] == 0 and stats["aligned"]
+
+    for metrics in (first, second):
+        assert metrics.trades == baseline.trades
+        assert metrics.total_pips == pytest.approx(baseline.total_pips)
+        assert metrics.trade_returns == pytest.approx(baseline.trade_returns)
+
+    # A longer run replays the cached prefix and appends the new tail.
+    longer = list(load_bars_csv(str(SAMPLE_CSV)))[: ROWS + 100]
+    third_runner, _ = _run(longer, tmp_path / "cache")
+    stats = third_runner._feature_replay.stats()
+    assert (stats["hits"], stats["recorded"]) == (ROWS, 100)
+
+
+def test_replay_stops_at_first_price_mismatch(tmp_path):
+    bars = list(load_bars_csv(str(SAMPLE_CSV)))[:ROWS]
+    _run(bars, tmp_path / "cache")
+
+    # Same timestamps, different prices from bar 500 on (e.g. another vendor).
+    shifted = [dict(bar) for bar in bars]
+    for bar in shifted[500:]:
+        for column in ("o", "h", "l", "c"):
+            bar[column] = bar[column] + 0.05
+    baseline = make_runner().run([dict(bar) for bar in shifted], mode="conservative")
+    runner, metrics = _run(shifted, tmp_path / "cache")
+    stats = runner._feature_replay.stats()
+    assert stats["hits"] == 500 and not stats["aligned"]
+    assert metrics.trades == baseline.trades
+    assert metrics.total_pips == pytest.approx(baseline.total_pips)
+
+
+def test_code_version_change_invalidates_cache(tmp_path, monkeypatch):
+    bars = list(load_bars_csv(str(SAMPLE_CSV)))[:300]
+    _run(bars, tmp_path / "cache")
+    old_key = FeatureCacheKey(symbol="USDJPY", tf="5m", or_n=make_runner().rcfg.or_n)
+    assert FeatureCache(tmp_path / "cache").load(old_key) is not None
+
+    monkeypatch.setattr(feature_cache, "FEATURE_SET_VERSION", feature_cache.FEATURE_SET_VERSION + 1)
+    feature_cache.feature_code_version.cache_clear()
+    try:
+        assert feature_cache.feature_code_version() != old_key.version
+        runner, _ = _run(bars, tmp_path / "cache")
+    finally:
+        feature_cache.feature_code_version.cache_clear()
+    assert runner._feature_replay.stats()["hits"] == 0
+    assert not old_key.path(tmp_path / "cache").exists()
+
+
+def test_ingest_extends_cache_with_rows_matching_the_runner(tmp_path, monkeypatch):
+    monkeypatch.setattr(pull_prices, "ANOMALY_LOG", tmp_path / "anomalies.jsonl")
+    validated = tmp_path / "validated" / "USDJPY" / "5m.csv"
+    paths = dict(
+        snapshot_path=tmp_path / "snapshot.json",
+        raw_path=tmp_path / "raw" / "USDJPY" / "5m.csv",
+        validated_path=validated,
+        features_path=tmp_path / "features" / "USDJPY" / "5m.csv",
+        feature_cache_dir=tmp_path / "ingest_cache",
+    )
+    or_n = make_runner().rcfg.or_n
+    rows = _sample_rows()
+    first = pull_prices.ingest_records(rows[:700], symbol="USDJPY", tf="5m", or_n=or_n, **paths)
+    assert first["feature_cache"]["appended"] == 700
+    second = pull_prices.ingest_records(rows, symbol="USDJPY", tf="5m", or_n=or_n, **paths)
+    assert second["feature_cache"]["appended"] == ROWS - 700
+    assert not second["feature_cache"]["rebuilt"]
+
+    bars = list(load_bars_csv(str(validated)))
+    _run(bars, tmp_path / "runner_cache")
+    key = FeatureCacheKey(symbol="USDJPY", tf="5m", or_n=or_n)
+    ingested = FeatureCache(tmp_path / "ingest_cache").load(key)
+    recorded = FeatureCache(tmp_path / "runner_cache").load(key)
+    assert ingested.ts == recorded.ts == [bar["timestamp"] for bar in bars]
+    for name, values in recorded.columns.items():
+        assert _same(ingested.columns[name], values), name
+    assert ingested.prices == recorded.prices
+
+    # Bars that do not overlap the table force a rebuild from the full file.
+    rebuilt = extend_feature_table(
+        tmp_path / "ingest_cache", symbol="USDJPY", tf="5m", or_n=or_n,
+        bars=bars[-5:-3], load_all=lambda: bars,
+    )
+    assert rebuilt["rebuilt"] and rebuilt["rows"] == len(bars)
+
+
+def test_cache_file_round_trips_without_numpy_and_replaces_stale_versions(tmp_path):
+    cache = FeatureCache(tmp_path)
+    key = FeatureCacheKey(symbol="USDJPY", tf="5m", or_n=6)
+    stale = key.path(tmp_path).with_name("or6_oldversion.npz")
+    stale.parent.mkdir(parents=True)
+    stale.write_bytes(b"legacy")
+
+    table = feature_cache.FeatureTable()
+    table.append("2024-01-01T00:00:00Z", {name: 1.5 for name in feature_cache.INDICATOR_COLUMNS})
+    table.append("2024-01-01T00:05:00Z", {})
+    path = cache.save(key, table)
+
+    assert path.suffix == ".zip" and not stale.exists()
+    loaded = cache.load(key)
+    assert loaded.ts == table.ts
+    for name in feature_cache.INDICATOR_COLUMNS:
+        assert loaded.columns[name][0] == 1.5 and math.isnan(loaded.columns[name][1])
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+from scripts._fetch_cache import FetchCache, fetch_chunked
+
+
+def _bars(start, end):
+    ts = start
+    while ts <= end:
+        yield {"timestamp": ts.strftime("%Y-%m-%dT%H:%M:%S"), "c": ts.minute}
+        ts += timedelta(minutes=5)
+
+
+def test_only_unsettled_chunks_are_refetched(tmp_path):
+    calls = []
+
+    def fetch(chunk_start, chunk_end, cached):
+        calls.append(chunk_start)
+        return {"rows": list(_bars(chunk_start, chunk_end))}
+
+    cache = FetchCache(tmp_path, chunk_minutes=60, settle_minutes=0)
+    now = datetime(2025, 3, 3, 12, 32)
+    kwargs = dict(cache=cache, provider="yfinance", symbol="USDJPY", tf="5m")
+
+    rows = fetch_chunked(fetch, start=now - timedelta(hours=2), end=now, now=now, **kwargs)
+    assert (rows[0]["timestamp"], rows[-1]["timestamp"], len(rows)) == (
+        "2025-03-03T10:35:00", "2025-03-03T12:30:00", 24,
+    )
+    assert len(calls) == 3
+
+    # The next poll re-requests the same lookback: only the growing chunk is fetched.
+    calls.clear()
+    later = now + timedelta(minutes=10)
+    stats = {}
+    rows = fetch_chunked(fetch, start=later - timedelta(hours=2), end=later, now=later, stats=stats, **kwargs)
+    assert calls == [datetime(2025, 3, 3, 12)]
+    assert stats == {"hits": 2, "revalidated": 0, "fetched": 1}
+    assert rows[-1]["timestamp"] == "2025-03-03T12:40:00"
+    assert rows[0]["timestamp"] == "2025-03-03T10:45:00"
+
+
+def test_empty_or_short_settled_chunks_are_rechecked_not_final(tmp_path):
+    published = {"late": False}
+    calls = []
+
+    def fetch(chunk_start, chunk_end, cached):
+        calls.append(chunk_start)
+        bars = list(_bars(chunk_start, chunk_end))
+        if chunk_start == datetime(2025, 3, 3, 10) and not published["late"]:
+            bars = []  # provider has not published this hour yet
+        elif chunk_start == datetime(2025, 3, 3, 9):
+            bars = bars[:6]  # transient short response
+        return {"rows": bars}
+
+    cache = FetchCache(tmp_path, chunk_minutes=60, settle_minutes=0, recheck_minutes=30)
+    kwargs = dict(cache=cache, provider="yfinance", symbol="USDJPY", tf="5m")
+    now = datetime(2025, 3, 3, 12, 0)
+    start, end = datetime(2025, 3, 3, 9), datetime(2025, 3, 3, 11, 55)
+
+    fetch_chunked(fetch, start=start, end=end, now=now, **kwargs)
+    entries = {p.name: cache.load(p) for p in tmp_path.rglob("*.json")}
+    assert entries["20250303T1100.json"]["final"] is True
+    assert entries["20250303T1000.json"]["final"] is False
+    assert entries["20250303T0900.json"]["recheck_at"] == "2025-03-03T12:30:00"
+
+    # Within the recheck window the stored (incomplete) chunks are reused.
+    calls.clear()
+    stats = {}
+    fetch_chunked(fetch, start=start, end=end, now=now + timedelta(minutes=10), stats=stats, **kwargs)
+    assert calls == [] and stats["hits"] == 3
+
+    # Afterwards they are fetched again and the late hour becomes final.
+    published["late"] = True
+    rows = fetch_chunked(fetch, start=start, end=end, now=now + timedelta(minutes=31), **kwargs)
+    assert sorted(calls) == [datetime(2025, 3, 3, 9), datetime(2025, 3, 3, 10)]
+    assert sum(row["timestamp"].startswith("2025-03-03T10") for row in rows) == 12
+    assert cache.load(cache.path("yfinance", "USDJPY", "5m", datetime(2025, 3, 3, 10)))["final"] is True
@@ -1,4 +1,6 @@
 import json
+import threading
+import time
 import urllib.parse
 import urllib.request
 from datetime import datetime, timedelta
@@ -544,3 +546,189 @@ def test_fetch_prices_invalid_value_raises(tmp_path: Path, api_client: SimpleNam
         )
 
     assert "invalid_field_value:volume" in str(exc.value)
+
+
+class _BarServer:
+    """Local stand-in provider serving synthetic 5m bars for the requested window."""
+
+    def __init__(self) -> None:
+        import http.server
+        import threading
+
+        self.requests: list[str] = []
+        self.not_modified: list[str] = []
+        self.fail_starts: set[str] = set()
+        server = self
+
+        class _Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802 - http.server API
+                params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+                start = datetime.fromisoformat(params["start"][0]).replace(tzinfo=None)
+                end = datetime.fromisoformat(params["end"][0]).replace(tzinfo=None)
+                server.requests.append(start.isoformat())
+                if start.isoformat() in server.fail_starts:
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                bars = []
+                ts = start + timedelta(minutes=(-start.minute) % 5)
+                while ts <= end:
+                    price = 150.0 + ts.hour / 100.0
+                    bars.append({
+                        "ts": ts.strftime("%Y-%m-%dT%H:%M:%S"), "open": price, "high": price + 0.05,
+                        "low": price - 0.05, "close": price + 0.01, "volume": 10,
+                    })
+                    ts += timedelta(minutes=5)
+                body = json.dumps({"data": bars}).encode("utf-8")
+                etag = '"%x"' % (hash(body) & 0xFFFFFFFF)
+                if self.headers.get("If-None-Match") == etag:
+                    server.not_modified.append(start.isoformat())
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_address[1]}/bars"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def bar_server(monkeypatch):
+    monkeypatch.setattr(fetch_prices_module, "_SLEEP", lambda *_: None)
+    server = _BarServer()
+    yield server
+    server.close()
+
+
+def test_plan_chunks_are_contiguous_and_disjoint():
+    start = datetime(2025, 1, 1)
+    chunks = fetch_prices_module.plan_chunks(start, start + timedelta(hours=10), 240)
+    assert [c[0] for c in chunks] == [start + timedelta(hours=h) for h in (0, 4, 8)]
+    assert chunks[0][1] == start + timedelta(hours=4) - timedelta(seconds=1)
+    assert chunks[-1][1] == start + timedelta(hours=10)
+
+
+def test_backfill_streams_chunks_in_order_and_resumes(tmp_path: Path, bar_server):
+    config_path, credentials_path = _write_config(tmp_path, bar_server.base_url)
+    manifest_path = tmp_path / "backfill.json"
+    start = datetime(2025, 1, 1)
+    end = start + timedelta(days=2)
+    kwargs = dict(
+        start=start, end=end, manifest_path=manifest_path, provider="mock",
+        config_path=config_path, credentials_path=credentials_path,
+        anomaly_log_path=tmp_path / "anomalies.jsonl", chunk_minutes=360, max_workers=3,
+    )
+    delivered: list[list[dict]] = []
+    bar_server.fail_starts = {(start + timedelta(hours=30)).isoformat()}
+    with pytest.raises(RuntimeError, match="api_request_failure"):
+        fetch_prices_module.backfill_prices("USDJPY", "5m", sink=delivered.append, **kwargs)
+    # Every chunk before the failed one was delivered, in order, and recorded.
+    assert len(delivered) == 5
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    assert sorted(manifest["chunks"]) == [
+        (start + timedelta(hours=6 * i)).strftime("%Y-%m-%dT%H:%M:%S") for i in range(5)
+    ]
+
+    bar_server.fail_starts = set()
+    bar_server.requests.clear()
+    summary = fetch_prices_module.backfill_prices("USDJPY", "5m", sink=delivered.append, **kwargs)
+    assert summary["chunks_total"] == 9 and summary["chunks_skipped"] == 5
+    assert sorted(bar_server.requests) == [(start + timedelta(hours=6 * i)).isoformat() for i in range(5, 9)]
+
+    timestamps = [row["timestamp"] for chunk in delivered for row in chunk]
+    assert len(timestamps) == 2 * 288 + 1
+    assert timestamps == sorted(set(timestamps))
+
+    snapshot_path = tmp_path / "snapshot.json"
+    validated_path = tmp_path / "validated" / "USDJPY" / "5m.csv"
+    for chunk in delivered:
+        ingest_records(
+            chunk, symbol="USDJPY", tf="5m", snapshot_path=snapshot_path,
+            raw_path=tmp_path / "raw.csv", validated_path=validated_path,
+            features_path=tmp_path / "features.csv", source_name="api_backfill",
+        )
+    assert len(validated_path.read_text(encoding="utf-8").splitlines()) == len(timestamps) + 1
+
+
+def test_backfill_waits_on_head_chunk_without_spinning(tmp_path: Path, bar_server, monkeypatch):
+    config_path, credentials_path = _write_config(tmp_path, bar_server.base_url)
+    start = datetime(2025, 1, 1)
+    later_done = threading.Semaphore(0)
+
+    def fake_fetch_window(provider_cfg, credentials, symbol, tf, *, start, end, **_):
+        if start == datetime(2025, 1, 1):
+            # Hold the head chunk until every later chunk has finished.
+            for _ in range(3):
+                later_done.acquire(timeout=5)
+            time.sleep(0.05)
+        else:
+            later_done.release()
+        return [{"timestamp": start.strftime("%Y-%m-%dT%H:%M:%S")}]
+
+    wait_calls: list[int] = []
+    real_wait = fetch_prices_module.wait
+
+    def counting_wait(futures, *args, **kwargs):
+        wait_calls.append(len(futures))
+        return real_wait(futures, *args, **kwargs)
+
+    monkeypatch.setattr(fetch_prices_module, "_fetch_window", fake_fetch_window)
+    monkeypatch.setattr(fetch_prices_module, "wait", counting_wait)
+    delivered: list[list[dict]] = []
+    summary = fetch_prices_module.backfill_prices(
+        "USDJPY", "5m", sink=delivered.append, start=start, end=start + timedelta(hours=24, seconds=-1),
+        manifest_path=tmp_path / "backfill.json", provider="mock", config_path=config_path,
+        credentials_path=credentials_path, anomaly_log_path=tmp_path / "anomalies.jsonl",
+        chunk_minutes=360, max_workers=4,
+    )
+    assert summary["chunks_fetched"] == 4
+    assert [chunk[0]["timestamp"] for chunk in delivered] == [
+        (start + timedelta(hours=6 * i)).strftime("%Y-%m-%dT%H:%M:%S") for i in range(4)
+    ]
+    # The loop blocks on the head chunk alone instead of spinning on the
+    # later chunks that have already completed.
+    assert wait_calls == [1]
+
+
+def test_fetch_cache_serves_settled_chunks_and_revalidates(tmp_path: Path, bar_server):
+    config_path, credentials_path = _write_config(tmp_path, bar_server.base_url)
+    start = datetime(2025, 1, 1, 0, 20)
+    end = start + timedelta(hours=3)
+    kwargs = dict(
+        start=start, end=end, provider="mock", config_path=config_path,
+        credentials_path=credentials_path, anomaly_log_path=tmp_path / "anomalies.jsonl",
+    )
+    expected = fetch_prices("USDJPY", "5m", **kwargs)
+    assert len(expected) == 37
+
+    bar_server.requests.clear()
+    cached = fetch_prices("USDJPY", "5m", cache_dir=tmp_path / "cache", **kwargs)
+    assert cached == expected
+    assert len(bar_server.requests) == 4  # one request per 60-minute chunk
+    bar_server.requests.clear()
+    assert fetch_prices("USDJPY", "5m", cache_dir=tmp_path / "cache", **kwargs) == expected
+    assert bar_server.requests == []  # every chunk is settled
+
+    # Chunks that are not settled yet are revalidated with If-None-Match.
+    config = yaml_compat.safe_load(config_path.read_text(encoding="utf-8"))
+    config["providers"]["mock"]["cache"] = {
+        "dir": str(tmp_path / "revalidate"), "chunk_minutes": 60, "settle_minutes": 10**8,
+    }
+    config_path.write_text(yaml_compat.safe_dump(config), encoding="utf-8")
+    assert fetch_prices("USDJPY", "5m", **kwargs) == expected
+    assert fetch_prices("USDJPY", "5m", **kwargs) == expected
+    assert len(bar_server.not_modified) == 4
@@ -0,0 +1,165 @@
+import math
+
+import pytest
+
+from core.fill_calibration import (
+    CalibrationAxis,
+    CollisionSample,
+    FillCalibrationCell,
+    FillCalibrationTable,
+    calibrate_fill_table,
+    simulate_collision_paths,
+)
+from core.fill_engine import BridgeFill, OrderSpec, SameBarPolicy
+from core.runner import BacktestRunner, RunnerConfig
+
+
+def _cell(p_tp: float, exit_mean_r: float, trades: int = 5) -> FillCalibrationCell:
+    return FillCalibrationCell(
+        p_tp=p_tp,
+        exit_mean_r=exit_mean_r,
+        exit_q10_r=exit_mean_r,
+        exit_q50_r=exit_mean_r,
+        exit_q90_r=exit_mean_r,
+        trades=trades,
+    )
+
+
+def _collision_bar():
+    return {"o": 149.90, "h": 150.25, "l": 149.70, "c": 150.15, "pip": 0.01, "spread": 0.001}
+
+
+def _collision_spec():
+    return OrderSpec(
+        side="BUY",
+        entry=150.0,
+        tp_pips=8.0,
+        sl_pips=12.0,
+        slip_cap_pip=2.0,
+        same_bar_policy=SameBarPolicy.PROBABILISTIC,
+    )
+
+
+def test_axis_index_clamps_to_edge_bins():
+    axis = CalibrationAxis(0.0, 1.0, 10)
+    assert axis.index(-5.0) == 0
+    assert axis.index(0.05) == 0
+    assert axis.index(0.55) == 5
+    assert axis.index(1.0) == 9
+    assert axis.index(42.0) == 9
+
+
+def test_lookup_prefers_full_cell_then_pooled_fallback():
+    table = FillCalibrationTable(min_trades=3)
+    ra, tp, sl = table.key_for(1.2, 0.3, 0.4)
+    table.cells[(ra, tp, sl)] = _cell(0.7, 0.1)
+    table.pooled[(tp, sl)] = _cell(0.4, -0.05)
+
+    assert table.lookup(1.2, 0.3, 0.4).p_tp == pytest.approx(0.7)
+    # Unknown ATR falls back to the pooled (d_tp, d_sl) cell.
+    assert table.lookup(None, 0.3, 0.4).p_tp == pytest.approx(0.4)
+
+    table.cells[(ra, tp, sl)] = _cell(0.7, 0.1, trades=1)
+    assert table.lookup(1.2, 0.3, 0.4).p_tp == pytest.approx(0.4)
+    assert table.lookup(1.2, 0.9, 0.9) is None
+
+
+def test_table_roundtrip(tmp_path):
+    table = FillCalibrationTable(min_trades=2, meta={"symbol": "USDJPY"})
+    table.cells[(1, 2, 3)] = _cell(0.6, 0.05)
+    table.pooled[(2, 3)] = _cell(0.55, 0.02)
+    path = table.save(tmp_path / "table.json")
+
+    loaded = FillCalibrationTable.load(path)
+    assert loaded.min_trades == 2
+    assert loaded.meta == {"symbol": "USDJPY"}
+    assert loaded.cells == table.cells
+    assert loaded.pooled == table.pooled
+
+
+def test_bridge_fill_consults_calibration_table():
+    bar = _collision_bar()
+    spec = _collision_spec()
+    table = FillCalibrationTable(min_trades=1)
+    feats = table.features(
+        entry_px=spec.entry,
+        tp_px=spec.entry + spec.tp_pips * bar["pip"],
+        stop_px=spec.entry - spec.sl_pips * bar["pip"],
+        high=bar["h"],
+        low=bar["l"],
+        atr=None,
+    )
+    _, tp_idx, sl_idx = table.key_for(*feats)
+    table.pooled[(tp_idx, sl_idx)] = _cell(0.25, -0.2, trades=4)
+
+    result = BridgeFill(calibration=table).simulate(bar, spec)
+    assert result["p_tp"] == pytest.approx(0.25)
+    assert result["exit_reason"] == "sl"
+    rng = bar["h"] - bar["l"]
+    assert math.isclose(result["exit_px"], spec.entry - 0.2 * rng, abs_tol=1e-9)
+
+    uncalibrated = BridgeFill().simulate(bar, spec)
+    assert uncalibrated["p_tp"] != pytest.approx(0.25)
+
+
+def test_collision_log_captures_same_bar_hits():
+    engine = BridgeFill()
+    engine.collision_log = []
+    bar = dict(_collision_bar(), atr=0.2)
+    engine.simulate(bar, _collision_spec())
+    assert len(engine.collision_log) == 1
+    sample = engine.collision_log[0]
+    assert sample.side == "BUY"
+    assert sample.atr == pytest.approx(0.2)
+    assert sample.require_entry_touch is True
+
+
+def test_runner_loads_calibration_from_config(tmp_path):
+    table = FillCalibrationTable()
+    table.pooled[(1, 1)] = _cell(0.5, 0.0)
+    path = table.save(tmp_path / "cal.json")
+    rcfg = RunnerConfig(fill_bridge_calibration=str(path))
+    runner = BacktestRunner(equity=100000.0, symbol="USDJPY", runner_cfg=rcfg)
+    assert runner.fill_engine_b.calibration is not None
+    assert runner.fill_engine_b.calibration.pooled == table.pooled
+    assert runner.fill_engine_c.calibration is None
+
+
+def test_simulated_paths_are_symmetric_and_follow_bar_shape():
+    pytest.importorskip("numpy")
+    up_bar = {"o": 100.0, "h": 101.5, "l": 98.5, "c": 101.4}
+    down_bar = {"o": 100.0, "h": 101.5, "l": 98.5, "c": 98.6}
+    samples = [
+        CollisionSample.from_bar(side="BUY", entry_px=100.2, tp_px=101.0, stop_px=99.5, bar=up_bar),
+        CollisionSample.from_bar(side="SELL", entry_px=99.8, tp_px=99.0, stop_px=100.5, bar=down_bar),
+    ]
+    result = simulate_collision_paths(samples, n_paths=3000, seed=7)
+    assert result.exit_r.shape == (2, 3000)
+    # Mirror-image collisions should resolve with (almost) the same odds.
+    assert result.p_tp[0] == pytest.approx(result.p_tp[1], abs=0.05)
+    # A close near the high implies the low printed first, so the buy stop wins.
+    assert result.p_tp[0] < 0.5
+    # Stop exits never fill better than the stop level.
+    rng = up_bar["h"] - up_bar["l"]
+    assert result.exit_r.min() >= -(100.2 - 98.5) / rng - 1e-9
+
+
+def test_calibrate_fill_table_batches_collisions():
+    pytest.importorskip("numpy")
+    bar = {"o": 100.0, "h": 101.0, "l": 99.0, "c": 100.5}
+    samples = [
+        CollisionSample.from_bar(
+            side="BUY", entry_px=100.1, tp_px=100.8, stop_px=99.4, bar=bar, atr=0.8
+        )
+        for _ in range(5)
+    ]
+    table = calibrate_fill_table(samples, n_paths=200, seed=1, max_batch_elements=20_000)
+    assert table.meta["samples"] == 5
+    assert len(table.cells) == 1
+    cell = next(iter(table.cells.values()))
+    assert cell.trades == 5
+    assert 0.0 < cell.p_tp < 1.0
+    assert cell.exit_q10_r <= cell.exit_q50_r <= cell.exit_q90_r
+    assert table.lookup_collision(
+        entry_px=100.1, tp_px=100.8, stop_px=99.4, bar=bar, atr=0.8
+    ) == cell
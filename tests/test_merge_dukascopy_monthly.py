@@ -1,7 +1,9 @@
 import csv
 from pathlib import Path
 
-from scripts.merge_dukascopy_monthly import merge_files
+import pytest
+
+from scripts.merge_dukascopy_monthly import merge_files, merge_files_parallel
 
 
 def _write_month(path: Path, rows):
@@ -56,3 +58,47 @@ def test_merge_handles_duplicates_and_sorting(tmp_path):
     assert sample["symbol"] == "USDJPY"
     assert sample["tf"] == "5m"
     assert sample["spread"] == "0.0"
+
+
+def _months(tmp_path: Path):
+    files = []
+    for month, offset in ((1, 0), (2, 30), (3, 60)):
+        path = tmp_path / f"USDJPY_2025{month:02d}_5min.csv"
+        rows = [
+            [f"2025-01-01T{(offset + i * 5) // 60:02d}:{(offset + i * 5) % 60:02d}:00Z", 150 + i, 151, 149, 150 + month, 100 * month]
+            for i in range(12)
+        ]
+        rows.append(rows[3][:5] + [7])  # duplicate inside one month
+        rows.reverse()
+        _write_month(path, rows)
+        files.append(path)
+    return files
+
+
+def test_parallel_merge_matches_in_memory_merge(tmp_path):
+    files = _months(tmp_path)
+    expected, expected_stats = merge_files(files, symbol="USDJPY", tf="5m", spread_default=0.1)
+
+    out = tmp_path / "out" / "merged.csv"
+    stats = merge_files_parallel(
+        files, symbol="USDJPY", tf="5m", spread_default=0.1, out_path=out, workers=2
+    )
+    assert stats == expected_stats
+    with out.open(newline="", encoding="utf-8") as f:
+        assert list(csv.DictReader(f)) == expected
+    assert not [p for p in out.parent.iterdir() if p != out]
+
+
+def test_parallel_merge_writes_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    files = _months(tmp_path)
+    out = tmp_path / "merged.csv"
+    stats = merge_files_parallel(
+        files, symbol="USDJPY", tf="5m", spread_default=0.0,
+        out_path=out, parquet_path=tmp_path / "merged.parquet",
+    )
+    table = pq.read_table(str(tmp_path / "merged.parquet"))
+    assert table.num_rows == stats.rows_merged
+    assert table.column("timestamp").to_pylist() == sorted(table.column("timestamp").to_pylist())
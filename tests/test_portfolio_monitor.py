@@ -1,4 +1,5 @@
 import json
+import os
 import shutil
 import subprocess
 import sys
@@ -8,6 +9,7 @@ from typing import Dict, Tuple
 
 import pytest
 
+from analysis import portfolio_monitor
 from analysis.portfolio_monitor import build_portfolio_summary, load_portfolio_snapshot
 
 FIXTURE_DIR = Path("reports/portfolio_samples/router_demo")
@@ -249,3 +251,78 @@ def test_build_portfolio_summary_accepts_zero_equity_values(tmp_path: Path) -> N
 
     summary = build_portfolio_summary(snapshot_dir)
     assert summary["aggregate_equity_curve"]
+
+
+def _point(minute: int, value: float) -> Tuple[datetime, str, float]:
+    dt = datetime(2025, 1, 1, tzinfo=timezone.utc).replace(minute=minute)
+    return dt, dt.isoformat().replace("+00:00", "Z"), value
+
+
+def test_vectorised_aggregation_forward_fills_and_keeps_drawdown_ties() -> None:
+    curves = {
+        "a": [_point(0, 100.0), _point(10, 120.0), _point(20, 90.0), _point(30, 120.0)],
+        "b": [_point(5, 50.0), _point(15, 40.0), _point(25, 60.0)],
+    }
+
+    aggregate = portfolio_monitor._aggregate_equity_curves(curves)
+    assert [(label[14:16], value) for _, label, value in aggregate] == [
+        ("05", 150.0),
+        ("10", 170.0),
+        ("15", 160.0),
+        ("20", 130.0),
+        ("25", 150.0),
+        ("30", 180.0),
+    ]
+
+    drawdown = portfolio_monitor._max_drawdown(curves["a"])
+    assert drawdown["max_drawdown_pct"] == pytest.approx(25.0)
+    assert drawdown["trough_ts"] == curves["a"][2][1]
+    # equal highs move the reported peak to the latest one
+    assert drawdown["peak_ts"] == curves["a"][3][1]
+    assert portfolio_monitor._max_drawdown([_point(0, 0.0), _point(5, -1.0)])["max_drawdown_pct"] == 0.0
+
+
+def test_build_portfolio_summary_reports_category_contributions(tmp_path: Path) -> None:
+    snapshot_dir, _ = _prepare_snapshot(tmp_path)
+
+    summary = build_portfolio_summary(snapshot_dir)
+
+    contributions = {row["category"]: row for row in summary["category_contributions"]}
+    aggregate_curve = summary["aggregate_equity_curve"]
+    total_pnl = aggregate_curve[-1]["equity"] - aggregate_curve[0]["equity"]
+    assert set(contributions) == {"day", "scalping"}
+    assert sum(row["pnl"] for row in contributions.values()) == pytest.approx(total_pnl)
+    assert sum(row["contribution_pct"] for row in contributions.values()) == pytest.approx(100.0)
+
+
+def test_strategy_series_cache_tracks_metrics_mtime(tmp_path: Path) -> None:
+    pytest.importorskip("numpy")
+    snapshot_dir, _ = _prepare_snapshot(tmp_path)
+    metrics_file = sorted((snapshot_dir / "metrics").glob("*.json"))[0]
+
+    first, _ = load_portfolio_snapshot(snapshot_dir)
+    again, _ = load_portfolio_snapshot(snapshot_dir)
+    assert again[0].arrays is first[0].arrays
+
+    payload = json.loads(metrics_file.read_text(encoding="utf-8"))
+    payload["equity_curve"] = payload["equity_curve"][:2]
+    metrics_file.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    stat = metrics_file.stat()
+    os.utime(metrics_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    refreshed, _ = load_portfolio_snapshot(snapshot_dir)
+    assert len(refreshed[0].equity_curve) == 2
+    assert len(refreshed[0].arrays) == 2
+
+
+def test_loop_fallback_matches_vectorised_summary(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("numpy")
+    snapshot_dir, _ = _prepare_snapshot(tmp_path)
+    generated_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    vectorised = build_portfolio_summary(snapshot_dir, generated_at=generated_at)
+    monkeypatch.setattr(portfolio_monitor, "np", None)
+    portfolio_monitor._SERIES_CACHE.clear()
+    fallback = build_portfolio_summary(snapshot_dir, generated_at=generated_at)
+
+    assert fallback == vectorised
@@ -4,6 +4,8 @@ import subprocess
 import sys
 from pathlib import Path
 
+import pytest
+
 from scripts.pull_prices import ingest_records
 
 
@@ -219,3 +221,137 @@ def test_non_monotonic_rows_skip_raw(tmp_path, monkeypatch):
     with anomaly_log.open(encoding="utf-8") as f:
         entries = [json.loads(line) for line in f]
     assert entries[0]["type"] == "non_monotonic"
+
+
+def test_ingest_commits_in_batches_and_resumes_after_crash(tmp_path, monkeypatch):
+    from scripts import pull_prices
+
+    monkeypatch.setattr(pull_prices, "ANOMALY_LOG", tmp_path / "anomalies.jsonl")
+    rows = list(csv.DictReader(SOURCE_CSV.splitlines()))
+
+    def _paths(name):
+        base = tmp_path / name
+        return dict(
+            snapshot_path=base / "snapshot.json",
+            raw_path=base / "raw.csv",
+            validated_path=base / "validated.csv",
+            features_path=base / "features.csv",
+        )
+
+    single = _paths("single")
+    ingest_records(rows, symbol="USDJPY", tf="5m", **single)
+
+    def _crashing(limit):
+        for row in rows[:limit]:
+            yield row
+        raise RuntimeError("source dropped")
+
+    batched = _paths("batched")
+    with pytest.raises(RuntimeError):
+        ingest_records(_crashing(5), symbol="USDJPY", tf="5m", batch_size=2, **batched)
+    # Two full batches were committed; the fifth row was still pending.
+    with batched["validated_path"].open(encoding="utf-8") as handle:
+        assert len(handle.read().splitlines()) == 1 + 4
+    snapshot = json.loads(batched["snapshot_path"].read_text(encoding="utf-8"))
+    assert snapshot["ingest"]["USDJPY_5m"].startswith("2024-01-01T00:15:00")
+
+    resumed = ingest_records(rows, symbol="USDJPY", tf="5m", batch_size=3, **batched)
+    assert resumed["rows_validated"] == 4
+    for name in ("raw_path", "validated_path", "features_path"):
+        assert batched[name].read_bytes() == single[name].read_bytes(), name
+
+
+def test_journal_rolls_back_partial_batch_on_restart(tmp_path, monkeypatch):
+    from scripts import pull_prices
+
+    monkeypatch.setattr(pull_prices, "ANOMALY_LOG", tmp_path / "anomalies.jsonl")
+    rows = list(csv.DictReader(SOURCE_CSV.splitlines()))
+    snapshot_path = tmp_path / "state" / "snapshot.json"
+    paths = dict(
+        snapshot_path=snapshot_path,
+        raw_path=tmp_path / "raw.csv",
+        validated_path=tmp_path / "validated.csv",
+        features_path=tmp_path / "features.csv",
+    )
+    ingest_records(rows[:3], symbol="USDJPY", tf="5m", **paths)
+    committed = {name: paths[name].read_bytes() for name in ("raw_path", "validated_path", "features_path")}
+
+    real_save = pull_prices._save_snapshot
+
+    def _crash(path, data):
+        raise OSError("power cut before commit")
+
+    monkeypatch.setattr(pull_prices, "_save_snapshot", _crash)
+    with pytest.raises(OSError):
+        ingest_records(rows, symbol="USDJPY", tf="5m", **paths)
+    journal = pull_prices.journal_path_for(snapshot_path, "USDJPY", "5m")
+    assert journal.exists()
+    assert paths["validated_path"].read_bytes() != committed["validated_path"]
+
+    monkeypatch.setattr(pull_prices, "_save_snapshot", real_save)
+    recovery = pull_prices.recover_ingest_journal("USDJPY", "5m", snapshot_path=snapshot_path)
+    assert recovery["action"] == "rolled_back"
+    assert not journal.exists()
+    for name, data in committed.items():
+        assert paths[name].read_bytes() == data, name
+
+    result = ingest_records(rows, symbol="USDJPY", tf="5m", **paths)
+    assert result["rows_validated"] == 5
+
+    # A journal whose watermark already reached the snapshot is a committed batch.
+    pull_prices._begin_journal(
+        journal,
+        key="USDJPY_5m",
+        watermark=pull_prices.get_last_processed_ts("USDJPY", "5m", snapshot_path=snapshot_path),
+        paths=[paths["validated_path"]],
+    )
+    with paths["validated_path"].open("a", encoding="utf-8") as handle:
+        handle.write("appended-after-journal\n")
+    after = paths["validated_path"].read_bytes()
+    recovery = pull_prices.recover_ingest_journal("USDJPY", "5m", snapshot_path=snapshot_path)
+    assert recovery["action"] == "rolled_forward"
+    assert paths["validated_path"].read_bytes() == after
+
+
+def test_journal_recovery_works_from_another_working_directory(tmp_path, monkeypatch):
+    from scripts import pull_prices
+
+    monkeypatch.setattr(pull_prices, "ANOMALY_LOG", tmp_path / "anomalies.jsonl")
+    rows = list(csv.DictReader(SOURCE_CSV.splitlines()))
+    snapshot_path = tmp_path / "state" / "snapshot.json"
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+    monkeypatch.chdir(workdir)
+    # Relative store paths, like the RAW_ROOT/VALIDATED_ROOT/FEATURES_ROOT defaults.
+    paths = dict(
+        snapshot_path=snapshot_path,
+        raw_path=Path("raw.csv"),
+        validated_path=Path("validated.csv"),
+        features_path=Path("features.csv"),
+    )
+    ingest_records(rows[:3], symbol="USDJPY", tf="5m", **paths)
+    committed = (workdir / "validated.csv").read_bytes()
+
+    def _crash(path, data):
+        raise OSError("power cut before commit")
+
+    monkeypatch.setattr(pull_prices, "_save_snapshot", _crash)
+    with pytest.raises(OSError):
+        ingest_records(rows, symbol="USDJPY", tf="5m", **paths)
+
+    monkeypatch.chdir(tmp_path)
+    recovery = pull_prices.recover_ingest_journal("USDJPY", "5m", snapshot_path=snapshot_path)
+    assert recovery["action"] == "rolled_back"
+    assert str((workdir / "validated.csv").resolve()) in recovery["truncated"]
+    assert (workdir / "validated.csv").read_bytes() == committed
+
+
+def test_tail_reads_match_full_scan():
+    from scripts import pull_prices
+
+    source = ROOT / "data" / "sample_orb.csv"
+    with source.open(newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert pull_prices._infer_last_ts_from_csv(source) == pull_prices._parse_ts(rows[-1]["timestamp"])
+    recent = pull_prices._load_recent_validated(source, limit=50)
+    assert recent == pull_prices._parse_validated_rows(rows, 50)
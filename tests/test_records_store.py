@@ -0,0 +1,134 @@
+import json
+
+import pytest
+
+from core.records_store import (
+    RecordsWriter,
+    find_records_file,
+    iter_records,
+    read_columns,
+    write_records,
+)
+from scripts.run_sim import main as run_sim_main
+from scripts.summarize_strategy_gate import main as summarize_gate_main
+from tests.runner_fixtures import MANIFEST_PATH, SAMPLE_CSV
+
+
+def _records():
+    records = []
+    for day in range(1, 7):
+        session = "LDN" if day % 2 else "NY"
+        records.append({"stage": "strategy_gate", "ts": f"2024-01-0{day}T07:00:00Z", "side": "BUY", "or_atr_ratio": 0.2})
+        records.append(
+            {
+                "stage": "trade",
+                "ts": f"2024-01-0{day}T09:00:00Z",
+                "side": "SELL",
+                "session": session,
+                "pnl_pips": float(day),
+                "ev_pass": True,
+            }
+        )
+    records[-1]["late_key"] = "only-in-last-batch"
+    return records
+
+
+def _expected(record):
+    return {key: (str(value) if isinstance(value, bool) else value) for key, value in record.items()}
+
+
+def _strip_missing(row):
+    return {key: value for key, value in row.items() if value is not None}
+
+
+def test_npz_round_trip_streams_batches_and_keeps_late_keys(tmp_path):
+    pytest.importorskip("numpy")
+    path = tmp_path / "records.npz"
+    with RecordsWriter(path, fmt="npz", batch_size=4) as writer:
+        writer.extend(_records())
+    assert writer.rows == 12
+    assert writer.columns["pnl_pips"] == "float"
+    assert writer.columns["ts"] == "str"
+
+    rows = [_strip_missing(row) for row in iter_records(path)]
+    assert rows == [_expected(record) for record in _records()]
+
+
+def test_projection_and_predicates_skip_batches(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    path = write_records(tmp_path / "records", _records(), fmt="npz", batch_size=4)
+    assert path.name == "records.npz"
+
+    loads = []
+    original = np.lib.format.read_array
+
+    def _counting_read(handle, *args, **kwargs):
+        loads.append(handle.name)
+        return original(handle, *args, **kwargs)
+
+    monkeypatch.setattr(np.lib.format, "read_array", _counting_read)
+
+    columns = read_columns(path, columns=["pnl_pips"], filters={"stage": "trade", "date": ("2024-01-01", "2024-01-02")})
+    assert list(columns) == ["pnl_pips"]
+    assert columns["pnl_pips"].tolist() == [1.0, 2.0]
+    # Only the first batch (2024-01-01..02) is decoded, and only two columns of it.
+    assert sorted(loads) == ["b000000/pnl_pips.npy", "b000000/stage.npy", "b000000/ts.npy"]
+
+    ny = read_columns(path, columns=["ts", "pnl_pips"], filters={"session": ["NY"]})
+    assert ny["pnl_pips"].tolist() == [2.0, 4.0, 6.0]
+    assert read_columns(path, filters={"session": "TOKYO"}) == {}
+
+
+def test_csv_reader_supports_the_same_queries(tmp_path):
+    path = write_records(tmp_path / "records", _records(), fmt="csv")
+    rows = list(iter_records(path, columns=["ts", "pnl_pips"], filters={"session": "LDN", "date": (None, "2024-01-03")}))
+    assert rows == [
+        {"ts": "2024-01-01T09:00:00Z", "pnl_pips": "1.0"},
+        {"ts": "2024-01-03T09:00:00Z", "pnl_pips": "3.0"},
+    ]
+
+
+def test_parquet_round_trip_with_pushdown(tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = write_records(tmp_path / "records", _records(), fmt="parquet", batch_size=4)
+    rows = [_strip_missing(row) for row in iter_records(path)]
+    assert rows == [_expected(record) for record in _records()]
+    columns = read_columns(path, columns=["pnl_pips"], filters={"stage": "trade", "session": "NY"})
+    assert columns["pnl_pips"].tolist() == [2.0, 4.0, 6.0]
+
+    groups = []
+    original = pq.ParquetFile.iter_batches
+
+    def _counting_iter(self, *args, **kwargs):
+        groups.extend(kwargs.get("row_groups") or [])
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(pq.ParquetFile, "iter_batches", _counting_iter)
+    early = read_columns(path, columns=["pnl_pips"], filters={"stage": "trade", "date": ("2024-01-01", "2024-01-02")})
+    assert early["pnl_pips"].tolist() == [1.0, 2.0]
+    # Row groups are read one at a time and later ones are skipped from their ts stats.
+    assert groups == [0]
+
+
+def test_run_sim_writes_columnar_records_for_downstream_tools(tmp_path):
+    pytest.importorskip("numpy")
+    out_dir = tmp_path / "runs"
+    argv = [
+        "--manifest", str(MANIFEST_PATH), "--csv", str(SAMPLE_CSV), "--no-auto-state",
+        "--out-dir", str(out_dir), "--debug", "--debug-sample-limit", "50",
+        "--json-out", str(tmp_path / "metrics.json"), "--records-format", "npz",
+    ]
+    assert run_sim_main(argv) == 0
+    run_dir = json.loads((tmp_path / "metrics.json").read_text(encoding="utf-8"))["run_dir"]
+    records_path = find_records_file(run_dir)
+    assert records_path is not None and records_path.name == "records.npz"
+    stages = read_columns(records_path, columns=["stage"])["stage"].tolist()
+    assert stages and all(isinstance(stage, str) for stage in stages)
+    checksums = json.loads((records_path.parent / "checksums.json").read_text(encoding="utf-8"))
+    assert "records.npz" in json.dumps(checksums)
+
+    out_json = tmp_path / "gate.json"
+    assert summarize_gate_main(["--run-dir", run_dir, "--stage", stages[0], "--out-json", str(out_json)]) == 0
+    summary = json.loads(out_json.read_text(encoding="utf-8"))
+    assert summary["records_path"].endswith("records.npz")
+    assert summary["stages"][stages[0]]["total_count"] == stages.count(stages[0])
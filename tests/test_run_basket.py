@@ -0,0 +1,96 @@
+import csv
+import json
+
+import pytest
+
+from scripts import run_basket
+from scripts.run_sim import main as run_sim_main
+from tests.runner_fixtures import MANIFEST_PATH, SAMPLE_CSV
+
+SYMBOLS = ("USDJPY", "EURJPY")
+
+
+def _basket_csv(tmp_path, rows=1500):
+    lines = SAMPLE_CSV.read_text(encoding="utf-8").splitlines()
+    out = [lines[0]]
+    for line in lines[1 : rows + 1]:
+        out.extend(line.replace("USDJPY", symbol) for symbol in SYMBOLS)
+    path = tmp_path / "basket.csv"
+    path.write_text("\n".join(out) + "\n", encoding="utf-8")
+    return path
+
+
+def test_partition_csv_splits_rows_in_one_pass(tmp_path):
+    shards = run_basket.partition_csv(_basket_csv(tmp_path, rows=10), tmp_path / "shards")
+    assert sorted(shards) == sorted(SYMBOLS)
+    for symbol, info in shards.items():
+        with info["path"].open(encoding="utf-8", newline="") as handle:
+            rows = list(csv.DictReader(handle))
+        assert info["rows"] == len(rows) == 10
+        assert {row["symbol"] for row in rows} == {symbol}
+
+    selected = run_basket.partition_csv(_basket_csv(tmp_path, rows=10), tmp_path / "only", symbols=["EURJPY"])
+    assert list(selected) == ["EURJPY"]
+
+
+def test_merge_equity_curves_sums_step_curves():
+    merged = run_basket.merge_equity_curves(
+        {
+            "A": [["t0", 100.0], ["t2", 110.0]],
+            "B": [["t0", 100.0], ["t1", 95.0], ["t3", 105.0]],
+        }
+    )
+    assert merged == [["t0", 200.0], ["t1", 195.0], ["t2", 205.0], ["t3", 215.0]]
+
+
+def test_merge_equity_curves_seeds_symbols_with_starting_equity():
+    # B trades only at t2; before that it must count at its starting equity,
+    # not at the equity after its first trade.
+    curves = {"A": [["t1", 101.0]], "B": [["t2", 205.0]]}
+    merged = run_basket.merge_equity_curves(curves, {"A": 100.0, "B": 200.0})
+    assert merged == [["t1", 301.0], ["t2", 306.0]]
+
+
+def test_build_portfolio_daily_sharpe_matches_sweep_definition():
+    daily = {"2024-01-01": {"pnl_pips": 10.0}, "2024-01-02": {"pnl_pips": -2.0}, "2024-01-03": {"pnl_pips": 4.0}}
+    portfolio = run_basket.build_portfolio({"A": {"equity": 100.0, "equity_curve": []}}, daily)
+    values = [10.0, -2.0, 4.0]
+    mean = sum(values) / len(values)
+    std = (sum((value - mean) ** 2 for value in values) / len(values)) ** 0.5
+    assert portfolio["daily_sharpe"] == pytest.approx(mean / std)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_basket_matches_single_symbol_runs(tmp_path, workers):
+    basket_csv = _basket_csv(tmp_path)
+    out_dir = tmp_path / "basket"
+    argv = [
+        "--manifest", str(MANIFEST_PATH), "--csv", str(basket_csv), "--out-dir", str(out_dir),
+        "--workers", str(workers), "--json-out", str(tmp_path / "portfolio.json"),
+        "--", "--no-auto-state", "--debug", "--debug-sample-limit", "20",
+    ]
+    assert run_basket.main(argv) == 0
+    portfolio = json.loads((tmp_path / "portfolio.json").read_text(encoding="utf-8"))
+    assert portfolio["symbols"] == sorted(SYMBOLS)
+
+    single = tmp_path / "single.json"
+    assert run_sim_main(
+        ["--manifest", str(MANIFEST_PATH), "--csv", str(basket_csv), "--no-auto-state", "--json-out", str(single)]
+    ) == 0
+    usdjpy = json.loads(single.read_text(encoding="utf-8"))
+    assert portfolio["per_symbol"]["USDJPY"]["total_pips"] == pytest.approx(usdjpy["total_pips"])
+    assert portfolio["per_symbol"]["EURJPY"]["symbol"] == "EURJPY"
+    assert portfolio["trades"] == sum(out["trades"] for out in portfolio["per_symbol"].values())
+    assert portfolio["total_pips"] == pytest.approx(
+        sum(out["total_pips"] for out in portfolio["per_symbol"].values())
+    )
+
+    with (out_dir / "daily.csv").open(encoding="utf-8", newline="") as handle:
+        daily = list(csv.DictReader(handle))
+    assert sum(float(row["pnl_pips"]) for row in daily) == pytest.approx(portfolio["total_pips"])
+
+    with open(portfolio["records_path"], encoding="utf-8", newline="") as handle:
+        records = list(csv.DictReader(handle))
+    assert {row["symbol"] for row in records} == set(SYMBOLS)
+    timestamps = [row["ts"] for row in records]
+    assert timestamps == sorted(timestamps)
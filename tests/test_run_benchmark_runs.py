@@ -336,3 +336,69 @@ def test_main_rebuild_index_failure(monkeypatch: pytest.MonkeyPatch, capsys, ben
     assert f"[rebuild_runs_index.py stdout]" in captured.err
     assert f"[rebuild_runs_index.py stderr]" in captured.err
     assert any(Path(cmd[1]).name == "rebuild_runs_index.py" for cmd in calls)
+
+
+def test_main_parallel_workers_run_in_memory(monkeypatch: pytest.MonkeyPatch, capsys, tmp_path: Path) -> None:
+    sample = Path(__file__).resolve().parents[1] / "data/sample_orb.csv"
+    lines = sample.read_text(encoding="utf-8").splitlines()[:3001]
+    bars_path = tmp_path / "bars.csv"
+    bars_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    reports_dir = tmp_path / "reports"
+    runs_dir = tmp_path / "runs"
+
+    class DummyProc:
+        returncode = 0
+        stdout = ""
+        stderr = ""
+
+    def _run(cmd: List[str], check: bool = False, **_kwargs):  # noqa: FBT002
+        if Path(cmd[1]).name != "rebuild_runs_index.py":
+            raise AssertionError(f"unexpected command: {cmd}")
+        return DummyProc()
+
+    monkeypatch.setattr(rb.subprocess, "run", _run)
+    rc = rb.main([
+        "--bars", str(bars_path),
+        "--windows", "5,2",
+        "--reports-dir", str(reports_dir),
+        "--runs-dir", str(runs_dir),
+        "--snapshot", str(tmp_path / "snapshot.json"),
+        "--workers", "3",
+    ])
+    assert rc == 0
+    result = json.loads(capsys.readouterr().out)
+    assert [entry["window"] for entry in result["rolling"]] == [5, 2]
+    (run_dir,) = runs_dir.iterdir()
+    assert {"params.json", "metrics.json", "checksums.json"} <= {p.name for p in run_dir.iterdir()}
+    checksums = json.loads((run_dir / "checksums.json").read_text(encoding="utf-8"))
+    assert set(checksums["files"]) >= {"params.json", "metrics.json"}
+
+    # Reference: the sequential path's window slicing (_filter_window ->
+    # _write_temp) read back through run_sim's CSV loader, not _simulate.
+    from core.runner import BacktestRunner
+    from scripts.config_utils import build_runner_config
+    from scripts.run_sim import load_bars_csv
+
+    args = rb.parse_args(["--bars", str(bars_path)])
+    rows = rb._read_rows(bars_path)
+
+    def _reference(csv_path: Path) -> dict:
+        bars = list(load_bars_csv(str(csv_path), symbol=args.symbol, default_symbol=args.symbol))
+        runner = BacktestRunner(equity=args.equity, symbol=args.symbol, runner_cfg=build_runner_config(args))
+        return runner.run(bars, mode=args.mode).as_dict()
+
+    def _assert_matches(actual: dict, expected: dict) -> None:
+        for key in ("trades", "wins", "total_pips", "sharpe", "max_drawdown"):
+            assert actual[key] == pytest.approx(expected[key]), key
+        assert actual["equity_curve"] == expected["equity_curve"]
+
+    for entry in result["rolling"]:
+        tmp_csv = rb._write_temp(rb._filter_window(rows, entry["window"]))
+        try:
+            expected = _reference(tmp_csv)
+        finally:
+            tmp_csv.unlink()
+        _assert_matches(json.loads(Path(entry["path"]).read_text(encoding="utf-8")), expected)
+    baseline = json.loads((reports_dir / "baseline" / "USDJPY_conservative.json").read_text(encoding="utf-8"))
+    _assert_matches(baseline, _reference(bars_path))
+    assert baseline["trades"] == result["baseline_metrics"]["trades"]
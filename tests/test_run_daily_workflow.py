@@ -2815,3 +2815,49 @@ def test_run_daily_workflow_uses_shared_timestamp_parser():
 
     assert parser("   ") is None
     assert parser("not-a-timestamp") is None
+
+
+def test_dag_workers_runs_stages_and_skips_unchanged(monkeypatch, tmp_path):
+    bars = tmp_path / "bars.csv"
+    bars.write_text("timestamp,o,h,l,c\n", encoding="utf-8")
+    captured = []
+
+    def fake_run_cmd(cmd, *, in_process=True):
+        # Parallel stages must not share the interpreter.
+        assert in_process is False
+        captured.append(Path(cmd[1]).name)
+        if "--out-json" in cmd:
+            Path(cmd[cmd.index("--out-json") + 1]).write_text("{}", encoding="utf-8")
+        return 0
+
+    monkeypatch.setattr(run_daily_workflow, "run_cmd", fake_run_cmd)
+    log_path = tmp_path / "automation.log"
+    argv = [
+        "--bars", str(bars),
+        "--check-data-quality",
+        "--data-quality-output-dir", str(tmp_path / "dq"),
+        "--data-quality-gap-csv", str(tmp_path / "dq/gaps.csv"),
+        "--data-quality-gap-json", str(tmp_path / "dq/gaps.json"),
+        "--check-benchmark-freshness",
+        "--dag-workers", "2",
+        "--dag-state", str(tmp_path / "dag_state.json"),
+        "--dag-log", str(log_path),
+    ]
+    (tmp_path / "dq").mkdir()
+    for name in ("gaps.csv", "gaps.json"):
+        (tmp_path / "dq" / name).write_text("", encoding="utf-8")
+
+    assert run_daily_workflow.main(argv) == 0
+    assert sorted(captured) == ["check_benchmark_freshness.py", "check_data_quality.py"]
+
+    assert run_daily_workflow.main(argv) == 0
+    assert captured[2:] == ["check_benchmark_freshness.py"]
+
+    entries = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    stage_entries = [e for e in entries if e["job_id"].endswith("-daily-workflow-data_quality")]
+    assert [e["status"] for e in stage_entries] == ["ok", "skipped"]
+    summaries = [e for e in entries if e["job_id"].endswith("-daily-workflow")]
+    assert summaries[-1]["diagnostics"]["stages"] == {
+        "benchmark_freshness": "ok",
+        "data_quality": "cached",
+    }
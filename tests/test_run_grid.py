@@ -46,6 +46,8 @@ class TestRunGrid(unittest.TestCase):
                 "--out-dir", os.path.join(os.path.dirname(__file__), "runs_grid")
             ])
             self.assertGreaterEqual(out.get("runs", 0), 1)
+            # The trial cache is opt-in; a plain grid run must not create it.
+            self.assertNotIn("trial_cache", out)
         finally:
             try:
                 os.remove(path)
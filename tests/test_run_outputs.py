@@ -0,0 +1,53 @@
+import hashlib
+import json
+
+import pytest
+
+from scripts._run_outputs import RunOutputWriter, iter_csv_chunks, render_json
+from scripts.run_sim import main as run_sim_main
+from tests.runner_fixtures import MANIFEST_PATH, SAMPLE_CSV
+
+
+def test_writer_hashes_bytes_in_submission_order(tmp_path):
+    with RunOutputWriter() as outputs:
+        first = outputs.write(tmp_path / "a.json", render_json({"x": [1, 2]}))
+        rows = [[i, f"v{i}"] for i in range(5000)]
+        second = outputs.write(tmp_path / "nested" / "b.csv", iter_csv_chunks(["i", "v"], rows))
+        order = outputs.submit(lambda: sorted(p.name for p in tmp_path.rglob("*.*")))
+    assert (tmp_path / "a.json").read_bytes() == b'{"x":[1,2]}'
+    for future, path in ((first, tmp_path / "a.json"), (second, tmp_path / "nested" / "b.csv")):
+        assert future.result() == hashlib.sha256(path.read_bytes()).hexdigest()
+    assert order.result() == ["a.json", "b.csv"]
+    assert (tmp_path / "nested" / "b.csv").read_text(encoding="utf-8").count("\n") == 5001
+
+
+def test_writer_reraises_background_failures(tmp_path):
+    (tmp_path / "blocker").write_text("file", encoding="utf-8")
+    outputs = RunOutputWriter()
+    outputs.write(tmp_path / "blocker" / "out.json", b"{}")
+    with pytest.raises(OSError):
+        outputs.close()
+
+
+def test_run_sim_outputs_are_compact_and_checksummed(tmp_path):
+    out_dir = tmp_path / "runs"
+    json_out = tmp_path / "metrics.json"
+    argv = [
+        "--manifest", str(MANIFEST_PATH), "--csv", str(SAMPLE_CSV), "--no-auto-state",
+        "--out-dir", str(out_dir), "--json-out", str(json_out), "--debug", "--debug-sample-limit", "10",
+    ]
+    assert run_sim_main(argv) == 0
+    (run_dir,) = out_dir.iterdir()
+    metrics_bytes = (run_dir / "metrics.json").read_bytes()
+    assert metrics_bytes == json_out.read_bytes()
+    assert b"\n" not in metrics_bytes
+
+    checksums = json.loads((run_dir / "checksums.json").read_text(encoding="utf-8"))["files"]
+    assert {"params.json", "metrics.json", "daily.csv", "records.csv"} <= set(checksums)
+    for name, digest in checksums.items():
+        assert hashlib.sha256((run_dir / name).read_bytes()).hexdigest() == digest
+    session = json.loads((run_dir / "session.log").read_text(encoding="utf-8"))
+    assert session["hashes"]["files"] == checksums
+
+    assert run_sim_main(argv + ["--pretty-json"]) == 0
+    assert json_out.read_text(encoding="utf-8").startswith("{\n  ")
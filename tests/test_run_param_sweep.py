@@ -308,3 +308,150 @@ def test_bayes_runner_retries_and_summary(tmp_path, monkeypatch):
     assert suggestion_indexes[0] == 1
     assert any(entry["search_metadata"].get("retry") == 1 for entry in payloads)
     assert max(suggestion_indexes) >= 2
+
+
+def _write_bayes_experiment(tmp_path: Path, **bayes_overrides: Any) -> Path:
+    manifest_path = tmp_path / "manifest.yaml"
+    manifest_path.write_text("strategy:\n  parameters:\n    k_tp: 1.5\n", encoding="utf-8")
+    bayes_block: Dict[str, Any] = {
+        "enabled": True,
+        "seed": 7,
+        "initial_random_trials": 2,
+        "constraint_retry_limit": 1,
+        "transforms": {"k_tp": {"mode": "continuous"}},
+    }
+    bayes_block.update(bayes_overrides)
+    config_path = tmp_path / "experiment.yaml"
+    config_path.write_text(
+        yaml.safe_dump(
+            {
+                "manifest_path": str(manifest_path),
+                "base_output_dir": str(tmp_path / "runs"),
+                "runner": {"base_cli": []},
+                "search_space": {
+                    "k_tp": {
+                        "path": "strategy.parameters.k_tp",
+                        "type": "float_range",
+                        "min": 1.0,
+                        "max": 3.0,
+                        "step": 0.1,
+                        "precision": 2,
+                    }
+                },
+                "constraints": [],
+                "seasonal_slices": [],
+                "scoring": {},
+                "bayes": bayes_block,
+            },
+            sort_keys=False,
+        ),
+        encoding="utf-8",
+    )
+    return config_path
+
+
+def _make_bayes_runner(config_path: Path, out_dir: Path, workers: int) -> "sweep.BayesSearchRunner":
+    args = sweep._parse_args(
+        ["--experiment", str(config_path), "--search", "bayes", "--workers", str(workers), "--out", str(out_dir)]
+    )
+    config = load_experiment_config(args.experiment)
+    runner = sweep.SweepRunner(config, args, timestamp="20240101_000000")
+    return sweep.BayesSearchRunner(runner, output_dir=out_dir, timestamp="20240101_000000")
+
+
+def _completed(spec, trial_dir: Path, *, score: float, feasible: bool = True) -> "sweep.TrialResult":
+    trial_dir.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "params": spec.params,
+        "status": "completed",
+        "feasible": feasible,
+        "score": score,
+        "search_metadata": dict(spec.metadata),
+    }
+    return sweep.TrialResult(spec=spec, status="completed", result_path=trial_dir / "result.json", payload=payload)
+
+
+def test_bayes_runner_async_keeps_workers_busy(tmp_path, monkeypatch):
+    import threading
+    import time as time_module
+
+    config_path = _write_bayes_experiment(tmp_path)
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def fake_run_single(self, spec, trial_dir):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time_module.sleep(0.02 * (1 + spec.index % 3))
+        with lock:
+            state["active"] -= 1
+        # The first trial violates constraints so a retry gets queued.
+        return _completed(spec, trial_dir, score=spec.params["k_tp"], feasible=spec.index != 0)
+
+    monkeypatch.setattr(sweep.SweepRunner, "_run_single", fake_run_single)
+    bayes = _make_bayes_runner(config_path, tmp_path / "out", workers=3)
+    results, meta = bayes.run(8)
+
+    assert state["peak"] == 3
+    assert len(results) == 8
+    assert meta["mode"] == "async"
+    assert meta["workers"] == 3
+    assert meta["evaluations"] == 8
+    assert meta["constraint_retries"] == 1
+    assert meta["suggestions"] == 7
+    assert len({tuple(sorted(item.spec.params.items())) for item in results}) == 8
+    retried = [item for item in results if item.spec.metadata["retry"] == 1]
+    assert len(retried) == 1
+    assert retried[0].spec.metadata["suggestion_index"] == 1
+
+
+def test_bayes_runner_uses_optuna_ask_tell_when_installed(tmp_path, monkeypatch):
+    told: List[Any] = []
+
+    class FakeTrial:
+        def __init__(self, number, params):
+            self.number = number
+            self.params = params
+
+    class FakeStudy:
+        def __init__(self):
+            self.asked = 0
+
+        def ask(self, distributions):
+            self.asked += 1
+            dist = distributions["k_tp"]
+            return FakeTrial(self.asked, {"k_tp": dist.low + 0.1234 * self.asked})
+
+        def tell(self, trial, value=None, state=None):
+            told.append((trial.number, value, state))
+
+        def enqueue_trial(self, params):  # pragma: no cover - dedupe fallback
+            raise AssertionError("unexpected enqueue")
+
+    class FloatDistribution:
+        def __init__(self, low, high, log=False):
+            self.low, self.high, self.log = low, high, log
+
+    study = FakeStudy()
+    sampler_kwargs: Dict[str, Any] = {}
+    fake_optuna = SimpleNamespace(
+        create_study=lambda direction, sampler: study,
+        samplers=SimpleNamespace(TPESampler=lambda **kwargs: sampler_kwargs.update(kwargs)),
+        distributions=SimpleNamespace(FloatDistribution=FloatDistribution),
+        trial=SimpleNamespace(TrialState=SimpleNamespace(FAIL="FAIL")),
+        logging=SimpleNamespace(WARNING=30, set_verbosity=lambda level: None),
+    )
+    monkeypatch.setitem(sys.modules, "optuna", fake_optuna)
+
+    def fake_run_single(self, spec, trial_dir):
+        return _completed(spec, trial_dir, score=spec.params["k_tp"], feasible=spec.params["k_tp"] < 1.3)
+
+    monkeypatch.setattr(sweep.SweepRunner, "_run_single", fake_run_single)
+    bayes = _make_bayes_runner(config_path=_write_bayes_experiment(tmp_path), out_dir=tmp_path / "out", workers=2)
+    results, meta = bayes.run(3)
+
+    assert meta["optimizer"] == "optuna"
+    assert sampler_kwargs["constant_liar"] is True
+    assert sorted(item.spec.params["k_tp"] for item in results) == [1.12, 1.25, 1.37]
+    assert sorted(told) == [(1, 1.12, None), (2, 1.25, None), (3, 1.12, None)]
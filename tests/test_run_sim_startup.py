@@ -0,0 +1,54 @@
+"""Import-time budget for ``scripts/run_sim.py``.
+
+Sweeps and benchmarks launch the CLI once per trial, so modules that are only
+needed for optional features must stay out of its import graph.
+"""
+
+import subprocess
+import sys
+
+from scripts.run_sim import ROOT_PATH
+
+# Generous enough for slow CI hosts; importing pandas alone exceeds it.
+IMPORT_BUDGET_US = 400_000
+
+DEFERRED_MODULES = (
+    "core.fill_calibration",
+    "core.router_pipeline",
+    "core.runner_checkpoint",
+    "core.sub_bar_replay",
+    "numpy",
+    "pandas",
+    "router.router_v1",
+    "scripts.ev_vs_actual_pnl",
+    "scripts.generate_experiment_report",
+    "scripts.propose_param_update",
+)
+
+
+def _import_profile(module: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_PATH,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        try:
+            profile[name.strip()] = int(cumulative)
+        except ValueError:
+            continue
+    return profile
+
+
+def test_run_sim_import_defers_optional_modules():
+    profile = _import_profile("scripts.run_sim")
+    assert "scripts.run_sim" in profile
+    loaded = sorted(name for name in DEFERRED_MODULES if name in profile)
+    assert loaded == []
+    assert profile["scripts.run_sim"] < IMPORT_BUDGET_US
@@ -0,0 +1,163 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from core.runner_checkpoint import RunCheckpointer, load_checkpoint, resume_offset
+from scripts.run_sim import load_bars_csv, main as run_sim_main
+from tests.runner_fixtures import MANIFEST_PATH, SAMPLE_CSV, make_runner
+
+
+class _Crash(Exception):
+    pass
+
+
+def _crash_after(iterator, count):
+    for index, bar in enumerate(iterator):
+        if index == count:
+            raise _Crash()
+        yield bar
+
+
+def test_load_bars_csv_offset_seeks_past_processed_rows(tmp_path):
+    csv_path = tmp_path / "bars.csv"
+    csv_path.write_text(
+        "timestamp,symbol,tf,o,h,l,c,v,spread\r\n"
+        "2024-01-01T08:00:00Z,USDJPY,5m,150.00,150.10,149.90,150.02,0,0.02\r\n"
+        "2024-01-01T08:05:00Z,USDJPY,5m,150.01,150.11,149.91,150.03,0,0.02\r\n"
+        "2024-01-01T08:10:00Z,USDJPY,5m,150.02,150.12,149.92,150.04,0,0.02\r\n",
+        encoding="utf-8",
+    )
+    iterator = load_bars_csv(str(csv_path))
+    next(iterator)
+    next(iterator)
+    offset = iterator.offset
+    assert csv_path.read_bytes()[:offset].endswith(b"150.03,0,0.02\r\n")
+
+    resumed = list(load_bars_csv(str(csv_path), start_offset=offset))
+    assert [bar["timestamp"] for bar in resumed] == ["2024-01-01T08:10:00Z"]
+
+
+@pytest.mark.parametrize("mode", ["conservative", "bridge"])
+def test_resumed_run_matches_uninterrupted_run(tmp_path, mode):
+    expected = make_runner().run(load_bars_csv(str(SAMPLE_CSV)), mode=mode).as_dict()
+
+    checkpoint_path = tmp_path / "checkpoint.json"
+    source = load_bars_csv(str(SAMPLE_CSV))
+    checkpointer = RunCheckpointer(checkpoint_path, every_bars=700, source=source)
+    with pytest.raises(_Crash):
+        make_runner().run(_crash_after(source, 3000), mode=mode, checkpoint=checkpointer)
+    assert checkpointer.writes == 4
+    assert list(tmp_path.iterdir()) == [checkpoint_path]
+
+    payload = load_checkpoint(checkpoint_path)
+    assert payload is not None
+    assert payload["bars_processed"] == 2800
+    offset = resume_offset(payload, SAMPLE_CSV)
+    assert offset > 0
+
+    runner = make_runner()
+    assert runner.load_checkpoint(payload)
+    resumed = runner.run(load_bars_csv(str(SAMPLE_CSV), start_offset=offset), mode=mode)
+    assert resumed.as_dict() == expected
+    # Seeking means no bar had to be re-parsed and skipped by timestamp.
+    assert runner.lifecycle.resume_skipped_bars == 0
+
+
+def test_resume_offset_rejects_rewritten_file(tmp_path):
+    csv_path = tmp_path / "bars.csv"
+    csv_path.write_bytes(SAMPLE_CSV.read_bytes()[:20000])
+    source = load_bars_csv(str(csv_path))
+    checkpointer = RunCheckpointer(tmp_path / "ck.json", every_bars=10, source=source)
+    make_runner().run(source, checkpoint=checkpointer)
+    payload = load_checkpoint(tmp_path / "ck.json")
+    assert resume_offset(payload, csv_path) > 0
+
+    data = bytearray(csv_path.read_bytes())
+    offset = payload["source"]["offset"]
+    data[offset - 5] = ord("9") if data[offset - 5] != ord("9") else ord("8")
+    csv_path.write_bytes(bytes(data))
+    assert resume_offset(payload, csv_path) == 0
+
+
+def test_checkpoint_every_days_counts_date_changes(tmp_path):
+    checkpointer = RunCheckpointer(tmp_path / "ck.json", every_days=2)
+    runner = make_runner()
+    for date in ["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-03"]:
+        runner._current_date = date
+        checkpointer.after_bar(runner)
+    assert checkpointer.writes == 1
+    assert "source" not in json.loads((tmp_path / "ck.json").read_text())
+
+
+def test_run_sim_resumes_from_checkpoint_and_clears_it(tmp_path, monkeypatch):
+    checkpoint_path = tmp_path / "run.checkpoint.json"
+    argv = [
+        "--manifest",
+        str(MANIFEST_PATH),
+        "--csv",
+        str(SAMPLE_CSV),
+        "--no-auto-state",
+        "--checkpoint",
+        str(checkpoint_path),
+        "--checkpoint-every-bars",
+        "1000",
+    ]
+    baseline_out = tmp_path / "baseline.json"
+    assert run_sim_main([*argv, "--json-out", str(baseline_out)]) == 0
+    assert not checkpoint_path.exists()
+
+    original_after_bar = RunCheckpointer.after_bar
+
+    def _crashing_after_bar(self, runner):
+        wrote = original_after_bar(self, runner)
+        if self.writes == 2:
+            raise _Crash()
+        return wrote
+
+    monkeypatch.setattr(RunCheckpointer, "after_bar", _crashing_after_bar)
+    with pytest.raises(_Crash):
+        run_sim_main([*argv, "--json-out", str(tmp_path / "crashed.json")])
+    monkeypatch.setattr(RunCheckpointer, "after_bar", original_after_bar)
+    assert checkpoint_path.exists()
+
+    resumed_out = tmp_path / "resumed.json"
+    assert run_sim_main([*argv, "--json-out", str(resumed_out)]) == 0
+    assert not checkpoint_path.exists()
+
+    baseline = json.loads(baseline_out.read_text(encoding="utf-8"))
+    resumed = json.loads(resumed_out.read_text(encoding="utf-8"))
+    assert resumed.pop("resumed_checkpoint")["bars_processed"] == 2000
+    for key in ("trades", "wins", "total_pips", "equity_curve"):
+        assert resumed[key] == baseline[key]
+
+
+def test_run_sim_ignores_checkpoint_after_manifest_edit(tmp_path, monkeypatch):
+    manifest_copy = tmp_path / "day_orb_5m.yaml"
+    manifest_copy.write_text(MANIFEST_PATH.read_text(encoding="utf-8"), encoding="utf-8")
+    checkpoint_path = tmp_path / "run.checkpoint.json"
+    argv = [
+        "--manifest", str(manifest_copy), "--csv", str(SAMPLE_CSV), "--no-auto-state",
+        "--checkpoint", str(checkpoint_path), "--checkpoint-every-bars", "1000",
+    ]
+    original_after_bar = RunCheckpointer.after_bar
+
+    def _crashing_after_bar(self, runner):
+        wrote = original_after_bar(self, runner)
+        if self.writes == 1:
+            raise _Crash()
+        return wrote
+
+    monkeypatch.setattr(RunCheckpointer, "after_bar", _crashing_after_bar)
+    with pytest.raises(_Crash):
+        run_sim_main(argv)
+    monkeypatch.setattr(RunCheckpointer, "after_bar", original_after_bar)
+    meta = load_checkpoint(checkpoint_path)["meta"]
+    assert meta["manifest_sha256"] and meta["runner_config_sha256"]
+
+    # Same manifest id, different file contents: the checkpoint must not resume.
+    with manifest_copy.open("a", encoding="utf-8") as handle:
+        handle.write("# edited after the crash\n")
+    out_path = tmp_path / "out.json"
+    assert run_sim_main([*argv, "--json-out", str(out_path)]) == 0
+    assert "resumed_checkpoint" not in json.loads(out_path.read_text(encoding="utf-8"))
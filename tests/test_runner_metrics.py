@@ -0,0 +1,99 @@
+import math
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.runner import BacktestRunner, Metrics, RunnerConfig
+from core.runner_metrics import DrawdownTracker, EquityCurveSampler, RunningStats
+
+
+def _returns(count=300, seed=7):
+    rng = random.Random(seed)
+    return [rng.gauss(0.5, 10.0) for _ in range(count)]
+
+
+def _timestamp(index):
+    return (datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(hours=index)).isoformat()
+
+
+def _record_all(metrics, returns):
+    for index, value in enumerate(returns):
+        metrics.record_trade(value, 1.0 if value > 0 else 0.0, timestamp=_timestamp(index))
+    return metrics
+
+
+def test_running_stats_and_drawdown_match_batch_formulas():
+    values = _returns()
+    stats = RunningStats.from_values(values)
+    mean = sum(values) / len(values)
+    variance = sum((v - mean) ** 2 for v in values) / len(values)
+    assert stats.mean == pytest.approx(mean)
+    assert stats.variance == pytest.approx(variance)
+    assert stats.sharpe() == pytest.approx(mean / math.sqrt(variance) * math.sqrt(len(values)))
+    assert RunningStats().sharpe() is None
+    assert RunningStats.from_values([3.0]).sharpe() == 0.0
+
+    equity, curve = 0.0, [0.0]
+    for value in values:
+        equity += value
+        curve.append(equity)
+    worst = min(e - max(curve[: i + 1]) for i, e in enumerate(curve))
+    assert DrawdownTracker.from_values(curve).max_drawdown == pytest.approx(worst)
+
+
+def test_sampler_bounds_points_and_keeps_latest():
+    sampler = EquityCurveSampler(max_points=8)
+    curve = []
+    for index in range(100):
+        sampler.append(curve, (str(index), float(index)))
+        assert len(curve) <= 8
+        assert curve[-1] == (str(index), float(index))
+    positions = [int(ts) for ts, _ in curve[:-1]]
+    assert positions[0] == 0
+    assert all(position % sampler.stride == 0 for position in positions)
+
+
+def test_downsampled_metrics_report_exact_statistics():
+    returns = _returns()
+    full = _record_all(Metrics(starting_equity=1000.0), returns)
+    compact = _record_all(
+        Metrics(starting_equity=1000.0, equity_curve_points=16, trade_returns_window=32), returns
+    )
+
+    assert len(full.equity_curve) == len(returns)
+    assert len(compact.equity_curve) <= 16
+    assert len(compact.trade_returns) == 32
+    assert compact.trade_returns == full.trade_returns[-32:]
+    full_dict, compact_dict = full.as_dict(), compact.as_dict()
+    assert compact_dict["sharpe"] == pytest.approx(full_dict["sharpe"])
+    assert compact_dict["max_drawdown"] == pytest.approx(full_dict["max_drawdown"])
+    assert compact_dict["equity_curve"][0] == full_dict["equity_curve"][0]
+    assert compact_dict["equity_curve"][-1] == full_dict["equity_curve"][-1]
+
+
+def test_runner_state_round_trip_keeps_streaming_statistics():
+    returns = _returns(120)
+    cfg = RunnerConfig(equity_curve_points=10, trade_returns_window=5)
+    runner = BacktestRunner(equity=1000.0, symbol="USDJPY", runner_cfg=cfg)
+    _record_all(runner.metrics, returns[:100])
+    state = runner.export_state()
+    assert len(state["metrics"]["equity_curve"]) <= 10
+    assert len(state["metrics"]["trade_returns"]) == 5
+
+    resumed = BacktestRunner(equity=1000.0, symbol="USDJPY", runner_cfg=cfg)
+    resumed.load_state(state)
+    for index, value in enumerate(returns[100:], start=100):
+        for metrics in (runner.metrics, resumed.metrics):
+            metrics.record_trade(value, 0.0, timestamp=_timestamp(index))
+
+    reference = _record_all(Metrics(starting_equity=1000.0), returns).as_dict()
+    resumed_dict = resumed.metrics.as_dict()
+    assert resumed_dict["sharpe"] == pytest.approx(reference["sharpe"])
+    assert resumed_dict["max_drawdown"] == pytest.approx(reference["max_drawdown"])
+    assert resumed.metrics.equity_curve == runner.metrics.equity_curve
+
+    # Bounding is opt-in: the default runner keeps the full history.
+    full_runner = BacktestRunner(equity=1000.0, symbol="USDJPY", runner_cfg=RunnerConfig())
+    assert full_runner.metrics.equity_curve_points is None
+    assert full_runner.metrics.trade_returns_window is None
@@ -0,0 +1,81 @@
+from copy import deepcopy
+
+import pytest
+
+from configs.strategies.loader import load_manifest
+from core.runner import BacktestRunner
+from scripts.run_sim import _load_strategy_class, _runner_config_from_manifest, load_bars_csv
+from tests.runner_fixtures import MANIFEST_PATH, SAMPLE_CSV
+
+PARAMS = (
+    {"or_n": 4, "k_tp": 1.2, "k_sl": 0.6},
+    {"or_n": 6, "k_tp": 0.9, "k_sl": 0.8},
+    {"or_n": 4, "k_tp": 1.2, "k_sl": 0.6},
+)
+EV_PROFILE = {
+    "global": {"recent": {"alpha_avg": 12.0, "beta_avg": 9.0}},
+    "buckets": [
+        {
+            "bucket": {"session": "LDN", "spread_band": "narrow", "rv_band": band},
+            "recent": {"alpha_avg": 3.0 + index, "beta_avg": 2.0},
+            "long_term": {"alpha_avg": 30.0, "beta_avg": 25.0},
+        }
+        for index, band in enumerate(("low", "mid", "high"))
+    ],
+}
+
+
+@pytest.fixture(scope="module")
+def bars():
+    return list(load_bars_csv(str(SAMPLE_CSV)))[:2500]
+
+
+def _runner(rcfg=None, **kwargs):
+    manifest = load_manifest(MANIFEST_PATH)
+    return BacktestRunner(
+        equity=100000.0,
+        symbol="USDJPY",
+        runner_cfg=rcfg or _runner_config_from_manifest(manifest),
+        strategy_cls=_load_strategy_class(manifest.strategy.class_path),
+        ev_profile=deepcopy(EV_PROFILE),
+        **kwargs,
+    )
+
+
+def _summary(metrics):
+    return (metrics.trades, metrics.total_pips, list(metrics.trade_returns), dict(metrics.daily))
+
+
+def _fresh(bars, params, state=None):
+    rcfg = _runner_config_from_manifest(load_manifest(MANIFEST_PATH))
+    rcfg.merge_strategy_params(params)
+    runner = _runner(rcfg)
+    if state is not None:
+        assert runner.load_state(deepcopy(state))
+    return runner.run(bars, mode="conservative")
+
+
+def test_reset_matches_fresh_runner_per_params(bars):
+    prepared = _runner()
+    base_strategy = deepcopy(prepared.rcfg.strategy)
+    original_rcfg = prepared.rcfg
+    for params in PARAMS:
+        prepared.reset(params)
+        assert prepared.stg.cfg["or_n"] == params["or_n"]
+        assert _summary(prepared.replay(bars)) == _summary(_fresh(bars, params))
+    assert original_rcfg.strategy == base_strategy
+    assert prepared._ev_profile_lookup[("LDN", "narrow", "mid")]["recent"]["alpha_avg"] == 4.0
+
+
+def test_reset_reapplies_loaded_state(bars):
+    seed = _runner()
+    seed.run(bars)
+    state = seed.export_state()
+
+    prepared = _runner()
+    assert prepared.load_state(deepcopy(state))
+    # Same or_n as the seed run, so the state's config fingerprint matches.
+    for params in ({"k_tp": 1.2, "k_sl": 0.6}, {"k_tp": 0.9}):
+        prepared.reset(params)
+        assert prepared.ev_global.alpha == pytest.approx(state["ev_global"]["alpha"])
+        assert _summary(prepared.replay(bars)) == _summary(_fresh(bars, params, state))
@@ -0,0 +1,102 @@
+import copy
+import json
+
+from analysis.dashboard.loaders import list_state_files, load_ev_history
+from core.state_snapshots import (
+    DELTA_SUFFIX,
+    apply_patch,
+    diff_state,
+    latest_snapshot,
+    list_snapshots,
+    load_snapshot,
+    prune_snapshots,
+    write_snapshot,
+)
+from scripts.aggregate_ev import aggregate_states
+
+
+def _state(step):
+    returns = [float(i % 7 - 3) for i in range(200 + step)]
+    return {
+        "ev_global": {"alpha": 10.0 + step, "beta": 5.0},
+        "ev_buckets": {
+            f"LDN:narrow:{band}": {"alpha": 1.0 + step * (band == "mid"), "beta": 2.0}
+            for band in ("low", "mid", "high")
+        },
+        "metrics": {
+            "trades": 200 + step,
+            "trade_returns": returns,
+            "daily": {f"2024-01-{day:02d}": {"pnl": float(day)} for day in range(1, 10 + step)},
+        },
+        "meta": {"step": step} if step % 2 else {"step": step, "odd": False},
+    }
+
+
+def test_diff_and_patch_round_trip():
+    previous, current = _state(1), _state(2)
+    patch = diff_state(previous, current)
+    assert apply_patch(previous, patch) == current
+    assert patch["p"]["metrics"]["a"]["trade_returns"] == current["metrics"]["trade_returns"][-1:]
+    assert "ev_global" in patch["p"] and "low" not in json.dumps(patch["p"]["ev_buckets"])
+    assert diff_state(current, copy.deepcopy(current)) == {}
+
+
+def test_archive_writes_deltas_between_keyframes_and_rebuilds_every_snapshot(tmp_path):
+    paths = [write_snapshot(tmp_path, f"20240101_0000{i:02d}_state", _state(i), keyframe_every=4) for i in range(9)]
+    kinds = ["delta" if p.name.endswith(DELTA_SUFFIX) else "key" for p in paths]
+    assert kinds == ["key", "delta", "delta", "delta", "key", "delta", "delta", "delta", "key"]
+    assert paths[1].stat().st_size * 5 < paths[0].stat().st_size
+
+    assert list_snapshots(tmp_path) == paths
+    assert latest_snapshot(tmp_path) == paths[-1]
+    cache = {}
+    for index, path in enumerate(paths):
+        assert load_snapshot(path) == _state(index)
+        assert load_snapshot(path, cache) == _state(index)
+    # Keyframes stay plain JSON for legacy readers.
+    assert json.loads(paths[4].read_text(encoding="utf-8")) == _state(4)
+
+    removed = prune_snapshots(tmp_path, keep=2)
+    # paths[7] is a delta, so its chain back to the keyframe paths[4] survives.
+    assert removed == paths[:4]
+    assert load_snapshot(paths[7]) == _state(7)
+
+    agg = aggregate_states(list_snapshots(tmp_path))
+    assert agg["global"]["count"] == 5
+    assert agg["buckets"]["LDN:narrow:mid"]["alpha_sum"] == sum(1.0 + i for i in range(4, 9))
+
+
+def test_legacy_archive_files_remain_loadable(tmp_path):
+    legacy = tmp_path / "20240101_000000.json"
+    legacy.write_text(json.dumps(_state(0), indent=2), encoding="utf-8")
+    (tmp_path / "20240101_000000_diff.json").write_text("{}", encoding="utf-8")
+    delta = write_snapshot(tmp_path, "20240101_000100", _state(1))
+    assert delta.name.endswith(DELTA_SUFFIX)
+    assert list_snapshots(tmp_path) == [legacy, delta]
+    assert load_snapshot(delta) == _state(1)
+
+
+def test_prune_with_stem_suffix_only_rotates_matching_snapshots(tmp_path):
+    run_sim = write_snapshot(tmp_path, "20240101_000000", _state(0), keyframe_every=4)
+    exports = [
+        write_snapshot(tmp_path, f"20240101_0001{i:02d}_state", _state(i + 1), keyframe_every=4) for i in range(6)
+    ]
+    later_run_sim = write_snapshot(tmp_path, "20240101_000900", _state(7), keyframe_every=4)
+
+    removed = prune_snapshots(tmp_path, keep=2, stem_suffix="_state")
+
+    remaining = list_snapshots(tmp_path)
+    assert run_sim in remaining and later_run_sim in remaining
+    assert all(path.name.endswith(("_state.json", "_state" + DELTA_SUFFIX)) for path in removed)
+    assert exports[-1] in remaining and exports[-2] in remaining
+    for path in remaining:
+        load_snapshot(path)
+
+
+def test_dashboard_history_includes_delta_snapshots(tmp_path):
+    paths = [write_snapshot(tmp_path, f"20240101_0000{i:02d}_state", _state(i), keyframe_every=4) for i in range(6)]
+    assert any(path.name.endswith(DELTA_SUFFIX) for path in paths)
+
+    assert list_state_files(tmp_path) == paths
+    history = load_ev_history(tmp_path)
+    assert [snapshot.alpha for snapshot in history] == [10.0 + i for i in range(6)]
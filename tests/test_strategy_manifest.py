@@ -89,3 +89,40 @@ def test_router_round_trip_with_priority_and_limits(tmp_path):
     assert reloaded.router.max_slippage_bps == manifest.router.max_slippage_bps
     assert reloaded.router.max_fill_latency_ms == manifest.router.max_fill_latency_ms
     assert reloaded.router.category_budget_pct == manifest.router.category_budget_pct
+
+
+def test_load_manifest_cached_reuses_pickle_until_yaml_changes(tmp_path):
+    import os
+
+    from configs.strategies import loader
+
+    manifest_path = tmp_path / "day_orb.yaml"
+    text = Path("configs/strategies/day_orb_5m.yaml").read_text(encoding="utf-8")
+    manifest_path.write_text(text, encoding="utf-8")
+    os.utime(manifest_path, ns=(1_700_000_000_000_000_000,) * 2)
+    cache_path = loader._manifest_cache_path(manifest_path)
+
+    first = loader.load_manifest_cached(manifest_path)
+    assert cache_path.exists()
+    assert first == load_manifest(manifest_path)
+
+    calls = []
+    original = loader.load_manifest
+
+    def _counting_load(path):
+        calls.append(path)
+        return original(path)
+
+    loader.load_manifest = _counting_load
+    try:
+        assert loader.load_manifest_cached(manifest_path) == first
+        assert calls == []
+
+        manifest_path.write_text(
+            text.replace("id: day_orb_5m_v1", "id: day_orb_5m_v2"), encoding="utf-8"
+        )
+        edited = loader.load_manifest_cached(manifest_path)
+        assert edited.id == "day_orb_5m_v2"
+        assert len(calls) == 1
+    finally:
+        loader.load_manifest = original
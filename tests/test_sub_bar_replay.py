@@ -0,0 +1,156 @@
+import math
+
+from core.fill_engine import BridgeFill, ConservativeFill, OrderSpec, SameBarPolicy
+from core.runner import BacktestRunner, RunnerConfig
+from core.sub_bar_replay import SubBarReplay
+
+
+def _write_1m(path, rows):
+    lines = ["timestamp,symbol,tf,o,h,l,c,v,spread"]
+    for ts, o, h, low, c in rows:
+        lines.append(f"{ts},USDJPY,1m,{o},{h},{low},{c},1,0.0")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def _collision_setup():
+    bar = {
+        "timestamp": "2024-01-02T10:05:00Z",
+        "o": 150.00,
+        "h": 150.20,
+        "l": 149.80,
+        "c": 150.10,
+        "pip": 0.01,
+        "spread": 0.0,
+    }
+    spec = OrderSpec(side="BUY", entry=150.00, tp_pips=10.0, sl_pips=10.0, slip_cap_pip=2.0)
+    return bar, spec
+
+
+def _minute_rows(first_leg_up: bool):
+    # Surround the parent bar with neighbours so the bisect has to skip them.
+    rows = [
+        ("2024-01-02T10:00:00", 150.0, 150.30, 149.70, 150.0),
+        ("2024-01-02T10:04:00", 150.0, 150.30, 149.70, 150.0),
+    ]
+    if first_leg_up:
+        rows += [
+            ("2024-01-02T10:05:00", 150.00, 150.04, 149.98, 150.03),
+            ("2024-01-02T10:06:00", 150.03, 150.15, 150.02, 150.12),
+            ("2024-01-02T10:07:00", 150.12, 150.13, 149.85, 149.88),
+        ]
+    else:
+        rows += [
+            ("2024-01-02T10:05:00", 150.00, 150.02, 149.95, 149.96),
+            ("2024-01-02T10:06:00", 149.96, 149.97, 149.85, 149.88),
+            ("2024-01-02T10:07:00", 149.88, 150.15, 149.87, 150.12),
+        ]
+    rows += [("2024-01-02T10:10:00", 150.0, 150.30, 149.70, 150.0)]
+    return rows
+
+
+def test_rows_for_only_returns_parent_bucket(tmp_path):
+    replay = SubBarReplay(_write_1m(tmp_path / "1m.csv", _minute_rows(True)))
+    rows = replay.rows_for("2024-01-02T10:05:00Z")
+    assert [row.ts for row in rows] == [
+        "2024-01-02T10:05:00",
+        "2024-01-02T10:06:00",
+        "2024-01-02T10:07:00",
+    ]
+    # Second lookup is served from the LRU cache.
+    replay.rows_for("2024-01-02T10:05:00Z")
+    assert replay.buckets_loaded == 1
+    assert replay.rows_for("2024-01-03T00:00:00Z") == []
+
+
+def test_replay_is_lazy_until_first_collision(tmp_path):
+    replay = SubBarReplay(_write_1m(tmp_path / "1m.csv", _minute_rows(True)))
+    assert replay._mm is None
+    replay.rows_for("2024-01-02T10:05:00Z")
+    assert replay._mm is not None
+    replay.close()
+
+
+def test_conservative_fill_uses_sub_bars_over_policy(tmp_path):
+    bar, spec = _collision_setup()
+    fill = ConservativeFill(SameBarPolicy.SL_FIRST)
+    fill.sub_bars = SubBarReplay(_write_1m(tmp_path / "1m.csv", _minute_rows(True)))
+    result = fill.simulate(bar, spec)
+    assert result["exit_reason"] == "tp"
+    assert math.isclose(result["exit_px"], 150.10, abs_tol=1e-9)
+
+    fill.sub_bars = SubBarReplay(_write_1m(tmp_path / "1m_down.csv", _minute_rows(False)))
+    result = fill.simulate(bar, spec)
+    assert result["exit_reason"] == "sl"
+    assert math.isclose(result["exit_px"], 149.90, abs_tol=1e-9)
+
+
+def test_bridge_fill_reports_exact_probability(tmp_path):
+    bar, spec = _collision_setup()
+    fill = BridgeFill()
+    fill.sub_bars = SubBarReplay(_write_1m(tmp_path / "1m.csv", _minute_rows(True)))
+    result = fill.simulate(bar, spec)
+    assert result["p_tp"] == 1.0
+    assert result["exit_reason"] == "tp"
+
+
+def test_missing_sub_bars_fall_back_to_policy(tmp_path):
+    bar, spec = _collision_setup()
+    bar["timestamp"] = "2024-02-01T00:00:00Z"
+    fill = ConservativeFill(SameBarPolicy.SL_FIRST)
+    fill.sub_bars = SubBarReplay(_write_1m(tmp_path / "1m.csv", _minute_rows(True)))
+    result = fill.simulate(bar, spec)
+    assert result["exit_reason"] == "sl"
+    assert fill.sub_bars.stats()["resolved"] == 0
+
+
+def test_single_ohlc_row_spanning_both_levels_is_unresolved(tmp_path):
+    path = _write_1m(tmp_path / "1m.csv", [("2024-01-02T10:05:00", 100.0, 100.5, 99.5, 100.2)])
+    replay = SubBarReplay(path)
+    # One 1m bar reaches both TP and SL; its OHLC does not say which printed
+    # first, so the caller's policy/calibration fallback must decide.
+    resolution = replay.resolve(
+        parent_ts="2024-01-02T10:05:00Z",
+        side="BUY",
+        entry_px=100.0,
+        tp_px=100.4,
+        stop_px=99.6,
+    )
+    assert resolution is None
+    assert replay.stats()["resolved"] == 0
+
+
+def test_tick_layout_uses_exit_side_of_book(tmp_path):
+    path = tmp_path / "ticks.csv"
+    path.write_text(
+        "timestamp,bid,ask\n"
+        "2024-01-02T10:05:00.100Z,149.99,150.01\n"
+        # Ask touches the SELL stop first although the bid never does.
+        "2024-01-02T10:05:01.000Z,150.08,150.10\n"
+        "2024-01-02T10:05:02.000Z,149.88,149.90\n",
+        encoding="utf-8",
+    )
+    replay = SubBarReplay(path)
+    resolution = replay.resolve(
+        parent_ts="2024-01-02T10:05:00Z",
+        side="SELL",
+        entry_px=150.00,
+        tp_px=149.90,
+        stop_px=150.10,
+    )
+    assert resolution is not None
+    assert resolution.exit_reason == "sl"
+    assert resolution.sub_bar_ts == "2024-01-02T10:05:01.000Z"
+
+
+def test_runner_attaches_sub_bar_replay(tmp_path):
+    path = _write_1m(tmp_path / "1m.csv", _minute_rows(True))
+    runner = BacktestRunner(
+        equity=100000.0,
+        symbol="USDJPY",
+        runner_cfg=RunnerConfig(fill_sub_bar_path=str(path)),
+    )
+    assert runner.sub_bar_replay is not None
+    assert runner.fill_engine_c.sub_bars is runner.sub_bar_replay
+    assert runner.fill_engine_b.sub_bars is runner.sub_bar_replay
+    assert BacktestRunner(equity=1.0, symbol="USDJPY").sub_bar_replay is None
@@ -0,0 +1,187 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from core.runner_progress import iter_period_chunks, partial_summary, period_key, run_in_chunks
+from scripts._param_sweep import (
+    ConstraintConfig,
+    ExperimentConfig,
+    PruningConfig,
+    ScoreConfig,
+    ScoreTerm,
+)
+from scripts._sweep_pruning import (
+    MedianPruner,
+    SuccessiveHalvingPruner,
+    TrialPruner,
+    watch_process,
+)
+from scripts.run_sim import load_bars_csv, main as run_sim_main
+from tests.runner_fixtures import MANIFEST_PATH, SAMPLE_CSV, make_runner
+
+
+def _spread_over_quarters(tmp_path: Path) -> Path:
+    """Copy the January sample so that its days span Q1-Q3 (order preserved)."""
+
+    lines = SAMPLE_CSV.read_text(encoding="utf-8").splitlines()
+    out = [lines[0]]
+    for line in lines[1:]:
+        day = int(line[8:10])
+        out.append(f"2018-{(day - 1) // 3 + 1:02d}-{(day - 1) % 3 + 1:02d}{line[10:]}")
+    path = tmp_path / "spread.csv"
+    path.write_text("\n".join(out) + "\n", encoding="utf-8")
+    return path
+
+
+def test_period_key_and_streaming_chunks():
+    assert period_key("2024-05-31T23:55:00Z", "quarter") == "2024Q2"
+    assert period_key("2024-05-31 23:55:00", "month") == "2024-05"
+    bars = [{"timestamp": ts} for ts in ("2024-01-31", "2024-02-01", "2024-02-02", "2024-04-01")]
+    chunks = [(key, [bar["timestamp"] for bar in chunk]) for key, chunk in iter_period_chunks(bars, "month")]
+    assert chunks == [
+        ("2024-01", ["2024-01-31"]),
+        ("2024-02", ["2024-02-01", "2024-02-02"]),
+        ("2024-04", ["2024-04-01"]),
+    ]
+
+
+def test_run_in_chunks_matches_full_run_and_reports_each_quarter(tmp_path):
+    csv_path = _spread_over_quarters(tmp_path)
+    expected = make_runner().run(load_bars_csv(str(csv_path))).as_dict()
+
+    records = []
+    runner = make_runner()
+    metrics = run_in_chunks(runner, load_bars_csv(str(csv_path)), period="quarter", on_chunk=records.append)
+
+    assert metrics.as_dict() == expected
+    assert [record["period"] for record in records] == ["2018Q1", "2018Q2", "2018Q3"]
+    assert records[-1]["bars"] == 5000
+    assert records[-1]["metrics"] == partial_summary(runner.metrics, runner.daily)
+    assert records[-1]["metrics"]["trades"] == expected["trades"]
+    drawdowns = [record["metrics"]["max_drawdown"] for record in records]
+    assert drawdowns == sorted(drawdowns, reverse=True)
+
+
+def test_run_sim_progress_out_writes_jsonl(tmp_path):
+    progress = tmp_path / "progress.jsonl"
+    argv = [
+        "--manifest",
+        str(MANIFEST_PATH),
+        "--csv",
+        str(_spread_over_quarters(tmp_path)),
+        "--no-auto-state",
+        "--json-out",
+        str(tmp_path / "out.json"),
+        "--progress-out",
+        str(progress),
+        "--progress-every",
+        "month",
+    ]
+    assert run_sim_main(argv) == 0
+    records = [json.loads(line) for line in progress.read_text(encoding="utf-8").splitlines()]
+    assert [record["step"] for record in records] == list(range(1, 10))
+    final = json.loads((tmp_path / "out.json").read_text(encoding="utf-8"))
+    assert records[-1]["metrics"]["total_pips"] == pytest.approx(final["total_pips"])
+
+
+def test_median_pruner_waits_for_warmup_and_peers():
+    pruner = MedianPruner(warmup_steps=1, min_trials=2)
+    for trial_id, value in (("a", 5.0), ("b", 3.0)):
+        assert not pruner.report(trial_id, 1, value)
+        assert not pruner.report(trial_id, 2, value)
+    assert not pruner.report("c", 1, -10.0)  # still warming up
+    assert pruner.report("c", 2, 1.0)
+    assert not pruner.report("d", 2, 4.5)
+
+
+def test_successive_halving_keeps_top_fraction_at_rungs():
+    pruner = SuccessiveHalvingPruner(min_resource=1, reduction_factor=2, min_trials=2)
+    assert [step for step in range(1, 10) if pruner.is_rung(step)] == [1, 2, 4, 8]
+    assert not pruner.report("a", 1, 1.0)
+    assert not pruner.report("b", 1, 2.0)
+    assert not pruner.report("c", 1, 3.0)
+    assert pruner.report("d", 1, 0.5)
+    assert not pruner.report("d", 3, -100.0)  # not a rung
+
+
+class _Experiment:
+    """Just enough of ExperimentConfig for TrialPruner."""
+
+    make_context = ExperimentConfig.make_context
+
+    def __init__(self, scoring=None):
+        self.scoring = scoring or ScoreConfig()
+
+
+def test_trial_pruner_constraint_rules():
+    config = PruningConfig.from_dict({"rule": "none", "warmup_steps": 1, "constraint_margin": 0.5})
+    constraints = [
+        ConstraintConfig(id="dd", metric="metrics.max_drawdown", op=">=", threshold=-100.0),
+        ConstraintConfig(id="tpm", metric="metrics.trades_per_month", op=">=", threshold=18.0),
+        ConstraintConfig(id="season", metric="seasonal.q1.sharpe", op=">=", threshold=0.0),
+    ]
+    pruner = TrialPruner(config, _Experiment(), constraints)
+
+    ok = {"max_drawdown": -50.0, "trades_per_month": 5.0}
+    assert pruner.check("t", {}, {"step": 1, "metrics": ok}) is None  # rate rule in warm-up
+    verdict = pruner.check("t", {}, {"step": 2, "period": "2018Q2", "metrics": ok})
+    assert verdict["reason"] == "constraint:tpm"
+    assert pruner.check("t", {}, {"step": 2, "metrics": {"max_drawdown": -50.0, "trades_per_month": 10.0}}) is None
+    verdict = pruner.check("t", {}, {"step": 1, "metrics": {"max_drawdown": -150.0}})
+    assert verdict["reason"] == "constraint:dd"
+
+
+def test_trial_pruner_applies_score_rule():
+    config = PruningConfig.from_dict({"rule": "median", "warmup_steps": 0, "min_trials": 2})
+    scoring = ScoreConfig(objectives=[ScoreTerm.from_dict({"metric": "metrics.total_pips", "goal": "max"})])
+    pruner = TrialPruner(config, _Experiment(scoring), [])
+    assert pruner.check("a", {}, {"step": 1, "metrics": {"total_pips": 10.0}}) is None
+    assert pruner.check("b", {}, {"step": 1, "metrics": {"total_pips": 20.0}}) is None
+    verdict = pruner.check("c", {}, {"step": 1, "metrics": {"total_pips": -5.0}})
+    assert verdict["reason"] == "median"
+    assert verdict["value"] == -5.0
+
+
+def test_watch_process_terminates_pruned_child(tmp_path):
+    progress = tmp_path / "progress.jsonl"
+    marker = tmp_path / "finished"
+    script = (
+        "import json, sys, time\n"
+        "for step in range(1, 50):\n"
+        "    with open(sys.argv[1], 'a') as fh:\n"
+        "        fh.write(json.dumps({'step': step}) + '\\n')\n"
+        "    time.sleep(0.05)\n"
+        "open(sys.argv[2], 'w').close()\n"
+    )
+    seen = []
+
+    def on_progress(record):
+        seen.append(record["step"])
+        return {"reason": "test"} if record["step"] >= 3 else None
+
+    returncode, verdict = watch_process(
+        [sys.executable, "-c", script, str(progress), str(marker)],
+        progress_path=progress,
+        on_progress=on_progress,
+        poll_interval=0.02,
+    )
+    assert verdict == {"reason": "test"}
+    assert returncode != 0
+    assert not marker.exists()
+    assert seen[:3] == [1, 2, 3]
+
+
+def test_watch_process_reports_but_never_prunes_finished_child(tmp_path):
+    progress = tmp_path / "progress.jsonl"
+    script = "import sys\nopen(sys.argv[1], 'w').write('{\"step\": 1}\\n{\"step\": 2}\\n')\n"
+    seen = []
+    returncode, verdict = watch_process(
+        [sys.executable, "-c", script, str(progress)],
+        progress_path=progress,
+        on_progress=lambda record: seen.append(record["step"]) or {"reason": "late"},
+        poll_interval=0.5,
+    )
+    assert (returncode, verdict) == (0, None)
+    assert seen == [1, 2]
@@ -0,0 +1,138 @@
+import contextlib
+import io
+import json
+import subprocess
+import sys
+
+from scripts._trial_cache import TrialCache, code_version, run_sim_argv, trial_key
+from scripts.run_grid import run_grid
+from scripts.run_sim import main as run_sim_main
+from tests.runner_fixtures import MANIFEST_PATH, SAMPLE_CSV
+
+
+def _counting_execute(calls):
+    def _execute(command):
+        calls.append(command)
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            returncode = run_sim_main(run_sim_argv(command))
+        return subprocess.CompletedProcess(command, returncode, stdout=buffer.getvalue(), stderr="")
+
+    return _execute
+
+
+def _run_sim_command(tmp_path, name, *extra):
+    return [
+        sys.executable,
+        "scripts/run_sim.py",
+        "--manifest",
+        str(MANIFEST_PATH),
+        "--csv",
+        str(SAMPLE_CSV),
+        "--json-out",
+        str(tmp_path / name / "metrics.json"),
+        "--out-daily-csv",
+        str(tmp_path / name / "daily.csv"),
+        "--out-dir",
+        str(tmp_path / name / "runs"),
+        *extra,
+    ]
+
+
+def test_get_put_round_trip_and_file_hash_memo(tmp_path):
+    cache = TrialCache(tmp_path / "cache.sqlite3")
+    key = trial_key(entry="test", dataset_sha256="abc", params={"b": 1, "a": [1, 2]}, code=code_version())
+    assert key == trial_key(entry="test", dataset_sha256="abc", params={"a": [1, 2], "b": 1}, code=code_version())
+    assert cache.get(key) is None
+    cache.put(key, {"value": 1.5}, entry="test", dataset_sha256="abc", params={})
+    reopened = TrialCache(cache.path)
+    assert reopened.get(key) == {"value": 1.5}
+    assert (cache.misses, reopened.hits) == (1, 1)
+
+    data = tmp_path / "data.csv"
+    data.write_text("a,b\n1,2\n", encoding="utf-8")
+    first = cache.file_sha256(data)
+    assert cache.file_sha256(data) == first
+    data.write_text("a,b\n1,3\n", encoding="utf-8")
+    assert cache.file_sha256(data) != first
+    assert cache.file_sha256(tmp_path / "missing.csv") is None
+
+
+def test_run_sim_hit_restores_outputs_into_new_run_dir(tmp_path):
+    cache = TrialCache(tmp_path / "cache.sqlite3")
+    calls = []
+    execute = _counting_execute(calls)
+
+    first = cache.run_sim(_run_sim_command(tmp_path, "first", "--no-auto-state"), execute)
+    second = cache.run_sim(_run_sim_command(tmp_path, "second", "--no-auto-state"), execute)
+
+    assert len(calls) == 1
+    assert first.returncode == second.returncode == 0
+    first_out = json.loads((tmp_path / "first" / "metrics.json").read_text(encoding="utf-8"))
+    second_out = json.loads((tmp_path / "second" / "metrics.json").read_text(encoding="utf-8"))
+    assert second_out["total_pips"] == first_out["total_pips"]
+    assert second_out["run_dir"].startswith(str(tmp_path / "second" / "runs"))
+    assert second_out["dump_daily"] == str(tmp_path / "second" / "daily.csv")
+    restored = sorted(p.name for p in (tmp_path / "second" / "runs").rglob("*") if p.is_file())
+    original = sorted(p.name for p in (tmp_path / "first" / "runs").rglob("*") if p.is_file())
+    assert restored == original
+    assert (tmp_path / "second" / "daily.csv").read_bytes() == (tmp_path / "first" / "daily.csv").read_bytes()
+
+    cache.run_sim(_run_sim_command(tmp_path, "third", "--no-auto-state", "--mode", "bridge"), execute)
+    assert len(calls) == 2
+
+
+def test_run_sim_with_auto_state_is_never_cached(tmp_path):
+    cache = TrialCache(tmp_path / "cache.sqlite3")
+    lookup = cache.lookup_run_sim(run_sim_argv(_run_sim_command(tmp_path, "auto", "--auto-state")))
+    assert lookup.key is None and not lookup.hit
+    lookup = cache.lookup_run_sim(["--manifest", str(tmp_path / "missing.yaml"), "--csv", str(SAMPLE_CSV)])
+    assert lookup.key is None
+
+
+def test_run_grid_reuses_cached_trials(tmp_path, monkeypatch):
+    argv = [
+        "--csv", str(SAMPLE_CSV), "--symbol", "USDJPY", "--k-tp", "1.0,1.2",
+        "--out-dir", str(tmp_path / "grid"), "--trial-cache", str(tmp_path / "cache.sqlite3"), "--quiet",
+    ]
+    first = run_grid(argv)
+    assert first["trial_cache"]["misses"] == 2
+
+    from scripts import run_grid as run_grid_module
+
+    class _Forbidden:
+        def __init__(self, *args, **kwargs):
+            raise AssertionError("cached grid trial was re-simulated")
+
+    monkeypatch.setattr(run_grid_module, "BacktestRunner", _Forbidden)
+    second = run_grid(argv)
+    assert second["trial_cache"]["hits"] == 2
+    assert [row["total_pips"] for row in second["best_by_total_pips"]] == [
+        row["total_pips"] for row in first["best_by_total_pips"]
+    ]
+
+
+def test_code_version_covers_run_path_helpers():
+    from scripts import _trial_cache
+
+    hashed = []
+    for entry in _trial_cache._CODE_SOURCES:
+        path = _trial_cache.ROOT / entry
+        hashed.extend(path.rglob("*.py") if path.is_dir() else _trial_cache.ROOT.glob(entry))
+    names = {p.relative_to(_trial_cache.ROOT).as_posix() for p in hashed}
+    assert {"scripts/_run_outputs.py", "scripts/_sweep_pruning.py", "configs/strategies/loader.py"} <= names
+
+
+def test_put_evicts_least_recently_used_entries_over_max_bytes(tmp_path):
+    cache = TrialCache(tmp_path / "cache.sqlite3", max_bytes=None)
+    blob = bytes(range(256)) * 64  # incompressible enough to keep payloads sizeable
+    for name in ("old", "used", "new"):
+        cache.put(name, {"blob": blob, "name": name}, entry="test", dataset_sha256="abc", params={})
+    assert cache.get("used")["name"] == "used"
+
+    with cache._connect() as conn:
+        sizes = dict(conn.execute("SELECT key, LENGTH(payload) FROM trials").fetchall())
+    assert cache.prune(max_bytes=sizes["used"] + sizes["new"]) == 1
+    assert cache.get("old") is None
+    assert cache.get("used") is not None and cache.get("new") is not None
+    assert cache.stats()["evicted"] == 1
@@ -0,0 +1,109 @@
+import csv
+import io
+import json
+import sys
+import threading
+from pathlib import Path
+
+from scripts import check_data_quality, run_daily_workflow
+from scripts._workflow_context import WorkflowContext, dict_rows
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_CSV = ROOT / "data/sample_orb.csv"
+
+
+def test_dict_rows_matches_dict_reader():
+    text = "a,b,c\n1,2,3\n\n4,5\n6,7,8,9\n"
+    expected = list(csv.DictReader(io.StringIO(text)))
+    assert list(dict_rows(csv.reader(io.StringIO(text)))) == expected
+
+
+def _audit_cmd(csv_path, out_json):
+    return [
+        sys.executable,
+        str(ROOT / "scripts/check_data_quality.py"),
+        "--csv", str(csv_path),
+        "--symbol", "USDJPY",
+        "--out-json", str(out_json),
+        "--calendar-day-summary",
+    ]
+
+
+def test_run_cmd_calls_main_in_process_and_shares_bars(tmp_path, monkeypatch):
+    bars = tmp_path / "bars.csv"
+    bars.write_bytes(SAMPLE_CSV.read_bytes())
+    assert check_data_quality.main(_audit_cmd(bars, tmp_path / "direct.json")[2:]) == 0
+
+    def no_subprocess(*_args, **_kwargs):
+        raise AssertionError("stage should run in-process")
+
+    context = WorkflowContext(ROOT)
+    with context.activate():
+        monkeypatch.setattr(run_daily_workflow.subprocess, "run", no_subprocess)
+        assert run_daily_workflow.run_cmd(_audit_cmd(bars, tmp_path / "first.json")) == 0
+        assert run_daily_workflow.run_cmd(_audit_cmd(bars, tmp_path / "second.json")) == 0
+        monkeypatch.undo()
+        assert run_daily_workflow.run_cmd([sys.executable, "-c", "raise SystemExit(3)"]) == 3
+    assert context.stats == {"hits": 1, "misses": 1, "inprocess": 2}
+
+    def _load(name):
+        payload = json.loads((tmp_path / name).read_text(encoding="utf-8"))
+        payload.pop("generated_at", None)
+        return payload
+
+    assert _load("first.json") == _load("second.json") == _load("direct.json")
+
+
+def test_in_process_stage_reports_argparse_errors(tmp_path):
+    context = WorkflowContext(ROOT)
+    with context.activate():
+        cmd = [sys.executable, str(ROOT / "scripts/check_data_quality.py"), "--no-such-flag"]
+        assert run_daily_workflow.run_cmd(cmd) == 2
+
+
+def test_concurrent_loads_parse_each_file_once_outside_the_lock(tmp_path):
+    bars = tmp_path / "bars.csv"
+    bars.write_bytes(SAMPLE_CSV.read_bytes())
+    other = tmp_path / "other.csv"
+    other.write_text("a,b\n1,2\n", encoding="utf-8")
+    context = WorkflowContext(ROOT)
+    release = threading.Event()
+    calls = []
+
+    def slow_loader(path):
+        calls.append(path.name)
+        release.wait(5)
+        return path.name
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(context.load("rows", bars, slow_loader)))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    # While bars.csv is still parsing, another key loads without waiting for it.
+    assert context.load("rows", other, lambda path: "other") == "other"
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["bars.csv"] * 3
+    assert calls == ["bars.csv"]
+    assert context.stats["misses"] == 2 and context.stats["hits"] == 2
+
+
+def test_run_cmd_spawns_when_in_process_is_disabled(tmp_path, monkeypatch):
+    spawned = []
+
+    def fake_run(cmd, **_kwargs):
+        spawned.append(cmd)
+        return run_daily_workflow.subprocess.CompletedProcess(cmd, 0)
+
+    context = WorkflowContext(ROOT)
+    with context.activate():
+        monkeypatch.setattr(run_daily_workflow.subprocess, "run", fake_run)
+        cmd = _audit_cmd(SAMPLE_CSV, tmp_path / "out.json")
+        assert run_daily_workflow.run_cmd(cmd, in_process=False) == 0
+    assert spawned == [cmd]
+    assert context.stats["inprocess"] == 0
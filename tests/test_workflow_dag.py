@@ -0,0 +1,104 @@
+import threading
+import time
+
+from scripts._workflow_dag import WorkflowStage, run_dag, stage_dependencies
+
+
+def _stage(name, tmp_path, inputs=(), outputs=(), **kwargs):
+    return WorkflowStage(
+        name,
+        lambda: ["echo", name],
+        inputs=tuple(tmp_path / p for p in inputs),
+        outputs=tuple(tmp_path / p for p in outputs),
+        **kwargs,
+    )
+
+
+def test_dependencies_follow_path_hazards(tmp_path):
+    stages = [
+        _stage("ingest", tmp_path, outputs=["bars.csv"]),
+        _stage("quality", tmp_path, inputs=["bars.csv"], outputs=["reports/dq.json"]),
+        _stage("latency", tmp_path, inputs=["latency.csv"], outputs=["ops/rollup.csv"]),
+        _stage("bench", tmp_path, inputs=["bars.csv"], outputs=["reports"]),
+        _stage("archive", tmp_path, inputs=["runs"], outputs=["ops/archive"], after=("latency",)),
+    ]
+    deps = stage_dependencies(stages)
+    assert deps["quality"] == {"ingest"}
+    assert deps["latency"] == set()
+    # bench rewrites the reports directory quality writes into.
+    assert deps["bench"] == {"ingest", "quality"}
+    assert deps["archive"] == {"latency"}
+
+
+def test_independent_stages_overlap_and_dependents_wait(tmp_path):
+    active = []
+    peak = []
+    finished = []
+    lock = threading.Lock()
+
+    def runner(cmd):
+        with lock:
+            active.append(cmd[1])
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(cmd[1])
+            finished.append(cmd[1])
+        return 0
+
+    stages = [
+        _stage("a", tmp_path, outputs=["a.json"]),
+        _stage("b", tmp_path, outputs=["b.json"]),
+        _stage("c", tmp_path, inputs=["a.json", "b.json"], outputs=["c.json"]),
+    ]
+    run = run_dag(stages, runner=runner, workers=2)
+    assert run.exit_code == 0
+    assert max(peak) == 2
+    assert finished[-1] == "c"
+    assert {r.status for r in run.results.values()} == {"ok"}
+
+
+def test_unchanged_inputs_skip_cacheable_stage(tmp_path):
+    (tmp_path / "bars.csv").write_text("ts,close\n1,1.0\n", encoding="utf-8")
+    calls = []
+
+    def runner(cmd):
+        calls.append(cmd[1])
+        (tmp_path / f"{cmd[1]}.json").write_text("{}", encoding="utf-8")
+        return 0
+
+    stages = [
+        _stage("dq", tmp_path, inputs=["bars.csv"], outputs=["dq.json"], cacheable=True),
+        _stage("alert", tmp_path, inputs=["bars.csv"], outputs=["alert.json"]),
+    ]
+    state = tmp_path / "state.json"
+    run_dag(stages, runner=runner, state_path=state)
+    second = run_dag(stages, runner=runner, state_path=state)
+    assert calls == ["dq", "alert", "alert"]
+    assert second.results["dq"].status == "cached"
+
+    (tmp_path / "bars.csv").write_text("ts,close\n1,1.0\n2,1.1\n", encoding="utf-8")
+    run_dag(stages, runner=runner, state_path=state)
+    (tmp_path / "dq.json").unlink()
+    run_dag(stages, runner=runner, state_path=state)
+    run_dag(stages, runner=runner, state_path=state, force=True)
+    assert calls.count("dq") == 4
+
+
+def test_failure_blocks_pending_stages(tmp_path):
+    calls = []
+
+    def runner(cmd):
+        calls.append(cmd[1])
+        return 3 if cmd[1] == "a" else 0
+
+    stages = [
+        _stage("a", tmp_path, outputs=["a.json"], cacheable=True),
+        _stage("b", tmp_path, inputs=["a.json"]),
+    ]
+    state = tmp_path / "state.json"
+    run = run_dag(stages, runner=runner, state_path=state)
+    assert run.exit_code == 3
+    assert calls == ["a"]
+    assert run.results["b"].status == "blocked"
+    assert not state.exists()
@@ -0,0 +1,65 @@
+from core.utils import yaml_compat as yaml
+
+
+DOC = """\
+meta:
+  id: cached
+  mode: off
+values: [1, 2.5, "x"]
+"""
+
+
+def test_load_file_matches_safe_load_and_returns_fresh_objects(tmp_path):
+    yaml.clear_cache()
+    path = tmp_path / "config.yaml"
+    path.write_text(DOC, encoding="utf-8")
+
+    first = yaml.load_file(path)
+    assert first == yaml.safe_load(DOC)
+    assert first["meta"]["mode"] == "off"
+    first["meta"]["id"] = "mutated"
+    assert yaml.load_file(path)["meta"]["id"] == "cached"
+
+
+def test_load_file_is_keyed_by_content(tmp_path, monkeypatch):
+    yaml.clear_cache()
+    path = tmp_path / "config.yaml"
+    path.write_text(DOC, encoding="utf-8")
+    yaml.load_file(path)
+
+    parses = []
+    original = yaml.safe_load
+
+    def _counting_safe_load(stream):
+        parses.append(stream)
+        return original(stream)
+
+    monkeypatch.setattr(yaml, "safe_load", _counting_safe_load)
+
+    # Fresh process: the on-disk entry is reused.
+    yaml.clear_cache()
+    assert yaml.load_file(path)["meta"]["id"] == "cached"
+    assert parses == []
+
+    # Same bytes under another name hit the in-process cache.
+    copy_path = tmp_path / "sub" / "copy.yaml"
+    copy_path.parent.mkdir()
+    copy_path.write_text(DOC, encoding="utf-8")
+    yaml.load_file(copy_path)
+    assert parses == []
+
+    path.write_text(DOC.replace("cached", "edited"), encoding="utf-8")
+    assert yaml.load_file(path)["meta"]["id"] == "edited"
+    assert len(parses) == 1
+
+
+def test_load_file_ignores_corrupt_disk_entry(tmp_path):
+    yaml.clear_cache()
+    path = tmp_path / "config.yaml"
+    path.write_text(DOC, encoding="utf-8")
+    yaml.load_file(path)
+    cache_file = next((tmp_path / "__pycache__").iterdir())
+    cache_file.write_bytes(b"not a pickle")
+
+    yaml.clear_cache()
+    assert yaml.load_file(path)["meta"]["id"] == "cached"